@@ -0,0 +1,223 @@
+"""partition audit tables by time
+
+Revision ID: 2026_10_16_partition_audit_tables
+Revises: 2025_08_16_add_ai_models_and_settings_tables
+Create Date: 2026-10-16 09:00:00.000000
+
+Turns ``audit_logs`` and ``extended_audit_logs`` into tables range
+partitioned by their timestamp. The existing table is kept as the partition
+of everything before the start of next month, so no rows are copied; it is
+dropped by retention once all of its rows have expired. Monthly partitions
+for the following months and a default partition are created here, later
+ones by the application's partition manager.
+
+ATTACH needs an index on the old table matching every index of the new
+parent, and would build the missing ones while holding an ACCESS EXCLUSIVE
+lock. They are built with CREATE INDEX CONCURRENTLY beforehand instead, so
+ATTACH only adopts them; the one for the new primary key replaces the old
+primary key first, as ATTACH only adopts constraint indexes for constraints.
+Concurrent builds cannot run in a transaction, so this migration commits
+between renaming the table and attaching it.
+"""
+
+import re
+from datetime import UTC, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "2026_10_16_partition_audit_tables"
+down_revision = "2025_08_16_add_ai_models_and_settings_tables"
+branch_labels = None
+depends_on = None
+
+# Partitioned tables and their partition key
+TABLES = {
+    "audit_logs": "created_at",
+    "extended_audit_logs": "timestamp",
+}
+
+# Indexes of the parent that are not carried over from the old table
+PARTIAL_INDEXES = {
+    "extended_audit_logs": {
+        "idx_audit_legal_hold_timestamp": 'USING btree ("timestamp") WHERE legal_hold',
+    },
+}
+
+PREMAKE_MONTHS = 3
+
+# The "USING method (columns) [WHERE ...]" part of an index definition
+_INDEX_BODY = re.compile(r" USING .*$")
+
+
+def _next_month(start: datetime) -> datetime:
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def _legacy_name(name: str) -> str:
+    # Identifiers are limited to 63 characters
+    return f"{name[:56]}_legacy"
+
+
+def _partition_index_name(name: str) -> str:
+    return f"{name[:58]}_part"
+
+
+def _partition_table(bind, table: str, key: str, boundary: datetime) -> None:
+    legacy = f"{table}_legacy"
+
+    # Captured before renaming, so the definitions still name the table that
+    # becomes the partitioned parent
+    indexes = bind.execute(
+        sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = :table"
+        ),
+        {"table": table},
+    ).all()
+    constraints = bind.execute(
+        sa.text(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    ).all()
+    constraint_names = {name for name, contype, _ in constraints if contype in "pu"}
+    primary_key = next(name for name, contype, _ in constraints if contype == "p")
+    unique_constraints = [name for name, contype, _ in constraints if contype == "u"]
+    unique_indexes = [
+        name
+        for name, definition in indexes
+        if definition.startswith("CREATE UNIQUE INDEX") and name not in constraint_names
+    ]
+
+    # Free the index names for the parent
+    op.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    for name in constraint_names:
+        op.execute(
+            f'ALTER TABLE "{legacy}" RENAME CONSTRAINT "{name}" TO "{_legacy_name(name)}"'
+        )
+    for name, _ in indexes:
+        if name not in constraint_names:
+            op.execute(f'ALTER INDEX "{name}" RENAME TO "{_legacy_name(name)}"')
+
+    op.execute(
+        f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ("{key}")'
+    )
+    # Primary and unique keys of a partitioned table must include the
+    # partition key; other unique indexes become plain indexes
+    op.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY (id, "{key}")')
+    for name, contype, definition in constraints:
+        if contype == "f":
+            op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+    # Indexes of the old table ATTACH cannot adopt: the new primary key and
+    # the plain replacements of unique indexes
+    partition_key = _partition_index_name(primary_key)
+    prebuilt = [
+        f'CREATE UNIQUE INDEX CONCURRENTLY "{partition_key}" '
+        f'ON "{legacy}" (id, "{key}")'
+    ]
+    for name, definition in indexes:
+        if name == primary_key:
+            continue
+        op.execute(definition.replace("CREATE UNIQUE INDEX", "CREATE INDEX", 1))
+        if definition.startswith("CREATE UNIQUE INDEX"):
+            body = _INDEX_BODY.search(definition).group(0)
+            prebuilt.append(
+                f'CREATE INDEX CONCURRENTLY "{_partition_index_name(name)}" '
+                f'ON "{legacy}"{body}'
+            )
+    for name, body in PARTIAL_INDEXES.get(table, {}).items():
+        op.execute(f'CREATE INDEX "{name}" ON "{table}" {body}')
+        prebuilt.append(
+            f'CREATE INDEX CONCURRENTLY "{_partition_index_name(name)}" '
+            f'ON "{legacy}" {body}'
+        )
+
+    # Commits the renames, so the old table is only briefly locked
+    with op.get_context().autocommit_block():
+        for statement in prebuilt:
+            op.execute(statement)
+
+    # A validated check lets SET NOT NULL and ATTACH skip scanning the old
+    # table; validating only takes a SHARE UPDATE EXCLUSIVE lock
+    check = f"{legacy}_range"
+    op.execute(
+        f'ALTER TABLE "{legacy}" ADD CONSTRAINT "{check}" '
+        f"CHECK (\"{key}\" IS NOT NULL AND \"{key}\" < '{boundary.isoformat()}') NOT VALID"
+    )
+    op.execute(f'ALTER TABLE "{legacy}" VALIDATE CONSTRAINT "{check}"')
+    op.execute(f'ALTER TABLE "{legacy}" ALTER COLUMN "{key}" SET NOT NULL')
+
+    # ATTACH only adopts an index for the parent's primary key if it backs a
+    # primary key itself, so the prebuilt index takes over the old key. The
+    # unique indexes replaced by plain ones go with it; both are catalog
+    # changes only
+    swap = [
+        f'DROP CONSTRAINT "{_legacy_name(primary_key)}"',
+        f'ADD CONSTRAINT "{partition_key}" PRIMARY KEY USING INDEX "{partition_key}"',
+    ]
+    swap += [f'DROP CONSTRAINT "{_legacy_name(name)}"' for name in unique_constraints]
+    op.execute(f'ALTER TABLE "{legacy}" {", ".join(swap)}')
+    for name in unique_indexes:
+        op.execute(f'DROP INDEX "{_legacy_name(name)}"')
+
+    op.execute(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{legacy}" '
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    )
+    op.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{check}"')
+
+    start = boundary
+    for _ in range(PREMAKE_MONTHS):
+        end = _next_month(start)
+        op.execute(
+            f'CREATE TABLE "{table}_p{start:%Y%m}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    op.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+
+def upgrade() -> None:
+    """Partition the audit tables by time."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    tables = sa.inspect(bind).get_table_names()
+    now = datetime.now(UTC)
+    boundary = _next_month(
+        now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    )
+    for table, key in TABLES.items():
+        if table in tables:
+            _partition_table(bind, table, key, boundary)
+
+
+def downgrade() -> None:
+    """Copy the partitioned audit tables back into plain tables."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for table in TABLES:
+        foreign_keys = bind.execute(
+            sa.text(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+            ),
+            {"table": table},
+        ).all()
+        plain = f"{table}_unpartitioned"
+        op.execute(f'CREATE TABLE "{plain}" (LIKE "{table}" INCLUDING ALL)')
+        op.execute(f'INSERT INTO "{plain}" SELECT * FROM "{table}"')
+        op.execute(f'DROP TABLE "{table}"')
+        op.execute(f'ALTER TABLE "{plain}" RENAME TO "{table}"')
+        for name, definition in foreign_keys:
+            op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
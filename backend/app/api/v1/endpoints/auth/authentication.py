@@ -21,8 +21,10 @@ from backend.app.core.security import (
     create_refresh_token,
     get_current_user_id,
     log_security_event,
+    revoke_token,
     security,
     verify_password,
+    verify_token,
 )
 from backend.app.core.csrf_protection import generate_csrf_token
 from backend.app.models.user import User
@@ -210,7 +212,7 @@ async def refresh_token(
     """
     try:
         # Verify refresh token
-        user_id = verify_token(refresh_token_data.refresh_token)
+        user_id = await verify_token(refresh_token_data.refresh_token)
         if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -267,8 +269,11 @@ async def logout(
     """
     try:
         # Verify token
-        user_id = verify_token(credentials.credentials)
+        user_id = await verify_token(credentials.credentials)
         if user_id:
+            # Blacklist the token and drop its cached principal everywhere
+            await revoke_token(credentials.credentials)
+
             # Log logout event
             log_security_event(
                 event_type="user_logout",
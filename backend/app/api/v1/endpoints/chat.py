@@ -5,9 +5,11 @@ This module provides chat endpoints with integration to the hybrid mode
 management system for structured responses and mode switching.
 """
 
+import json
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
@@ -335,6 +337,113 @@ async def send_message(
         )
 
 
+def _format_sse(event: str, data: dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/conversations/{conversation_id}/messages/stream")
+@rate_limit_chat
+async def stream_message(
+    conversation_id: str,
+    message_request: SecureChatMessageRequest,
+    request: Request,
+    current_user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Send a message to a conversation and stream the response as server-sent events.
+
+    Emits ``start``, ``token`` for each generated chunk, then ``done`` or
+    ``error``. Tokens are produced only as fast as the client reads them, and
+    a client disconnect cancels generation.
+
+    Args:
+        conversation_id: Conversation ID
+        message_request: Chat message request
+        request: HTTP request, used to detect client disconnects
+        current_user_id: Current user ID
+        db: Database session
+
+    Returns:
+        StreamingResponse: ``text/event-stream`` response
+    """
+    try:
+        # Verify conversation access
+        conversation = conversation_service.get_conversation(
+            conversation_id, current_user_id
+        )
+        if not conversation or str(conversation.user_id) != current_user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found or access denied",
+            )
+
+        # Add user message to conversation
+        user_message = conversation_service.add_message(
+            conversation_id=conversation_id,
+            user_id=current_user_id,
+            content=message_request.message,
+            role="user",
+            metadata=message_request.metadata,
+        )
+    except SecurityValidationError as e:
+        log_security_event("validation_error", str(e), current_user_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Security validation failed: {str(e)}",
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting message stream: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to send message: {str(e)}",
+        )
+
+    events = assistant_engine.stream_message(
+        user_id=current_user_id,
+        conversation_id=conversation_id,
+        message=message_request.message,
+        assistant_id=message_request.assistant_id,
+        use_knowledge_base=message_request.use_knowledge_base,
+        max_context_chunks=message_request.max_context_chunks,
+        temperature=message_request.temperature,
+        max_tokens=message_request.max_tokens,
+        model=message_request.model,
+        force_mode=message_request.force_mode,
+        metadata=message_request.metadata,
+    )
+
+    async def event_stream():
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    logger.info(
+                        f"Client left conversation {conversation_id} stream, "
+                        "stopping generation"
+                    )
+                    break
+                data = event["data"]
+                if event["event"] == "start":
+                    data = {
+                        **data,
+                        "conversation_id": conversation_id,
+                        "message_id": str(user_message.id),
+                    }
+                yield _format_sse(event["event"], data)
+        finally:
+            # Closing the engine stream closes the provider stream
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/conversations/{conversation_id}/messages")
 async def get_conversation_messages(
     conversation_id: str,
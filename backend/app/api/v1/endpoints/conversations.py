@@ -4,11 +4,12 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.app.core.database import get_db
-from backend.app.core.security import get_current_user
-from backend.app.models.user import User
+from backend.app.core.database import get_async_db, get_db
+from backend.app.core.principal_cache import Principal
+from backend.app.core.security import get_current_principal
 from backend.app.models.user import UserRole
 from backend.app.schemas.conversation import (
     ConversationCreate,
@@ -18,7 +19,10 @@ from backend.app.schemas.conversation import (
     MessageCreate,
     MessageResponse,
 )
-from backend.app.services.conversation_service import ConversationService
+from backend.app.services.conversation_service import (
+    AsyncConversationService,
+    ConversationService,
+)
 
 router = APIRouter()
 
@@ -44,7 +48,7 @@ class ConversationCreateRequest(BaseModel):
 async def create_conversation(
     conversation_data: ConversationCreateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Create a new conversation."""
     service = ConversationService(db)
@@ -68,11 +72,11 @@ async def list_conversations(
     mine: bool | None = Query(False, description="Only current user's conversations"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """List conversations (paginated, filterable)."""
-    service = ConversationService(db)
+    service = AsyncConversationService(db)
     # Default to current user's conversations
     # If mine=true, force current user; otherwise only allow other user_id for admins
     if mine:
@@ -83,11 +87,10 @@ async def list_conversations(
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         else:
             user_id = str(current_user.id)
-    conversations = service.get_user_conversations(user_id)
-    total = len(conversations)
-    start = (page - 1) * size
-    end = start + size
-    page_convs = conversations[start:end]
+    # Only the requested page is loaded
+    page_convs, total = await service.get_user_conversations(
+        user_id, skip=(page - 1) * size, limit=size
+    )
     return ConversationListResponse(
         conversations=page_convs,
         total=total,
@@ -100,12 +103,12 @@ async def list_conversations(
 @router.get("/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
     conversation_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get a conversation by ID."""
-    service = ConversationService(db)
-    conv = service.get_conversation(conversation_id, str(current_user.id))
+    service = AsyncConversationService(db)
+    conv = await service.get_conversation(conversation_id, str(current_user.id))
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
     return conv
@@ -116,7 +119,7 @@ async def update_conversation(
     conversation_id: str,
     update_data: ConversationUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Update a conversation."""
     service = ConversationService(db)
@@ -138,7 +141,7 @@ async def update_conversation(
 async def delete_conversation(
     conversation_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Delete a conversation."""
     service = ConversationService(db)
@@ -151,7 +154,7 @@ async def delete_conversation(
 async def archive_conversation(
     conversation_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Archive a conversation."""
     service = ConversationService(db)
@@ -167,15 +170,15 @@ async def archive_conversation(
 @router.get("/{conversation_id}/messages", response_model=list[MessageResponse])
 async def list_messages(
     conversation_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """List all messages in a conversation."""
-    service = ConversationService(db)
+    service = AsyncConversationService(db)
     # Check access rights
-    if not service.has_conversation_access(conversation_id, str(current_user.id)):
+    if not await service.has_conversation_access(conversation_id, str(current_user.id)):
         raise HTTPException(status_code=403, detail="Access denied")
-    return service.get_conversation_messages(conversation_id)
+    return await service.get_conversation_messages(conversation_id)
 
 
 @router.post(
@@ -186,13 +189,13 @@ async def list_messages(
 async def add_message(
     conversation_id: str,
     message_data: MessageCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Add a message to a conversation."""
-    service = ConversationService(db)
+    service = AsyncConversationService(db)
     # Check access rights
-    if not service.has_conversation_access(conversation_id, str(current_user.id)):
+    if not await service.has_conversation_access(conversation_id, str(current_user.id)):
         raise HTTPException(status_code=403, detail="Access denied")
     # Create MessageCreate object with conversation_id
     from backend.app.schemas.conversation import MessageCreate as SchemaMessageCreate
@@ -204,4 +207,4 @@ async def add_message(
         message_type=message_data.message_type,
         message_metadata=message_data.message_metadata,
     )
-    return service.add_message(message_create)
+    return await service.add_message(message_create)
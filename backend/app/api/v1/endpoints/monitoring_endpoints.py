@@ -12,11 +12,14 @@ from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
+from backend.app.core.config import get_settings
 from backend.app.core.database import get_db
 from backend.app.core.security import get_current_user
 from backend.app.models.user import User
+from backend.app.monitoring.core.metrics import get_metrics_collector
 from backend.app.monitoring.performance_monitor import (
     AlertSeverity,
     get_performance_monitor,
@@ -42,6 +45,22 @@ async def get_system_metrics(
         raise HTTPException(status_code=500, detail=f"Failed to get metrics: {str(e)}")
 
 
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics() -> PlainTextResponse:
+    """
+    Expose the metrics registry in the Prometheus text format.
+
+    Unauthenticated so that scrapers can reach it; disable it with
+    ``PROMETHEUS_METRICS_ENABLED=false`` where the API is public.
+    """
+    if not get_settings().monitoring.prometheus_metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(
+        get_metrics_collector().export_metrics("prometheus"),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @router.get("/database")
 async def get_database_metrics(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
@@ -8,7 +8,10 @@ typing indicators, chat state management, and knowledge base integration.
 import asyncio
 import contextlib
 import json
+from collections import deque
+from collections.abc import Callable
 from datetime import datetime
+from typing import Any
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
@@ -17,6 +20,7 @@ router = APIRouter()
 
 from loguru import logger
 
+from backend.app.core.config import get_settings
 from backend.app.core.database import get_db
 
 # get_current_user_ws is defined in this file
@@ -25,24 +29,357 @@ from backend.app.models.user import User
 from backend.app.services.ai_service import AIService
 from backend.app.services.conversation_service import ConversationService
 from backend.app.services.knowledge_service import KnowledgeService
+from backend.app.services.websocket_fanout import (
+    CONVERSATION,
+    USER,
+    FanoutBackend,
+    create_fanout_backend,
+)
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Framings a client can request for streamed response chunks
+STREAM_ENCODINGS = ("json", "msgpack")
+
+
+class _DiscardedConnection:
+    """Stands in for a connection closed before its stream was opened."""
+
+    async def send_text(self, message: str) -> None:
+        pass
+
+    async def send_bytes(self, message: bytes) -> None:
+        pass
+
+
+class StreamCoalescer:
+    """
+    Buffers streamed response deltas for one connection and sends them as
+    few frames.
+
+    Buffered deltas are flushed as one ``stream_chunk`` frame once
+    ``max_bytes`` are buffered or ``flush_interval`` seconds after the first
+    buffered delta, whichever comes first. The envelope is serialized once per
+    stream so each frame only encodes its content. With ``msgpack`` encoding
+    frames are sent as binary messages.
+    """
+
+    def __init__(
+        self,
+        connection: "ConnectionWriter | WebSocket | _DiscardedConnection",
+        conversation_id: str,
+        encoding: str = "json",
+        flush_interval: float | None = None,
+        max_bytes: int | None = None,
+    ):
+        ws_settings = get_settings().websocket
+
+        self.connection = connection
+        self.encoding = encoding
+        self.flush_interval = (
+            ws_settings.stream_flush_interval_ms / 1000
+            if flush_interval is None
+            else flush_interval
+        )
+        self.max_bytes = max_bytes or ws_settings.stream_flush_max_bytes
+        self.frames_sent = 0
+
+        self._parts: list[str] = []
+        self._size = 0
+        self._timer: asyncio.Task | None = None
+        self._send_lock = asyncio.Lock()
+
+        # Everything but the content is fixed for the whole stream
+        if encoding == "msgpack":
+            self._prefix = b"".join(
+                [
+                    b"\x82",  # map with 2 entries
+                    msgpack.packb("type"),
+                    msgpack.packb("stream_chunk"),
+                    msgpack.packb("data"),
+                    b"\x83",  # map with 3 entries
+                    msgpack.packb("conversation_id"),
+                    msgpack.packb(conversation_id),
+                    msgpack.packb("is_partial"),
+                    msgpack.packb(True),
+                    msgpack.packb("content"),
+                ]
+            )
+        else:
+            self._prefix = (
+                '{"type": "stream_chunk", "data": {"conversation_id": '
+                f'{json.dumps(conversation_id)}, "is_partial": true, "content": '
+            )
+
+    def _encode(self, content: str) -> str | bytes:
+        if self.encoding == "msgpack":
+            return self._prefix + msgpack.packb(content)
+        return f"{self._prefix}{json.dumps(content)}}}}}"
+
+    async def push(self, content: str) -> None:
+        """Buffer a delta, sending a frame if the byte budget is reached."""
+        if not content:
+            return
+
+        self._parts.append(content)
+        self._size += len(content.encode())
+        if self._size >= self.max_bytes:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Send everything buffered so far as one frame."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._send_buffer()
+
+    async def close(self) -> None:
+        """Flush the remaining deltas; call before the stream's final message."""
+        await self.flush()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # Detach first so a concurrent flush() does not cancel the send
+        self._timer = None
+        try:
+            await self._send_buffer()
+        except Exception as e:
+            logger.debug(f"Deferred stream flush failed: {e}")
+
+    async def _send_buffer(self) -> None:
+        async with self._send_lock:
+            if not self._parts:
+                return
+            frame = self._encode("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+            if isinstance(frame, bytes):
+                await self.connection.send_bytes(frame)
+            else:
+                await self.connection.send_text(frame)
+            self.frames_sent += 1
+
+
+class ConnectionWriter:
+    """
+    Bounded outbound queue drained by a dedicated writer task.
+
+    Broadcasts enqueue without waiting, so one slow client cannot stall
+    delivery to the others. When the queue is full the slow-consumer policy
+    either drops the oldest queued broadcast frame or disconnects the client.
+    Frames enqueued with a coalesce key replace a still-queued frame with the
+    same key. ``send_text``/``send_bytes`` wait for room instead, giving the
+    connection's own stream backpressure, and let the writer stand in for the
+    socket. Their frames are never dropped, since a response stream missing
+    a chunk cannot be reassembled by the client.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        conversation_id: str,
+        on_close: Callable[["ConnectionWriter"], None],
+        max_queue: int | None = None,
+        policy: str | None = None,
+    ):
+        ws_settings = get_settings().websocket
+
+        self.websocket = websocket
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.max_queue = max_queue or ws_settings.outbound_queue_size
+        self.policy = policy or ws_settings.slow_consumer_policy
+        self.closed = False
+
+        self._on_close = on_close
+        # Queued items are (coalesce key, frame, droppable)
+        self._queue: deque[tuple[str | None, str | bytes, bool]] = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._evict_task: asyncio.Task | None = None
+
+        self.stats = {
+            "sent": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "max_depth": 0,
+        }
+
+    @property
+    def depth(self) -> int:
+        """Frames waiting to be written."""
+        return len(self._queue)
+
+    def start(self) -> None:
+        """Start the writer task."""
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(
+        self,
+        frame: str | bytes,
+        coalesce_key: str | None = None,
+        droppable: bool = True,
+    ) -> bool:
+        """
+        Queue a frame without waiting.
+
+        Args:
+            frame: Encoded message
+            coalesce_key: Replace a queued frame with the same key, if any
+            droppable: Whether the drop_oldest policy may discard the frame
+
+        Returns:
+            False if the connection is closed or was disconnected as too slow
+        """
+        if self.closed:
+            return False
+
+        if coalesce_key is not None:
+            for i, (key, _, queued_droppable) in enumerate(self._queue):
+                if key == coalesce_key:
+                    self._queue[i] = (key, frame, queued_droppable)
+                    self.stats["coalesced"] += 1
+                    return True
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == "disconnect":
+                logger.warning(
+                    f"Disconnecting slow WebSocket client {self.user_id} "
+                    f"({len(self._queue)} frames queued)"
+                )
+                self._close()
+                # The writer task is cancelled on close, so close from here
+                self._evict_task = asyncio.create_task(self._evict())
+                return False
+            oldest = next(
+                (i for i, (_, _, queued) in enumerate(self._queue) if queued), None
+            )
+            if oldest is not None:
+                del self._queue[oldest]
+                self.stats["dropped"] += 1
+            elif droppable:
+                # Only stream frames are queued; they outrank a broadcast
+                self.stats["dropped"] += 1
+                return True
+
+        self._queue.append((coalesce_key, frame, droppable))
+        self.stats["max_depth"] = max(self.stats["max_depth"], len(self._queue))
+        self._ready.set()
+        return True
+
+    async def send_text(self, message: str) -> None:
+        """Queue a text frame, waiting while the queue is full."""
+        await self._wait_for_space()
+        self.enqueue(message, droppable=False)
+
+    async def send_bytes(self, message: bytes) -> None:
+        """Queue a binary frame, waiting while the queue is full."""
+        await self._wait_for_space()
+        self.enqueue(message, droppable=False)
+
+    def close(self) -> None:
+        """Stop the writer task and discard queued frames."""
+        self._close()
+        if self._task is not None:
+            self._task.cancel()
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get queue depth and delivery counters."""
+        return {**self.stats, "depth": len(self._queue), "closed": self.closed}
+
+    async def _wait_for_space(self) -> None:
+        while not self.closed and len(self._queue) >= self.max_queue:
+            self._space.clear()
+            await self._space.wait()
+
+    def _close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        # Wake the writer and any producer waiting for room
+        self._ready.set()
+        self._space.set()
+        self._on_close(self)
+
+    async def _evict(self) -> None:
+        with contextlib.suppress(Exception):
+            await self.websocket.close(code=1013, reason="Client too slow")
+
+    async def _run(self) -> None:
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+
+                _, frame, _ = self._queue.popleft()
+                self._space.set()
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+                self.stats["sent"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"WebSocket writer for {self.user_id} stopped: {e}")
+            self._close()
 
 
 class ConnectionManager:
-    """Manages WebSocket connections for real-time chat."""
+    """
+    Manages WebSocket connections for real-time chat.
 
-    def __init__(self):
+    Connections are local to this worker. Broadcasts and personal messages
+    are also published on the fan-out backend, so clients connected to other
+    workers receive them too.
+    """
+
+    def __init__(self, fanout: FanoutBackend | None = None):
+        self.fanout = fanout or create_fanout_backend()
+        self._fanout_tasks: set[asyncio.Task] = set()
         self.active_connections: dict[str, WebSocket] = {}
         self.conversation_connections: dict[str, set[str]] = {}
         self.user_connections: dict[str, set[str]] = {}
         self.knowledge_search_connections: dict[str, set[str]] = {}
+        self.stream_encodings: dict[str, str] = {}
+        self.writers: dict[str, ConnectionWriter] = {}
 
-    async def connect(self, websocket: WebSocket, user_id: str, conversation_id: str):
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        conversation_id: str,
+        stream_encoding: str = "json",
+    ):
         """Connect a user to a conversation WebSocket."""
         await websocket.accept()
 
         connection_id = f"{user_id}_{conversation_id}"
+        if connection_id in self.writers:
+            # Replaces an earlier connection of the same user
+            self.disconnect(user_id, conversation_id)
         self.active_connections[connection_id] = websocket
 
+        # Binary stream frames are opt-in and need msgpack installed
+        if stream_encoding not in STREAM_ENCODINGS or (
+            stream_encoding == "msgpack" and not MSGPACK_AVAILABLE
+        ):
+            stream_encoding = "json"
+        self.stream_encodings[connection_id] = stream_encoding
+
         # Track conversation connections
         if conversation_id not in self.conversation_connections:
             self.conversation_connections[conversation_id] = set()
@@ -62,29 +399,58 @@ class ConnectionManager:
                         "user_id": user_id,
                         "conversation_id": conversation_id,
                         "message": "Connected to chat",
+                        "stream_encoding": stream_encoding,
                     },
                 },
             ),
         )
 
+        # All further frames go through the connection's outbound queue
+        writer = ConnectionWriter(
+            websocket,
+            user_id,
+            conversation_id,
+            on_close=self._on_writer_closed,
+        )
+        self.writers[connection_id] = writer
+        writer.start()
+
+        await self.fanout.subscribe(CONVERSATION, conversation_id)
+        await self.fanout.subscribe(USER, user_id)
+
     def disconnect(self, user_id: str, conversation_id: str):
         """Disconnect a user from a conversation."""
         connection_id = f"{user_id}_{conversation_id}"
 
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
+        self.stream_encodings.pop(connection_id, None)
+
+        writer = self.writers.pop(connection_id, None)
+        if writer is not None:
+            writer.close()
 
         # Remove from conversation tracking
         if conversation_id in self.conversation_connections:
             self.conversation_connections[conversation_id].discard(connection_id)
             if not self.conversation_connections[conversation_id]:
                 del self.conversation_connections[conversation_id]
+                self._release_channel(CONVERSATION, conversation_id)
 
         # Remove from user tracking
         if user_id in self.user_connections:
             self.user_connections[user_id].discard(connection_id)
             if not self.user_connections[user_id]:
                 del self.user_connections[user_id]
+                self._release_channel(USER, user_id)
+
+    async def start(self) -> None:
+        """Start receiving events published by other workers."""
+        await self.fanout.start(self._on_fanout_event)
+
+    async def stop(self) -> None:
+        """Stop cross-worker fan-out."""
+        await self.fanout.stop()
 
     async def send_personal_message(
         self,
@@ -93,32 +459,128 @@ class ConnectionManager:
         conversation_id: str,
     ):
         """Send a message to a specific user in a conversation."""
+        writer = self.writers.get(f"{user_id}_{conversation_id}")
+        if writer is not None:
+            await writer.send_text(message)
+            return
+
+        # The user may be connected to another worker
+        await self.fanout.publish(
+            USER,
+            user_id,
+            {
+                "kind": USER,
+                "user_id": user_id,
+                "conversation_id": conversation_id,
+                "message": message,
+            },
+        )
+
+    def open_stream(self, user_id: str, conversation_id: str) -> StreamCoalescer:
+        """
+        Create a coalescing stream writer for a user's connection.
+
+        If the connection is already gone, e.g. disconnected as a slow
+        consumer, the stream's frames are discarded.
+        """
         connection_id = f"{user_id}_{conversation_id}"
-        if connection_id in self.active_connections:
-            await self.active_connections[connection_id].send_text(message)
+        writer = self.writers.get(connection_id)
+        if writer is None:
+            logger.debug(f"Discarding stream for closed connection {connection_id}")
+        return StreamCoalescer(
+            writer or _DiscardedConnection(),
+            conversation_id,
+            encoding=self.stream_encodings.get(connection_id, "json"),
+        )
 
     async def broadcast_to_conversation(
         self,
         message: str,
         conversation_id: str,
         exclude_user: str | None = None,
+        coalesce_key: str | None = None,
     ):
-        """Broadcast a message to all users in a conversation."""
-        if conversation_id in self.conversation_connections:
-            for connection_id in self.conversation_connections[conversation_id]:
-                # Skip excluded user
-                if exclude_user and connection_id.startswith(f"{exclude_user}_"):
-                    continue
+        """
+        Broadcast a message to all users in a conversation.
+
+        The encoded message is queued on every local participant's writer
+        without waiting, so delivery proceeds concurrently and slow clients
+        are handled by their own queue's policy. It is then published for
+        participants connected to other workers.
+        """
+        self._deliver_to_conversation(
+            message, conversation_id, exclude_user, coalesce_key
+        )
+        await self.fanout.publish(
+            CONVERSATION,
+            conversation_id,
+            {
+                "kind": CONVERSATION,
+                "conversation_id": conversation_id,
+                "message": message,
+                "exclude_user": exclude_user,
+                "coalesce_key": coalesce_key,
+            },
+        )
 
-                if connection_id in self.active_connections:
-                    try:
-                        await self.active_connections[connection_id].send_text(message)
-                    except Exception:
-                        # Remove broken connection
-                        del self.active_connections[connection_id]
-                        self.conversation_connections[conversation_id].discard(
-                            connection_id,
-                        )
+    def _deliver_to_conversation(
+        self,
+        message: str,
+        conversation_id: str,
+        exclude_user: str | None = None,
+        coalesce_key: str | None = None,
+    ) -> None:
+        # Snapshot: slow-consumer disconnects mutate the connection set
+        for connection_id in list(
+            self.conversation_connections.get(conversation_id, ())
+        ):
+            writer = self.writers.get(connection_id)
+            # Skip excluded user
+            if writer is None or writer.user_id == exclude_user:
+                continue
+            writer.enqueue(message, coalesce_key=coalesce_key)
+
+    def get_connection_stats(self) -> dict[str, dict[str, Any]]:
+        """Get outbound queue depth and drop counters per connection."""
+        return {
+            connection_id: writer.get_statistics()
+            for connection_id, writer in self.writers.items()
+        }
+
+    def _on_writer_closed(self, writer: ConnectionWriter) -> None:
+        connection_id = f"{writer.user_id}_{writer.conversation_id}"
+        if self.writers.get(connection_id) is writer:
+            self.disconnect(writer.user_id, writer.conversation_id)
+
+    async def _on_fanout_event(self, event: dict[str, Any]) -> None:
+        """Deliver an event published by another worker to local sockets."""
+        if event.get("kind") == CONVERSATION:
+            self._deliver_to_conversation(
+                event["message"],
+                event["conversation_id"],
+                exclude_user=event.get("exclude_user"),
+                coalesce_key=event.get("coalesce_key"),
+            )
+        elif event.get("kind") == USER:
+            writer = self.writers.get(f"{event['user_id']}_{event['conversation_id']}")
+            if writer is not None:
+                writer.enqueue(event["message"])
+
+    def _release_channel(self, kind: str, key: str) -> None:
+        # disconnect() is synchronous, so unsubscribe in the background
+        task = asyncio.get_running_loop().create_task(self._unsubscribe(kind, key))
+        self._fanout_tasks.add(task)
+        task.add_done_callback(self._fanout_tasks.discard)
+
+    async def _unsubscribe(self, kind: str, key: str) -> None:
+        # A client may have connected again before this task ran
+        connections = (
+            self.conversation_connections
+            if kind == CONVERSATION
+            else self.user_connections
+        )
+        if key not in connections:
+            await self.fanout.unsubscribe(kind, key)
 
     async def send_typing_indicator(
         self,
@@ -138,10 +600,12 @@ class ConnectionManager:
             },
         )
 
+        # A newer indicator from the same user replaces a still-queued one
         await self.broadcast_to_conversation(
             message,
             conversation_id,
             exclude_user=user_id,
+            coalesce_key=f"typing:{user_id}",
         )
 
     async def send_knowledge_update(
@@ -251,6 +715,7 @@ async def websocket_endpoint(
     websocket: WebSocket,
     conversation_id: str,
     token: str,
+    stream_encoding: str = "json",
     db: Session = Depends(get_db),
 ):
     """WebSocket endpoint for real-time chat with knowledge base integration."""
@@ -279,7 +744,12 @@ async def websocket_endpoint(
             return
 
         # Connect to WebSocket
-        await manager.connect(websocket, str(user.id), conversation_id)
+        await manager.connect(
+            websocket,
+            str(user.id),
+            conversation_id,
+            stream_encoding=stream_encoding,
+        )
 
         # Initialize services
         conversation_service = ConversationService(db)
@@ -336,10 +806,9 @@ async def websocket_endpoint(
 
                     # Generate AI response with streaming
                     try:
-                        # Get conversation context
-                        messages = conversation_service.get_messages(
+                        # Token-budgeted recent history plus rolling summary
+                        messages = conversation_service.get_conversation_history(
                             conversation_id,
-                            limit=10,
                         )
 
                         # Prepare knowledge context for AI
@@ -380,6 +849,9 @@ async def websocket_endpoint(
                         message_id = None
                         metadata = {}
 
+                        # Deltas are coalesced into fewer stream_chunk frames
+                        stream = manager.open_stream(str(user.id), conversation_id)
+
                         # Generate streaming AI response with RAG
                         async for chunk in ai_service.chat_completion_with_rag_stream(
                             messages=messages,
@@ -395,6 +867,7 @@ async def websocket_endpoint(
                         ):
                             if "error" in chunk:
                                 # Handle error
+                                await stream.close()
                                 error_message = json.dumps(
                                     {
                                         "type": "error",
@@ -421,22 +894,8 @@ async def websocket_endpoint(
                                 if content_chunk:
                                     full_response_content += content_chunk
 
-                                    # Send streaming chunk to client
-                                    stream_message = json.dumps(
-                                        {
-                                            "type": "stream_chunk",
-                                            "data": {
-                                                "conversation_id": conversation_id,
-                                                "content": content_chunk,
-                                                "is_partial": True,
-                                            },
-                                        },
-                                    )
-                                    await manager.send_personal_message(
-                                        stream_message,
-                                        str(user.id),
-                                        conversation_id,
-                                    )
+                                    # Buffer streaming chunk for the client
+                                    await stream.push(content_chunk)
 
                                 # Check if response is complete
                                 if chunk.get("choices") and chunk["choices"][0].get(
@@ -445,6 +904,9 @@ async def websocket_endpoint(
                                     finish_reason = chunk["choices"][0]["finish_reason"]
 
                                     if finish_reason in ["stop", "length"]:
+                                        # Deliver buffered deltas first
+                                        await stream.close()
+
                                         # Response is complete, save to database
                                         from backend.app.schemas.conversation import (
                                             MessageCreate,
@@ -505,12 +967,14 @@ async def websocket_endpoint(
                                         )
                                         break
 
-                            # Stop typing indicator
-                            await manager.send_typing_indicator(
-                                conversation_id,
-                                str(user.id),
-                                False,
-                            )
+                        await stream.close()
+
+                        # Stop typing indicator
+                        await manager.send_typing_indicator(
+                            conversation_id,
+                            str(user.id),
+                            False,
+                        )
 
                     except Exception as e:
                         logger.error(f"AI response generation error: {e}")
@@ -6,8 +6,11 @@ and performance tracking for the audit system.
 """
 
 import asyncio
+import bisect
 import json
 import logging
+import threading
+from collections import Counter, defaultdict
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -25,20 +28,105 @@ from backend.app.utils.exceptions import AuditError
 logger = logging.getLogger(__name__)
 
 
+# Upper bounds (ms) of the buckets of the audit duration histograms
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# How long hourly duration histograms are kept in Redis
+HISTOGRAM_TTL_SECONDS = 86400
+
+
+def _duration_bucket(duration_ms: float) -> str:
+    """Get the histogram field of a duration, e.g. ``le_250`` or ``le_inf``."""
+    index = bisect.bisect_left(DURATION_BUCKETS_MS, duration_ms)
+    if index == len(DURATION_BUCKETS_MS):
+        return "le_inf"
+    return f"le_{DURATION_BUCKETS_MS[index]}"
+
+
+class AuditMetricsBuffer:
+    """
+    In-process aggregation of audit metrics.
+
+    Events are folded into hash field increments locally, so recording an
+    event never touches Redis. ``drain`` hands the accumulated increments
+    over and resets the buffer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: dict[str, Counter[str]] = defaultdict(Counter)
+        self._sums: dict[str, dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self._expiring: set[str] = set()
+        self.events = 0
+
+    def __len__(self) -> int:
+        return self.events
+
+    def record(
+        self,
+        counts: list[tuple[str, str]],
+        sums: list[tuple[str, str, float]] = (),
+        expiring: tuple[str, ...] = (),
+    ) -> None:
+        """
+        Fold one event into the buffer.
+
+        Args:
+            counts: ``(key, field)`` pairs to increment by one
+            sums: ``(key, field, amount)`` triples to add to
+            expiring: Keys that expire after ``HISTOGRAM_TTL_SECONDS``
+        """
+        with self._lock:
+            for key, field in counts:
+                self._counts[key][field] += 1
+            for key, field, amount in sums:
+                self._sums[key][field] += amount
+            self._expiring.update(expiring)
+            self.events += 1
+
+    def drain(
+        self,
+    ) -> tuple[dict[str, Counter[str]], dict[str, dict[str, float]], set[str], int]:
+        """Take the buffered increments and reset the buffer."""
+        with self._lock:
+            drained = (self._counts, self._sums, self._expiring, self.events)
+            self._counts = defaultdict(Counter)
+            self._sums = defaultdict(lambda: defaultdict(float))
+            self._expiring = set()
+            self.events = 0
+        return drained
+
+
 class AuditMetrics:
-    """Audit metrics collection and tracking."""
+    """
+    Audit metrics collection and tracking.
 
-    def __init__(self, db: Session):
+    Recorded events are aggregated in an ``AuditMetricsBuffer`` and written to
+    Redis in a single pipeline every ``audit_metrics_flush_interval`` seconds,
+    or as soon as ``audit_metrics_max_pending`` events are buffered. Durations
+    are kept as a histogram per event type and hour, and as atomic sum and
+    count fields from which the average is derived.
+    """
+
+    def __init__(self, db: Session, redis_client: redis.Redis | None = None):
         self.db = db
-        self.redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_METRICS_DB,
-            password=settings.REDIS_PASSWORD,
+        self.redis_client = redis_client or redis.Redis.from_url(
+            settings.redis.redis_url,
+            db=settings.redis.redis_db,
             decode_responses=True,
         )
         self.metrics_prefix = "audit_metrics:"
         self.performance_prefix = "audit_performance:"
+        self.buffer = AuditMetricsBuffer()
+        self.flush_interval = settings.monitoring.audit_metrics_flush_interval
+        self.max_pending = settings.monitoring.audit_metrics_max_pending
+        self._flush_task: asyncio.Task | None = None
+        self._pending_flush: asyncio.Future | None = None
+
+    def _duration_key(self, name: str) -> str:
+        return f"{self.performance_prefix}duration:{name}"
 
     async def record_audit_event(
         self,
@@ -48,43 +136,23 @@ class AuditMetrics:
     ) -> None:
         """Record audit event metrics."""
         try:
-            timestamp = datetime.now(UTC)
-            key = f"{self.metrics_prefix}events:{timestamp.strftime('%Y%m%d:%H')}"
-
-            # Increment event counters
-            self.redis_client.hincrby(key, f"total_{event_type.value}", 1)
-            if success:
-                self.redis_client.hincrby(key, f"success_{event_type.value}", 1)
-            else:
-                self.redis_client.hincrby(key, f"failed_{event_type.value}", 1)
-
-            # Record performance metrics
-            perf_key = f"{self.performance_prefix}{event_type.value}:{timestamp.strftime('%Y%m%d:%H')}"
-            self.redis_client.lpush(perf_key, duration_ms)
-            self.redis_client.expire(perf_key, 86400)  # Keep for 24 hours
-
-            # Update rolling averages
-            avg_key = f"{self.performance_prefix}avg:{event_type.value}"
-            current_avg = self.redis_client.get(avg_key)
-            if current_avg:
-                current_avg = float(current_avg)
-                count = int(
-                    self.redis_client.get(
-                        f"{self.performance_prefix}count:{event_type.value}",
-                    )
-                    or 0,
-                )
-                new_avg = ((current_avg * count) + duration_ms) / (count + 1)
-                self.redis_client.set(avg_key, new_avg)
-                self.redis_client.incr(
-                    f"{self.performance_prefix}count:{event_type.value}",
-                )
-            else:
-                self.redis_client.set(avg_key, duration_ms)
-                self.redis_client.set(
-                    f"{self.performance_prefix}count:{event_type.value}",
-                    1,
-                )
+            event = event_type.value
+            hour = datetime.now(UTC).strftime("%Y%m%d:%H")
+            key = f"{self.metrics_prefix}events:{hour}"
+            histogram_key = f"{self.performance_prefix}{event}:{hour}"
+            duration_key = self._duration_key(event)
+
+            self.buffer.record(
+                counts=[
+                    (key, f"total_{event}"),
+                    (key, f"{'success' if success else 'failed'}_{event}"),
+                    (histogram_key, _duration_bucket(duration_ms)),
+                    (duration_key, "count"),
+                ],
+                sums=[(duration_key, "sum", duration_ms)],
+                expiring=(histogram_key,),
+            )
+            self._schedule_flush()
 
         except Exception as e:
             logger.exception(f"Failed to record audit metrics: {str(e)}")
@@ -122,24 +190,94 @@ class AuditMetrics:
     ) -> None:
         """Record cache performance metrics."""
         try:
-            timestamp = datetime.now(UTC)
-            key = f"{self.performance_prefix}cache:{timestamp.strftime('%Y%m%d:%H')}"
-
-            # Increment cache counters
-            self.redis_client.hincrby(key, f"total_{cache_operation}", 1)
-            if hit:
-                self.redis_client.hincrby(key, f"hit_{cache_operation}", 1)
-            else:
-                self.redis_client.hincrby(key, f"miss_{cache_operation}", 1)
+            hour = datetime.now(UTC).strftime("%Y%m%d:%H")
+            key = f"{self.performance_prefix}cache:{hour}"
+            histogram_key = (
+                f"{self.performance_prefix}cache_perf:{cache_operation}:{hour}"
+            )
 
-            # Record cache performance
-            perf_key = f"{self.performance_prefix}cache_perf:{cache_operation}:{timestamp.strftime('%Y%m%d:%H')}"
-            self.redis_client.lpush(perf_key, duration_ms)
-            self.redis_client.expire(perf_key, 86400)
+            self.buffer.record(
+                counts=[
+                    (key, f"total_{cache_operation}"),
+                    (key, f"{'hit' if hit else 'miss'}_{cache_operation}"),
+                    (histogram_key, _duration_bucket(duration_ms)),
+                ],
+                expiring=(histogram_key,),
+            )
+            self._schedule_flush()
 
         except Exception as e:
             logger.exception(f"Failed to record cache performance: {str(e)}")
 
+    def flush(self) -> int:
+        """
+        Write the buffered metrics to Redis in a single pipeline.
+
+        Returns:
+            int: Number of events flushed
+        """
+        counts, sums, expiring, events = self.buffer.drain()
+        if not events:
+            return 0
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key, fields in counts.items():
+            for field, amount in fields.items():
+                pipe.hincrby(key, field, amount)
+        for key, fields in sums.items():
+            for field, amount in fields.items():
+                pipe.hincrbyfloat(key, field, amount)
+        for key in expiring:
+            pipe.expire(key, HISTOGRAM_TTL_SECONDS)
+
+        try:
+            pipe.execute()
+        except Exception as e:
+            # Metrics are best effort; the increments are dropped
+            logger.exception(f"Failed to flush {events} audit metric events: {e}")
+            return 0
+        return events
+
+    async def close(self) -> None:
+        """Stop periodic flushing and flush what is still buffered."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await asyncio.to_thread(self.flush)
+
+    def _schedule_flush(self) -> None:
+        """Start periodic flushing, and flush early when the buffer is full."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+        if len(self.buffer) >= self.max_pending and (
+            self._pending_flush is None or self._pending_flush.done()
+        ):
+            self._pending_flush = asyncio.get_running_loop().run_in_executor(
+                None, self.flush
+            )
+
+    async def _flush_loop(self) -> None:
+        """Background task flushing the buffer periodically."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.exception(f"Error flushing audit metrics: {str(e)}")
+
+    def get_average_duration(
+        self, event_type: AuditEventType
+    ) -> tuple[float, int] | None:
+        """Get the average duration (ms) and count of an event type."""
+        total, count = self.redis_client.hmget(
+            self._duration_key(event_type.value), "sum", "count"
+        )
+        count = int(count or 0)
+        if not count:
+            return None
+        return float(total or 0) / count, count
+
     async def get_performance_metrics(
         self,
         start_date: datetime | None = None,
@@ -200,6 +338,7 @@ class AuditMetrics:
     async def get_real_time_metrics(self) -> dict[str, Any]:
         """Get real-time performance metrics."""
         try:
+            await asyncio.to_thread(self.flush)
             current_hour = datetime.now(UTC).strftime("%Y%m%d:%H")
 
             metrics = {
@@ -231,17 +370,11 @@ class AuditMetrics:
 
             # Rolling averages
             for event_type in AuditEventType:
-                avg_key = f"{self.performance_prefix}avg:{event_type.value}"
-                avg_duration = self.redis_client.get(avg_key)
-                if avg_duration:
+                average = self.get_average_duration(event_type)
+                if average:
                     metrics["rolling_averages"][event_type.value] = {
-                        "avg_duration_ms": float(avg_duration),
-                        "total_count": int(
-                            self.redis_client.get(
-                                f"{self.performance_prefix}count:{event_type.value}",
-                            )
-                            or 0,
-                        ),
+                        "avg_duration_ms": average[0],
+                        "total_count": average[1],
                     }
 
             return metrics
@@ -253,6 +386,7 @@ class AuditMetrics:
     async def get_performance_alerts(self) -> list[dict[str, Any]]:
         """Get performance alerts based on thresholds."""
         try:
+            await asyncio.to_thread(self.flush)
             alerts = []
             current_hour = datetime.now(UTC).strftime("%Y%m%d:%H")
 
@@ -283,11 +417,10 @@ class AuditMetrics:
 
             # Check for performance degradation
             for event_type in AuditEventType:
-                avg_key = f"{self.performance_prefix}avg:{event_type.value}"
-                avg_duration = self.redis_client.get(avg_key)
+                average = self.get_average_duration(event_type)
 
-                if avg_duration:
-                    avg_duration = float(avg_duration)
+                if average:
+                    avg_duration = average[0]
                     # Alert if average duration > 1000ms
                     if avg_duration > 1000:
                         alerts.append(
@@ -327,32 +460,27 @@ class AuditMetrics:
                 "peak_count": 0,
             }
 
-            # Get database metrics
-            query = self.db.query(ExtendedAuditLog).filter(
+            # The period is a range on the partition key, so only the
+            # partitions of the period are scanned
+            in_period = (
                 ExtendedAuditLog.event_type == event_type,
                 ExtendedAuditLog.timestamp >= start_date,
                 ExtendedAuditLog.timestamp <= end_date,
             )
 
-            total_events = query.count()
-            successful_events = query.filter(
-                ExtendedAuditLog.action_result == "success",
-            ).count()
-            failed_events = total_events - successful_events
-
-            # Calculate average duration
-            duration_result = (
-                self.db.query(func.avg(ExtendedAuditLog.event_duration))
-                .filter(
-                    ExtendedAuditLog.event_type == event_type,
-                    ExtendedAuditLog.timestamp >= start_date,
-                    ExtendedAuditLog.timestamp <= end_date,
-                    ExtendedAuditLog.event_duration.isnot(None),
+            total_events, successful_events, avg_duration = (
+                self.db.query(
+                    func.count(ExtendedAuditLog.id),
+                    func.count(ExtendedAuditLog.id).filter(
+                        ExtendedAuditLog.action_result == "success",
+                    ),
+                    func.avg(ExtendedAuditLog.event_duration),
                 )
-                .scalar()
+                .filter(*in_period)
+                .one()
             )
-
-            avg_duration = float(duration_result) if duration_result else 0
+            failed_events = total_events - successful_events
+            avg_duration = float(avg_duration) if avg_duration else 0
 
             # Find peak hour
             peak_hour_query = (
@@ -360,11 +488,7 @@ class AuditMetrics:
                     func.date_trunc("hour", ExtendedAuditLog.timestamp).label("hour"),
                     func.count(ExtendedAuditLog.id).label("count"),
                 )
-                .filter(
-                    ExtendedAuditLog.event_type == event_type,
-                    ExtendedAuditLog.timestamp >= start_date,
-                    ExtendedAuditLog.timestamp <= end_date,
-                )
+                .filter(*in_period)
                 .group_by(text("hour"))
                 .order_by(text("count DESC"))
                 .first()
@@ -472,6 +596,7 @@ class AuditPerformanceMonitor:
             "avg_duration": 1000,  # 1000ms average duration threshold
             "peak_events": 1000,  # 1000 events per hour threshold
         }
+        self._tasks: list[asyncio.Task] = []
 
     async def start_monitoring(self) -> None:
         """Start the performance monitoring system."""
@@ -479,12 +604,22 @@ class AuditPerformanceMonitor:
             logger.info("Starting audit performance monitoring")
 
             # Start background monitoring tasks
-            asyncio.create_task(self._monitor_performance())
-            asyncio.create_task(self._cleanup_old_metrics())
+            self._tasks = [
+                asyncio.create_task(self._monitor_performance()),
+                asyncio.create_task(self._cleanup_old_metrics()),
+            ]
 
         except Exception as e:
             logger.exception(f"Failed to start performance monitoring: {str(e)}")
 
+    async def stop_monitoring(self) -> None:
+        """Stop the monitoring tasks and flush buffered metrics."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.metrics.close()
+
     async def _monitor_performance(self) -> None:
         """Background task to monitor performance."""
         while True:
@@ -541,6 +676,7 @@ class AuditPerformanceMonitor:
     async def get_monitoring_dashboard(self) -> dict[str, Any]:
         """Get comprehensive monitoring dashboard data."""
         try:
+            await asyncio.to_thread(self.metrics.flush)
             return {
                 "timestamp": datetime.now(UTC).isoformat(),
                 "overview": await self._get_overview_metrics(),
@@ -604,12 +740,9 @@ class AuditPerformanceMonitor:
 
             # Get average response times for each event type
             for event_type in AuditEventType:
-                avg_key = f"{self.metrics.performance_prefix}avg:{event_type.value}"
-                avg_duration = self.metrics.redis_client.get(avg_key)
-                if avg_duration:
-                    performance["avg_response_times"][event_type.value] = float(
-                        avg_duration,
-                    )
+                average = self.metrics.get_average_duration(event_type)
+                if average:
+                    performance["avg_response_times"][event_type.value] = average[0]
 
             return performance
 
@@ -696,3 +829,14 @@ def get_audit_monitor(db: Session) -> AuditPerformanceMonitor:
     if audit_monitor is None:
         audit_monitor = AuditPerformanceMonitor(db)
     return audit_monitor
+
+
+async def close_audit_monitoring() -> None:
+    """Stop the global audit monitor and flush the global audit metrics."""
+    global audit_metrics, audit_monitor
+    if audit_monitor is not None:
+        await audit_monitor.stop_monitoring()
+        audit_monitor = None
+    if audit_metrics is not None:
+        await audit_metrics.close()
+        audit_metrics = None
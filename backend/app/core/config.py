@@ -15,6 +15,28 @@ class DatabaseSettings(BaseSettings):
     database_url: str = Field(default="sqlite:///./test.db", description="Database URL")
     database_pool_size: int = Field(default=20, description="Database pool size")
     database_max_overflow: int = Field(default=30, description="Database max overflow")
+    database_pool_timeout: float = Field(
+        default=30.0,
+        description="Seconds to wait for a pooled connection",
+    )
+    database_statement_timeout_ms: int = Field(
+        default=30000,
+        description="PostgreSQL statement timeout in milliseconds (0 disables it)",
+    )
+
+    # Async engine
+    database_async_url: str | None = Field(
+        default=None,
+        description="Async database URL; derived from database_url if unset",
+    )
+    database_async_pool_size: int = Field(
+        default=20,
+        description="Async database pool size",
+    )
+    database_async_max_overflow: int = Field(
+        default=10,
+        description="Async database max overflow",
+    )
 
 
 class RedisSettings(BaseSettings):
@@ -41,6 +63,26 @@ class SecuritySettings(BaseSettings):
         description="JWT refresh token expire days",
     )
 
+    # Authenticated principal cache
+    principal_cache_enabled: bool = Field(
+        default=True,
+        description="Cache authenticated user snapshots per token",
+    )
+    principal_cache_ttl_seconds: int = Field(
+        default=30,
+        ge=1,
+        description="Seconds a cached principal is served before it is reloaded",
+    )
+    principal_cache_max_entries: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of cached principals per worker",
+    )
+    principal_cache_channel: str = Field(
+        default="convosphere:principal:invalidate",
+        description="Redis pub/sub channel carrying principal cache invalidations",
+    )
+
     @field_validator("secret_key")
     @classmethod
     def validate_secret_key(cls, v):
@@ -87,6 +129,38 @@ class AISettings(BaseSettings):
         description="LiteLLM proxy host",
     )
 
+    # Conversation context store
+    context_max_conversations: int = Field(
+        default=1000,
+        description="Max conversation contexts kept in process memory",
+    )
+    context_ttl_seconds: int = Field(
+        default=86400,
+        description="Idle time after which a conversation context expires",
+    )
+    context_redis_enabled: bool = Field(
+        default=False,
+        description="Persist conversation contexts in Redis and share them across workers",
+    )
+
+    # Conversation history window
+    history_token_budget: int = Field(
+        default=3000,
+        description="Tokens of recent messages (plus summary) sent as conversation history",
+    )
+    history_window_max_messages: int = Field(
+        default=50,
+        description="Max recent messages loaded per turn for the history window",
+    )
+    history_summary_refresh_messages: int = Field(
+        default=10,
+        description="Unsummarized messages kept beyond the window before they are summarized",
+    )
+    history_summary_batch_messages: int = Field(
+        default=100,
+        description="Max messages folded into the rolling summary per refresh",
+    )
+
     @field_validator("litellm_temperature")
     @classmethod
     def validate_temperature(cls, v):
@@ -104,6 +178,26 @@ class WeaviateSettings(BaseSettings):
         description="Weaviate URL",
     )
     weaviate_api_key: str | None = Field(default=None, description="Weaviate API key")
+    weaviate_batch_size: int = Field(
+        default=100,
+        description="Objects per Weaviate batch request (0 for dynamic sizing)",
+    )
+    weaviate_batch_concurrent_requests: int = Field(
+        default=2,
+        description="Concurrent Weaviate batch requests",
+    )
+    weaviate_query_timeout_seconds: float = Field(
+        default=10.0,
+        description="Timeout for a single Weaviate query",
+    )
+    weaviate_insert_timeout_seconds: float = Field(
+        default=90.0,
+        description="Timeout for a single Weaviate insert or batch request",
+    )
+    weaviate_max_workers: int = Field(
+        default=8,
+        description="Threads used to run Weaviate calls off the event loop",
+    )
 
 
 class KnowledgeBaseSettings(BaseSettings):
@@ -118,6 +212,52 @@ class KnowledgeBaseSettings(BaseSettings):
     max_chunk_size: int = Field(default=2000, description="Max chunk size")
     min_chunk_size: int = Field(default=100, description="Min chunk size")
 
+    # Embedding cache
+    embedding_cache_max_entries: int = Field(
+        default=10000,
+        description="Max embeddings kept in the in-process LRU cache",
+    )
+    embedding_cache_ttl_seconds: int = Field(
+        default=3600,
+        description="TTL for embeddings in the in-process cache",
+    )
+    embedding_cache_redis_enabled: bool = Field(
+        default=True,
+        description="Share cached embeddings across workers via Redis",
+    )
+    embedding_cache_redis_ttl_seconds: int = Field(
+        default=604800,
+        description="TTL for embeddings in the Redis cache tier",
+    )
+
+    # Embedding dispatch
+    embedding_max_concurrent_batches: int = Field(
+        default=4,
+        description="Max embedding batches in flight per request",
+    )
+    embedding_batch_max_items: int = Field(
+        default=96,
+        description="Max texts per embedding batch",
+    )
+
+    # Semantic RAG response cache
+    rag_semantic_cache_max_entries: int = Field(
+        default=256,
+        description="Max cached RAG responses per config/user scope",
+    )
+    rag_semantic_cache_max_scopes: int = Field(
+        default=1024,
+        description="Max config/user scopes held by the semantic RAG cache",
+    )
+    rag_semantic_cache_ttl_seconds: int = Field(
+        default=3600,
+        description="TTL for responses in the semantic RAG cache",
+    )
+    rag_semantic_cache_channel: str = Field(
+        default="convosphere:rag-cache:invalidate",
+        description="Redis pub/sub channel carrying semantic RAG cache invalidations",
+    )
+
     # Document Processing
     chunk_size: int = Field(default=500, description="Chunk size")
     chunk_overlap: int = Field(default=50, description="Chunk overlap")
@@ -373,6 +513,87 @@ class MonitoringSettings(BaseSettings):
         json_schema_extra={"env": "MONITORING_COLLECTION_INTERVAL"},
     )
     performance_alert_thresholds: dict = Field(default_factory=dict)
+    prometheus_metrics_enabled: bool = Field(
+        default=True,
+        description="Serve request metrics in the Prometheus text format",
+        json_schema_extra={"env": "PROMETHEUS_METRICS_ENABLED"},
+    )
+    audit_metrics_flush_interval: float = Field(
+        default=5.0,
+        description="Seconds between flushes of buffered audit metrics to Redis",
+        json_schema_extra={"env": "AUDIT_METRICS_FLUSH_INTERVAL"},
+    )
+    audit_metrics_max_pending: int = Field(
+        default=1000,
+        description="Buffered audit events that trigger an early flush",
+        json_schema_extra={"env": "AUDIT_METRICS_MAX_PENDING"},
+    )
+
+
+class WebSocketSettings(BaseSettings):
+    """WebSocket streaming configuration settings."""
+
+    stream_flush_interval_ms: int = Field(
+        default=30,
+        description="Longest time a streamed delta is buffered before it is sent",
+    )
+    stream_flush_max_bytes: int = Field(
+        default=2048,
+        description="Buffered stream bytes that trigger an immediate frame",
+    )
+    outbound_queue_size: int = Field(
+        default=256,
+        description="Frames queued per connection before the slow-consumer policy applies",
+    )
+    slow_consumer_policy: str = Field(
+        default="drop_oldest",
+        description="What to do when a connection's queue is full: drop_oldest or disconnect",
+    )
+    fanout_backend: str = Field(
+        default="local",
+        description="Cross-worker event fan-out: local (single worker) or redis",
+    )
+    fanout_channel_prefix: str = Field(
+        default="convosphere:ws",
+        description="Prefix of the Redis pub/sub channels used for fan-out",
+    )
+
+
+class AuditSettings(BaseSettings):
+    """Audit log writer configuration settings."""
+
+    audit_queue_max_size: int = Field(
+        default=10000,
+        description="Audit events queued for writing before the overflow policy applies",
+    )
+    audit_overflow_policy: str = Field(
+        default="block",
+        description="What to do when the audit queue is full: block, drop_newest or drop_oldest",
+    )
+    audit_batch_size: int = Field(
+        default=500,
+        description="Audit events written per bulk insert",
+    )
+    audit_flush_interval: float = Field(
+        default=1.0,
+        description="Longest time in seconds an audit event waits for its batch to fill",
+    )
+    audit_spool_path: str | None = Field(
+        default=None,
+        description="Local append-only spool of unwritten audit events, replayed on startup",
+    )
+    audit_partition_interval: str = Field(
+        default="month",
+        description="Time range of each audit table partition: day or month",
+    )
+    audit_partitions_premake: int = Field(
+        default=3,
+        description="Future audit table partitions created ahead of time",
+    )
+    audit_partition_maintenance_interval: float = Field(
+        default=3600.0,
+        description="Seconds between checks that future audit partitions exist",
+    )
 
 
 class Settings(BaseSettings):
@@ -452,6 +673,8 @@ class Settings(BaseSettings):
         default_factory=SecurityFeatureSettings
     )
     monitoring: MonitoringSettings = Field(default_factory=MonitoringSettings)
+    websocket: WebSocketSettings = Field(default_factory=WebSocketSettings)
+    audit: AuditSettings = Field(default_factory=AuditSettings)
 
     model_config = ConfigDict(
         env_file=".env",
@@ -2,28 +2,58 @@
 Database connection and session management.
 
 This module provides database connection setup, session management,
-and utility functions for the AI Assistant Platform.
+and utility functions for the AI Assistant Platform. A synchronous engine
+serves ``get_db``; an asyncio engine (asyncpg for PostgreSQL, aiosqlite for
+SQLite) serves ``get_async_db`` for code running on the event loop.
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Any
 
 from loguru import logger
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.pool import QueuePool
 
 from .config import get_settings
 
+# Async drivers used in place of the configured sync ones
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _is_postgres(url: str) -> bool:
+    return url.startswith(("postgresql", "postgres"))
+
+
+def _sync_connect_args(url: str) -> dict[str, Any]:
+    timeout = get_settings().database.database_statement_timeout_ms
+    if _is_postgres(url) and timeout > 0:
+        return {"options": f"-c statement_timeout={timeout}"}
+    return {}
+
+
 # Create database engine
 engine = create_engine(
     get_settings().database.database_url,
     poolclass=QueuePool,
     pool_size=get_settings().database.database_pool_size,
     max_overflow=get_settings().database.database_max_overflow,
+    pool_timeout=get_settings().database.database_pool_timeout,
     pool_pre_ping=True,
     pool_recycle=3600,  # Recycle connections after 1 hour
     echo=get_settings().debug,  # Log SQL queries in debug mode
+    connect_args=_sync_connect_args(get_settings().database.database_url),
 )
 
 # Create session factory
@@ -65,6 +95,113 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_async_database_url() -> str:
+    """
+    Get the database URL for the async engine.
+
+    Returns:
+        str: ``database_async_url`` if set, else ``database_url`` with its
+        driver replaced by the matching asyncio driver
+    """
+    db_settings = get_settings().database
+    if db_settings.database_async_url:
+        return db_settings.database_async_url
+
+    url = db_settings.database_url
+    scheme, sep, rest = url.partition("://")
+    if scheme in _ASYNC_DRIVERS:
+        return f"{_ASYNC_DRIVERS[scheme]}{sep}{rest}"
+    return url
+
+
+# Created on first use so the sync-only paths don't need the async drivers
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async database engine, creating it on first use.
+
+    Returns:
+        AsyncEngine: Engine with pool sizing and statement timeout from
+        the database settings
+    """
+    global _async_engine
+
+    if _async_engine is None:
+        settings = get_settings()
+        db_settings = settings.database
+        url = get_async_database_url()
+
+        options: dict[str, Any] = {
+            "pool_pre_ping": True,
+            "echo": settings.debug,
+        }
+        if not url.startswith("sqlite"):
+            options.update(
+                pool_size=db_settings.database_async_pool_size,
+                max_overflow=db_settings.database_async_max_overflow,
+                pool_timeout=db_settings.database_pool_timeout,
+                pool_recycle=3600,
+            )
+        timeout = db_settings.database_statement_timeout_ms
+        if _is_postgres(url) and timeout > 0:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(timeout)},
+            }
+
+        _async_engine = create_async_engine(url, **options)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the factory for async database sessions."""
+    global _async_session_factory
+
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(),
+            autoflush=False,
+            # Objects stay usable after commit without a lazy refresh
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session.
+
+    Yields:
+        AsyncSession: Async database session
+
+    Example:
+        ```python
+        async def endpoint(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(User))
+        ```
+    """
+    async with get_async_session_factory()() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session error: {e}")
+            await db.rollback()
+            raise
+
+
+async def close_async_db() -> None:
+    """Dispose of the async engine's connection pool."""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+        logger.info("Async database engine disposed")
+
+
 def create_default_admin_user() -> Any | None:
     """Create and return a fallback admin user (development only)."""
     try:
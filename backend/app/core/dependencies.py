@@ -12,24 +12,10 @@ from loguru import logger
 from sqlalchemy.orm import Session
 
 from backend.app.core.database import get_db
-from backend.app.core.security import get_current_user_id
+from backend.app.core.security import get_current_user
 from backend.app.models.user import User, UserRole
 
 
-def get_current_user(
-    current_user_id: Annotated[str, Depends(get_current_user_id)],
-    db: Annotated[Session, Depends(get_db)],
-) -> User:
-    """Get current authenticated user."""
-    user = db.query(User).filter(User.id == current_user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-    return user
-
-
 def require_admin_role(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
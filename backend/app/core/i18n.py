@@ -11,7 +11,8 @@ from typing import Any
 
 from fastapi import Request
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 class I18nManager:
@@ -120,29 +121,38 @@ class I18nManager:
         }
 
 
-class I18nMiddleware(BaseHTTPMiddleware):
-    """FastAPI middleware for automatic language detection and translation."""
+class I18nMiddleware:
+    """
+    ASGI middleware for automatic language detection and translation.
+
+    The response is passed through as it is sent; only the headers of
+    ``http.response.start`` are amended, so streaming responses are not
+    buffered.
+    """
 
-    def __init__(self, app, i18n_manager: I18nManager):
+    def __init__(self, app: ASGIApp, i18n_manager: I18nManager):
         """Initialize the middleware."""
-        super().__init__(app)
+        self.app = app
         self.i18n_manager = i18n_manager
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and add language context."""
-        # Detect language
-        language = self.i18n_manager.detect_language(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Add language to request state
+        # Detect language and add it to request state
+        request = Request(scope)
+        language = self.i18n_manager.detect_language(request)
         request.state.language = language
 
-        # Process request
-        response = await call_next(request)
-
-        # Add language header to response
-        response.headers["Content-Language"] = language
+        async def send_wrapper(message: Message) -> None:
+            # Add language header to response
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["Content-Language"] = language
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
 # Global i18n manager instance
@@ -6,6 +6,9 @@ This module provides advanced pagination capabilities including:
 - Offset-based pagination with optimizations
 - Pagination metadata and navigation
 - Performance monitoring for pagination
+
+Paginators execute queries on an ``AsyncSession``; use
+``backend.app.core.database.get_async_db`` to obtain one.
 """
 
 import math
@@ -15,7 +18,7 @@ from enum import Enum
 from typing import Any, Generic, TypeVar
 
 from sqlalchemy import asc, desc, func, select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
 
 T = TypeVar("T")
@@ -70,7 +73,7 @@ class PaginatedResult(Generic[T]):
 class CursorPagination:
     """Cursor-based pagination for optimal performance."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def paginate_with_cursor(
@@ -178,7 +181,7 @@ class CursorPagination:
 class OffsetPagination:
     """Optimized offset-based pagination."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def paginate_with_offset(
@@ -260,7 +263,7 @@ class OffsetPagination:
 class KeysetPagination:
     """Keyset pagination for complex sorting scenarios."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def paginate_with_keyset(
@@ -376,7 +379,7 @@ class KeysetPagination:
 class PaginationOptimizer:
     """Optimizer for pagination performance."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.cursor_pagination = CursorPagination(db)
         self.offset_pagination = OffsetPagination(db)
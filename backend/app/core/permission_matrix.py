@@ -0,0 +1,202 @@
+"""
+Compiled permission model for role and group based access control.
+
+Permission names are interned to bit positions and every role and group is
+compiled to a bitmask of the permissions it grants, so a permission check is
+a dictionary lookup and a bit test. Role masks are built once at import; a
+group's mask is compiled the first time the group is seen and reused until the
+group changes. Nothing on the check path touches Redis or the database.
+
+Group masks are versioned by the group's ``updated_at`` (or, for groups that
+were never updated, their permission list) and by a matrix-wide generation.
+An update to a group therefore recompiles its mask on every worker the next
+time the group is loaded, and ``invalidate`` drops all compiled group masks
+at once.
+"""
+
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+WILDCARD = "*"
+
+# Permissions granted by each role, by role value
+ROLE_PERMISSIONS: dict[str, frozenset[str]] = {
+    "super_admin": frozenset({WILDCARD}),
+    "admin": frozenset(
+        {
+            "assistant:read",
+            "assistant:write",
+            "assistant:delete",
+            "conversation:read",
+            "conversation:write",
+            "conversation:delete",
+            "user:read",
+            "user:write",
+            "user:delete",
+            "tool:read",
+            "tool:write",
+            "tool:delete",
+            "knowledge:read",
+            "knowledge:write",
+            "knowledge:delete",
+            "group:read",
+            "group:write",
+            "group:delete",
+            "organization:read",
+            "organization:write",
+        }
+    ),
+    "manager": frozenset(
+        {
+            "assistant:read",
+            "assistant:write",
+            "assistant:delete",
+            "conversation:read",
+            "conversation:write",
+            "conversation:delete",
+            "user:read",
+            "user:write",
+            "tool:read",
+            "tool:write",
+            "knowledge:read",
+            "knowledge:write",
+            "knowledge:delete",
+            "group:read",
+        }
+    ),
+    "user": frozenset(
+        {
+            "assistant:read",
+            "assistant:write",
+            "conversation:read",
+            "conversation:write",
+            "tool:read",
+            "knowledge:read",
+            "knowledge:write",
+            "user:read_own",
+            "user:write_own",
+        }
+    ),
+    "guest": frozenset(
+        {
+            "assistant:read",
+            "conversation:read",
+            "user:read_own",
+        }
+    ),
+}
+
+
+def _role_key(role: Any) -> str:
+    # UserRole is a str enum, but enum members do not hash like their values
+    return getattr(role, "value", role)
+
+
+class PermissionMatrix:
+    """Permissions interned to bits, with role and group bitmasks."""
+
+    def __init__(self, role_permissions: dict[str, Iterable[str]] | None = None):
+        self._lock = threading.Lock()
+        # The wildcard always takes bit 0
+        self._bits: dict[str, int] = {WILDCARD: 1}
+        self._names: list[str] = [WILDCARD]
+        self._role_masks: dict[str, int] = {}
+        # group id -> (generation, group version, mask)
+        self._group_masks: dict[str, tuple[int, Any, int]] = {}
+        self.generation = 0
+
+        for role, permissions in (role_permissions or ROLE_PERMISSIONS).items():
+            self._role_masks[_role_key(role)] = self.compile(permissions)
+
+    def bit(self, permission: str) -> int:
+        """Get the bit of a permission, interning it if it is new."""
+        bit = self._bits.get(permission)
+        if bit is not None:
+            return bit
+        with self._lock:
+            bit = self._bits.get(permission)
+            if bit is None:
+                bit = 1 << len(self._names)
+                self._names.append(permission)
+                self._bits[permission] = bit
+        return bit
+
+    def compile(self, permissions: Iterable[str] | None) -> int:
+        """Compile permission names to a bitmask."""
+        mask = 0
+        for permission in permissions or ():
+            mask |= self.bit(permission)
+        return mask
+
+    def names(self, mask: int) -> set[str]:
+        """Decode a bitmask to permission names."""
+        return {
+            name for index, name in enumerate(self._names) if mask >> index & 1
+        }
+
+    def allows(self, mask: int, permission: str) -> bool:
+        """
+        Check a permission against a bitmask.
+
+        Permissions that were never granted to anything have no bit yet and
+        are only allowed by the wildcard.
+        """
+        if mask & 1:
+            return True
+        bit = self._bits.get(permission)
+        return bit is not None and bool(mask & bit)
+
+    def role_mask(self, role: Any) -> int:
+        """Get the bitmask of a role; unknown roles grant nothing."""
+        return self._role_masks.get(_role_key(role), 0)
+
+    def group_mask(self, group: Any) -> int:
+        """
+        Get the bitmask of a group, compiling it if the group changed.
+
+        Args:
+            group: Object with ``id``, ``permissions`` and ``updated_at``
+
+        Returns:
+            int: Bitmask of the group's permissions
+        """
+        key = str(group.id)
+        # Groups that were never updated are versioned by their permissions
+        version = getattr(group, "updated_at", None) or tuple(group.permissions or ())
+        entry = self._group_masks.get(key)
+        if entry is not None and entry[0] == self.generation and entry[1] == version:
+            return entry[2]
+
+        mask = self.compile(group.permissions)
+        self._group_masks[key] = (self.generation, version, mask)
+        return mask
+
+    def user_mask(self, role: Any, groups: Iterable[Any] = ()) -> int:
+        """Get the combined bitmask of a role and groups."""
+        mask = self.role_mask(role)
+        for group in groups:
+            mask |= self.group_mask(group)
+        return mask
+
+    def invalidate_group(self, group_id: str) -> None:
+        """Drop the compiled mask of a group."""
+        self._group_masks.pop(str(group_id), None)
+
+    def invalidate(self) -> None:
+        """Drop all compiled group masks."""
+        self.generation += 1
+        self._group_masks.clear()
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get matrix sizes."""
+        return {
+            "permissions": len(self._names),
+            "roles": len(self._role_masks),
+            "groups": len(self._group_masks),
+            "generation": self.generation,
+        }
+
+
+# Global permission matrix instance
+permission_matrix = PermissionMatrix()
@@ -0,0 +1,331 @@
+"""
+Short-lived cache of authenticated principals.
+
+Resolving the caller of a request means checking the token blacklist in Redis
+and loading the user with its groups from the database. A principal is an
+immutable snapshot of what authorization needs from that user (id, role,
+organization, group ids and effective permissions); it is cached per token
+for a few seconds so that cheap endpoints skip both round trips.
+
+Entries are keyed by the token's ``jti`` and dropped when the user, their
+role or their groups change or the token is revoked. Invalidations are
+applied locally at once and published on a Redis channel so that every other
+worker drops its copy as well.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import redis.asyncio as redis
+from loguru import logger
+
+from .config import get_settings
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Immutable snapshot of an authenticated user."""
+
+    id: str
+    email: str
+    username: str
+    role: Any
+    organization_id: str | None
+    group_ids: frozenset[str]
+    permissions: frozenset[str]
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        """
+        Snapshot a user whose groups are loaded.
+
+        Args:
+            user: User model instance
+
+        Returns:
+            Principal: Snapshot of the user
+        """
+        return cls(
+            id=str(user.id),
+            email=user.email,
+            username=user.username,
+            role=user.role,
+            organization_id=(
+                str(user.organization_id) if user.organization_id else None
+            ),
+            group_ids=frozenset(str(group.id) for group in user.groups),
+            permissions=frozenset(user.get_effective_permissions()),
+            is_active=bool(user.is_active),
+        )
+
+    def has_permission(self, permission: str) -> bool:
+        """Check a permission against the snapshot."""
+        return "*" in self.permissions or permission in self.permissions
+
+
+def token_cache_key(token: str, payload: dict[str, Any]) -> str:
+    """
+    Get the cache key of a decoded token.
+
+    Tokens issued before ``jti`` was added are keyed by their digest.
+    """
+    jti = payload.get("jti")
+    if jti:
+        return str(jti)
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """Per-worker LRU of principals with TTL and cross-worker invalidation."""
+
+    def __init__(
+        self,
+        ttl_seconds: int | None = None,
+        max_entries: int | None = None,
+        channel: str | None = None,
+        enabled: bool | None = None,
+    ):
+        settings = get_settings()
+        security = settings.security
+
+        self.ttl_seconds = ttl_seconds or security.principal_cache_ttl_seconds
+        self.max_entries = max_entries or security.principal_cache_max_entries
+        self.channel = channel or security.principal_cache_channel
+        self.enabled = (
+            security.principal_cache_enabled if enabled is None else enabled
+        )
+        self.redis_url = settings.redis.redis_url
+        self.redis_db = settings.redis.redis_db
+        self.worker_id = uuid.uuid4().hex
+
+        # token key -> (expires at, principal), least recently used first
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        # user id -> token keys, to drop all tokens of a user at once
+        self._user_keys: dict[str, set[str]] = {}
+
+        self._redis: redis.Redis | None = None
+        self._pubsub: Any = None
+        self._listener: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0,
+        }
+
+    def get(self, key: str) -> Principal | None:
+        """
+        Get a cached principal.
+
+        Args:
+            key: Token cache key
+
+        Returns:
+            Principal if cached and not expired, None otherwise
+        """
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return principal
+
+    def put(
+        self,
+        key: str,
+        principal: Principal,
+        token_expires_at: float | None = None,
+    ) -> None:
+        """
+        Cache a principal.
+
+        Args:
+            key: Token cache key
+            principal: Principal to cache
+            token_expires_at: Token expiry as a Unix timestamp; the entry never
+                outlives the token
+        """
+        if not self.enabled:
+            return
+        ttl = float(self.ttl_seconds)
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - time.time())
+            if ttl <= 0:
+                return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, principal)
+        self._user_keys.setdefault(principal.id, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached principal of a user, on all workers."""
+        self._drop_user(str(user_id))
+        self._publish_soon({"user_id": str(user_id)})
+
+    def invalidate_token(self, key: str) -> None:
+        """Drop the cached principal of one token, on all workers."""
+        self._drop_token(key)
+        self._publish_soon({"key": key})
+
+    def invalidate_all(self) -> None:
+        """Drop every cached principal, on all workers."""
+        self._drop_all()
+        self._publish_soon({"all": True})
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get cache counters and size."""
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "connected": self._pubsub is not None,
+        }
+
+    async def start(self) -> None:
+        """Subscribe to invalidations published by other workers."""
+        if not self.enabled or self._listener is not None:
+            return
+        try:
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                db=self.redis_db,
+                decode_responses=True,
+                socket_connect_timeout=2,
+            )
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(self.channel)
+        except (redis.RedisError, OSError, ValueError) as e:
+            # Without invalidations from other workers, a change made on one
+            # worker is only seen by the others once their entries expire
+            logger.warning(f"Principal cache invalidation channel unavailable: {e}")
+            self._redis = None
+            self._pubsub = None
+            return
+
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"Principal cache listening on {self.channel}")
+
+    async def stop(self) -> None:
+        """Stop the listener and close the Redis connections."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._pubsub is not None:
+            with contextlib.suppress(Exception):
+                await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis is not None:
+            with contextlib.suppress(Exception):
+                await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, event: dict[str, Any]) -> None:
+        """Publish an invalidation to the other workers."""
+        if self._redis is None:
+            return
+        payload = json.dumps({**event, "origin": self.worker_id})
+        try:
+            await self._redis.publish(self.channel, payload)
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"Principal cache invalidation publish failed: {e}")
+
+    def apply(self, event: dict[str, Any]) -> None:
+        """Apply an invalidation received from another worker."""
+        if event.get("all"):
+            self._drop_all()
+        elif event.get("user_id"):
+            self._drop_user(str(event["user_id"]))
+        elif event.get("key"):
+            self._drop_token(str(event["key"]))
+
+    def _publish_soon(self, event: dict[str, Any]) -> None:
+        if self._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the event loop the other workers rely on the TTL
+            return
+        task = loop.create_task(self.publish(event))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _drop_user(self, user_id: str) -> None:
+        for key in list(self._user_keys.get(user_id, ())):
+            self._remove(key)
+        self.stats["invalidations"] += 1
+
+    def _drop_token(self, key: str) -> None:
+        self._remove(key)
+        self.stats["invalidations"] += 1
+
+    def _drop_all(self) -> None:
+        self._entries.clear()
+        self._user_keys.clear()
+        self.stats["invalidations"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].id
+        keys = self._user_keys.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[user_id]
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Principal cache listener error: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if not message or message.get("type") != "message":
+                continue
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            # Invalidations from this worker were applied when published
+            if event.get("origin") == self.worker_id:
+                continue
+            self.apply(event)
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
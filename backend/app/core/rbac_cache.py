@@ -12,6 +12,7 @@ from typing import Any
 
 from loguru import logger
 
+from backend.app.core.permission_matrix import permission_matrix
 from backend.app.core.redis_client import get_redis_client
 from backend.app.models.user import User, UserRole
 
@@ -178,6 +179,8 @@ class RBACCache:
 
     def clear_all_cache(self) -> bool:
         """Clear all RBAC cache."""
+        permission_matrix.invalidate()
+
         pattern = f"{self.cache_prefix}*"
         keys = self.redis.keys(pattern)
 
@@ -234,25 +237,18 @@ class CachedUserPermissions:
     def __init__(self, user: User):
         self.user = user
         self.user_id = str(user.id)
-        self._permissions: set[str] | None = None
+        self._mask: int | None = None
         self._groups: list[dict[str, Any]] | None = None
 
-    def get_permissions(self) -> set[str]:
-        """Get user permissions with caching."""
-        if self._permissions is None:
-            # Try cache first
-            cached_permissions = rbac_cache.get_user_permissions(self.user_id)
-
-            if cached_permissions is not None:
-                self._permissions = cached_permissions
-            else:
-                # Calculate permissions
-                self._permissions = self._calculate_permissions()
-
-                # Cache permissions
-                rbac_cache.set_user_permissions(self.user_id, self._permissions)
+    def get_mask(self) -> int:
+        """Get the compiled permission bitmask of the user."""
+        if self._mask is None:
+            self._mask = permission_matrix.user_mask(self.user.role, self.user.groups)
+        return self._mask
 
-        return self._permissions
+    def get_permissions(self) -> set[str]:
+        """Get user permissions."""
+        return permission_matrix.names(self.get_mask())
 
     def get_groups(self) -> list[dict[str, Any]]:
         """Get user groups with caching."""
@@ -278,113 +274,14 @@ class CachedUserPermissions:
 
         return self._groups
 
-    def _calculate_permissions(self) -> set[str]:
-        """Calculate user permissions."""
-        permissions = set()
-
-        # Role-based permissions
-        role_permissions = self._get_role_permissions(self.user.role)
-        permissions.update(role_permissions)
-
-        # Group-based permissions
-        for group in self.user.groups:
-            if group.permissions:
-                permissions.update(group.permissions)
-
-        return permissions
-
-    def _get_role_permissions(self, role: UserRole) -> set[str]:
-        """Get role permissions with caching."""
-        # Try cache first
-        cached_permissions = rbac_cache.get_role_permissions(role)
-
-        if cached_permissions is not None:
-            return cached_permissions
-
-        # Calculate role permissions
-        role_permissions = self._calculate_role_permissions(role)
-
-        # Cache role permissions
-        rbac_cache.set_role_permissions(role, role_permissions)
-
-        return role_permissions
-
-    def _calculate_role_permissions(self, role: UserRole) -> set[str]:
-        """Calculate role permissions."""
-        role_permissions = {
-            UserRole.SUPER_ADMIN: {"*"},
-            UserRole.ADMIN: {
-                "assistant:read",
-                "assistant:write",
-                "assistant:delete",
-                "conversation:read",
-                "conversation:write",
-                "conversation:delete",
-                "user:read",
-                "user:write",
-                "user:delete",
-                "tool:read",
-                "tool:write",
-                "tool:delete",
-                "knowledge:read",
-                "knowledge:write",
-                "knowledge:delete",
-                "group:read",
-                "group:write",
-                "group:delete",
-                "organization:read",
-                "organization:write",
-            },
-            UserRole.MANAGER: {
-                "assistant:read",
-                "assistant:write",
-                "assistant:delete",
-                "conversation:read",
-                "conversation:write",
-                "conversation:delete",
-                "user:read",
-                "user:write",
-                "tool:read",
-                "tool:write",
-                "knowledge:read",
-                "knowledge:write",
-                "knowledge:delete",
-                "group:read",
-            },
-            UserRole.USER: {
-                "assistant:read",
-                "assistant:write",
-                "conversation:read",
-                "conversation:write",
-                "tool:read",
-                "knowledge:read",
-                "knowledge:write",
-                "user:read_own",
-                "user:write_own",
-            },
-            UserRole.GUEST: {
-                "assistant:read",
-                "conversation:read",
-                "user:read_own",
-            },
-        }
-
-        return role_permissions.get(role, set())
-
     def has_permission(self, permission: str) -> bool:
         """Check if user has specific permission."""
-        permissions = self.get_permissions()
-
-        # Check for wildcard permission
-        if "*" in permissions:
-            return True
-
-        return permission in permissions
+        return permission_matrix.allows(self.get_mask(), permission)
 
     def invalidate_cache(self):
         """Invalidate user cache."""
         rbac_cache.bulk_invalidate_user_cache(self.user_id)
-        self._permissions = None
+        self._mask = None
         self._groups = None
 
 
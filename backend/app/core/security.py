@@ -5,16 +5,18 @@ This module provides JWT token management, password hashing,
 and security utilities for the AI Assistant Platform.
 """
 
+import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from loguru import logger
 from passlib.context import CryptContext
 
 from .config import get_settings
+from .principal_cache import Principal, principal_cache, token_cache_key
 
 # Password hashing context with optimized bcrypt settings
 pwd_context = CryptContext(
@@ -77,7 +79,7 @@ def create_access_token(
             minutes=settings.security.jwt_access_token_expire_minutes,
         )
 
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex}
     return jwt.encode(
         to_encode,
         settings.security.secret_key,
@@ -107,7 +109,12 @@ def create_refresh_token(
             days=settings.security.jwt_refresh_token_expire_days,
         )
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    to_encode = {
+        "exp": expire,
+        "sub": str(subject),
+        "jti": uuid.uuid4().hex,
+        "type": "refresh",
+    }
     return jwt.encode(
         to_encode,
         settings.security.secret_key,
@@ -115,40 +122,25 @@ def create_refresh_token(
     )
 
 
-async def verify_token(token: str) -> str | None:
+def decode_token(token: str) -> dict[str, Any] | None:
     """
-    Verify and decode a JWT token.
+    Decode a JWT token and check its signature and expiry.
+
+    Does not consult the blacklist.
 
     Args:
-        token: JWT token to verify
+        token: JWT token to decode
 
     Returns:
-        Optional[str]: Token subject (user ID) if valid, None otherwise
+        Optional[dict]: Token claims if valid and carrying a subject, None otherwise
     """
     try:
-        # Check if token is blacklisted (only if Redis is available)
-        try:
-            from backend.app.core.redis_client import is_token_blacklisted
-
-            is_blacklisted = await is_token_blacklisted(token)
-            if is_blacklisted:
-                logger.warning("JWT token is blacklisted")
-                return None
-        except Exception as e:
-            # If Redis is not available, skip blacklist check but continue with token verification
-            logger.debug(f"Redis not available for token blacklist check: {e}")
-            # Continue without blacklist check - this is normal during startup
-
         settings = get_settings()
         payload = jwt.decode(
             token,
             settings.security.secret_key,
             algorithms=[settings.security.jwt_algorithm],
         )
-        subject: str = payload.get("sub")
-        if subject is None:
-            return None
-        return subject
     except JWTError as e:
         logger.warning(f"JWT token verification failed: {e}")
         return None
@@ -156,6 +148,75 @@ async def verify_token(token: str) -> str | None:
         logger.error(f"Token verification error: {e}")
         return None
 
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+
+async def is_token_revoked(token: str) -> bool:
+    """
+    Check whether a token is on the blacklist.
+
+    Args:
+        token: JWT token to check
+
+    Returns:
+        bool: True if blacklisted; False if not or if Redis is unavailable
+    """
+    try:
+        from backend.app.core.redis_client import is_token_blacklisted
+
+        if await is_token_blacklisted(token):
+            logger.warning("JWT token is blacklisted")
+            return True
+    except Exception as e:
+        # If Redis is not available, skip blacklist check but continue with token verification
+        logger.debug(f"Redis not available for token blacklist check: {e}")
+        # Continue without blacklist check - this is normal during startup
+    return False
+
+
+async def verify_token(token: str) -> str | None:
+    """
+    Verify and decode a JWT token.
+
+    Args:
+        token: JWT token to verify
+
+    Returns:
+        Optional[str]: Token subject (user ID) if valid, None otherwise
+    """
+    if await is_token_revoked(token):
+        return None
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    return payload["sub"]
+
+
+async def revoke_token(token: str) -> bool:
+    """
+    Blacklist a token until it expires and drop its cached principal.
+
+    Args:
+        token: JWT token to revoke
+
+    Returns:
+        bool: True if the token was blacklisted
+    """
+    payload = decode_token(token)
+    if payload is None:
+        return False
+
+    principal_cache.invalidate_token(token_cache_key(token, payload))
+
+    from backend.app.core.redis_client import add_to_blacklist
+
+    remaining = int(payload["exp"] - datetime.now(UTC).timestamp())
+    if remaining <= 0:
+        return True
+    return await add_to_blacklist(token, remaining)
+
 
 async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -185,39 +246,123 @@ async def get_current_user_id(
     return user_id
 
 
-async def get_current_user(
+async def get_current_principal(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> "User":
+) -> Principal:
     """
-    Get current user from JWT token.
+    Get a snapshot of the current user from JWT token.
+
+    The snapshot is cached per token for a few seconds, so repeated requests
+    with the same token skip the blacklist check and the user query. Use it
+    instead of ``get_current_user`` where only the id, role, organization,
+    groups or permissions of the caller are needed.
 
     Args:
+        request: Current request; keeps a user loaded on a cache miss
         credentials: HTTP authorization credentials
 
     Returns:
-        User: Current user object
+        Principal: Current user snapshot
 
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    from backend.app.core.database import get_db
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from backend.app.core.database import get_async_session_factory
     from backend.app.models.user import User
 
-    user_id = await get_current_user_id(credentials)
+    token = credentials.credentials
+    payload = decode_token(token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-    # Get database session
-    db = next(get_db())
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    key = token_cache_key(token, payload)
+    principal = principal_cache.get(key)
+    if principal is not None:
+        return principal
+
+    if await is_token_revoked(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Load the user and its groups without blocking the event loop
+    async with get_async_session_factory()() as db:
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.groups))
+            .where(User.id == payload["sub"])
+        )
+        user = result.scalar_one_or_none()
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal = Principal.from_user(user)
+    principal_cache.put(key, principal, token_expires_at=payload.get("exp"))
+    # Spares get_current_user loading the same user again in this request
+    request.state.current_user = user
+    return principal
+
+
+async def get_current_user(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+) -> "User":
+    """
+    Get current user from JWT token.
+
+    The user is only queried if the principal came from the cache.
+
+    Args:
+        request: Current request
+        principal: Current user snapshot
+
+    Returns:
+        User: Current user object, with its groups loaded
+
+    Raises:
+        HTTPException: If user not found
+    """
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from backend.app.core.database import get_async_session_factory
+    from backend.app.models.user import User
+
+    user = getattr(request.state, "current_user", None)
+    if user is not None and str(user.id) == principal.id:
         return user
-    finally:
-        db.close()
+
+    # Load the user without blocking the event loop
+    async with get_async_session_factory()() as db:
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.groups))
+            .where(User.id == principal.id)
+        )
+        user = result.scalar_one_or_none()
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
 
 
 async def get_current_active_user(
@@ -244,6 +389,7 @@ async def get_current_active_user(
 
 
 async def get_current_user_optional(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> "User | None":
     """
@@ -251,13 +397,15 @@ async def get_current_user_optional(
     This is useful for endpoints that can work with or without authentication.
 
     Args:
+        request: Current request
         credentials: HTTP authorization credentials
 
     Returns:
         User | None: Current user object or None if no valid token
     """
     try:
-        return await get_current_user(credentials)
+        principal = await get_current_principal(request, credentials)
+        return await get_current_user(request, principal)
     except HTTPException:
         return None
 
@@ -11,6 +11,7 @@ from typing import Any, Dict, List
 import requests
 from sqlalchemy.orm import Session
 
+from backend.app.core.principal_cache import principal_cache
 from backend.app.core.sso.providers.base import BaseSSOProvider
 from backend.app.models.domain_groups import DomainGroup
 from backend.app.models.user import AuthProvider, User, UserRole, UserStatus
@@ -171,6 +172,7 @@ class OAuthProvider(BaseSSOProvider):
                     if user.role != mapped_role:
                         user.role = mapped_role
                         db.commit()
+                        principal_cache.invalidate_user(str(user.id))
 
                 # Create domain groups for OAuth groups
                 domain_group = await self._create_domain_group_from_oauth(group, db)
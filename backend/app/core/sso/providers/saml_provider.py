@@ -14,6 +14,7 @@ from saml2.config import Config as SamlConfig
 from saml2.response import AuthnResponse
 from sqlalchemy.orm import Session
 
+from backend.app.core.principal_cache import principal_cache
 from backend.app.core.sso.providers.base import BaseSSOProvider
 from backend.app.models.domain_groups import DomainGroup
 from backend.app.models.user import AuthProvider, User, UserRole, UserStatus
@@ -191,6 +192,7 @@ class SAMLProvider(BaseSSOProvider):
                     if user.role != mapped_role:
                         user.role = mapped_role
                         db.commit()
+                        principal_cache.invalidate_user(str(user.id))
 
                 # Create domain groups for SAML groups
                 domain_group = await self._create_domain_group_from_saml(group, db)
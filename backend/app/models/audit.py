@@ -6,14 +6,16 @@ system events, and security-related actions for compliance and monitoring.
 """
 
 import uuid
+from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy import ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from .base import Base, TimestampMixin
 
@@ -106,7 +108,17 @@ class AuditLog(Base, TimestampMixin):
     description = Column(Text, nullable=False)
     details = Column(JSON, nullable=True)  # Additional event details
 
-    # Timestamp (inherited from Base)
+    # Partition key; PostgreSQL requires it in the primary key
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    # Range partitioned by created_at, see services/audit/audit_partitions.py
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     def __repr__(self) -> str:
         """String representation of the audit log."""
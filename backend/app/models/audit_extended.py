@@ -6,6 +6,7 @@ and support for various compliance frameworks including GDPR, SOX, and ISO 27001
 """
 
 import uuid
+from datetime import UTC, datetime
 from enum import Enum
 
 from sqlalchemy import (
@@ -22,6 +23,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -187,7 +189,9 @@ class ExtendedAuditLog(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # Event identification
-    event_id = Column(String(255), unique=True, nullable=False, index=True)
+    # Not unique: unique constraints of a partitioned table must include the
+    # partition key
+    event_id = Column(String(255), nullable=False, index=True)
     event_type = Column(SQLEnum(AuditEventType), nullable=False, index=True)
     event_category = Column(SQLEnum(AuditEventCategory), nullable=False, index=True)
     severity = Column(
@@ -197,9 +201,11 @@ class ExtendedAuditLog(Base):
         index=True,
     )
 
-    # Timestamps
+    # Timestamps; the partition key, so it is part of the primary key
     timestamp = Column(
         DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(UTC),
         server_default=func.now(),
         nullable=False,
         index=True,
@@ -263,8 +269,15 @@ class ExtendedAuditLog(Base):
             "resource_id",
             "timestamp",
         ),
+        # Finds rows on legal hold before a partition is dropped
+        Index(
+            "idx_audit_legal_hold_timestamp",
+            "timestamp",
+            postgresql_where=text("legal_hold"),
+        ),
         # Index("idx_audit_compliance_timestamp", "compliance_frameworks", "timestamp"),  # Disabled due to JSON column indexing issues
-        {"extend_existing": True},
+        # Range partitioned by timestamp, see services/audit/audit_partitions.py
+        {"extend_existing": True, "postgresql_partition_by": 'RANGE ("timestamp")'},
     )
 
     def __repr__(self) -> str:
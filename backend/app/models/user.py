@@ -15,6 +15,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.orm import validates
+from ..core.permission_matrix import permission_matrix
 from ..utils.helpers import parse_datetime
 
 from .base import Base
@@ -248,78 +249,13 @@ class User(Base):
 
     def has_permission(self, permission: str) -> bool:
         """Check if user has specific permission based on role and groups."""
-        # Check role-based permissions
-        role_permissions = {
-            UserRole.SUPER_ADMIN: ["*"],  # All permissions
-            UserRole.ADMIN: [
-                "assistant:read",
-                "assistant:write",
-                "assistant:delete",
-                "conversation:read",
-                "conversation:write",
-                "conversation:delete",
-                "user:read",
-                "user:write",
-                "user:delete",
-                "tool:read",
-                "tool:write",
-                "tool:delete",
-                "knowledge:read",
-                "knowledge:write",
-                "knowledge:delete",
-                "group:read",
-                "group:write",
-                "group:delete",
-                "organization:read",
-                "organization:write",
-            ],
-            UserRole.MANAGER: [
-                "assistant:read",
-                "assistant:write",
-                "assistant:delete",
-                "conversation:read",
-                "conversation:write",
-                "conversation:delete",
-                "user:read",
-                "user:write",
-                "tool:read",
-                "tool:write",
-                "knowledge:read",
-                "knowledge:write",
-                "knowledge:delete",
-                "group:read",
-            ],
-            UserRole.USER: [
-                "assistant:read",
-                "assistant:write",
-                "conversation:read",
-                "conversation:write",
-                "tool:read",
-                "knowledge:read",
-                "knowledge:write",
-                "user:read_own",
-                "user:write_own",
-            ],
-            UserRole.GUEST: [
-                "assistant:read",
-                "conversation:read",
-                "user:read_own",
-            ],
-        }
-
-        user_permissions = role_permissions.get(self.role, [])
-        if "*" in user_permissions:
+        # Groups are only loaded when the role does not grant the permission
+        if permission_matrix.allows(permission_matrix.role_mask(self.role), permission):
             return True
-
-        if permission in user_permissions:
-            return True
-
-        # Check group-based permissions
-        for group in self.groups:
-            if group.permissions and permission in group.permissions:
-                return True
-
-        return False
+        return any(
+            permission_matrix.allows(permission_matrix.group_mask(group), permission)
+            for group in self.groups
+        )
 
     def can_access_assistant(self, assistant_id: str) -> bool:
         """Check if user can access specific assistant."""
@@ -381,72 +317,5 @@ class User(Base):
 
     def get_effective_permissions(self) -> list[str]:
         """Get all effective permissions for the user."""
-        permissions = set()
-
-        # Role-based permissions
-        role_permissions = {
-            UserRole.SUPER_ADMIN: ["*"],
-            UserRole.ADMIN: [
-                "assistant:read",
-                "assistant:write",
-                "assistant:delete",
-                "conversation:read",
-                "conversation:write",
-                "conversation:delete",
-                "user:read",
-                "user:write",
-                "user:delete",
-                "tool:read",
-                "tool:write",
-                "tool:delete",
-                "knowledge:read",
-                "knowledge:write",
-                "knowledge:delete",
-                "group:read",
-                "group:write",
-                "group:delete",
-                "organization:read",
-                "organization:write",
-            ],
-            UserRole.MANAGER: [
-                "assistant:read",
-                "assistant:write",
-                "assistant:delete",
-                "conversation:read",
-                "conversation:write",
-                "conversation:delete",
-                "user:read",
-                "user:write",
-                "tool:read",
-                "tool:write",
-                "knowledge:read",
-                "knowledge:write",
-                "knowledge:delete",
-                "group:read",
-            ],
-            UserRole.USER: [
-                "assistant:read",
-                "assistant:write",
-                "conversation:read",
-                "conversation:write",
-                "tool:read",
-                "knowledge:read",
-                "knowledge:write",
-                "user:read_own",
-                "user:write_own",
-            ],
-            UserRole.GUEST: [
-                "assistant:read",
-                "conversation:read",
-                "user:read_own",
-            ],
-        }
-
-        permissions.update(role_permissions.get(self.role, []))
-
-        # Group-based permissions
-        for group in self.groups:
-            if group.permissions:
-                permissions.update(group.permissions)
-
-        return list(permissions)
+        mask = permission_matrix.user_mask(self.role, self.groups)
+        return list(permission_matrix.names(mask))
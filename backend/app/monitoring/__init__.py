@@ -10,9 +10,11 @@ from .core import (
     AlertChannel,
     AlertManager,
     AlertSeverity,
+    Histogram,
     Metric,
     MetricsCollector,
     MetricType,
+    get_metrics_collector,
 )
 from .database import DatabaseMonitor
 from .middleware import PerformanceMiddleware
@@ -42,6 +44,8 @@ __all__ = [
     "monitor_performance",
     # Core components
     "MetricsCollector",
+    "get_metrics_collector",
+    "Histogram",
     "AlertManager",
     "Metric",
     "Alert",
@@ -6,12 +6,20 @@ functionality for the performance monitoring system.
 """
 
 from .alerts import Alert, AlertChannel, AlertManager, AlertSeverity
-from .metrics import Metric, MetricsCollector, MetricType
+from .metrics import (
+    Histogram,
+    Metric,
+    MetricsCollector,
+    MetricType,
+    get_metrics_collector,
+)
 
 __all__ = [
     "MetricsCollector",
     "Metric",
     "MetricType",
+    "Histogram",
+    "get_metrics_collector",
     "AlertManager",
     "Alert",
     "AlertSeverity",
@@ -1,20 +1,53 @@
 """
 Core metrics functionality for performance monitoring.
 
-This module provides the base Metric class and MetricsCollector for
-collecting and managing performance metrics.
+This module provides the Metric class and the MetricsCollector registry.
+Observations are aggregated as they are recorded: each series, identified by
+metric name, type and label set, keeps a running total, the last gauge value
+or a histogram. Recording is constant time and memory is bounded by the
+number of series instead of the number of observations, so percentiles cover
+every observation since the series was created.
 """
 
+import bisect
 import json
-import statistics
-from collections import defaultdict, deque
+import math
+import re
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 from loguru import logger
 
+# Upper bounds of the exported histogram buckets, in seconds for timers
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+# Relative error of histogram quantiles
+QUANTILE_ACCURACY = 0.01
+_GAMMA = (1 + QUANTILE_ACCURACY) / (1 - QUANTILE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+LabelKey = tuple[tuple[str, str], ...]
+
 
 class MetricType(Enum):
     """Types of metrics."""
@@ -38,16 +71,158 @@ class Metric:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+def label_key(tags: dict[str, str] | None) -> LabelKey:
+    """Get the hashable key of a label set."""
+    if not tags:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in tags.items()))
+
+
+class Histogram:
+    """
+    Distribution of observed values.
+
+    Keeps fixed buckets for Prometheus exposition and log-scale bins for
+    quantiles; a quantile is within ``QUANTILE_ACCURACY`` of the true value
+    relative to that value.
+    """
+
+    __slots__ = (
+        "bounds",
+        "bucket_counts",
+        "bins",
+        "non_positive",
+        "count",
+        "sum",
+        "sum_sq",
+        "min",
+        "max",
+    )
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        # One count per bound plus the +Inf bucket, not cumulative
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.bins: dict[int, int] = {}
+        self.non_positive = 0
+        self.count = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        self.count += 1
+        self.sum += value
+        self.sum_sq += value * value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += 1
+        if value > 0:
+            index = math.ceil(math.log(value) / _LOG_GAMMA)
+            self.bins[index] = self.bins.get(index, 0) + 1
+        else:
+            self.non_positive += 1
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the observations of another histogram with the same bounds."""
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for i, count in enumerate(other.bucket_counts):
+            self.bucket_counts[i] += count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.non_positive += other.non_positive
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile, 0 <= q <= 1."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.non_positive
+        if rank < seen:
+            # Non-positive values are not binned; they only occur at the bottom
+            return self.min
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                estimate = 2 * _GAMMA**index / (_GAMMA + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def statistics(self) -> dict[str, float]:
+        """Summarize the distribution."""
+        if self.count == 0:
+            return {}
+        mean = self.sum / self.count
+        variance = 0.0
+        if self.count > 1:
+            variance = max(
+                (self.sum_sq - self.count * mean * mean) / (self.count - 1), 0.0
+            )
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": mean,
+            "median": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "std_dev": math.sqrt(variance),
+            "sum": self.sum,
+        }
+
+    def cumulative_buckets(self) -> list[tuple[str, int]]:
+        """Get ``(le, cumulative count)`` pairs for exposition."""
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds, self.bucket_counts):
+            total += count
+            buckets.append((_format_value(bound), total))
+        buckets.append(("+Inf", total + self.bucket_counts[-1]))
+        return buckets
+
+
+class _Series:
+    """Aggregated state of one metric name, type and label set."""
+
+    __slots__ = ("value", "histogram", "updated")
+
+    def __init__(self, metric_type: MetricType):
+        self.value = 0.0
+        self.histogram = (
+            Histogram()
+            if metric_type in (MetricType.HISTOGRAM, MetricType.TIMER)
+            else None
+        )
+        self.updated = 0.0
+
+
 class MetricsCollector:
-    """Collects and manages performance metrics."""
+    """Registry of pre-aggregated metric series."""
 
     def __init__(self, max_metrics: int = 10000, retention_hours: int = 24):
-        """Initialize metrics collector."""
+        """
+        Initialize metrics collector.
+
+        Args:
+            max_metrics: Maximum number of series; observations for new series
+                beyond it are dropped
+            retention_hours: Series not updated for this long are removed
+        """
         self.max_metrics = max_metrics
         self.retention_hours = retention_hours
-        self.metrics: deque[Metric] = deque(maxlen=max_metrics)
-        self.aggregated_metrics: dict[str, list[float]] = defaultdict(list)
-        self._last_cleanup = datetime.now()
+        self.started_at = time.time()
+        self.dropped_observations = 0
+        self._series: dict[tuple[str, MetricType], dict[LabelKey, _Series]] = {}
+        self._series_count = 0
+        self._descriptions: dict[str, str] = {}
 
     def record_metric(
         self,
@@ -58,21 +233,35 @@ class MetricsCollector:
         description: str = "",
         metadata: dict[str, Any] | None = None,
     ) -> None:
-        """Record a new metric."""
-        try:
-            metric = Metric(
-                name=name,
-                value=value,
-                metric_type=metric_type,
-                timestamp=datetime.now(),
-                tags=tags or {},
-                description=description,
-                metadata=metadata or {},
-            )
+        """
+        Record an observation.
 
-            self.metrics.append(metric)
-            self._aggregate_metric(metric)
-            self._cleanup_old_metrics()
+        Counters add the value, gauges replace it and histograms and timers
+        observe it. ``metadata`` is accepted for compatibility and not kept.
+        """
+        try:
+            family = self._series.get((name, metric_type))
+            if family is None:
+                family = self._series.setdefault((name, metric_type), {})
+                if description:
+                    self._descriptions[name] = description
+
+            key = label_key(tags)
+            series = family.get(key)
+            if series is None:
+                if self._series_count >= self.max_metrics:
+                    self.dropped_observations += 1
+                    return
+                series = family.setdefault(key, _Series(metric_type))
+                self._series_count += 1
+
+            if metric_type == MetricType.COUNTER:
+                series.value += value
+            else:
+                series.value = value
+                if series.histogram is not None:
+                    series.histogram.observe(value)
+            series.updated = time.time()
 
         except Exception as e:
             logger.error(f"Failed to record metric {name}: {e}")
@@ -109,60 +298,99 @@ class MetricsCollector:
         tags: dict[str, str] | None = None,
         limit: int | None = None,
     ) -> list[Metric]:
-        """Get metrics with optional filtering."""
+        """
+        Get one metric per series with optional filtering.
+
+        The value is the counter total or the last observed value; histogram
+        and timer series carry their summary in ``metadata``. Metrics are
+        ordered by last update, so ``limit`` keeps the most recent ones.
+        """
         try:
-            filtered_metrics = list(self.metrics)
-
-            # Filter by name
-            if name:
-                filtered_metrics = [m for m in filtered_metrics if m.name == name]
-
-            # Filter by metric type
-            if metric_type:
-                filtered_metrics = [
-                    m for m in filtered_metrics if m.metric_type == metric_type
-                ]
-
-            # Filter by timestamp
-            if since:
-                filtered_metrics = [m for m in filtered_metrics if m.timestamp >= since]
-
-            # Filter by tags
-            if tags:
-                filtered_metrics = [
-                    m
-                    for m in filtered_metrics
-                    if all(m.tags.get(k) == v for k, v in tags.items())
-                ]
-
-            # Apply limit
+            since_ts = since.timestamp() if since else None
+            wanted = set(label_key(tags))
+
+            matches = []
+            for (series_name, series_type), family in self._series.items():
+                if name and series_name != name:
+                    continue
+                if metric_type and series_type != metric_type:
+                    continue
+                for key, series in family.items():
+                    if since_ts is not None and series.updated < since_ts:
+                        continue
+                    if wanted and not wanted.issubset(key):
+                        continue
+                    matches.append((series_name, series_type, key, series))
+
+            matches.sort(key=lambda match: match[3].updated)
             if limit:
-                filtered_metrics = filtered_metrics[-limit:]
-
-            return filtered_metrics
+                matches = matches[-limit:]
+
+            return [
+                Metric(
+                    name=series_name,
+                    value=series.value,
+                    metric_type=series_type,
+                    timestamp=datetime.fromtimestamp(series.updated),
+                    tags=dict(key),
+                    description=self._descriptions.get(series_name, ""),
+                    metadata=(
+                        series.histogram.statistics() if series.histogram else {}
+                    ),
+                )
+                for series_name, series_type, key, series in matches
+            ]
 
         except Exception as e:
             logger.error(f"Failed to get metrics: {e}")
             return []
 
+    def get_histogram(
+        self,
+        name: str,
+        metric_type: MetricType = MetricType.TIMER,
+        tags: dict[str, str] | None = None,
+    ) -> Histogram:
+        """Get the merged histogram of all series of a metric matching ``tags``."""
+        merged = Histogram()
+        wanted = set(label_key(tags))
+        for key, series in self._series.get((name, metric_type), {}).items():
+            if series.histogram is not None and wanted.issubset(key):
+                merged.merge(series.histogram)
+        return merged
+
+    def get_total(
+        self,
+        name: str,
+        tags: dict[str, str] | None = None,
+    ) -> float:
+        """Get the sum of all counter series of a metric matching ``tags``."""
+        wanted = set(label_key(tags))
+        return sum(
+            series.value
+            for key, series in self._series.get((name, MetricType.COUNTER), {}).items()
+            if wanted.issubset(key)
+        )
+
     def get_statistics(self, name: str, metric_type: MetricType) -> dict[str, float]:
-        """Get statistical summary for a metric."""
-        try:
-            metrics = self.get_metrics(name=name, metric_type=metric_type)
-            if not metrics:
-                return {}
+        """
+        Get statistical summary for a metric.
 
-            values = [m.value for m in metrics]
+        Histograms and timers are summarized over every observation of all
+        their series; counters and gauges over the current value of each
+        series.
+        """
+        try:
+            if metric_type in (MetricType.HISTOGRAM, MetricType.TIMER):
+                return self.get_histogram(name, metric_type).statistics()
 
-            return {
-                "count": len(values),
-                "min": min(values),
-                "max": max(values),
-                "mean": statistics.mean(values),
-                "median": statistics.median(values),
-                "std_dev": statistics.stdev(values) if len(values) > 1 else 0.0,
-                "sum": sum(values),
-            }
+            family = self._series.get((name, metric_type))
+            if not family:
+                return {}
+            histogram = Histogram()
+            for series in family.values():
+                histogram.observe(series.value)
+            return histogram.statistics()
 
         except Exception as e:
             logger.error(f"Failed to get statistics for {name}: {e}")
@@ -171,23 +399,23 @@ class MetricsCollector:
     def get_metric_summary(self) -> dict[str, Any]:
         """Get summary of all metrics."""
         try:
+            self._cleanup_old_metrics()
+
             summary = {
-                "total_metrics": len(self.metrics),
+                "total_metrics": self._series_count,
                 "metric_types": defaultdict(int),
                 "top_metrics": defaultdict(int),
                 "recent_activity": 0,
+                "dropped_observations": self.dropped_observations,
             }
 
-            # Count by metric type
-            for metric in self.metrics:
-                summary["metric_types"][metric.metric_type.value] += 1
-                summary["top_metrics"][metric.name] += 1
-
-            # Count recent activity (last hour)
-            one_hour_ago = datetime.now() - timedelta(hours=1)
-            summary["recent_activity"] = len(
-                [m for m in self.metrics if m.timestamp >= one_hour_ago]
-            )
+            one_hour_ago = time.time() - 3600
+            for (name, metric_type), family in self._series.items():
+                summary["metric_types"][metric_type.value] += len(family)
+                summary["top_metrics"][name] += len(family)
+                summary["recent_activity"] += sum(
+                    1 for series in family.values() if series.updated >= one_hour_ago
+                )
 
             return dict(summary)
 
@@ -196,40 +424,20 @@ class MetricsCollector:
             return {}
 
     def _cleanup_old_metrics(self) -> None:
-        """Remove metrics older than retention period."""
+        """Remove series not updated within the retention period."""
         try:
-            cutoff_time = datetime.now() - timedelta(hours=self.retention_hours)
-
-            # Remove old metrics from deque
-            while self.metrics and self.metrics[0].timestamp < cutoff_time:
-                self.metrics.popleft()
-
-            # Clean up aggregated metrics
-            for metric_name in list(self.aggregated_metrics.keys()):
-                self.aggregated_metrics[metric_name] = [
-                    v
-                    for v in self.aggregated_metrics[metric_name]
-                    if v >= cutoff_time.timestamp()
-                ]
+            cutoff = time.time() - self.retention_hours * 3600
+            for family_key in list(self._series):
+                family = self._series[family_key]
+                for key in [k for k, s in family.items() if s.updated < cutoff]:
+                    del family[key]
+                    self._series_count -= 1
+                if not family:
+                    del self._series[family_key]
 
         except Exception as e:
             logger.error(f"Failed to cleanup old metrics: {e}")
 
-    def _aggregate_metric(self, metric: Metric) -> None:
-        """Aggregate metric for statistical analysis."""
-        try:
-            key = f"{metric.name}_{metric.metric_type.value}"
-            self.aggregated_metrics[key].append(metric.timestamp.timestamp())
-
-            # Keep only recent values for aggregation
-            cutoff_time = datetime.now() - timedelta(hours=self.retention_hours)
-            self.aggregated_metrics[key] = [
-                v for v in self.aggregated_metrics[key] if v >= cutoff_time.timestamp()
-            ]
-
-        except Exception as e:
-            logger.error(f"Failed to aggregate metric: {e}")
-
     def export_metrics(self, format: str = "json") -> str:
         """Export metrics in specified format."""
         try:
@@ -246,19 +454,18 @@ class MetricsCollector:
     def _export_json_format(self) -> str:
         """Export metrics in JSON format."""
         try:
-            metrics_data = []
-            for metric in self.metrics:
-                metrics_data.append(
-                    {
-                        "name": metric.name,
-                        "value": metric.value,
-                        "type": metric.metric_type.value,
-                        "timestamp": metric.timestamp.isoformat(),
-                        "tags": metric.tags,
-                        "description": metric.description,
-                        "metadata": metric.metadata,
-                    }
-                )
+            metrics_data = [
+                {
+                    "name": metric.name,
+                    "value": metric.value,
+                    "type": metric.metric_type.value,
+                    "timestamp": metric.timestamp.isoformat(),
+                    "tags": metric.tags,
+                    "description": metric.description,
+                    "metadata": metric.metadata,
+                }
+                for metric in self.get_metrics()
+            ]
 
             return json.dumps(metrics_data, indent=2, default=str)
 
@@ -267,45 +474,108 @@ class MetricsCollector:
             return "[]"
 
     def _export_prometheus_format(self) -> str:
-        """Export metrics in Prometheus format."""
+        """Export metrics in the Prometheus text exposition format."""
         try:
-            prometheus_lines = []
-
-            for metric in self.metrics:
-                # Convert metric name to Prometheus format
-                prometheus_name = metric.name.replace(".", "_").replace("-", "_")
-
-                # Build tags string
-                tags_str = ""
-                if metric.tags:
-                    tag_pairs = [f'{k}="{v}"' for k, v in metric.tags.items()]
-                    tags_str = "{" + ",".join(tag_pairs) + "}"
-
-                # Format value based on metric type
-                if metric.metric_type == MetricType.COUNTER:
-                    prometheus_lines.append(
-                        f"{prometheus_name}_total{tags_str} {metric.value}"
-                    )
-                elif metric.metric_type == MetricType.GAUGE:
-                    prometheus_lines.append(
-                        f"{prometheus_name}{tags_str} {metric.value}"
+            self._cleanup_old_metrics()
+            lines = []
+
+            for (name, metric_type), family in sorted(
+                self._series.items(), key=lambda item: (item[0][0], item[0][1].value)
+            ):
+                if not family:
+                    continue
+                prometheus_name = _prometheus_name(name)
+                if metric_type == MetricType.COUNTER and not prometheus_name.endswith(
+                    "_total"
+                ):
+                    prometheus_name += "_total"
+                prometheus_type = {
+                    MetricType.COUNTER: "counter",
+                    MetricType.GAUGE: "gauge",
+                    MetricType.HISTOGRAM: "histogram",
+                    MetricType.TIMER: "histogram",
+                }[metric_type]
+
+                description = self._descriptions.get(name)
+                if description:
+                    lines.append(
+                        f"# HELP {prometheus_name} {_escape_help(description)}"
                     )
-                elif metric.metric_type == MetricType.HISTOGRAM:
-                    prometheus_lines.append(
-                        f"{prometheus_name}_bucket{tags_str} {metric.value}"
+                lines.append(f"# TYPE {prometheus_name} {prometheus_type}")
+
+                for key, series in family.items():
+                    if series.histogram is None:
+                        lines.append(
+                            f"{prometheus_name}{_format_labels(key)} "
+                            f"{_format_value(series.value)}"
+                        )
+                        continue
+                    for le, count in series.histogram.cumulative_buckets():
+                        lines.append(
+                            f"{prometheus_name}_bucket"
+                            f"{_format_labels(key, ('le', le))} {count}"
+                        )
+                    lines.append(
+                        f"{prometheus_name}_sum{_format_labels(key)} "
+                        f"{_format_value(series.histogram.sum)}"
                     )
-                elif metric.metric_type == MetricType.TIMER:
-                    prometheus_lines.append(
-                        f"{prometheus_name}_seconds{tags_str} {metric.value}"
+                    lines.append(
+                        f"{prometheus_name}_count{_format_labels(key)} "
+                        f"{series.histogram.count}"
                     )
 
-                # Add timestamp
-                prometheus_lines.append(
-                    f"# {prometheus_name} {metric.timestamp.timestamp()}"
-                )
-
-            return "\n".join(prometheus_lines)
+            return "\n".join(lines) + "\n" if lines else ""
 
         except Exception as e:
             logger.error(f"Failed to export Prometheus metrics: {e}")
             return ""
+
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _prometheus_name(name: str) -> str:
+    name = _INVALID_NAME_CHARS.sub("_", name)
+    if name[:1].isdigit():
+        name = f"_{name}"
+    return name
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(key)
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    labels = ",".join(
+        f'{_prometheus_name(k)}="{_escape_label(v)}"' for k, v in pairs
+    )
+    return "{" + labels + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+@lru_cache
+def get_metrics_collector() -> MetricsCollector:
+    """Get the process-wide metrics registry."""
+    from backend.app.core.config import get_settings
+
+    settings = get_settings().monitoring
+    return MetricsCollector(
+        max_metrics=settings.monitoring_max_metrics,
+        retention_hours=settings.monitoring_retention_hours,
+    )
@@ -1,205 +1,111 @@
 """
 Performance monitoring middleware.
 
-This module provides FastAPI middleware for monitoring HTTP request/response
+This module provides ASGI middleware for monitoring HTTP request/response
 performance and collecting request metrics.
 """
 
 import time
 from typing import Any
 
-from fastapi import Request
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..core.metrics import MetricsCollector
 
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
-    """Middleware for monitoring HTTP request/response performance."""
+class PerformanceMiddleware:
+    """
+    Middleware for monitoring HTTP request/response performance.
 
-    def __init__(self, app, metrics_collector: MetricsCollector):
+    Implemented as plain ASGI middleware: the response is streamed through
+    untouched and only the status of ``http.response.start`` is observed, so
+    no extra task or body buffering is added to the request.
+    """
+
+    def __init__(self, app: ASGIApp, metrics_collector: MetricsCollector):
         """Initialize performance middleware."""
-        super().__init__(app)
+        self.app = app
         self.metrics_collector = metrics_collector
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and collect performance metrics."""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Extract request information
-        method = request.method
-        url = str(request.url)
-        path = request.url.path
-        query_params = str(request.query_params)
-        client_ip = self._get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "")
+        start_ns = time.perf_counter_ns()
+        status_code = 500  # Assume 500 until the response starts
 
-        # Record request start
-        self.metrics_collector.increment_counter(
-            "http_requests_total",
-            tags={"method": method, "path": path, "status": "started"},
-        )
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
+        success = False
         try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate response time
-            response_time = time.time() - start_time
-
-            # Record successful request metrics
+            await self.app(scope, receive, send_wrapper)
+            success = True
+        finally:
+            # The route is only known once the router has matched the request
             self._record_request_metrics(
-                method=method,
-                path=path,
-                status_code=response.status_code,
-                response_time=response_time,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                success=True,
+                method=scope["method"],
+                route=_route_template(scope),
+                status_code=status_code if success else 500,
+                response_time=(time.perf_counter_ns() - start_ns) / 1e9,
+                user_agent=Headers(scope=scope).get("user-agent", ""),
+                success=success,
             )
 
-            return response
-
-        except Exception as e:
-            # Calculate response time for failed requests
-            response_time = time.time() - start_time
-
-            # Record failed request metrics
-            self._record_request_metrics(
-                method=method,
-                path=path,
-                status_code=500,  # Assume 500 for exceptions
-                response_time=response_time,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                success=False,
-                error=str(e),
-            )
-
-            # Re-raise the exception
-            raise
-
     def _record_request_metrics(
         self,
         method: str,
-        path: str,
+        route: str,
         status_code: int,
         response_time: float,
-        client_ip: str,
         user_agent: str,
         success: bool,
-        error: str | None = None,
     ) -> None:
-        """Record comprehensive request metrics."""
+        """
+        Record request metrics.
+
+        Labels are limited to the method, route template, status and user
+        agent category so the number of series stays bounded.
+        """
         try:
-            # Basic request metrics
+            status = str(status_code)
+
             self.metrics_collector.increment_counter(
                 "http_requests_total",
-                tags={
-                    "method": method,
-                    "path": path,
-                    "status_code": str(status_code),
-                    "success": str(success).lower(),
-                },
+                tags={"method": method, "route": route, "status_code": status},
             )
-
-            # Response time metrics
             self.metrics_collector.record_timer(
                 "http_request_duration_seconds",
                 response_time,
-                tags={"method": method, "path": path, "status_code": str(status_code)},
+                tags={"method": method, "route": route},
             )
 
-            # Response time histogram
-            self.metrics_collector.record_histogram(
-                "http_request_duration_histogram",
-                response_time,
-                tags={"method": method, "path": path},
-            )
-
-            # Status code metrics
-            self.metrics_collector.increment_counter(
-                "http_responses_total",
-                tags={
-                    "status_code": str(status_code),
-                    "status_class": f"{status_code // 100}xx",
-                },
-            )
-
-            # Error metrics
             if not success or status_code >= 400:
                 self.metrics_collector.increment_counter(
                     "http_errors_total",
                     tags={
                         "method": method,
-                        "path": path,
-                        "status_code": str(status_code),
+                        "route": route,
+                        "status_code": status,
                         "error_type": "exception" if not success else "http_error",
                     },
                 )
 
-                if error:
-                    self.metrics_collector.increment_counter(
-                        "http_error_details",
-                        tags={
-                            "error": error[:100],  # Truncate long error messages
-                            "method": method,
-                            "path": path,
-                        },
-                    )
-
-            # Client metrics
             self.metrics_collector.increment_counter(
                 "http_client_requests",
-                tags={
-                    "client_ip": client_ip,
-                    "user_agent": self._categorize_user_agent(user_agent),
-                },
+                tags={"user_agent": self._categorize_user_agent(user_agent)},
             )
 
-            # Path-specific metrics
-            self.metrics_collector.increment_counter(
-                "http_path_requests", tags={"path": path, "method": method}
-            )
-
-            # Performance alerts for slow requests
-            if response_time > 5.0:  # Alert for requests over 5 seconds
-                self.metrics_collector.increment_counter(
-                    "http_slow_requests",
-                    tags={"method": method, "path": path, "duration_range": "5s+"},
-                )
-
-            elif response_time > 1.0:  # Track requests over 1 second
-                self.metrics_collector.increment_counter(
-                    "http_slow_requests",
-                    tags={"method": method, "path": path, "duration_range": "1s-5s"},
-                )
-
         except Exception as e:
             logger.error(f"Failed to record request metrics: {e}")
 
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request."""
-        try:
-            # Check for forwarded headers first
-            forwarded_for = request.headers.get("x-forwarded-for")
-            if forwarded_for:
-                return forwarded_for.split(",")[0].strip()
-
-            real_ip = request.headers.get("x-real-ip")
-            if real_ip:
-                return real_ip
-
-            # Fallback to direct connection
-            if hasattr(request, "client") and request.client:
-                return request.client.host
-
-            return "unknown"
-
-        except Exception:
-            return "unknown"
-
     def _categorize_user_agent(self, user_agent: str) -> str:
         """Categorize user agent string."""
         try:
@@ -225,50 +131,34 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             return "unknown"
 
     def get_request_statistics(self, time_window_minutes: int = 60) -> dict[str, Any]:
-        """Get request statistics for a time window."""
-        try:
-            # Get metrics from the last time window
-            from datetime import datetime, timedelta
+        """
+        Get request statistics.
 
-            since = datetime.now() - timedelta(minutes=time_window_minutes)
-
-            # Get request metrics
-            request_metrics = self.metrics_collector.get_metrics(
-                name="http_requests_total", since=since
-            )
-
-            # Get response time metrics
-            response_time_metrics = self.metrics_collector.get_metrics(
-                name="http_request_duration_seconds", since=since
-            )
-
-            # Get error metrics
-            error_metrics = self.metrics_collector.get_metrics(
-                name="http_errors_total", since=since
-            )
-
-            # Calculate statistics
-            total_requests = len(request_metrics)
-            total_errors = len(error_metrics)
-
-            avg_response_time = 0.0
-            if response_time_metrics:
-                avg_response_time = sum(m.value for m in response_time_metrics) / len(
-                    response_time_metrics
-                )
+        Totals and percentiles cover every request since the series were
+        created; the window only scales the request rate.
+        """
+        try:
+            total_requests = self.metrics_collector.get_total("http_requests_total")
+            total_errors = self.metrics_collector.get_total("http_errors_total")
+            durations = self.metrics_collector.get_histogram(
+                "http_request_duration_seconds"
+            ).statistics()
 
             error_rate = (
                 (total_errors / total_requests * 100) if total_requests > 0 else 0.0
             )
-            requests_per_minute = (
-                total_requests / time_window_minutes if time_window_minutes > 0 else 0.0
-            )
+            uptime_minutes = (time.time() - self.metrics_collector.started_at) / 60
+            window = min(time_window_minutes, uptime_minutes)
+            requests_per_minute = total_requests / window if window > 0 else 0.0
 
             return {
-                "total_requests": total_requests,
-                "total_errors": total_errors,
+                "total_requests": int(total_requests),
+                "total_errors": int(total_errors),
                 "error_rate_percent": error_rate,
-                "avg_response_time_seconds": avg_response_time,
+                "avg_response_time_seconds": durations.get("mean", 0.0),
+                "p50_response_time_seconds": durations.get("median", 0.0),
+                "p95_response_time_seconds": durations.get("p95", 0.0),
+                "p99_response_time_seconds": durations.get("p99", 0.0),
                 "requests_per_minute": requests_per_minute,
                 "time_window_minutes": time_window_minutes,
             }
@@ -276,3 +166,10 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.error(f"Failed to get request statistics: {e}")
             return {}
+
+
+def _route_template(scope: dict[str, Any]) -> str:
+    """Get the path template of the matched route, e.g. ``/users/{user_id}``."""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or "unmatched"
@@ -16,7 +16,12 @@ from sqlalchemy.orm import Session
 from backend.app.core.caching import get_cache_manager
 from backend.app.core.config import get_settings
 
-from .core import AlertChannel, AlertManager, AlertSeverity, MetricsCollector
+from .core import (
+    AlertChannel,
+    AlertManager,
+    AlertSeverity,
+    get_metrics_collector,
+)
 from .database import DatabaseMonitor
 from .system import SystemMonitor
 from .types import (
@@ -37,10 +42,8 @@ class PerformanceMonitor:
         self.settings = get_settings()
 
         # Initialize monitoring components
-        self.metrics_collector = MetricsCollector(
-            max_metrics=self.settings.monitoring.monitoring_max_metrics,
-            retention_hours=self.settings.monitoring.monitoring_retention_hours,
-        )
+        # Shared by every monitor and the request middleware
+        self.metrics_collector = get_metrics_collector()
         self.alert_manager = AlertManager()
         self.system_monitor = SystemMonitor()
         self.database_monitor = DatabaseMonitor(db)
@@ -159,6 +159,16 @@ class RAGConfig(BaseModel):
     )
     reranking_enabled: bool = Field(default=True, description="Enable result reranking")
     cache_results: bool = Field(default=True, description="Cache retrieval results")
+    semantic_cache: bool = Field(
+        default=True,
+        description="Reuse cached results for paraphrased queries",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        ge=0.5,
+        le=1.0,
+        description="Minimum query similarity for reusing a cached response",
+    )
 
     # Performance Configuration
     timeout_seconds: float = Field(
@@ -173,6 +183,12 @@ class RAGConfig(BaseModel):
         le=20,
         description="Maximum concurrent searches",
     )
+    fusion_rank_constant: int = Field(
+        default=60,
+        ge=1,
+        le=1000,
+        description="Rank constant k for reciprocal-rank fusion of sub-queries",
+    )
     batch_size: int = Field(
         default=10,
         ge=1,
@@ -326,7 +342,18 @@ class RAGResult(BaseModel):
     source_id: str = Field(..., description="Source ID")
 
     # Relevance metrics
-    similarity_score: float = Field(..., ge=0.0, le=1.0, description="Similarity score")
+    similarity_score: float | None = Field(
+        None,
+        ge=0.0,
+        le=1.0,
+        description="Similarity score; None for keyword-only hits",
+    )
+    keyword_score: float | None = Field(
+        None,
+        ge=0.0,
+        le=1.0,
+        description="BM25 score scaled to the best keyword hit",
+    )
     relevance_score: float = Field(..., ge=0.0, le=1.0, description="Relevance score")
     ranking_score: float = Field(..., ge=0.0, le=1.0, description="Final ranking score")
 
@@ -5,7 +5,7 @@ This package contains business logic services for the platform.
 """
 
 from .assistant_service import AssistantService
-from .conversation_service import ConversationService
+from .conversation_service import AsyncConversationService, ConversationService
 from .email_service import EmailService, email_service
 from .token_service import TokenService, token_service
 from .tool_service import ToolService
@@ -13,6 +13,7 @@ from .user_service import UserService
 
 __all__ = [
     "AssistantService",
+    "AsyncConversationService",
     "ConversationService",
     "ToolService",
     "UserService",
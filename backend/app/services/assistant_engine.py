@@ -5,6 +5,7 @@ This module provides the main assistant engine with hybrid chat/agent mode
 capabilities, structured output, and integration with the HybridModeManager.
 """
 
+from collections.abc import AsyncGenerator
 from datetime import UTC, datetime
 from typing import Any
 
@@ -186,6 +187,32 @@ class AssistantEngine:
                 error_message=str(e),
             )
 
+    def stream_message(
+        self,
+        user_id: str,
+        conversation_id: str,
+        message: str,
+        **kwargs: Any,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Process a user message and stream the response as it is generated.
+
+        Args:
+            user_id: User ID
+            conversation_id: Conversation ID
+            message: User message
+            **kwargs: Options accepted by the modular engine's stream_message
+
+        Returns:
+            Async generator of stream events
+        """
+        return self.engine.stream_message(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            message=message,
+            **kwargs,
+        )
+
     def get_processing_status(self, request_id: str) -> dict[str, Any] | None:
         """
         Get processing status for a request.
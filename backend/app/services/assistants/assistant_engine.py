@@ -6,6 +6,8 @@ with hybrid mode support, extracted from the original AssistantEngine for better
 """
 
 import asyncio
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from datetime import UTC, datetime
 from typing import Any
 
@@ -20,7 +22,7 @@ from backend.app.schemas.hybrid_mode import (
 from .assistant_context import AssistantContextManager
 from .assistant_memory import AssistantMemoryManager
 from .assistant_processor import AssistantProcessor
-from .assistant_response import AssistantResponseGenerator
+from .assistant_response import AIResponse, AssistantResponseGenerator
 from .assistant_tools import AssistantToolsManager
 
 
@@ -97,9 +99,23 @@ class AssistantEngine:
         self.default_model = get_settings().default_ai_model
         self.default_max_tokens = 2048
 
+        # Deadlines (seconds) for the stages before generation; a stage that
+        # misses its deadline is cancelled and contributes its empty default
+        self.stage_timeouts = {
+            "conversation_context": 2.0,
+            "knowledge_context": 3.0,
+            "tools": 1.0,
+        }
+
         # Processing semaphore to limit concurrent requests
         self.processing_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
 
+        # Post-response work (memory, persistence) running off the response path
+        self._background_tasks: set[asyncio.Task] = set()
+        # Latest persistence task per conversation; the next turn of the
+        # conversation waits for it so its history includes the previous turn
+        self._pending_turns: dict[str, asyncio.Task] = {}
+
         # Initialize modular services
         self.processor = AssistantProcessor()
         self.context_manager = AssistantContextManager()
@@ -186,65 +202,200 @@ class AssistantEngine:
             if request_id in self.processing_requests:
                 del self.processing_requests[request_id]
 
+    async def stream_message(
+        self,
+        user_id: str,
+        conversation_id: str,
+        message: str,
+        assistant_id: str | None = None,
+        use_knowledge_base: bool = True,
+        max_context_chunks: int = 5,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        model: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        force_mode: ConversationMode | None = None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Process a user message and stream the response as it is generated.
+
+        Yields ``start``, one ``token`` per provider chunk, then ``done`` (or
+        ``error``). Tools are not offered while streaming. Closing the
+        generator early stops the provider stream and skips persistence.
+
+        Args:
+            user_id: User ID
+            conversation_id: Conversation ID
+            message: User message
+            assistant_id: Assistant ID (optional)
+            use_knowledge_base: Whether to use knowledge base
+            max_context_chunks: Maximum knowledge chunks to include
+            temperature: AI model temperature
+            max_tokens: Maximum tokens for response
+            model: AI model to use
+            metadata: Additional metadata
+            force_mode: Force specific conversation mode
+
+        Yields:
+            Stream events with ``event`` and ``data`` keys
+        """
+        request_id = (
+            f"req_{len(self.processing_requests)}_{datetime.now(UTC).timestamp()}"
+        )
+
+        request = ProcessingRequest(
+            request_id=request_id,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            message=message,
+            assistant_id=assistant_id,
+            use_knowledge_base=use_knowledge_base,
+            use_tools=False,
+            max_context_chunks=max_context_chunks,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            model=model,
+            metadata=metadata,
+            force_mode=force_mode,
+        )
+
+        self.processing_requests[request_id] = request
+        stream = None
+
+        try:
+            started = time.perf_counter()
+            stage_timings: dict[str, float] = {}
+            degraded_stages: list[str] = []
+
+            # The client paces the rest of the stream, so it holds no slot
+            async with self.processing_semaphore:
+                context, knowledge_context, _ = await self._gather_inputs(
+                    request, stage_timings, degraded_stages
+                )
+                (
+                    response_metadata,
+                    stream,
+                ) = await self.response_generator.generate_response_stream(
+                    request, context, knowledge_context
+                )
+
+            yield {
+                "event": "start",
+                "data": {
+                    "request_id": request_id,
+                    "model": response_metadata["model_used"],
+                    "provider": response_metadata["provider"],
+                    "stage_timings": {
+                        stage: round(seconds, 4)
+                        for stage, seconds in stage_timings.items()
+                    },
+                    "degraded_stages": degraded_stages,
+                },
+            }
+
+            stage_start = time.perf_counter()
+            parts: list[str] = []
+            finish_reason = None
+            async for chunk in stream:
+                if chunk.finish_reason:
+                    finish_reason = chunk.finish_reason
+                if chunk.content:
+                    parts.append(chunk.content)
+                    yield {"event": "token", "data": {"content": chunk.content}}
+            stage_timings["generation"] = time.perf_counter() - stage_start
+
+            ai_response = AIResponse(content="".join(parts), metadata=response_metadata)
+            structured_response = (
+                await self.response_generator.create_structured_response(
+                    request, ai_response
+                )
+            )
+            self._persist_in_background(request, ai_response, structured_response)
+
+            yield {
+                "event": "done",
+                "data": {
+                    "request_id": request_id,
+                    "content": ai_response.content,
+                    "model_used": response_metadata["model_used"],
+                    "finish_reason": finish_reason,
+                    "processing_time": time.perf_counter() - started,
+                    "stage_timings": {
+                        stage: round(seconds, 4)
+                        for stage, seconds in stage_timings.items()
+                    },
+                },
+            }
+        except Exception as e:
+            logger.error(f"Error streaming request {request_id}: {e}")
+            yield {
+                "event": "error",
+                "data": {"request_id": request_id, "message": str(e)},
+            }
+        finally:
+            if stream is not None:
+                await stream.aclose()
+            self.processing_requests.pop(request_id, None)
+
     async def _process_request(self, request: ProcessingRequest) -> ProcessingResult:
         """Process a single request with hybrid mode support."""
         start_time = datetime.now(UTC)
+        stage_timings: dict[str, float] = {}
+        degraded_stages: list[str] = []
 
         try:
-            # Get conversation context
-            context = await self.context_manager.get_conversation_context(request)
-
-            # Prepare knowledge context
-            knowledge_context = ""
-            if request.use_knowledge_base:
-                knowledge_context = (
-                    await self.context_manager.prepare_knowledge_context(request)
-                )
-
-            # Prepare tools
-            tools = []
-            if request.use_tools:
-                tools = await self.tools_manager.prepare_tools(request.message)
+            context, knowledge_context, tools = await self._gather_inputs(
+                request, stage_timings, degraded_stages
+            )
 
             # Generate response
+            stage_start = time.perf_counter()
             ai_response = await self.response_generator.generate_response(
                 request, context, knowledge_context, tools
             )
+            stage_timings["generation"] = time.perf_counter() - stage_start
+            ai_response.metadata = ai_response.metadata or {}
 
             # Execute tools if needed
             if ai_response.tool_calls:
+                stage_start = time.perf_counter()
                 tool_results = await self.tools_manager.execute_tools(
                     ai_response.tool_calls,
                     user_id=request.user_id,
                     conversation_id=request.conversation_id,
                 )
+                stage_timings["tool_execution"] = time.perf_counter() - stage_start
                 # Update response with tool results
-                ai_response.metadata = ai_response.metadata or {}
                 ai_response.metadata["tool_results"] = tool_results
 
-            # Update memory
-            await self.memory_manager.update_memory(request, ai_response)
-
-            # Save response to conversation
             structured_response = (
                 await self.response_generator.create_structured_response(
                     request, ai_response
                 )
             )
-            await self.context_manager.save_response_to_conversation(
-                request, structured_response
-            )
+
+            # Update memory and save the response after returning
+            self._persist_in_background(request, ai_response, structured_response)
 
             end_time = datetime.now(UTC)
             processing_time = (end_time - start_time).total_seconds()
 
+            metadata = {
+                **ai_response.metadata,
+                "stage_timings": {
+                    stage: round(seconds, 4) for stage, seconds in stage_timings.items()
+                },
+            }
+            if degraded_stages:
+                metadata["degraded_stages"] = degraded_stages
+
             # Create processing result
             result = ProcessingResult(
                 request_id=request.request_id,
                 success=True,
                 content=ai_response.content,
                 tool_calls=ai_response.tool_calls or [],
-                metadata=ai_response.metadata or {},
+                metadata=metadata,
                 model_used=ai_response.metadata.get("model_used", self.default_model),
                 tokens_used=ai_response.metadata.get("tokens_used", 0),
                 processing_time=processing_time,
@@ -271,6 +422,152 @@ class AssistantEngine:
                 error_message=str(e),
             )
 
+    async def _gather_inputs(
+        self,
+        request: ProcessingRequest,
+        stage_timings: dict[str, float],
+        degraded_stages: list[str],
+    ) -> tuple[dict[str, Any], str, list[dict[str, Any]]]:
+        """Gather conversation context, knowledge context and tools concurrently."""
+        # None of the stages depends on another
+        context, knowledge_context, tools = await asyncio.gather(
+            self._run_stage(
+                "conversation_context",
+                lambda: self._get_conversation_context(request),
+                {
+                    "messages": [],
+                    "conversation_id": request.conversation_id,
+                    "user_id": request.user_id,
+                    "assistant_id": request.assistant_id,
+                },
+                stage_timings,
+                degraded_stages,
+            ),
+            self._run_stage(
+                "knowledge_context",
+                lambda: self.context_manager.prepare_knowledge_context(request),
+                "",
+                stage_timings,
+                degraded_stages,
+                enabled=request.use_knowledge_base,
+            ),
+            self._run_stage(
+                "tools",
+                lambda: self.tools_manager.prepare_tools(request.message),
+                [],
+                stage_timings,
+                degraded_stages,
+                enabled=request.use_tools,
+            ),
+        )
+        return context, knowledge_context, tools
+
+    async def _run_stage(
+        self,
+        name: str,
+        stage: Callable[[], Awaitable[Any]],
+        default: Any,
+        timings: dict[str, float],
+        degraded: list[str],
+        enabled: bool = True,
+    ) -> Any:
+        """
+        Run one pre-generation stage under its deadline.
+
+        Args:
+            name: Stage name, also the key in ``stage_timeouts``
+            stage: Factory for the stage coroutine
+            default: Value used when the stage is disabled, times out or fails
+            timings: Stage durations in seconds, updated in place
+            degraded: Names of stages that fell back to their default
+
+        Returns:
+            The stage result or its default
+        """
+        if not enabled:
+            return default
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(stage(), timeout=self.stage_timeouts[name])
+        except TimeoutError:
+            logger.warning(
+                f"Stage {name} exceeded its {self.stage_timeouts[name]}s deadline, "
+                "continuing without it"
+            )
+            degraded.append(name)
+            return default
+        except Exception as e:
+            logger.error(f"Stage {name} failed: {e}")
+            degraded.append(name)
+            return default
+        finally:
+            timings[name] = time.perf_counter() - started
+
+    async def _get_conversation_context(
+        self, request: ProcessingRequest
+    ) -> dict[str, Any]:
+        """Get the conversation context once the previous turn is persisted."""
+        previous = self._pending_turns.get(request.conversation_id)
+        if previous is not None:
+            # Shielded, so a missed stage deadline does not cancel persistence
+            await asyncio.shield(previous)
+        return await self.context_manager.get_conversation_context(request)
+
+    def _persist_in_background(
+        self,
+        request: ProcessingRequest,
+        ai_response: AIResponse,
+        structured_response: StructuredResponse | None,
+    ) -> None:
+        """Persist a turn off the response path, after earlier turns."""
+        conversation_id = request.conversation_id
+        previous = self._pending_turns.get(conversation_id)
+
+        async def persist() -> None:
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            await self._persist_turn(request, ai_response, structured_response)
+
+        task = self._run_in_background(persist())
+        self._pending_turns[conversation_id] = task
+
+        def forget(done: asyncio.Task) -> None:
+            if self._pending_turns.get(conversation_id) is done:
+                del self._pending_turns[conversation_id]
+
+        task.add_done_callback(forget)
+
+    async def _persist_turn(
+        self,
+        request: ProcessingRequest,
+        ai_response: AIResponse,
+        structured_response: StructuredResponse | None,
+    ) -> None:
+        """Update memory and save the response to the conversation."""
+        results = await asyncio.gather(
+            self.memory_manager.update_memory(request, ai_response),
+            self.context_manager.save_response_to_conversation(
+                request, structured_response
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error persisting request {request.request_id}: {result}")
+
+    def _run_in_background(self, coro: Awaitable[Any]) -> asyncio.Task:
+        """Run a coroutine without blocking the response, keeping a reference."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def wait_for_background_tasks(self) -> None:
+        """Wait until pending memory and persistence work has finished."""
+        while self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
     def get_processing_status(self, request_id: str) -> dict[str, Any] | None:
         """
         Get processing status for a request.
@@ -342,6 +639,7 @@ class AssistantEngine:
             ),
             "average_processing_time": round(avg_processing_time, 3),
             "max_concurrent_requests": self.max_concurrent_requests,
+            "pending_background_tasks": len(self._background_tasks),
             "default_model": self.default_model,
         }
 
@@ -5,11 +5,18 @@ This module provides response generation functionality for assistant processing,
 including AI model integration, structured output generation, and response formatting.
 """
 
+from collections.abc import AsyncGenerator
 from typing import Any
 
 from loguru import logger
 
 from backend.app.schemas.hybrid_mode import StructuredResponse
+from backend.app.services.ai.core.provider_manager import ProviderManager
+from backend.app.services.ai.providers.base import (
+    ChatCompletionChunk,
+    ChatCompletionRequest,
+    ChatMessage,
+)
 from backend.app.services.ai_service import ai_service
 from backend.app.services.hybrid_mode_manager import hybrid_mode_manager
 
@@ -45,6 +52,7 @@ class AssistantResponseGenerator:
         """Initialize the response generator."""
         self.ai_service = ai_service
         self.hybrid_mode_manager = hybrid_mode_manager
+        self.provider_manager = ProviderManager()
 
     async def generate_response(
         self,
@@ -120,6 +128,91 @@ class AssistantResponseGenerator:
                 metadata={"error": str(e)},
             )
 
+    async def generate_response_stream(
+        self,
+        request: ProcessingRequest,
+        context: dict[str, Any],
+        knowledge_context: str,
+    ) -> tuple[dict[str, Any], AsyncGenerator[ChatCompletionChunk, None]]:
+        """
+        Start streaming an AI response for the request.
+
+        Tools are not offered on the streaming path; provider streams carry
+        text only.
+
+        Args:
+            request: Processing request
+            context: Conversation context
+            knowledge_context: Knowledge base context
+
+        Returns:
+            Response metadata and the provider chunk stream; the caller must
+            close the stream, which stops the provider generation
+        """
+        mode_decision = await self.hybrid_mode_manager.decide_mode(
+            conversation_id=request.conversation_id,
+            user_message=request.message,
+            context=context,
+            force_mode=request.force_mode,
+        )
+
+        messages = self._prepare_messages_for_ai(
+            request, context, knowledge_context, mode_decision
+        )
+        system_message = self._create_system_message(mode_decision, knowledge_context)
+
+        provider_name, model = self._resolve_provider(request.model)
+        provider = self.provider_manager.get_provider(provider_name)
+        if provider is None:
+            raise ValueError(f"Provider '{provider_name}' is not available")
+
+        stream = provider.chat_completion_stream(
+            ChatCompletionRequest(
+                messages=[
+                    ChatMessage(role="system", content=system_message),
+                    *(
+                        ChatMessage(role=m["role"], content=m["content"])
+                        for m in messages
+                    ),
+                ],
+                model=model,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                stream=True,
+            )
+        )
+        metadata = {
+            "model_used": model,
+            "provider": provider_name,
+            "mode_decision": mode_decision.dict() if mode_decision else None,
+            "knowledge_context_used": bool(knowledge_context),
+            "tools_available": 0,
+        }
+        return metadata, stream
+
+    def _resolve_provider(self, model: str | None) -> tuple[str, str]:
+        """
+        Pick the provider serving a model.
+
+        Args:
+            model: Requested model, or None for the first provider's default
+
+        Returns:
+            Provider name and model
+        """
+        providers = self.provider_manager.get_available_providers()
+        if not providers:
+            raise ValueError("No AI provider is configured")
+
+        if model:
+            for provider_name in providers:
+                if model in self.provider_manager.get_available_models(provider_name):
+                    return provider_name, model
+            raise ValueError(f"Model '{model}' is not available")
+
+        provider_name = providers[0]
+        return provider_name, self.provider_manager.get_default_model(provider_name)
+
     def _prepare_messages_for_ai(
         self,
         request: ProcessingRequest,
@@ -0,0 +1,284 @@
+"""
+Time partitioning of the audit tables.
+
+On PostgreSQL ``audit_logs`` and ``extended_audit_logs`` are range
+partitioned by their timestamp into daily or monthly partitions, per the
+``audit_partition_interval`` setting. The partition manager creates the
+partition of the current interval and of the next ``audit_partitions_premake``
+intervals ahead of time, and keeps a default partition for rows outside every
+partition. Retention detaches and drops whole partitions instead of deleting
+rows.
+
+On other databases, or for tables that are not partitioned, the manager does
+nothing and callers fall back to deleting rows.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import get_settings
+from backend.app.core.database import get_db
+
+# Partitioned tables and their partition key
+PARTITIONED_TABLES = {
+    "audit_logs": "created_at",
+    "extended_audit_logs": "timestamp",
+}
+
+# Tables whose rows can be put on legal hold
+LEGAL_HOLD_TABLES = {"extended_audit_logs"}
+
+INTERVALS = ("day", "month")
+
+_RANGE_BOUND = re.compile(r"FROM \((.+)\) TO \((.+)\)")
+
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    """A partition and its range; ``None`` bounds are MINVALUE/MAXVALUE."""
+
+    name: str
+    lower: datetime | None = None
+    upper: datetime | None = None
+    is_default: bool = False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Check whether the partition overlaps ``[start, end)``."""
+        if self.is_default:
+            return False
+        return (self.lower is None or self.lower < end) and (
+            self.upper is None or start < self.upper
+        )
+
+
+def _parse_bound(value: str) -> datetime | None:
+    value = value.strip()
+    if value.upper() in ("MINVALUE", "MAXVALUE"):
+        return None
+    value = value.strip("'")
+    # PostgreSQL renders whole-hour offsets as +00
+    if re.search(r"[+-]\d{2}$", value):
+        value += ":00"
+    return datetime.fromisoformat(value)
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    """Get the start of the partition interval containing a moment."""
+    moment = moment.astimezone(UTC)
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start if interval == "day" else start.replace(day=1)
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    """Get the start of the partition interval following ``start``."""
+    if interval == "day":
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    """Get the name of the partition of a table starting at ``start``."""
+    return f"{table}_p{start:%Y%m%d}" if interval == "day" else f"{table}_p{start:%Y%m}"
+
+
+class AuditPartitionManager:
+    """Creates and drops the time partitions of the audit tables."""
+
+    def __init__(
+        self,
+        db: Session,
+        interval: str | None = None,
+        premake: int | None = None,
+    ):
+        audit_settings = get_settings().audit
+        self.db = db
+        self.interval = interval or audit_settings.audit_partition_interval
+        self.premake = (
+            audit_settings.audit_partitions_premake if premake is None else premake
+        )
+        if self.interval not in INTERVALS:
+            raise ValueError(f"Unknown audit partition interval: {self.interval}")
+
+    def is_partitioned(self, table: str) -> bool:
+        """Check whether a table is a partitioned PostgreSQL table."""
+        if self.db.get_bind().dialect.name != "postgresql":
+            return False
+        return (
+            self.db.execute(
+                text(
+                    "SELECT 1 FROM pg_partitioned_table p "
+                    "JOIN pg_class c ON c.oid = p.partrelid "
+                    "WHERE c.relname = :table "
+                    "AND c.relnamespace = to_regnamespace(current_schema())"
+                ),
+                {"table": table},
+            ).first()
+            is not None
+        )
+
+    def list_partitions(self, table: str) -> list[Partition]:
+        """Get the partitions of a table, ordered by their lower bound."""
+        rows = self.db.execute(
+            text(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits i "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "WHERE parent.relname = :table "
+                "AND parent.relnamespace = to_regnamespace(current_schema())"
+            ),
+            {"table": table},
+        ).all()
+
+        partitions = []
+        for name, bound in rows:
+            if bound == "DEFAULT":
+                partitions.append(Partition(name, is_default=True))
+                continue
+            match = _RANGE_BOUND.search(bound)
+            if match:
+                partitions.append(
+                    Partition(
+                        name, _parse_bound(match.group(1)), _parse_bound(match.group(2))
+                    )
+                )
+        return sorted(
+            partitions, key=lambda p: p.lower or datetime.min.replace(tzinfo=UTC)
+        )
+
+    def ensure_partitions(self, now: datetime | None = None) -> list[str]:
+        """
+        Create missing partitions of the current and the upcoming intervals.
+
+        Args:
+            now: Moment whose interval is the first one covered
+
+        Returns:
+            list[str]: Names of the partitions created
+        """
+        now = now or datetime.now(UTC)
+        created = []
+        for table in PARTITIONED_TABLES:
+            if self.is_partitioned(table):
+                created.extend(self._ensure_table_partitions(table, now))
+        if created:
+            logger.info(f"Created audit partitions: {', '.join(created)}")
+        return created
+
+    def _ensure_table_partitions(self, table: str, now: datetime) -> list[str]:
+        partitions = self.list_partitions(table)
+        created = []
+
+        if not any(p.is_default for p in partitions):
+            self.db.execute(
+                text(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+            )
+            self.db.commit()
+            created.append(f"{table}_default")
+
+        start = period_start(now, self.interval)
+        for _ in range(self.premake + 1):
+            end = next_period(start, self.interval)
+            if not any(p.overlaps(start, end) for p in partitions):
+                name = partition_name(table, start, self.interval)
+                try:
+                    # Bounds are literals; partition bounds cannot be parameters
+                    self.db.execute(
+                        text(
+                            f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                            f"FOR VALUES FROM ('{start.isoformat()}') "
+                            f"TO ('{end.isoformat()}')"
+                        )
+                    )
+                    self.db.commit()
+                    created.append(name)
+                except Exception as e:
+                    # e.g. the default partition already holds rows of the range
+                    self.db.rollback()
+                    logger.error(f"Failed to create audit partition {name}: {e}")
+            start = end
+        return created
+
+    def drop_partitions_before(self, table: str, cutoff: datetime) -> int:
+        """
+        Detach and drop the partitions whose whole range is before ``cutoff``.
+
+        Partitions holding rows on legal hold are kept. Each partition is
+        dropped in its own transaction, so locks on the table are brief.
+
+        Returns:
+            int: Estimated number of rows dropped, from table statistics
+        """
+        if not self.is_partitioned(table):
+            return 0
+
+        dropped_rows = 0
+        for partition in self.list_partitions(table):
+            if (
+                partition.is_default
+                or partition.upper is None
+                or partition.upper > cutoff
+            ):
+                continue
+            if table in LEGAL_HOLD_TABLES and self._has_legal_hold(partition):
+                logger.warning(
+                    f"Keeping audit partition {partition.name}: rows on legal hold"
+                )
+                continue
+
+            rows = self.db.execute(
+                text(
+                    "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class "
+                    "WHERE relname = :name "
+                    "AND relnamespace = to_regnamespace(current_schema())"
+                ),
+                {"name": partition.name},
+            ).scalar()
+            self.db.execute(
+                text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition.name}"')
+            )
+            self.db.execute(text(f'DROP TABLE "{partition.name}"'))
+            self.db.commit()
+
+            dropped_rows += rows or 0
+            logger.info(f"Dropped audit partition {partition.name}")
+        return dropped_rows
+
+    def _has_legal_hold(self, partition: Partition) -> bool:
+        # Served by the partial index on legal_hold
+        return (
+            self.db.execute(
+                text(f'SELECT 1 FROM "{partition.name}" WHERE legal_hold LIMIT 1')
+            ).first()
+            is not None
+        )
+
+
+def ensure_audit_partitions() -> list[str]:
+    """Create missing audit partitions with a fresh database session."""
+    db = next(get_db())
+    try:
+        return AuditPartitionManager(db).ensure_partitions()
+    finally:
+        db.close()
+
+
+async def run_partition_maintenance(interval_seconds: float | None = None) -> None:
+    """Background task creating upcoming audit partitions every interval."""
+    interval_seconds = (
+        interval_seconds or get_settings().audit.audit_partition_maintenance_interval
+    )
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(ensure_audit_partitions)
+        except Exception as e:
+            logger.error(f"Error maintaining audit partitions: {e}")
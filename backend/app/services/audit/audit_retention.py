@@ -1,10 +1,13 @@
 """
 Audit retention policy management.
 
-This module handles retention policies for audit logs.
+This module handles retention policies for audit logs. Policies covering
+every event type are enforced by dropping whole time partitions of the audit
+table; policies limited to some event types, and databases without
+partitioning, delete the expired rows.
 """
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from sqlalchemy.orm import Session
@@ -12,12 +15,15 @@ from sqlalchemy.orm import Session
 from backend.app.models.audit_extended import AuditRetentionRule as AuditRetentionPolicy
 from backend.app.models.audit_extended import ExtendedAuditLog as AuditLog
 
+from .audit_partitions import AuditPartitionManager
+
 
 class RetentionManager:
     """Manages retention policies for audit logs."""
 
     def __init__(self, db: Session):
         self.db = db
+        self.partition_manager = AuditPartitionManager(db)
 
     def create_retention_policy(
         self, name: str, retention_days: int, event_types: list[str] = None
@@ -28,7 +34,7 @@ class RetentionManager:
                 name=name,
                 retention_days=retention_days,
                 event_types=event_types or [],
-                is_active=True,
+                enabled=True,
             )
             self.db.add(policy)
             self.db.commit()
@@ -41,7 +47,7 @@ class RetentionManager:
         """Apply all active retention policies."""
         policies = (
             self.db.query(AuditRetentionPolicy)
-            .filter(AuditRetentionPolicy.is_active)
+            .filter(AuditRetentionPolicy.enabled)
             .all()
         )
         total_deleted = 0
@@ -53,45 +59,59 @@ class RetentionManager:
         return total_deleted
 
     def _apply_policy(self, policy: AuditRetentionPolicy) -> int:
-        """Apply a specific retention policy."""
-        cutoff_date = datetime.utcnow() - timedelta(days=policy.retention_days)
+        """
+        Apply a specific retention policy.
+
+        Without event types, partitions entirely older than the cutoff are
+        dropped; rows of the partition holding the cutoff are dropped with it
+        once it has fully expired. The returned count is then estimated.
+        """
+        cutoff_date = datetime.now(UTC) - timedelta(days=policy.retention_days)
+
+        if not policy.event_types and self.partition_manager.is_partitioned(
+            AuditLog.__tablename__
+        ):
+            return self.partition_manager.drop_partitions_before(
+                AuditLog.__tablename__, cutoff_date
+            )
 
-        query = self.db.query(AuditLog).filter(AuditLog.timestamp < cutoff_date)
+        count = self._expired_logs(policy, cutoff_date).delete(
+            synchronize_session=False
+        )
+        self.db.commit()
 
-        if policy.event_types:
-            query = query.filter(AuditLog.event_type.in_(policy.event_types))
+        return count
 
-        # Get count before deletion
-        count = query.count()
+    def _expired_logs(self, policy: AuditRetentionPolicy, cutoff_date: datetime):
+        """Query the logs a policy removes; rows on legal hold are kept."""
+        query = self.db.query(AuditLog).filter(
+            AuditLog.timestamp < cutoff_date, AuditLog.legal_hold.is_(False)
+        )
 
-        # Delete old logs
-        query.delete()
-        self.db.commit()
+        if policy.event_types:
+            query = query.filter(AuditLog.event_type.in_(policy.event_types))
 
-        return count
+        return query
 
     def get_retention_summary(self) -> dict[str, Any]:
         """Get a summary of retention policies and their impact."""
         policies = self.db.query(AuditRetentionPolicy).all()
         summary = {
             "total_policies": len(policies),
-            "active_policies": len([p for p in policies if p.is_active]),
+            "active_policies": len([p for p in policies if p.enabled]),
             "policy_details": [],
         }
 
         for policy in policies:
-            cutoff_date = datetime.utcnow() - timedelta(days=policy.retention_days)
-            query = self.db.query(AuditLog).filter(AuditLog.timestamp < cutoff_date)
-
-            if policy.event_types:
-                query = query.filter(AuditLog.event_type.in_(policy.event_types))
+            cutoff_date = datetime.now(UTC) - timedelta(days=policy.retention_days)
+            query = self._expired_logs(policy, cutoff_date)
 
             summary["policy_details"].append(
                 {
                     "name": policy.name,
                     "retention_days": policy.retention_days,
                     "event_types": policy.event_types,
-                    "is_active": policy.is_active,
+                    "is_active": policy.enabled,
                     "logs_to_delete": query.count(),
                 }
             )
@@ -5,9 +5,8 @@ This service provides centralized audit logging functionality for compliance,
 security monitoring, and system debugging.
 """
 
-import asyncio
 import uuid
-from contextlib import asynccontextmanager, suppress
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Any
 
@@ -22,84 +21,29 @@ from backend.app.models.audit_extended import (
     AuditEventCategory,
     AuditSeverity as ExtendedSeverity,
 )
+from backend.app.services.audit_writer import AuditWriter
 
 
 class AuditService:
     """Centralized audit service for comprehensive activity logging."""
 
     def __init__(self):
-        self._queue = asyncio.Queue()
-        self._worker_task = None
+        self._writer = AuditWriter()
         self._enabled = True
-        self._batch_size = 50
-        self._flush_interval = 30  # seconds
 
     async def start(self):
-        """Start the audit service worker."""
-        if self._worker_task is None:
-            self._worker_task = asyncio.create_task(self._worker())
-            logger.info("Audit service started")
+        """Start the audit writer, replaying spooled events first."""
+        await self._writer.start()
+        logger.info("Audit service started")
 
     async def stop(self):
-        """Stop the audit service worker."""
-        if self._worker_task:
-            self._worker_task.cancel()
-            with suppress(asyncio.CancelledError):
-                await self._worker_task
-            self._worker_task = None
-            logger.info("Audit service stopped")
-
-    async def _worker(self):
-        """Background worker for processing audit events."""
-        batch = []
-        last_flush = datetime.now(UTC)
-
-        while True:
-            try:
-                # Wait for events with timeout
-                try:
-                    event = await asyncio.wait_for(
-                        self._queue.get(), timeout=self._flush_interval
-                    )
-                    batch.append(event)
-                except TimeoutError:
-                    pass
-
-                # Flush batch if full or timeout reached
-                current_time = datetime.now(UTC)
-                if (
-                    len(batch) >= self._batch_size
-                    or (
-                        batch
-                        and (current_time - last_flush).seconds >= self._flush_interval
-                    )
-                ) and batch:
-                    await self._flush_batch(batch)
-                    batch = []
-                    last_flush = current_time
-
-            except Exception as e:
-                logger.error(f"Error in audit worker: {e}")
-                await asyncio.sleep(1)
-
-    async def _flush_batch(self, batch: list[dict[str, Any]]):
-        """Flush a batch of audit events to the database."""
-        try:
-            db = next(get_db())
-            try:
-                for event_data in batch:
-                    audit_log = AuditLog(**event_data)
-                    db.add(audit_log)
+        """Stop the audit writer after writing the queued events."""
+        await self._writer.stop()
+        logger.info("Audit service stopped")
 
-                db.commit()
-                logger.debug(f"Flushed {len(batch)} audit events")
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Error flushing audit batch: {e}")
-            finally:
-                db.close()
-        except Exception as e:
-            logger.error(f"Error getting database session for audit: {e}")
+    def get_statistics(self) -> dict[str, Any]:
+        """Get audit writer queue statistics."""
+        return self._writer.get_statistics()
 
     async def log_event(
         self,
@@ -134,7 +78,7 @@ class AuditService:
             "updated_at": datetime.now(UTC),  # Add updated_at field
         }
 
-        await self._queue.put(event_data)
+        await self._writer.submit(event_data)
 
     def log_event_sync(
         self,
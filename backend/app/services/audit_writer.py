@@ -0,0 +1,396 @@
+"""
+Bulk writer for audit events.
+
+Audit events are accepted into a bounded in-memory queue and written to the
+``audit_logs`` table in batches, each batch as a single multi-row
+``INSERT ... VALUES`` on the async engine. What happens when the queue is
+full is controlled by the overflow policy:
+
+- ``block``: the caller waits until the writer has made room
+- ``drop_newest``: the new event is discarded
+- ``drop_oldest``: the oldest queued event is discarded
+
+When a spool path is configured, every accepted event is also appended to a
+local JSON-lines spool before it is queued, so events that were accepted but
+not yet written survive a crash of the process. The spool is split into
+segments that are deleted once all their events are written. Segments are
+named after the process that wrote them, which holds a lock on its lock file
+while it runs, so several workers can share a spool path. Segments of
+processes that are no longer running are replayed on startup. Replayed rows
+keep their ids and duplicates are skipped, so replaying a batch that had
+already been committed is harmless.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import socket
+import time
+import uuid
+from contextlib import suppress
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import insert
+
+from backend.app.core.config import get_settings
+from backend.app.core.database import get_async_engine
+from backend.app.models.audit import AuditEventType, AuditLog, AuditSeverity
+
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+def _encode(value: Any) -> Any:
+    """JSON encoder for the non-JSON column values of audit events."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode(row: dict[str, Any]) -> dict[str, Any]:
+    """Restore the column values of a spooled audit event."""
+    for key in ("id", "user_id"):
+        if row.get(key):
+            row[key] = uuid.UUID(row[key])
+    for key in ("created_at", "updated_at"):
+        if row.get(key):
+            row[key] = datetime.fromisoformat(row[key])
+    row["event_type"] = AuditEventType(row["event_type"])
+    row["severity"] = AuditSeverity(row["severity"])
+    return row
+
+
+def _insert_ignoring_duplicates(dialect_name: str, rows: list[dict[str, Any]]):
+    """Build a multi-row insert that skips rows whose id already exists."""
+    table = AuditLog.__table__
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(table).values(rows)
+    return dialect_insert(table).values(rows).on_conflict_do_nothing()
+
+
+class AuditSpool:
+    """Append-only local spool of accepted audit events."""
+
+    def __init__(self, path: str | Path, segment_size: int = 10000):
+        self.path = Path(path)
+        self.segment_size = segment_size
+        # Unique across hosts sharing the path and across reused pids
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{time.time_ns()}"
+        self._lock = None
+        self._file = None
+        self._segment: int | None = None
+        self._written = 0
+        # segment -> events appended but not yet written to the database
+        self._outstanding: dict[int, int] = {}
+        # Locks of stopped processes whose segments are being replayed
+        self._claimed: list = []
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{self.owner}.{segment}")
+
+    def _lock_path(self, owner: str) -> Path:
+        return self.path.with_name(f"{self.path.name}.{owner}.lock")
+
+    def append(self, row: dict[str, Any]) -> int:
+        """
+        Append an event to the current segment.
+
+        Returns:
+            int: Segment holding the event, to be released once it is written
+        """
+        if self._file is None or self._written >= self.segment_size:
+            self._rotate()
+        self._file.write(json.dumps(row, default=_encode) + "\n")
+        # Reaches the OS before the event is queued; fsync is left to the OS
+        self._file.flush()
+        self._written += 1
+        self._outstanding[self._segment] += 1
+        return self._segment
+
+    def release(self, segment: int, count: int = 1) -> None:
+        """Mark events of a segment as written, deleting finished segments."""
+        self._outstanding[segment] -= count
+        if self._outstanding[segment] <= 0 and segment != self._segment:
+            self._delete(segment)
+
+    def close(self) -> None:
+        """
+        Close the spool, deleting the current segment if all its events are
+        written. Segments still holding unwritten events are left for replay
+        by the next process.
+        """
+        self._close_segment()
+        if self._lock is not None:
+            self._unlock(self._lock, self._lock_path(self.owner))
+            self._lock = None
+        self.release_claims()
+
+    def leftover(self) -> list[Path]:
+        """
+        Claim the segments of processes that are no longer running.
+
+        The claims are kept until ``release_claims``, so the segments are
+        not replayed by another process at the same time.
+        """
+        prefix = f"{self.path.name}."
+        segments: dict[str, list[Path]] = {}
+        for path in self.path.parent.glob(f"{prefix}*"):
+            owner, _, segment = path.name[len(prefix) :].rpartition(".")
+            if owner and owner != self.owner and segment.isdigit():
+                segments.setdefault(owner, []).append(path)
+
+        leftover = []
+        for owner, paths in segments.items():
+            lock = self._try_lock(self._lock_path(owner))
+            if lock is not None:
+                self._claimed.append((lock, self._lock_path(owner)))
+                leftover.extend(paths)
+        return sorted(leftover)
+
+    def release_claims(self) -> None:
+        """Release the locks of replayed processes."""
+        for lock, path in self._claimed:
+            self._unlock(lock, path)
+        self._claimed = []
+
+    def read(self, path: Path) -> list[dict[str, Any]]:
+        """Read the events of a segment, skipping a line torn by a crash."""
+        rows = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(_decode(json.loads(line)))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable audit spool line in {path}: {e}")
+        return rows
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        segment, self._segment = self._segment, None
+        if segment is not None and self._outstanding.get(segment, 0) <= 0:
+            self._delete(segment)
+
+    def _rotate(self) -> None:
+        self._close_segment()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self._lock is None:
+            # Held until close(); released by the OS if the process dies
+            self._lock = self._try_lock(self._lock_path(self.owner))
+        self._segment = time.time_ns()
+        self._outstanding[self._segment] = 0
+        self._written = 0
+        self._file = open(self._segment_path(self._segment), "a", encoding="utf-8")
+
+    def _delete(self, segment: int) -> None:
+        self._outstanding.pop(segment, None)
+        with suppress(FileNotFoundError):
+            self._segment_path(segment).unlink()
+
+    @staticmethod
+    def _try_lock(path: Path):
+        """Open and lock a lock file, or get None if it is locked elsewhere."""
+        lock = open(path, "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return None
+        return lock
+
+    @staticmethod
+    def _unlock(lock, path: Path) -> None:
+        # Deleted while still locked, so nobody locks a file about to vanish
+        with suppress(FileNotFoundError):
+            path.unlink()
+        lock.close()
+
+
+class AuditWriter:
+    """Bounded queue of audit events written to the database in bulk."""
+
+    def __init__(
+        self,
+        max_queue_size: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        overflow_policy: str | None = None,
+        spool_path: str | None = None,
+    ):
+        audit_settings = get_settings().audit
+        self.batch_size = batch_size or audit_settings.audit_batch_size
+        self.flush_interval = flush_interval or audit_settings.audit_flush_interval
+        self.overflow_policy = overflow_policy or audit_settings.audit_overflow_policy
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy: {self.overflow_policy}")
+
+        spool_path = spool_path or audit_settings.audit_spool_path
+        self.spool = AuditSpool(spool_path) if spool_path else None
+        # Queued items are (spool segment, row)
+        self._queue: asyncio.Queue[tuple[int | None, dict[str, Any]]] = asyncio.Queue(
+            maxsize=max_queue_size or audit_settings.audit_queue_max_size
+        )
+        self._task: asyncio.Task | None = None
+        # Batch being collected and batch being written by the task
+        self._batch: list[tuple[int | None, dict[str, Any]]] = []
+        self._inflight: asyncio.Future | None = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        """Replay spooled events and start writing queued events."""
+        if self._task is not None:
+            return
+        if self.spool:
+            await self._replay()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write the events still queued and stop the writer."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+        batch, self._batch = self._batch, []
+        await self._write(batch)
+        while not self._queue.empty():
+            await self._write(self._take(self.batch_size))
+        if self.spool:
+            self.spool.close()
+
+    async def submit(self, row: dict[str, Any]) -> bool:
+        """
+        Accept an audit event for writing.
+
+        Args:
+            row: Column values of the ``audit_logs`` row
+
+        Returns:
+            bool: False if the event was dropped by the overflow policy
+        """
+        if self._queue.full():
+            if self.overflow_policy == "drop_newest":
+                self._drop()
+                return False
+            if self.overflow_policy == "drop_oldest":
+                self._release([self._queue.get_nowait()])
+                self._drop()
+
+        segment = self.spool.append(row) if self.spool else None
+        await self._queue.put((segment, row))
+        return True
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get queue depth and event counts."""
+        return {
+            "queued": self._queue.qsize(),
+            "max_queue_size": self._queue.maxsize,
+            "overflow_policy": self.overflow_policy,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            logger.warning(f"Audit queue full, {self.dropped} events dropped so far")
+
+    def _take(self, limit: int) -> list[tuple[int | None, dict[str, Any]]]:
+        items = []
+        while len(items) < limit and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return items
+
+    async def _run(self) -> None:
+        """Collect events into batches and write them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                self._batch.extend(self._take(self.batch_size - len(self._batch)))
+                timeout = deadline - loop.time()
+                if len(self._batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except TimeoutError:
+                    break
+
+            batch, self._batch = self._batch, []
+            # A write in progress is finished by stop() rather than cancelled
+            self._inflight = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._inflight)
+
+    async def _write(self, batch: list[tuple[int | None, dict[str, Any]]]) -> None:
+        """Insert a batch; on failure its spooled events are kept for replay."""
+        if not batch:
+            return
+        try:
+            await self._insert([row for _, row in batch])
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Error writing {len(batch)} audit events: {e}")
+            return
+        self.written += len(batch)
+        self._release(batch)
+        logger.debug(f"Wrote {len(batch)} audit events")
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        engine = get_async_engine()
+        async with engine.begin() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                await conn.execute(
+                    _insert_ignoring_duplicates(
+                        engine.dialect.name, rows[start : start + self.batch_size]
+                    )
+                )
+
+    def _release(self, items: list[tuple[int | None, dict[str, Any]]]) -> None:
+        if not self.spool:
+            return
+        for segment, _ in items:
+            if segment is not None:
+                self.spool.release(segment)
+
+    async def _replay(self) -> None:
+        """Write the events of spool segments left behind by stopped processes."""
+        try:
+            for path in self.spool.leftover():
+                try:
+                    rows = self.spool.read(path)
+                    if rows:
+                        await self._insert(rows)
+                    path.unlink()
+                    logger.info(f"Replayed {len(rows)} spooled audit events from {path}")
+                except FileNotFoundError:
+                    # Replayed by another process before it was claimed here
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to replay audit spool {path}: {e}")
+        finally:
+            self.spool.release_claims()
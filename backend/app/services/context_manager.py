@@ -2,18 +2,53 @@
 Context Manager for conversation context management.
 
 This module provides conversation context management with token limits,
-message history, and context optimization for AI assistants.
+message history, and context optimization for AI assistants. Contexts are
+held in a bounded LRU store that can persist them in Redis, so they survive
+restarts and are shared across workers. Tokens are counted with the
+model's tokenizer when ``tiktoken`` is installed.
 """
 
-import asyncio
+import heapq
 import json
-from dataclasses import dataclass, field
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
+import redis.asyncio as redis
 from loguru import logger
 
+from backend.app.core.config import get_settings
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Seconds to wait before trying Redis again after a connection failure
+_REDIS_RETRY_INTERVAL = 30.0
+
+# Times a change is re-applied after losing a race with another worker
+_MAX_CONFLICT_RETRIES = 3
+
+# Writes the context only if Redis still holds the version it was read at,
+# then bumps the version. Returns the new version, or -1 on a conflict.
+_COMPARE_AND_SET = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'version') or '0')
+if current ~= tonumber(ARGV[1]) then
+    return -1
+end
+redis.call('HSET', KEYS[1], 'version', current + 1, 'data', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return current + 1
+"""
+
 
 class ContextType(Enum):
     """Context type enumeration."""
@@ -45,28 +80,329 @@ class ConversationContext:
 
     conversation_id: str
     user_id: str
-    assistant_id: str | None
+    assistant_id: str | None = None
     items: list[ContextItem] = field(default_factory=list)
     max_tokens: int = 8000
     current_tokens: int = 0
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     settings: dict[str, Any] = field(default_factory=dict)
+    model: str | None = None
+    # Redis version the context was read at; 0 if it was never saved
+    version: int = 0
+
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: str) -> Any:
+    """Get the tiktoken encoding for a model, or None without tiktoken."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    # LiteLLM names may carry a provider prefix (e.g. "openai/gpt-4o")
+    name = model.rsplit("/", 1)[-1]
+    try:
+        # Encodings are downloaded on first use, which fails offline
+        return tiktoken.encoding_for_model(name)
+    except KeyError:
+        pass
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, estimating token counts: {e}")
+        return None
+    try:
+        # Close enough for models tiktoken does not know
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens of a text for a model.
+
+    Args:
+        text: Text to count
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        Token count; roughly 4 characters per token without tiktoken
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def context_to_json(context: ConversationContext) -> str:
+    """Serialize a conversation context for the Redis tier."""
+    return json.dumps(asdict(context), default=_json_default)
+
+
+def context_from_json(data: str) -> ConversationContext:
+    """Deserialize a conversation context written by ``context_to_json``."""
+    raw = json.loads(data)
+    raw["items"] = [
+        ContextItem(
+            **{
+                **item,
+                "type": ContextType(item["type"]),
+                "timestamp": _parse_datetime(item["timestamp"]),
+                "expires_at": _parse_datetime(item.get("expires_at")),
+            }
+        )
+        for item in raw.get("items", [])
+    ]
+    raw["created_at"] = _parse_datetime(raw["created_at"])
+    raw["updated_at"] = _parse_datetime(raw["updated_at"])
+    return ConversationContext(**raw)
+
+
+class ContextStore:
+    """
+    Bounded LRU store of conversation contexts with an optional Redis tier.
+
+    At most ``max_contexts`` contexts are kept in memory; the least recently
+    used one is evicted first. Contexts idle for longer than ``ttl_seconds``
+    expire. With Redis enabled every saved context is also written to Redis
+    with the same TTL, and a local miss is looked up there.
+
+    Contexts in Redis carry a version that is bumped on every write. A
+    context is only written if Redis still holds the version it was read at,
+    so workers do not overwrite each other's changes, and a local copy is
+    replaced when Redis holds a newer version.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int | None = None,
+        ttl_seconds: int | None = None,
+        redis_url: str | None = None,
+        redis_enabled: bool | None = None,
+        key_prefix: str = "context",
+    ):
+        settings = get_settings()
+        ai_settings = settings.ai
+
+        self.max_contexts = max_contexts or ai_settings.context_max_conversations
+        self.ttl_seconds = ttl_seconds or ai_settings.context_ttl_seconds
+        self.redis_enabled = (
+            ai_settings.context_redis_enabled
+            if redis_enabled is None
+            else redis_enabled
+        )
+        self.redis_url = redis_url or settings.redis.redis_url
+        self.redis_db = settings.redis.redis_db
+        self.key_prefix = key_prefix
+
+        self._contexts: OrderedDict[str, ConversationContext] = OrderedDict()
+
+        self._redis: redis.Redis | None = None
+        self._redis_retry_at = 0.0
+
+        self.stats = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "redis_errors": 0,
+            "conflicts": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return conversation_id in self._contexts
+
+    async def get(self, conversation_id: str) -> ConversationContext | None:
+        """
+        Look up a conversation context.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            The context, or None if it is unknown or expired
+        """
+        context = self._contexts.get(conversation_id)
+        if context is not None:
+            if not self._is_expired(context):
+                self._contexts.move_to_end(conversation_id)
+                # Only the version is fetched while the local copy is current
+                newer = await self._load_remote(conversation_id, context.version)
+                if newer is not None:
+                    return newer
+                self.stats["hits"] += 1
+                return context
+            del self._contexts[conversation_id]
+            self.stats["expirations"] += 1
+
+        context = await self._load_remote(conversation_id)
+        if context is not None:
+            return context
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, context: ConversationContext) -> bool:
+        """
+        Save a context in memory and, if enabled, in Redis.
+
+        Returns:
+            False if another worker saved the context since it was read; the
+            local copy is then replaced by theirs and the change is not saved
+        """
+        client = self._get_redis()
+        if client is None:
+            self._put_local(context)
+            return True
+        try:
+            version = await client.eval(
+                _COMPARE_AND_SET,
+                1,
+                self._redis_key(context.conversation_id),
+                context.version,
+                context_to_json(context),
+                self.ttl_seconds,
+            )
+        except (redis.RedisError, OSError) as e:
+            self._disable_redis(e)
+            self._put_local(context)
+            return True
+
+        if int(version) < 0:
+            self.stats["conflicts"] += 1
+            logger.warning(
+                f"Context of conversation {context.conversation_id} "
+                "was changed by another worker"
+            )
+            self._contexts.pop(context.conversation_id, None)
+            await self._load_remote(context.conversation_id)
+            return False
+
+        context.version = int(version)
+        self._put_local(context)
+        return True
+
+    async def delete(self, conversation_id: str) -> bool:
+        """
+        Remove a context from both tiers.
+
+        Returns:
+            True if the context was held in memory
+        """
+        found = self._contexts.pop(conversation_id, None) is not None
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await client.delete(self._redis_key(conversation_id))
+            except (redis.RedisError, OSError) as e:
+                self._disable_redis(e)
+        return found
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get store counters."""
+        return {
+            **self.stats,
+            "contexts": len(self._contexts),
+            "max_contexts": self.max_contexts,
+            "redis_enabled": self.redis_enabled,
+        }
+
+    def _is_expired(self, context: ConversationContext) -> bool:
+        age = datetime.now(UTC) - context.updated_at
+        return age > timedelta(seconds=self.ttl_seconds)
+
+    def _put_local(self, context: ConversationContext) -> None:
+        self._contexts[context.conversation_id] = context
+        self._contexts.move_to_end(context.conversation_id)
+
+        # Expired contexts gather at the least recently used end
+        while self._contexts:
+            oldest = next(iter(self._contexts.values()))
+            if oldest is context or not self._is_expired(oldest):
+                break
+            self._contexts.popitem(last=False)
+            self.stats["expirations"] += 1
+
+        while len(self._contexts) > self.max_contexts:
+            self._contexts.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def _load_remote(
+        self, conversation_id: str, known_version: int | None = None
+    ) -> ConversationContext | None:
+        """Load a context from Redis, only if newer than ``known_version``."""
+        client = self._get_redis()
+        if client is None:
+            return None
+        key = self._redis_key(conversation_id)
+        try:
+            if known_version is not None:
+                version = await client.hget(key, "version")
+                if version is None or int(version) <= known_version:
+                    return None
+            version, data = await client.hmget(key, ["version", "data"])
+        except (redis.RedisError, OSError) as e:
+            self._disable_redis(e)
+            return None
+        if not data:
+            return None
+
+        context = context_from_json(data)
+        context.version = int(version)
+        self._put_local(context)
+        self.stats["redis_hits"] += 1
+        return context
+
+    def _redis_key(self, conversation_id: str) -> str:
+        return f"{self.key_prefix}:{conversation_id}"
+
+    def _get_redis(self) -> redis.Redis | None:
+        if not self.redis_enabled:
+            return None
+        if self._redis is None and time.monotonic() >= self._redis_retry_at:
+            try:
+                self._redis = redis.Redis.from_url(
+                    self.redis_url,
+                    db=self.redis_db,
+                    decode_responses=True,
+                    socket_connect_timeout=2,
+                    socket_timeout=2,
+                )
+            except (redis.RedisError, ValueError) as e:
+                self._disable_redis(e)
+        return self._redis
+
+    def _disable_redis(self, error: Exception) -> None:
+        logger.warning(f"Context store Redis tier unavailable: {error}")
+        self.stats["redis_errors"] += 1
+        self._redis = None
+        self._redis_retry_at = time.monotonic() + _REDIS_RETRY_INTERVAL
 
 
 class ContextManager:
     """Manages conversation context with token limits and optimization."""
 
-    def __init__(self):
+    def __init__(self, store: ContextStore | None = None):
         """Initialize the context manager."""
-        self.contexts: dict[str, ConversationContext] = {}
-        self.max_context_age = timedelta(hours=24)  # Context expires after 24 hours
-        self.cleanup_interval = 300  # Cleanup every 5 minutes
+        self.store = store if store is not None else ContextStore()
+        self.default_model = get_settings().ai.litellm_model
         self.token_buffer = 500  # Buffer for token estimation
 
-        # Start cleanup task
-        asyncio.create_task(self._cleanup_old_contexts())
-
     async def get_context(
         self,
         conversation_id: str,
@@ -82,13 +418,45 @@ class ContextManager:
         Returns:
             Conversation context
         """
-        if conversation_id not in self.contexts:
-            self.contexts[conversation_id] = ConversationContext(
+        context = await self.store.get(conversation_id)
+        if context is None:
+            context = ConversationContext(
                 conversation_id=conversation_id,
                 user_id=user_id,
             )
+            if not await self.store.put(context):
+                # Created by another worker in the meantime
+                context = await self.store.get(conversation_id) or context
+
+        return context
+
+    async def _update_context(
+        self,
+        conversation_id: str,
+        user_id: str,
+        change: Callable[[ConversationContext], Awaitable[bool]],
+    ) -> bool:
+        """
+        Apply a change to a context and save it.
+
+        The change is applied again to the other worker's copy if the context
+        was saved elsewhere in the meantime.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID
+            change: Coroutine function changing the context in place
 
-        return self.contexts[conversation_id]
+        Returns:
+            The result of the change, or False if it could not be saved
+        """
+        for _ in range(_MAX_CONFLICT_RETRIES):
+            context = await self.get_context(conversation_id, user_id)
+            result = await change(context)
+            if await self.store.put(context):
+                return result
+        logger.error(f"Could not save context of conversation {conversation_id}")
+        return False
 
     async def add_message(
         self,
@@ -111,8 +479,6 @@ class ContextManager:
         Returns:
             True if added successfully
         """
-        context = await self.get_context(conversation_id, user_id)
-
         # Determine context type based on role
         if role == "system":
             context_type = ContextType.SYSTEM
@@ -121,39 +487,41 @@ class ContextManager:
         else:
             context_type = ContextType.CONVERSATION
 
-        # Estimate token count
-        token_count = await self._estimate_tokens(content)
-
-        # Create context item
-        item = ContextItem(
-            id=f"msg_{len(context.items)}",
-            type=context_type,
-            content=content,
-            metadata={
-                "role": role,
-                "user_id": user_id,
-                **(metadata or {}),
-            },
-            timestamp=datetime.now(UTC),
-            token_count=token_count,
-        )
+        async def change(context: ConversationContext) -> bool:
+            # Estimate token count
+            token_count = await self._estimate_tokens(content, context.model)
 
-        # Check if adding this item would exceed token limit
-        if context.current_tokens + token_count > context.max_tokens:
-            # Optimize context to make room
-            await self._optimize_context(context)
+            # Create context item
+            item = ContextItem(
+                id=f"msg_{len(context.items)}",
+                type=context_type,
+                content=content,
+                metadata={
+                    "role": role,
+                    "user_id": user_id,
+                    **(metadata or {}),
+                },
+                timestamp=datetime.now(UTC),
+                token_count=token_count,
+            )
 
-            # Check again after optimization
+            # Check if adding this item would exceed token limit
             if context.current_tokens + token_count > context.max_tokens:
-                logger.warning(f"Context full for conversation {conversation_id}")
-                return False
+                # Optimize context to make room
+                await self._optimize_context(context)
 
-        # Add item to context
-        context.items.append(item)
-        context.current_tokens += token_count
-        context.updated_at = datetime.now(UTC)
+                # Check again after optimization
+                if context.current_tokens + token_count > context.max_tokens:
+                    logger.warning(f"Context full for conversation {conversation_id}")
+                    return False
 
-        return True
+            # Add item to context
+            context.items.append(item)
+            context.current_tokens += token_count
+            context.updated_at = datetime.now(UTC)
+            return True
+
+        return await self._update_context(conversation_id, user_id, change)
 
     async def add_knowledge_context(
         self,
@@ -172,40 +540,41 @@ class ContextManager:
         Returns:
             True if added successfully
         """
-        context = await self.get_context(conversation_id, user_id)
-
-        for chunk in knowledge_chunks:
-            content = chunk.get("content", "")
-            token_count = await self._estimate_tokens(content)
+        async def change(context: ConversationContext) -> bool:
+            for chunk in knowledge_chunks:
+                content = chunk.get("content", "")
+                token_count = await self._estimate_tokens(content, context.model)
+
+                item = ContextItem(
+                    id=f"knowledge_{len(context.items)}",
+                    type=ContextType.KNOWLEDGE,
+                    content=content,
+                    metadata={
+                        "source": chunk.get("source"),
+                        "score": chunk.get("score", 0.0),
+                        "chunk_id": chunk.get("id"),
+                        **(chunk.get("metadata", {})),
+                    },
+                    timestamp=datetime.now(UTC),
+                    token_count=token_count,
+                    importance_score=chunk.get("score", 0.5),
+                )
 
-            item = ContextItem(
-                id=f"knowledge_{len(context.items)}",
-                type=ContextType.KNOWLEDGE,
-                content=content,
-                metadata={
-                    "source": chunk.get("source"),
-                    "score": chunk.get("score", 0.0),
-                    "chunk_id": chunk.get("id"),
-                    **(chunk.get("metadata", {})),
-                },
-                timestamp=datetime.now(UTC),
-                token_count=token_count,
-                importance_score=chunk.get("score", 0.5),
-            )
+                # Check token limit
+                if context.current_tokens + token_count > context.max_tokens:
+                    await self._optimize_context(context)
 
-            # Check token limit
-            if context.current_tokens + token_count > context.max_tokens:
-                await self._optimize_context(context)
+                    if context.current_tokens + token_count > context.max_tokens:
+                        logger.warning("Cannot add knowledge context - limit exceeded")
+                        return False
 
-                if context.current_tokens + token_count > context.max_tokens:
-                    logger.warning("Cannot add knowledge context - limit exceeded")
-                    return False
+                context.items.append(item)
+                context.current_tokens += token_count
 
-            context.items.append(item)
-            context.current_tokens += token_count
+            context.updated_at = datetime.now(UTC)
+            return True
 
-        context.updated_at = datetime.now(UTC)
-        return True
+        return await self._update_context(conversation_id, user_id, change)
 
     async def add_tool_result(
         self,
@@ -228,43 +597,43 @@ class ContextManager:
         Returns:
             True if added successfully
         """
-        context = await self.get_context(conversation_id, user_id)
-
         # Convert result to string
         if isinstance(result, dict):
             content = json.dumps(result, indent=2)
         else:
             content = str(result)
 
-        token_count = await self._estimate_tokens(content)
+        async def change(context: ConversationContext) -> bool:
+            token_count = await self._estimate_tokens(content, context.model)
 
-        item = ContextItem(
-            id=f"tool_{len(context.items)}",
-            type=ContextType.TOOL_RESULT,
-            content=content,
-            metadata={
-                "tool_name": tool_name,
-                "result_type": type(result).__name__,
-                **(metadata or {}),
-            },
-            timestamp=datetime.now(UTC),
-            token_count=token_count,
-            importance_score=0.8,  # Tool results are moderately important
-        )
-
-        # Check token limit
-        if context.current_tokens + token_count > context.max_tokens:
-            await self._optimize_context(context)
+            item = ContextItem(
+                id=f"tool_{len(context.items)}",
+                type=ContextType.TOOL_RESULT,
+                content=content,
+                metadata={
+                    "tool_name": tool_name,
+                    "result_type": type(result).__name__,
+                    **(metadata or {}),
+                },
+                timestamp=datetime.now(UTC),
+                token_count=token_count,
+                importance_score=0.8,  # Tool results are moderately important
+            )
 
+            # Check token limit
             if context.current_tokens + token_count > context.max_tokens:
-                logger.warning("Cannot add tool result - limit exceeded")
-                return False
+                await self._optimize_context(context)
 
-        context.items.append(item)
-        context.current_tokens += token_count
-        context.updated_at = datetime.now(UTC)
+                if context.current_tokens + token_count > context.max_tokens:
+                    logger.warning("Cannot add tool result - limit exceeded")
+                    return False
 
-        return True
+            context.items.append(item)
+            context.current_tokens += token_count
+            context.updated_at = datetime.now(UTC)
+            return True
+
+        return await self._update_context(conversation_id, user_id, change)
 
     async def get_messages_for_completion(
         self,
@@ -367,8 +736,7 @@ class ContextManager:
 
     async def clear_context(self, conversation_id: str, user_id: str):
         """Clear conversation context."""
-        if conversation_id in self.contexts:
-            del self.contexts[conversation_id]
+        if await self.store.delete(conversation_id):
             logger.info(f"Cleared context for conversation {conversation_id}")
 
     async def set_context_settings(
@@ -378,12 +746,19 @@ class ContextManager:
         settings: dict[str, Any],
     ):
         """Set context settings."""
-        context = await self.get_context(conversation_id, user_id)
-        context.settings.update(settings)
 
-        # Update max tokens if specified
-        if "max_tokens" in settings:
-            context.max_tokens = settings["max_tokens"]
+        async def change(context: ConversationContext) -> bool:
+            context.settings.update(settings)
+
+            # Update max tokens if specified
+            if "max_tokens" in settings:
+                context.max_tokens = settings["max_tokens"]
+            # Model used to count tokens of items added from now on
+            if "model" in settings:
+                context.model = settings["model"]
+            return True
+
+        await self._update_context(conversation_id, user_id, change)
 
     async def _optimize_context(self, context: ConversationContext):
         """
@@ -395,29 +770,24 @@ class ContextManager:
         if context.current_tokens <= context.max_tokens:
             return
 
-        # Sort items by importance and recency
-        def sort_key(item: ContextItem) -> tuple[float, datetime]:
-            # Higher importance score = higher priority
-            # More recent = higher priority
-            recency_score = (
-                datetime.now(UTC) - item.timestamp
-            ).total_seconds() / 3600  # Hours ago
-            return (item.importance_score, -recency_score)
-
-        # Sort items (least important first)
-        sorted_items = sorted(context.items, key=sort_key)
-
         # Remove items until we're under the limit
         tokens_to_remove = (
             context.current_tokens - context.max_tokens + self.token_buffer
         )
 
+        # Min-heap on (importance, timestamp): least important, then oldest
+        heap = [
+            (item.importance_score, item.timestamp, index)
+            for index, item in enumerate(context.items)
+        ]
+        heapq.heapify(heap)
+
         removed_tokens = 0
-        items_to_remove = []
+        removed: set[int] = set()
 
-        for item in sorted_items:
-            if removed_tokens >= tokens_to_remove:
-                break
+        while heap and removed_tokens < tokens_to_remove:
+            _, _, index = heapq.heappop(heap)
+            item = context.items[index]
 
             # Don't remove system messages unless absolutely necessary
             if (
@@ -426,53 +796,32 @@ class ContextManager:
             ):
                 continue
 
-            items_to_remove.append(item)
+            removed.add(index)
             removed_tokens += item.token_count
 
-        # Remove items
-        for item in items_to_remove:
-            context.items.remove(item)
-            context.current_tokens -= item.token_count
+        # Rebuild the item list once instead of removing items one by one
+        context.items = [
+            item for index, item in enumerate(context.items) if index not in removed
+        ]
+        context.current_tokens -= removed_tokens
 
         logger.info(
-            f"Optimized context: removed {len(items_to_remove)} items, "
+            f"Optimized context: removed {len(removed)} items, "
             f"freed {removed_tokens} tokens",
         )
 
-    async def _estimate_tokens(self, text: str) -> int:
+    async def _estimate_tokens(self, text: str, model: str | None = None) -> int:
         """
-        Estimate token count for text.
+        Count tokens for text.
 
         Args:
-            text: Text to estimate tokens for
+            text: Text to count tokens for
+            model: Model whose tokenizer to use; defaults to the configured model
 
         Returns:
-            Estimated token count
+            Token count
         """
-        # Simple estimation: ~4 characters per token
-        # In a production system, you'd use a proper tokenizer
-        return len(text) // 4 + 1
-
-    async def _cleanup_old_contexts(self):
-        """Clean up old contexts periodically."""
-        while True:
-            try:
-                current_time = datetime.now(UTC)
-                contexts_to_remove = []
-
-                for conversation_id, context in self.contexts.items():
-                    if current_time - context.updated_at > self.max_context_age:
-                        contexts_to_remove.append(conversation_id)
-
-                for conversation_id in contexts_to_remove:
-                    del self.contexts[conversation_id]
-                    logger.info(f"Cleaned up old context: {conversation_id}")
-
-                await asyncio.sleep(self.cleanup_interval)
-
-            except Exception as e:
-                logger.error(f"Error in context cleanup: {e}")
-                await asyncio.sleep(self.cleanup_interval)
+        return count_tokens(text, model or self.default_model)
 
 
 # Global context manager instance
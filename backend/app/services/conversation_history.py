@@ -0,0 +1,292 @@
+"""
+Incremental conversation history for AI context.
+
+Each turn loads only a bounded tail of recent messages, trims it to a token
+budget and prepends a rolling summary of everything older. The summary is
+stored in the conversation's metadata together with a checkpoint (the
+timestamp of the last summarized message).
+
+Messages after the checkpoint are never left out of the prompt silently:
+older ones stay in the window while they fit the budget, until enough have
+piled up to summarize them in one call. As soon as one does not fit, the
+summary is refreshed in the background, folding at most a batch of messages
+into it per refresh.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import desc
+
+from backend.app.core.config import get_settings
+from backend.app.core.database import SessionLocal
+from backend.app.models.conversation import Conversation, Message, MessageRole
+from backend.app.services.context_manager import count_tokens
+
+# Key of the rolling summary in Conversation.conversation_metadata
+SUMMARY_KEY = "history_summary"
+
+HISTORY_ROLES = (MessageRole.USER, MessageRole.ASSISTANT)
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below for use as context in later turns. "
+    "Keep facts, decisions, open questions and user preferences; drop "
+    "pleasantries. If a previous summary is given, extend it with the new "
+    "messages. Answer with the summary only."
+)
+
+# (previous summary, messages to fold in, user id) -> new summary
+Summarizer = Callable[[str | None, list[dict[str, str]], str], Awaitable[str]]
+
+# Summary refreshes in flight, by conversation id, shared by all providers
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+
+class ConversationHistoryProvider:
+    """Token-budgeted history window with a persisted rolling summary."""
+
+    def __init__(
+        self,
+        db: Any,
+        summarizer: Summarizer | None = None,
+        session_factory: Callable[[], Any] = SessionLocal,
+        token_budget: int | None = None,
+        window_max_messages: int | None = None,
+        refresh_messages: int | None = None,
+        batch_messages: int | None = None,
+    ):
+        ai_settings = get_settings().ai
+
+        self.db = db
+        self.summarizer = summarizer or self._summarize
+        self.session_factory = session_factory
+        self.model = ai_settings.litellm_model
+        self.token_budget = token_budget or ai_settings.history_token_budget
+        self.window_max_messages = (
+            window_max_messages or ai_settings.history_window_max_messages
+        )
+        self.refresh_messages = (
+            refresh_messages or ai_settings.history_summary_refresh_messages
+        )
+        self.batch_messages = batch_messages or ai_settings.history_summary_batch_messages
+
+    def get_history(
+        self,
+        conversation_id: str,
+        token_budget: int | None = None,
+    ) -> list[dict[str, str]]:
+        """
+        Get the history to send with the next turn.
+
+        Args:
+            conversation_id: Conversation ID
+            token_budget: Tokens for summary and messages; defaults to the
+                configured budget
+
+        Returns:
+            List of messages in LiteLLM format, oldest first, led by a system
+            message carrying the summary if there is one
+        """
+        conversation = (
+            self.db.query(Conversation)
+            .filter(Conversation.id == conversation_id)
+            .first()
+        )
+        if not conversation:
+            return []
+
+        summary = (conversation.conversation_metadata or {}).get(SUMMARY_KEY)
+        through = _parse_checkpoint(summary)
+        budget = token_budget or self.token_budget
+
+        history = []
+        if summary:
+            summary_message = {
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{summary['content']}",
+            }
+            history.append(summary_message)
+            budget -= count_tokens(summary_message["content"], self.model)
+
+        # Newest first; messages beyond the regular window wait there for a
+        # batch to fill up, and one extra row tells whether older ones exist
+        limit = self.window_max_messages + self.refresh_messages
+        query = self.db.query(Message).filter(
+            Message.conversation_id == conversation_id,
+            Message.role.in_(HISTORY_ROLES),
+        )
+        if through is not None:
+            query = query.filter(Message.created_at > through)
+        recent = query.order_by(desc(Message.created_at)).limit(limit + 1).all()
+
+        window = []
+        tokens = 0
+        for message in recent[:limit]:
+            message_tokens = count_tokens(message.content, self.model)
+            # The latest message is always kept, even if it alone is too long
+            if window and tokens + message_tokens > budget:
+                break
+            window.append(message)
+            tokens += message_tokens
+        window.reverse()
+
+        history.extend(
+            {"role": message.role.value, "content": message.content}
+            for message in window
+        )
+
+        # Unsummarized messages missing from the prompt are summarized now;
+        # those kept beyond the regular window once a batch has piled up
+        pending = len(window) - self.window_max_messages
+        if window and (len(window) < len(recent) or pending >= self.refresh_messages):
+            regular_start = window[max(pending, 0)].created_at
+            self._schedule_refresh(conversation, regular_start)
+
+        return history
+
+    def _schedule_refresh(
+        self,
+        conversation: Conversation,
+        window_start: datetime,
+    ) -> None:
+        """Schedule a refresh of the summary unless one is running."""
+        conversation_id = str(conversation.id)
+        if conversation_id in _refresh_tasks:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside the event loop; the next async turn refreshes
+            return
+
+        task = loop.create_task(
+            self.refresh_summary(conversation_id, str(conversation.user_id), window_start)
+        )
+        _refresh_tasks[conversation_id] = task
+        task.add_done_callback(lambda _: _refresh_tasks.pop(conversation_id, None))
+
+    async def refresh_summary(
+        self,
+        conversation_id: str,
+        user_id: str,
+        window_start: datetime,
+    ) -> bool:
+        """
+        Fold messages older than the window into the rolling summary.
+
+        Uses its own database sessions, so it can outlive the request that
+        scheduled it, and holds no connection while the summarizer runs.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: Owner of the conversation, for the summarizer
+            window_start: Timestamp of the oldest message in the window
+
+        Returns:
+            True if the summary was updated
+        """
+        try:
+            with self.session_factory() as db:
+                conversation = (
+                    db.query(Conversation)
+                    .filter(Conversation.id == conversation_id)
+                    .first()
+                )
+                if not conversation:
+                    return False
+                summary = (conversation.conversation_metadata or {}).get(SUMMARY_KEY)
+                through = _parse_checkpoint(summary)
+
+                query = db.query(Message).filter(
+                    Message.conversation_id == conversation_id,
+                    Message.role.in_(HISTORY_ROLES),
+                    Message.created_at < window_start,
+                )
+                if through is not None:
+                    query = query.filter(Message.created_at > through)
+                batch = (
+                    query.order_by(Message.created_at)
+                    .limit(self.batch_messages)
+                    .all()
+                )
+                if not batch:
+                    return False
+                messages = [
+                    {"role": message.role.value, "content": message.content}
+                    for message in batch
+                ]
+                checkpoint = batch[-1].created_at
+
+            content = await self.summarizer(
+                summary["content"] if summary else None,
+                messages,
+                user_id,
+            )
+
+            with self.session_factory() as db:
+                conversation = (
+                    db.query(Conversation)
+                    .filter(Conversation.id == conversation_id)
+                    .first()
+                )
+                if not conversation:
+                    return False
+                # Assign a new dict so the JSON column is flagged as changed
+                metadata = dict(conversation.conversation_metadata or {})
+                metadata[SUMMARY_KEY] = {
+                    "content": content,
+                    "through": checkpoint.isoformat(),
+                    "message_count": (summary or {}).get("message_count", 0)
+                    + len(messages),
+                    "updated_at": datetime.now(UTC).isoformat(),
+                }
+                conversation.conversation_metadata = metadata
+                db.commit()
+
+            logger.info(
+                f"Refreshed history summary for conversation {conversation_id} "
+                f"with {len(messages)} messages",
+            )
+            return True
+
+        except Exception as e:
+            logger.warning(
+                f"History summary refresh failed for conversation {conversation_id}: {e}"
+            )
+            return False
+
+    async def _summarize(
+        self,
+        previous_summary: str | None,
+        messages: list[dict[str, str]],
+        user_id: str,
+    ) -> str:
+        """Summarize messages with the configured chat model."""
+        from backend.app.services.ai_service import AIService
+
+        transcript = "\n".join(
+            f"{message['role']}: {message['content']}" for message in messages
+        )
+        if previous_summary:
+            transcript = f"Previous summary:\n{previous_summary}\n\n{transcript}"
+
+        response = await AIService(self.db).chat_completion(
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": transcript},
+            ],
+            user_id=user_id,
+            use_knowledge_base=False,
+            use_tools=False,
+        )
+        return response.content.strip()
+
+
+def _parse_checkpoint(summary: dict[str, Any] | None) -> datetime | None:
+    if not summary or not summary.get("through"):
+        return None
+    return datetime.fromisoformat(summary["through"])
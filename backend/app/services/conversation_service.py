@@ -2,8 +2,9 @@
 
 from typing import Any
 
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, func, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from backend.app.core.database import get_db
@@ -13,11 +14,12 @@ from backend.app.core.exceptions import (
     NotFoundError,
     ValidationError,
 )
-from backend.app.models.conversation import Conversation, Message, MessageRole
+from backend.app.models.conversation import Conversation, Message
 from backend.app.schemas.conversation import (
     ConversationCreate,
     MessageCreate,
 )
+from backend.app.services.conversation_history import ConversationHistoryProvider
 
 
 class ConversationService:
@@ -364,38 +366,29 @@ class ConversationService:
                 operation="get_conversation_messages",
             )
 
-    def get_conversation_history(self, conversation_id: str) -> list[dict[str, str]]:
+    def get_conversation_history(
+        self,
+        conversation_id: str,
+        token_budget: int | None = None,
+    ) -> list[dict[str, str]]:
         """
         Get conversation history for AI context.
 
+        Only the most recent messages that fit the token budget are loaded;
+        older messages are represented by the conversation's rolling summary.
+
         Args:
             conversation_id: Conversation ID
+            token_budget: Max tokens of summary and messages
 
         Returns:
             List[Dict[str, str]]: List of messages in LiteLLM format
         """
-        messages = (
-            self.db.query(Message)
-            .filter(
-                Message.conversation_id == conversation_id,
-            )
-            .order_by(Message.created_at)
-            .all()
+        return ConversationHistoryProvider(self.db).get_history(
+            conversation_id,
+            token_budget=token_budget,
         )
 
-        # Convert to LiteLLM format
-        history = []
-        for msg in messages:
-            if msg.role in [MessageRole.USER, MessageRole.ASSISTANT]:
-                history.append(
-                    {
-                        "role": msg.role.value,
-                        "content": msg.content,
-                    },
-                )
-
-        return history
-
     def delete_conversation(self, conversation_id: str, user_id: str) -> bool:
         """
         Delete a conversation.
@@ -458,5 +451,202 @@ class ConversationService:
         return True
 
 
+class AsyncConversationService:
+    """
+    Conversation queries for the request path on an ``AsyncSession``.
+
+    Covers the reads and writes every chat turn makes, so they don't block
+    the event loop. Relationships used by ``to_dict`` are loaded eagerly
+    because async sessions cannot lazy-load.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_conversation(
+        self,
+        conversation_id: str,
+        user_id: str,
+    ) -> dict[str, Any]:
+        """
+        Get conversation by ID and verify ownership.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID for verification
+
+        Returns:
+            Dict[str, Any]: Conversation data
+
+        Raises:
+            ValidationError: If conversation_id or user_id is empty
+            NotFoundError: If conversation not found or not owned
+            DatabaseError: If database operation fails
+        """
+        if not conversation_id or not conversation_id.strip():
+            raise ValidationError("conversation_id", "Conversation ID is required")
+        if not user_id or not user_id.strip():
+            raise ValidationError("user_id", "User ID is required")
+
+        try:
+            result = await self.db.execute(
+                select(Conversation)
+                .options(joinedload(Conversation.assistant))
+                .where(
+                    Conversation.id == conversation_id.strip(),
+                    Conversation.user_id == user_id.strip(),
+                ),
+            )
+            conversation = result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            raise DatabaseError(
+                f"Database error getting conversation: {str(e)}",
+                operation="get_conversation",
+            )
+
+        if not conversation:
+            raise NotFoundError("Conversation", conversation_id)
+        return conversation.to_dict()
+
+    async def has_conversation_access(self, conversation_id: str, user_id: str) -> bool:
+        """Check whether a user owns a conversation."""
+        result = await self.db.execute(
+            select(Conversation.id).where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == user_id,
+            ),
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def get_user_conversations(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Get one page of a user's conversations, most recently updated first.
+
+        Args:
+            user_id: User ID
+            skip: Number of conversations to skip
+            limit: Maximum number of conversations to return
+
+        Returns:
+            Tuple of the page of conversations and the user's total count
+        """
+        total = await self.db.scalar(
+            select(func.count(Conversation.id)).where(Conversation.user_id == user_id),
+        )
+        result = await self.db.execute(
+            select(Conversation)
+            .options(joinedload(Conversation.assistant))
+            .where(Conversation.user_id == user_id)
+            .order_by(desc(Conversation.updated_at))
+            .offset(skip)
+            .limit(limit),
+        )
+        return [conv.to_dict() for conv in result.scalars()], total or 0
+
+    async def get_conversation_messages(
+        self,
+        conversation_id: str,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get messages in a conversation with pagination.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages to return
+            offset: Number of messages to skip
+
+        Returns:
+            List[Dict[str, Any]]: List of messages
+
+        Raises:
+            ValidationError: If pagination arguments are invalid
+            DatabaseError: If database operation fails
+        """
+        if offset is not None and offset < 0:
+            raise ValidationError("offset", "Offset cannot be negative")
+        if limit is not None and (limit < 1 or limit > 1000):
+            raise ValidationError("limit", "Limit must be between 1 and 1000")
+
+        query = (
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at)
+            .offset(offset)
+            .limit(limit)
+        )
+        try:
+            result = await self.db.execute(query)
+        except SQLAlchemyError as e:
+            raise DatabaseError(
+                f"Failed to get conversation messages: {str(e)}",
+                operation="get_conversation_messages",
+            )
+        return [msg.to_dict() for msg in result.scalars()]
+
+    async def add_message(self, message_data: MessageCreate) -> dict[str, Any]:
+        """
+        Add a message to a conversation.
+
+        Args:
+            message_data: Message data
+
+        Returns:
+            Dict[str, Any]: Created message data
+
+        Raises:
+            NotFoundError: If conversation not found
+            DatabaseError: If database operation fails
+        """
+        from datetime import UTC, datetime
+
+        try:
+            conversation = await self.db.get(Conversation, message_data.conversation_id)
+            if not conversation:
+                raise NotFoundError("Conversation", str(message_data.conversation_id))
+
+            message = Message(
+                conversation_id=conversation.id,
+                content=message_data.content,
+                role=message_data.role,
+                message_type=message_data.message_type,
+                tool_name=message_data.tool_name,
+                tool_input=message_data.tool_input,
+                tool_output=message_data.tool_output,
+                tokens_used=message_data.tokens_used or 0,
+                model_used=message_data.model_used,
+                message_metadata=message_data.message_metadata or {},
+            )
+            self.db.add(message)
+
+            # Update conversation statistics in the same transaction
+            conversation.message_count = (conversation.message_count or 0) + 1
+            conversation.total_tokens = (conversation.total_tokens or 0) + (
+                message.tokens_used
+            )
+            conversation.updated_at = datetime.now(UTC)
+
+            await self.db.commit()
+            # Load server-generated timestamps
+            await self.db.refresh(message)
+            return message.to_dict()
+
+        except NotFoundError:
+            await self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise DatabaseError(
+                f"Database error adding message: {str(e)}",
+                operation="add_message",
+            )
+
+
 # Global conversation service instance (for static access, e.g. in AIService)
 conversation_service = ConversationService(next(get_db()))
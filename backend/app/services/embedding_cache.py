@@ -0,0 +1,244 @@
+"""
+Two-tier cache for embedding vectors.
+
+L1 is a bounded in-process LRU with per-entry TTL that stores vectors as
+compact float32 buffers. L2 is a shared Redis tier so embeddings survive
+restarts and are reused across workers. Keys are the ones produced by
+``EmbeddingService._get_cache_key``.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+import redis.asyncio as redis
+
+from backend.app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before trying Redis again after a connection failure
+_L2_RETRY_INTERVAL = 30.0
+
+
+class EmbeddingCache:
+    """Bounded LRU/TTL embedding cache with an optional Redis tier."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: int | None = None,
+        redis_url: str | None = None,
+        redis_ttl_seconds: int | None = None,
+        redis_enabled: bool | None = None,
+        key_prefix: str = "embedding",
+    ):
+        settings = get_settings()
+        kb_settings = settings.knowledge_base
+
+        self.max_entries = max_entries or kb_settings.embedding_cache_max_entries
+        self.ttl_seconds = ttl_seconds or kb_settings.embedding_cache_ttl_seconds
+        self.redis_ttl_seconds = (
+            redis_ttl_seconds or kb_settings.embedding_cache_redis_ttl_seconds
+        )
+        self.redis_enabled = (
+            kb_settings.embedding_cache_redis_enabled
+            if redis_enabled is None
+            else redis_enabled
+        )
+        self.redis_url = redis_url or settings.redis.redis_url
+        self.redis_db = settings.redis.redis_db
+        self.key_prefix = key_prefix
+
+        # key -> (float32 buffer, expires_at monotonic timestamp)
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+
+        self._redis: redis.Redis | None = None
+        self._redis_retry_at = 0.0
+
+        self.stats = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "l2_errors": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self._get_local(key) is not None
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes held by cached vectors in the local tier."""
+        return self._bytes
+
+    @staticmethod
+    def encode(vector: list[float] | np.ndarray) -> bytes:
+        """Encode a vector as a float32 buffer."""
+        return np.asarray(vector, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def decode(buffer: bytes) -> np.ndarray:
+        """Decode a float32 buffer into a read-only vector."""
+        return np.frombuffer(buffer, dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Local tier
+    # ------------------------------------------------------------------
+
+    def _get_local(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        buffer, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove_local(key)
+            self.stats["expirations"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return buffer
+
+    def _put_local(self, key: str, buffer: bytes) -> None:
+        if key in self._entries:
+            self._remove_local(key)
+
+        self._entries[key] = (buffer, time.monotonic() + self.ttl_seconds)
+        self._bytes += len(buffer)
+
+        while len(self._entries) > self.max_entries:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def _remove_local(self, key: str) -> None:
+        buffer, _ = self._entries.pop(key)
+        self._bytes -= len(buffer)
+
+    # ------------------------------------------------------------------
+    # Redis tier
+    # ------------------------------------------------------------------
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def _get_redis(self) -> redis.Redis | None:
+        if not self.redis_enabled:
+            return None
+        if self._redis is None and time.monotonic() >= self._redis_retry_at:
+            try:
+                # Binary client: vectors are stored as raw float32 buffers
+                self._redis = redis.Redis.from_url(
+                    self.redis_url,
+                    db=self.redis_db,
+                    decode_responses=False,
+                    socket_connect_timeout=2,
+                    socket_timeout=2,
+                )
+            except (redis.RedisError, ValueError) as e:
+                self._disable_redis(e)
+        return self._redis
+
+    def _disable_redis(self, error: Exception) -> None:
+        logger.warning(f"Embedding cache Redis tier unavailable: {error}")
+        self.stats["l2_errors"] += 1
+        self._redis = None
+        self._redis_retry_at = time.monotonic() + _L2_RETRY_INTERVAL
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """
+        Look up vectors for the given keys.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Mapping of found keys to float32 vectors
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found: dict[str, np.ndarray] = {}
+        remote_keys: list[str] = []
+
+        for key in unique_keys:
+            buffer = self._get_local(key)
+            if buffer is not None:
+                found[key] = self.decode(buffer)
+                self.stats["l1_hits"] += 1
+            else:
+                remote_keys.append(key)
+
+        client = self._get_redis() if remote_keys else None
+        if client is not None:
+            try:
+                buffers = await client.mget(
+                    [self._redis_key(key) for key in remote_keys],
+                )
+            except (redis.RedisError, OSError) as e:
+                self._disable_redis(e)
+                buffers = [None] * len(remote_keys)
+
+            for key, buffer in zip(remote_keys, buffers, strict=True):
+                if buffer:
+                    self._put_local(key, buffer)
+                    found[key] = self.decode(buffer)
+                    self.stats["l2_hits"] += 1
+
+        self.stats["misses"] += len(unique_keys) - len(found)
+        return found
+
+    async def set_many(self, items: dict[str, list[float] | np.ndarray]) -> None:
+        """
+        Store vectors in both tiers.
+
+        Args:
+            items: Mapping of cache keys to vectors
+        """
+        if not items:
+            return
+
+        buffers = {key: self.encode(vector) for key, vector in items.items()}
+        for key, buffer in buffers.items():
+            self._put_local(key, buffer)
+
+        client = self._get_redis()
+        if client is None:
+            return
+
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, buffer in buffers.items():
+                    pipe.set(self._redis_key(key), buffer, ex=self.redis_ttl_seconds)
+                await pipe.execute()
+        except (redis.RedisError, OSError) as e:
+            self._disable_redis(e)
+
+    def clear(self) -> None:
+        """Clear the local tier. Shared Redis entries expire via TTL."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get cache counters."""
+        hits = self.stats["l1_hits"] + self.stats["l2_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups > 0 else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "redis_enabled": self.redis_enabled,
+        }
@@ -17,6 +17,7 @@ import numpy as np
 from litellm import completion
 
 from backend.app.core.config import get_settings
+from backend.app.services.embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
@@ -79,12 +80,242 @@ class EmbeddingBatch:
     error_count: int = 0
 
 
+@dataclass
+class EmbeddingResultBatch:
+    """
+    Columnar embedding results for a list of texts.
+
+    Row ``i`` of ``vectors`` belongs to ``texts[i]``. Rows of texts that could
+    not be embedded are zero and flagged ``False`` in ``valid``.
+    """
+
+    texts: list[str]
+    model: str
+    vectors: np.ndarray  # float32, shape (n, dimension)
+    valid: np.ndarray  # bool, shape (n,)
+    quality_scores: np.ndarray  # float32, shape (n,)
+    cached: np.ndarray  # bool, shape (n,)
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @classmethod
+    def empty(cls, texts: list[str], model: str) -> "EmbeddingResultBatch":
+        """Create a batch in which no text has an embedding."""
+        n = len(texts)
+        return cls(
+            texts=texts,
+            model=model,
+            vectors=np.zeros((n, 0), dtype=np.float32),
+            valid=np.zeros(n, dtype=bool),
+            quality_scores=np.zeros(n, dtype=np.float32),
+            cached=np.zeros(n, dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def dimension(self) -> int:
+        """Dimension of the embedding vectors."""
+        return self.vectors.shape[1]
+
+    def get_vector(self, index: int) -> list[float] | None:
+        """Get the embedding for one text as a list, or None if it failed."""
+        if not self.valid[index]:
+            return None
+        return self.vectors[index].tolist()
+
+    def to_results(self) -> list[EmbeddingResult | None]:
+        """Expand into per-text EmbeddingResult objects."""
+        vectors = self.vectors.tolist()
+        return [
+            EmbeddingResult(
+                text=text,
+                embedding=vectors[i],
+                model=self.model,
+                dimension=self.dimension,
+                timestamp=self.created_at,
+                metadata={"cached": True} if self.cached[i] else {},
+                quality_score=float(self.quality_scores[i]),
+            )
+            if self.valid[i]
+            else None
+            for i, text in enumerate(self.texts)
+        ]
+
+
+# Rows processed at once for element-wise metrics (Manhattan) to bound the
+# size of the temporary ``candidates - query`` matrix.
+_ELEMENTWISE_CHUNK_ROWS = 4096
+
+
+class SimilarityMatrix:
+    """
+    Candidate embeddings held as a pre-normalized float32 matrix.
+
+    Norms are computed once at construction so every similarity metric can be
+    evaluated for all candidates in a single batched NumPy operation.
+    """
+
+    def __init__(self, candidates: list[list[float]] | np.ndarray):
+        matrix = np.asarray(candidates, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1) if matrix.size else matrix.reshape(0, 0)
+        if matrix.ndim != 2:
+            raise ValueError("Candidate embeddings must form a 2-D matrix")
+
+        self.matrix = np.ascontiguousarray(matrix)
+        self.norms = np.linalg.norm(self.matrix, axis=1)
+        self.squared_norms = self.norms * self.norms
+
+        # Zero vectors stay zero after normalization, so cosine yields 0.0
+        # exactly like EmbeddingService._cosine_similarity.
+        safe_norms = np.where(self.norms > 0, self.norms, 1.0)
+        self.normalized = self.matrix / safe_norms[:, None]
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def dimension(self) -> int:
+        """Dimension of the candidate vectors."""
+        return self.matrix.shape[1]
+
+    def scores(
+        self,
+        query: list[float] | np.ndarray,
+        metric: SimilarityMetric = SimilarityMetric.COSINE,
+    ) -> np.ndarray:
+        """
+        Score every candidate against the query.
+
+        Args:
+            query: Query embedding vector
+            metric: Similarity metric to use
+
+        Returns:
+            Array with one similarity score per candidate
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=np.float32)
+
+        vector = np.asarray(query, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dimension:
+            raise ValueError(
+                f"Query dimension {vector.shape[0]} does not match "
+                f"candidate dimension {self.dimension}",
+            )
+
+        if metric == SimilarityMetric.DOT_PRODUCT:
+            return self.matrix @ vector
+
+        if metric == SimilarityMetric.EUCLIDEAN:
+            # ||c - q||^2 = ||c||^2 - 2 c.q + ||q||^2
+            squared = self.squared_norms - 2.0 * (self.matrix @ vector)
+            squared += float(vector @ vector)
+            return 1.0 / (1.0 + np.sqrt(np.maximum(squared, 0.0)))
+
+        if metric == SimilarityMetric.MANHATTAN:
+            distances = np.empty(len(self), dtype=np.float32)
+            for start in range(0, len(self), _ELEMENTWISE_CHUNK_ROWS):
+                stop = start + _ELEMENTWISE_CHUNK_ROWS
+                distances[start:stop] = np.abs(self.matrix[start:stop] - vector).sum(
+                    axis=1,
+                )
+            return 1.0 / (1.0 + distances)
+
+        if metric != SimilarityMetric.COSINE:
+            logger.warning(f"Unknown similarity metric: {metric}")
+
+        query_norm = float(np.linalg.norm(vector))
+        if query_norm == 0:
+            return np.zeros(len(self), dtype=np.float32)
+        return self.normalized @ (vector / query_norm)
+
+    def top_k(
+        self,
+        query: list[float] | np.ndarray,
+        k: int,
+        metric: SimilarityMetric = SimilarityMetric.COSINE,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Select the k most similar candidates.
+
+        Args:
+            query: Query embedding vector
+            k: Number of candidates to return
+            metric: Similarity metric to use
+
+        Returns:
+            Tuple of (indices, scores) ordered by descending similarity
+        """
+        scores = self.scores(query, metric)
+        indices = select_top_k(scores, k)
+        return indices, scores[indices]
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the k highest scores, best first, via argpartition."""
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    candidate_idx = np.argpartition(-scores, k - 1)[:k]
+    order = np.argsort(-scores[candidate_idx], kind="stable")
+    return candidate_idx[order]
+
+
+def maximal_marginal_relevance(
+    relevance: np.ndarray,
+    similarity: np.ndarray,
+    diversity_weight: float,
+    k: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Greedy Maximal Marginal Relevance selection.
+
+    Each step picks the candidate maximizing
+    ``relevance - diversity_weight * max_similarity_to_selected``, updating the
+    redundancy of all remaining candidates with one vectorized maximum.
+
+    Args:
+        relevance: Relevance score per candidate, shape (n,)
+        similarity: Pairwise candidate similarity, shape (n, n)
+        diversity_weight: Weight of the redundancy penalty
+        k: Number of candidates to select; all of them by default
+
+    Returns:
+        Selected indices in pick order and their marginal scores
+    """
+    n = relevance.shape[0]
+    k = n if k is None else max(0, min(k, n))
+
+    selected = np.empty(k, dtype=np.intp)
+    marginal = np.empty(k, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    redundancy = np.zeros(n, dtype=np.float32)
+
+    for step in range(k):
+        scores = np.where(available, relevance - diversity_weight * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected[step] = best
+        marginal[step] = scores[best]
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+
+    return selected, marginal
+
+
 class EmbeddingService:
     """Service for generating and managing embeddings."""
 
     def __init__(self):
-        self.model = get_settings().knowledge_base.default_embedding_model
-        self.batch_size = 10  # Process embeddings in batches
+        kb_settings = get_settings().knowledge_base
+        self.model = kb_settings.default_embedding_model
+        self.batch_size = kb_settings.embedding_batch_max_items  # Max texts per batch
+        self.max_concurrent_batches = kb_settings.embedding_max_concurrent_batches
+        self.default_batch_token_budget = 8192
         self.max_retries = 3
         self.retry_delay = 1.0
 
@@ -127,9 +358,8 @@ class EmbeddingService:
             },
         }
 
-        # Embedding cache
-        self.embedding_cache = {}
-        self.cache_size_limit = 10000
+        # Embedding cache (in-process LRU backed by a shared Redis tier)
+        self.embedding_cache = EmbeddingCache()
 
         # Performance tracking
         self.embedding_stats = {
@@ -150,6 +380,9 @@ class EmbeddingService:
         """
         Generate embeddings for a list of texts with enhanced features.
 
+        Prefer ``generate_embedding_batch`` for large inputs; it returns one
+        float32 matrix instead of a dataclass per text.
+
         Args:
             texts: List of text strings to embed
             model: Embedding model to use
@@ -159,136 +392,260 @@ class EmbeddingService:
         Returns:
             List of embedding results with metadata
         """
-        start_time = datetime.now(UTC)
-
         try:
             if not texts:
                 return []
 
-            model_name = model or self.model
-            batch_size = batch_size or self.batch_size
+            batch = await self._generate_embedding_batch(
+                texts,
+                model,
+                use_cache,
+                batch_size,
+            )
+            return batch.to_results()
 
-            # Check cache first
-            cached_results = []
-            uncached_texts = []
-            uncached_indices = []
+        except Exception as e:
+            logger.exception(f"Error generating embeddings: {e}")
+            # Error recording disabled for now
+            return []
 
-            if use_cache:
-                for i, text in enumerate(texts):
-                    cache_key = self._get_cache_key(text, model_name)
-                    if cache_key in self.embedding_cache:
-                        cached_results.append(self.embedding_cache[cache_key])
-                        self.embedding_stats["cache_hits"] += 1
-                    else:
-                        uncached_texts.append(text)
-                        uncached_indices.append(i)
-                        self.embedding_stats["cache_misses"] += 1
-            else:
-                uncached_texts = texts
-                uncached_indices = list(range(len(texts)))
-
-            # Generate embeddings for uncached texts
-            new_embeddings = []
-            if uncached_texts:
-                new_embeddings = await self._generate_embeddings_with_retry(
-                    uncached_texts,
-                    model_name,
-                    batch_size,
-                )
+    async def generate_embedding_batch(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        use_cache: bool = True,
+        batch_size: int | None = None,
+    ) -> EmbeddingResultBatch:
+        """
+        Generate embeddings for a list of texts as a columnar batch.
+
+        Args:
+            texts: List of text strings to embed
+            model: Embedding model to use
+            use_cache: Whether to use embedding cache
+            batch_size: Override default batch size
+
+        Returns:
+            Batch with one float32 row per text
+        """
+        model_name = model or self.model
+        try:
+            return await self._generate_embedding_batch(
+                texts,
+                model_name,
+                use_cache,
+                batch_size,
+            )
+        except Exception as e:
+            logger.exception(f"Error generating embedding batch: {e}")
+            return EmbeddingResultBatch.empty(texts, model_name)
+
+    async def _generate_embedding_batch(
+        self,
+        texts: list[str],
+        model: str | None,
+        use_cache: bool,
+        batch_size: int | None,
+    ) -> EmbeddingResultBatch:
+        """Look up cached vectors, embed the rest and merge by index."""
+        start_time = datetime.now(UTC)
 
-                # Cache new embeddings
-                if use_cache:
-                    for i, embedding in enumerate(new_embeddings):
-                        if embedding:
-                            cache_key = self._get_cache_key(
-                                uncached_texts[i],
-                                model_name,
-                            )
-                            self._cache_embedding(cache_key, embedding)
-
-            # Combine cached and new results
-            all_results = []
-            cached_idx = 0
-            new_idx = 0
-
-            for i in range(len(texts)):
-                if i in uncached_indices:
-                    # Use new embedding
-                    if new_idx < len(new_embeddings) and new_embeddings[new_idx]:
-                        result = EmbeddingResult(
-                            text=texts[i],
-                            embedding=new_embeddings[new_idx],
-                            model=model_name,
-                            dimension=len(new_embeddings[new_idx]),
-                            timestamp=datetime.now(UTC),
-                            quality_score=self._calculate_quality_score(
-                                new_embeddings[new_idx],
-                            ),
-                        )
-                        all_results.append(result)
-                    else:
-                        all_results.append(None)
-                    new_idx += 1
+        model_name = model or self.model
+        batch_size = batch_size or self.batch_size
+        n = len(texts)
+        if n == 0:
+            return EmbeddingResultBatch.empty(texts, model_name)
+
+        # Check cache first
+        cached_vectors: list[np.ndarray] = []
+        cached_indices: list[int] = []
+        uncached_indices: list[int] = []
+
+        if use_cache:
+            cache_keys = [self._get_cache_key(text, model_name) for text in texts]
+            found = await self.embedding_cache.get_many(cache_keys)
+            for i, cache_key in enumerate(cache_keys):
+                vector = found.get(cache_key)
+                if vector is not None:
+                    cached_vectors.append(vector)
+                    cached_indices.append(i)
                 else:
-                    # Use cached embedding
-                    all_results.append(cached_results[cached_idx])
-                    cached_idx += 1
-
-            # Update statistics
-            processing_time = (datetime.now(UTC) - start_time).total_seconds()
-            self.embedding_stats["total_embeddings"] += len(texts)
-            self.embedding_stats["total_processing_time"] += processing_time
-            self.embedding_stats["average_processing_time"] = (
-                self.embedding_stats["total_processing_time"]
-                / self.embedding_stats["total_embeddings"]
+                    uncached_indices.append(i)
+            self.embedding_stats["cache_hits"] += len(cached_indices)
+            self.embedding_stats["cache_misses"] += len(uncached_indices)
+        else:
+            uncached_indices = list(range(n))
+
+        # Generate embeddings for uncached texts
+        uncached_texts = [texts[i] for i in uncached_indices]
+        new_embeddings: list[list[float] | None] = []
+        if uncached_texts:
+            new_embeddings = await self._generate_embeddings_with_retry(
+                uncached_texts,
+                model_name,
+                batch_size,
             )
 
-            # Record performance metrics
-            # Performance monitoring disabled for now
+        generated_positions = [
+            position
+            for position, embedding in enumerate(new_embeddings)
+            if embedding
+        ]
+        generated_indices = np.asarray(
+            [uncached_indices[position] for position in generated_positions],
+            dtype=np.intp,
+        )
+
+        # Merge cached and new vectors into one matrix by index
+        if cached_vectors:
+            dimension = len(cached_vectors[0])
+        elif generated_positions:
+            dimension = len(new_embeddings[generated_positions[0]])
+        else:
+            dimension = 0
+
+        vectors = np.zeros((n, dimension), dtype=np.float32)
+        valid = np.zeros(n, dtype=bool)
+        cached = np.zeros(n, dtype=bool)
+
+        if cached_vectors:
+            cached_index_array = np.asarray(cached_indices, dtype=np.intp)
+            vectors[cached_index_array] = np.stack(cached_vectors)
+            valid[cached_index_array] = True
+            cached[cached_index_array] = True
+
+        if generated_positions:
+            vectors[generated_indices] = np.asarray(
+                [new_embeddings[position] for position in generated_positions],
+                dtype=np.float32,
+            )
+            valid[generated_indices] = True
 
-            return all_results
+            # Cache new embeddings
+            if use_cache:
+                await self.embedding_cache.set_many(
+                    {
+                        self._get_cache_key(texts[i], model_name): vectors[i]
+                        for i in generated_indices.tolist()
+                    },
+                )
 
-        except Exception as e:
-            logger.exception(f"Error generating embeddings: {e}")
-            # Error recording disabled for now
-            return []
+        quality_scores = np.zeros(n, dtype=np.float32)
+        if valid.any():
+            quality_scores[valid] = self._calculate_quality_scores(vectors[valid])
+
+        # Update statistics
+        processing_time = (datetime.now(UTC) - start_time).total_seconds()
+        self.embedding_stats["total_embeddings"] += n
+        self.embedding_stats["total_processing_time"] += processing_time
+        self.embedding_stats["average_processing_time"] = (
+            self.embedding_stats["total_processing_time"]
+            / self.embedding_stats["total_embeddings"]
+        )
+
+        return EmbeddingResultBatch(
+            texts=texts,
+            model=model_name,
+            vectors=vectors,
+            valid=valid,
+            quality_scores=quality_scores,
+            cached=cached,
+        )
+
+    def _get_batch_token_budget(self, model: str) -> int:
+        """Get the per-request token budget for a model from model_configs."""
+        try:
+            return self.model_configs[EmbeddingModel(model)]["max_tokens"]
+        except (ValueError, KeyError):
+            return self.default_batch_token_budget
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Estimate token count for a text (roughly 4 characters per token)."""
+        return max(1, len(text) // 4)
+
+    def _plan_batches(
+        self,
+        texts: list[str],
+        model: str,
+        max_items: int,
+    ) -> list[tuple[int, int]]:
+        """
+        Split texts into batches that fit the model's token budget.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model name
+            max_items: Maximum number of texts per batch
+
+        Returns:
+            List of (start, end) index ranges into texts
+        """
+        token_budget = self._get_batch_token_budget(model)
+        batches = []
+        start = 0
+        batch_tokens = 0
+
+        for i, text in enumerate(texts):
+            tokens = self._estimate_tokens(text)
+            batch_full = i - start >= max_items or batch_tokens + tokens > token_budget
+            if i > start and batch_full:
+                batches.append((start, i))
+                start = i
+                batch_tokens = 0
+            batch_tokens += tokens
+
+        if start < len(texts):
+            batches.append((start, len(texts)))
+        return batches
 
     async def _generate_embeddings_with_retry(
         self,
         texts: list[str],
         model: str,
         batch_size: int,
-    ) -> list[list[float]]:
-        """Generate embeddings with retry logic."""
-        for attempt in range(self.max_retries):
-            try:
-                embeddings = []
+    ) -> list[list[float] | None]:
+        """
+        Generate embeddings by dispatching token-budgeted batches concurrently.
 
-                # Process in batches
-                for i in range(0, len(texts), batch_size):
-                    batch = texts[i : i + batch_size]
+        Each batch is retried on its own with exponential backoff. Texts of a
+        batch that still fails after all retries get ``None`` so results of
+        other batches are kept.
+        """
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
 
-                    # Generate embeddings for batch
+        async def run_batch(start: int, end: int) -> None:
+            batch = texts[start:end]
+            for attempt in range(self.max_retries):
+                async with semaphore:
                     batch_embeddings = await self._generate_batch_embeddings(
                         batch,
                         model,
                     )
-                    embeddings.extend(batch_embeddings)
-
-                    # Small delay to avoid rate limiting
-                    await asyncio.sleep(0.1)
+                if len(batch_embeddings) == len(batch):
+                    embeddings[start:end] = batch_embeddings
+                    return
 
-                return embeddings
-
-            except Exception as e:
                 logger.warning(
-                    f"Embedding generation attempt {attempt + 1} failed: {e}",
+                    f"Embedding batch {start}-{end} attempt {attempt + 1} failed: "
+                    f"got {len(batch_embeddings)} of {len(batch)} embeddings",
                 )
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                else:
-                    raise
-        return None
+                    await asyncio.sleep(self.retry_delay * (2**attempt))
+
+            logger.error(
+                f"Embedding batch {start}-{end} failed after "
+                f"{self.max_retries} attempts",
+            )
+
+        await asyncio.gather(
+            *(
+                run_batch(start, end)
+                for start, end in self._plan_batches(texts, model, batch_size)
+            ),
+        )
+        return embeddings
 
     async def _generate_batch_embeddings(
         self,
@@ -333,40 +690,42 @@ class EmbeddingService:
         text_hash = hashlib.md5(text.encode(), usedforsecurity=False).hexdigest()
         return f"{model}:{text_hash}"
 
-    def _cache_embedding(self, cache_key: str, embedding: list[float]):
-        """Cache an embedding."""
-        if len(self.embedding_cache) >= self.cache_size_limit:
-            # Remove oldest entries (simple LRU)
-            oldest_keys = list(self.embedding_cache.keys())[:1000]
-            for key in oldest_keys:
-                del self.embedding_cache[key]
-
-        self.embedding_cache[cache_key] = embedding
-
     def _calculate_quality_score(self, embedding: list[float]) -> float:
         """Calculate quality score for embedding."""
         try:
-            # Convert to numpy array
-            emb_array = np.array(embedding)
-
-            # Calculate various quality metrics
-            magnitude = np.linalg.norm(emb_array)
-            variance = np.var(emb_array)
-            entropy = -np.sum(emb_array * np.log(np.abs(emb_array) + 1e-10))
-
-            # Normalize and combine metrics
-            quality_score = (
-                0.4 * (magnitude / len(embedding))
-                + 0.3 * min(variance, 1.0)
-                + 0.3 * min(entropy / len(embedding), 1.0)
-            )
-
-            return min(quality_score, 1.0)
+            return float(self._calculate_quality_scores(np.asarray([embedding]))[0])
 
         except Exception as e:
             logger.exception(f"Error calculating quality score: {e}")
             return 0.5  # Default score
 
+    def _calculate_quality_scores(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Calculate quality scores for a matrix of embeddings in one pass.
+
+        Args:
+            embeddings: Matrix with one embedding per row
+
+        Returns:
+            Array with one quality score per row
+        """
+        emb_array = np.asarray(embeddings, dtype=np.float32)
+        dimension = emb_array.shape[1]
+
+        # Calculate various quality metrics per row
+        magnitude = np.linalg.norm(emb_array, axis=1)
+        variance = np.var(emb_array, axis=1)
+        entropy = -np.sum(emb_array * np.log(np.abs(emb_array) + 1e-10), axis=1)
+
+        # Normalize and combine metrics
+        quality_scores = (
+            0.4 * (magnitude / dimension)
+            + 0.3 * np.minimum(variance, 1.0)
+            + 0.3 * np.minimum(entropy / dimension, 1.0)
+        )
+
+        return np.minimum(quality_scores, 1.0)
+
     async def generate_single_embedding(self, text: str) -> list[float] | None:
         """
         Generate embedding for a single text.
@@ -455,7 +814,7 @@ class EmbeddingService:
     def calculate_batch_similarity(
         self,
         query_embedding: list[float],
-        candidate_embeddings: list[list[float]],
+        candidate_embeddings: list[list[float]] | SimilarityMatrix,
         metric: SimilarityMetric = SimilarityMetric.COSINE,
     ) -> list[float]:
         """
@@ -463,32 +822,22 @@ class EmbeddingService:
 
         Args:
             query_embedding: Query embedding vector
-            candidate_embeddings: List of candidate embedding vectors
+            candidate_embeddings: Candidate embedding vectors or prebuilt matrix
             metric: Similarity metric to use
 
         Returns:
             List of similarity scores
         """
         try:
-            if not query_embedding or not candidate_embeddings:
+            if query_embedding is None or len(query_embedding) == 0:
+                return []
+            if candidate_embeddings is None or len(candidate_embeddings) == 0:
                 return []
 
-            query_vec = np.array(query_embedding)
-            candidate_matrix = np.array(candidate_embeddings)
+            if not isinstance(candidate_embeddings, SimilarityMatrix):
+                candidate_embeddings = SimilarityMatrix(candidate_embeddings)
 
-            if metric == SimilarityMetric.COSINE:
-                # Manual cosine similarity calculation for batch
-                similarities = []
-                for candidate in candidate_matrix:
-                    sim = self._cosine_similarity(query_vec, candidate)
-                    similarities.append(sim)
-                return similarities
-            # Calculate individually for other metrics
-            similarities = []
-            for candidate in candidate_embeddings:
-                sim = self.calculate_similarity(query_embedding, candidate, metric)
-                similarities.append(sim)
-            return similarities
+            return candidate_embeddings.scores(query_embedding, metric).tolist()
 
         except Exception as e:
             logger.exception(f"Error calculating batch similarity: {e}")
@@ -497,37 +846,43 @@ class EmbeddingService:
     def find_most_similar(
         self,
         query_embedding: list[float],
-        candidate_embeddings: list[list[float]],
+        candidate_embeddings: list[list[float]] | SimilarityMatrix,
         top_k: int = 5,
+        metric: SimilarityMetric = SimilarityMetric.COSINE,
     ) -> list[dict[str, Any]]:
         """
         Find most similar embeddings to query embedding.
 
+        Pass a prebuilt ``SimilarityMatrix`` to reuse the normalized candidate
+        matrix across queries.
+
         Args:
             query_embedding: Query embedding vector
-            candidate_embeddings: List of candidate embedding vectors
+            candidate_embeddings: Candidate embedding vectors or prebuilt matrix
             top_k: Number of top results to return
+            metric: Similarity metric to use
 
         Returns:
             List of results with index and similarity score
         """
         try:
-            similarities = []
-
-            for i, candidate in enumerate(candidate_embeddings):
-                similarity = self.calculate_similarity(query_embedding, candidate)
-                similarities.append(
-                    {
-                        "index": i,
-                        "similarity": similarity,
-                    },
-                )
+            if query_embedding is None or len(query_embedding) == 0:
+                return []
+            if candidate_embeddings is None or len(candidate_embeddings) == 0:
+                return []
 
-            # Sort by similarity (descending)
-            similarities.sort(key=lambda x: x["similarity"], reverse=True)
+            if not isinstance(candidate_embeddings, SimilarityMatrix):
+                candidate_embeddings = SimilarityMatrix(candidate_embeddings)
 
-            # Return top_k results
-            return similarities[:top_k]
+            indices, scores = candidate_embeddings.top_k(
+                query_embedding,
+                top_k,
+                metric,
+            )
+            return [
+                {"index": int(index), "similarity": float(score)}
+                for index, score in zip(indices, scores, strict=True)
+            ]
 
         except Exception as e:
             logger.exception(f"Error finding most similar embeddings: {e}")
@@ -551,14 +906,11 @@ class EmbeddingService:
             texts = [chunk["content"] for chunk in chunks]
 
             # Generate embeddings
-            embeddings = await self.generate_embeddings(texts)
+            batch = await self.generate_embedding_batch(texts)
 
             # Add embeddings to chunks
             for i, chunk in enumerate(chunks):
-                if i < len(embeddings):
-                    chunk["embedding"] = embeddings[i]
-                else:
-                    chunk["embedding"] = None
+                chunk["embedding"] = batch.get_vector(i)
 
             return chunks
 
@@ -790,11 +1142,12 @@ class EmbeddingService:
                 else 0.0
             ),
             "cache_size": len(self.embedding_cache),
+            "cache": self.embedding_cache.get_statistics(),
             "available_models": list(self.model_configs.keys()),
         }
 
     def clear_cache(self):
-        """Clear the embedding cache."""
+        """Clear the in-process embedding cache."""
         self.embedding_cache.clear()
         logger.info("Embedding cache cleared")
 
@@ -39,6 +39,7 @@ from backend.app.services.document.recovery_manager import (
 # from .ai_service import AIService  # Removed to fix circular import
 from .document.document_service import DocumentService
 from .embedding_service import embedding_service
+from .semantic_cache import rag_response_cache
 from .storage.config import StorageConfig
 from .storage.manager import StorageManager
 from .weaviate_service import WeaviateService
@@ -431,13 +432,17 @@ class KnowledgeService:
 
             # Generate embeddings for chunks
             chunk_texts = [chunk.content for chunk in chunks]
-            embeddings = await embedding_service.generate_embeddings(chunk_texts)
+            embedding_batch = await embedding_service.generate_embedding_batch(
+                chunk_texts
+            )
 
-            # Add embeddings to chunks and store in Weaviate
+            # Add embeddings to chunks and collect them for Weaviate
+            weaviate_chunks = []
             for i, chunk in enumerate(chunks):
-                if i < len(embeddings) and embeddings[i]:
-                    chunk.embedding = embeddings[i]
-                    chunk.embedding_model = get_settings().default_embedding_model
+                embedding = embedding_batch.get_vector(i)
+                if embedding:
+                    chunk.embedding = embedding
+                    chunk.embedding_model = embedding_batch.model
                     chunk.embedding_created_at = datetime.utcnow()
 
                     # Enhanced metadata for Weaviate
@@ -463,13 +468,33 @@ class KnowledgeService:
                     if chunk.section_title:
                         weaviate_metadata["section_title"] = chunk.section_title
 
-                    # Store in Weaviate
-                    self.weaviate_service.add_document_chunk(
-                        chunk_id=str(chunk.id),
-                        document_id=str(document.id),
-                        content=chunk.content,
-                        embedding=embeddings[i],
-                        metadata=weaviate_metadata,
+                    weaviate_chunks.append(
+                        {
+                            "chunk_id": str(chunk.id),
+                            "chunk_index": chunk.chunk_index,
+                            "content": chunk.content,
+                            "embedding": embedding,
+                            "metadata": weaviate_metadata,
+                        }
+                    )
+
+            # Store in Weaviate in batches; chunk UUIDs are deterministic, so a
+            # retry of this operation overwrites instead of duplicating
+            ingest_result = self.weaviate_service.add_document_chunks(
+                str(document.id),
+                weaviate_chunks,
+            )
+            if ingest_result.failed:
+                if self.weaviate_service.client is None:
+                    logger.warning(
+                        f"Weaviate unavailable, chunks of document {document_id} "
+                        "were not indexed"
+                    )
+                else:
+                    raise ValueError(
+                        f"Failed to index {len(ingest_result.failed)} of "
+                        f"{ingest_result.total} chunks in Weaviate: "
+                        f"{ingest_result.failed[0]['error']}"
                     )
 
             # Save chunks to database
@@ -500,6 +525,9 @@ class KnowledgeService:
 
             self.db.commit()
 
+            # Cached RAG answers citing the old chunks are now stale
+            rag_response_cache.invalidate_documents([str(document.id)])
+
             logger.info(
                 f"Successfully processed document {document_id} with {len(chunks)} chunks"
             )
@@ -649,6 +677,9 @@ class KnowledgeService:
             if not document:
                 return False
 
+            # Cached answers citing the document must go even if a later step fails
+            rag_response_cache.invalidate_documents([str(document.id)])
+
             # Delete from Weaviate
             self.weaviate_service.delete_document_chunks(str(document.id))
 
@@ -161,7 +161,6 @@ class PerformanceIntegration:
                     tags={
                         "operation": "set",
                         "namespace": "conversation",
-                        "key": conversation_id,
                     },
                 )
 
@@ -217,7 +216,6 @@ class PerformanceIntegration:
                     tags={
                         "operation": "set",
                         "namespace": "ai_response",
-                        "user_id": user_id,
                     },
                 )
 
@@ -5,13 +5,17 @@ This module provides advanced RAG functionality with integration to existing
 Weaviate service, knowledge base, and caching systems.
 """
 
+import asyncio
 import hashlib
 import json
 import time
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
+from functools import partial
 from typing import Any
 from uuid import uuid4
 
+import numpy as np
 from loguru import logger
 
 from backend.app.core.exceptions import AIError, ConfigurationError
@@ -27,18 +31,25 @@ from backend.app.schemas.rag import (
     RAGStrategy,
 )
 from backend.app.services.cache_service import cache_service
-from backend.app.services.weaviate_service import WeaviateService
+from backend.app.services.embedding_service import (
+    SimilarityMatrix,
+    embedding_service,
+    maximal_marginal_relevance,
+)
+from backend.app.services.semantic_cache import rag_response_cache
+from backend.app.services.weaviate_service import async_weaviate_service
 
 
 class RAGService:
     """Enhanced RAG service with advanced features."""
 
     def __init__(self):
-        self.weaviate_service = WeaviateService()
+        self.weaviate_service = async_weaviate_service
         self.default_config = self._create_default_config()
         self.metrics = self._initialize_metrics()
         self._configs: dict[str, RAGConfig] = {}
         self._cache_enabled = True
+        self.semantic_cache = rag_response_cache
 
     def _create_default_config(self) -> RAGConfig:
         """Create default RAG configuration."""
@@ -75,7 +86,7 @@ class RAGService:
         """Initialize RAG service."""
         try:
             # Test Weaviate connection
-            if not self.weaviate_service.health():
+            if not await self.weaviate_service.health():
                 logger.warning(
                     "Weaviate service not available, RAG features may be limited",
                 )
@@ -126,6 +137,23 @@ class RAGService:
                     self._update_metrics(True, time.time() - start_time, cached_result)
                     return cached_result
 
+            # Paraphrased queries can reuse a semantically cached response
+            semantic_scope = None
+            query_embedding = None
+            if config.cache_results and config.semantic_cache:
+                semantic_scope = self._create_semantic_cache_scope(request, config)
+                query_embedding = await self._embed_query(request.query)
+                cached_result = self._get_semantic_cached_result(
+                    semantic_scope,
+                    query_embedding,
+                    request,
+                    config,
+                    request_id,
+                )
+                if cached_result:
+                    self._update_metrics(True, time.time() - start_time, cached_result)
+                    return cached_result
+
             # Perform retrieval
             retrieval_start = time.time()
             results = await self._perform_retrieval(request, config)
@@ -154,6 +182,17 @@ class RAGService:
             # Cache results if enabled
             if config.cache_results and self._cache_enabled:
                 await self._cache_result(cache_key, response)
+            if semantic_scope and query_embedding:
+                self.semantic_cache.store(
+                    semantic_scope,
+                    query_embedding,
+                    response,
+                    document_ids={
+                        result.source_id
+                        for result in response.results
+                        if result.source_type == "document"
+                    },
+                )
 
             # Update metrics
             total_time = time.time() - start_time
@@ -220,79 +259,220 @@ class RAGService:
 
         return results
 
-    async def _semantic_retrieval(
+    def _semantic_subqueries(
         self,
         request: RAGRequest,
         config: RAGConfig,
         conversation_history: list[dict[str, Any]],
+    ) -> list[tuple[str, Callable[[], Awaitable[list[dict[str, Any]]]]]]:
+        """Build the semantic sub-queries for a request."""
+        subqueries = [
+            (
+                "semantic:knowledge",
+                partial(
+                    self._search_knowledge,
+                    query=request.query,
+                    limit=config.max_results,
+                ),
+            ),
+        ]
+
+        # Search conversation history if available
+        if conversation_history:
+            subqueries.append(
+                (
+                    "semantic:conversation",
+                    partial(
+                        self._search_conversation,
+                        query=request.query,
+                        conversation_id=request.conversation_id,
+                        limit=min(config.max_results, 3),  # Limit conversation results
+                    ),
+                ),
+            )
+
+        return subqueries
+
+    def _keyword_subqueries(
+        self,
+        request: RAGRequest,
+        config: RAGConfig,
+    ) -> list[tuple[str, Callable[[], Awaitable[list[dict[str, Any]]]]]]:
+        """Build the BM25 keyword sub-query for a request."""
+        keywords = self._extract_keywords(request.query)
+        if not keywords:
+            return []
+        return [
+            (
+                "keyword:bm25",
+                partial(
+                    self._search_keywords,
+                    query=" ".join(keywords),
+                    limit=config.max_results,
+                ),
+            ),
+        ]
+
+    async def _search_knowledge(self, query: str, limit: int) -> list[dict[str, Any]]:
+        """Search the knowledge base and format the results."""
+        results = await self.weaviate_service.semantic_search_knowledge(
+            query=query,
+            limit=limit,
+        )
+        return self._format_knowledge_results(results)
+
+    async def _search_keywords(self, query: str, limit: int) -> list[dict[str, Any]]:
+        """Search the knowledge base keyword index and format the results."""
+        results = await self.weaviate_service.keyword_search_knowledge(
+            query=query,
+            limit=limit,
+        )
+
+        # BM25 scores are unbounded; scale to the best hit of this query
+        top_score = max((r.get("score") or 0.0 for r in results), default=0.0)
+        formatted = self._format_knowledge_results(results)
+        for result in formatted:
+            # Not a cosine similarity, so kept out of the similarity threshold
+            bm25_score = result["similarity_score"] or 0.0
+            result["similarity_score"] = None
+            result["keyword_score"] = bm25_score / top_score if top_score > 0 else 0.0
+        return formatted
+
+    async def _search_conversation(
+        self,
+        query: str,
+        conversation_id: str | None,
+        limit: int,
     ) -> list[dict[str, Any]]:
-        """Perform semantic retrieval using Weaviate."""
+        """Search conversation messages and format the results."""
+        results = await self.weaviate_service.semantic_search_messages(
+            query=query,
+            conversation_id=conversation_id,
+            limit=limit,
+        )
+        return self._format_conversation_results(results)
 
-        results = []
+    async def _fan_out(
+        self,
+        subqueries: list[tuple[str, Callable[[], Awaitable[list[dict[str, Any]]]]]],
+        config: RAGConfig,
+        deadline: float | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run sub-queries concurrently under one shared deadline.
 
-        # Search knowledge base
-        if config.knowledge_sources or not config.knowledge_sources:
-            knowledge_results = self.weaviate_service.semantic_search_knowledge(
-                query=request.query,
-                limit=config.max_results,
-            )
-            results.extend(self._format_knowledge_results(knowledge_results))
+        Sub-queries still running at the deadline are cancelled and the
+        results of the finished ones are returned.
 
-        # Search conversation history if available
-        if conversation_history:
-            conversation_results = self.weaviate_service.semantic_search_messages(
-                query=request.query,
-                conversation_id=request.conversation_id,
-                limit=min(config.max_results, 3),  # Limit conversation results
+        Args:
+            subqueries: (name, factory) pairs; factories create the coroutine
+            config: RAG configuration with timeout and concurrency limit
+            deadline: Absolute event-loop time to stop at; defaults to
+                ``config.timeout_seconds`` from now
+
+        Returns:
+            Result lists of the sub-queries that completed, in input order
+        """
+        if not subqueries:
+            return []
+
+        semaphore = asyncio.Semaphore(config.max_concurrent_searches)
+
+        async def run(
+            factory: Callable[[], Awaitable[list[dict[str, Any]]]],
+        ) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await factory()
+
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + config.timeout_seconds
+
+        tasks = [asyncio.create_task(run(factory)) for _, factory in subqueries]
+        done, pending = await asyncio.wait(
+            tasks,
+            timeout=max(0.0, deadline - loop.time()),
+        )
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            timed_out = [
+                name for (name, _), t in zip(subqueries, tasks) if t in pending
+            ]
+            logger.warning(
+                "RAG retrieval deadline reached, "
+                f"returning partial results without: {', '.join(timed_out)}",
             )
-            results.extend(self._format_conversation_results(conversation_results))
 
-        return results
+        result_lists = []
+        for (name, _), task in zip(subqueries, tasks, strict=True):
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                logger.warning(f"RAG sub-query {name} failed: {task.exception()}")
+                continue
+            result_lists.append(task.result())
 
-    async def _hybrid_retrieval(
+        return result_lists
+
+    async def _semantic_retrieval(
         self,
         request: RAGRequest,
         config: RAGConfig,
         conversation_history: list[dict[str, Any]],
+        deadline: float | None = None,
     ) -> list[dict[str, Any]]:
-        """Perform hybrid retrieval combining semantic and keyword search."""
-
-        # Perform both semantic and keyword searches
-        semantic_results = await self._semantic_retrieval(
-            request,
+        """Perform semantic retrieval using Weaviate."""
+        result_lists = await self._fan_out(
+            self._semantic_subqueries(request, config, conversation_history),
             config,
-            conversation_history,
+            deadline,
         )
-        keyword_results = await self._keyword_retrieval(
-            request,
-            config,
-            conversation_history,
+        return self._combine_results(
+            *result_lists, rank_constant=config.fusion_rank_constant
         )
 
-        # Combine and deduplicate results
-        return self._combine_results(semantic_results, keyword_results)
+    async def _hybrid_retrieval(
+        self,
+        request: RAGRequest,
+        config: RAGConfig,
+        conversation_history: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Perform hybrid retrieval combining semantic and keyword search."""
+        # Semantic and keyword sub-queries run concurrently against one deadline
+        deadline = asyncio.get_running_loop().time() + config.timeout_seconds
+        semantic_results, keyword_results = await asyncio.gather(
+            self._semantic_retrieval(
+                request, config, conversation_history, deadline=deadline
+            ),
+            self._keyword_retrieval(
+                request, config, conversation_history, deadline=deadline
+            ),
+        )
+        return self._combine_results(
+            semantic_results,
+            keyword_results,
+            rank_constant=config.fusion_rank_constant,
+        )
 
     async def _keyword_retrieval(
         self,
         request: RAGRequest,
         config: RAGConfig,
         conversation_history: list[dict[str, Any]],
+        deadline: float | None = None,
     ) -> list[dict[str, Any]]:
         """Perform keyword-based retrieval."""
-
-        # Extract keywords from query
-        keywords = self._extract_keywords(request.query)
-
-        # Search using keywords (simplified implementation)
-        results = []
-        for keyword in keywords[:5]:  # Limit to top 5 keywords
-            keyword_results = self.weaviate_service.semantic_search_knowledge(
-                query=keyword,
-                limit=config.max_results // 2,
-            )
-            results.extend(self._format_knowledge_results(keyword_results))
-
-        return results
+        result_lists = await self._fan_out(
+            self._keyword_subqueries(request, config),
+            config,
+            deadline,
+        )
+        return self._combine_results(
+            *result_lists, rank_constant=config.fusion_rank_constant
+        )
 
     async def _contextual_retrieval(
         self,
@@ -313,7 +493,7 @@ class RAGService:
         )
 
         # Perform semantic search with contextual query
-        results = self.weaviate_service.semantic_search_knowledge(
+        results = await self.weaviate_service.semantic_search_knowledge(
             query=context_query,
             limit=config.max_results,
         )
@@ -355,38 +535,60 @@ class RAGService:
         config: RAGConfig,
     ) -> list[RAGResult]:
         """Process and rank retrieval results."""
+        # Tokenize the query and every result once for the whole ranking stage
+        query_terms = set(request.query.lower().split())
 
-        # Convert to RAGResult objects
+        # Convert to RAGResult objects, keeping embeddings and token sets aligned
         rag_results = []
+        vectors = []
+        token_sets = []
+        fusion_scores = []
         for result in results:
+            # Keyword-only hits carry no similarity to the query
+            similarity = result.get("similarity_score")
             try:
+                tokens = result.get("content", "").lower().split()
+                token_set = set(tokens)
                 rag_result = RAGResult(
                     content=result.get("content", ""),
                     source=result.get("source", "unknown"),
                     source_type=result.get("source_type", "document"),
                     source_id=result.get("source_id", ""),
-                    similarity_score=result.get("similarity_score", 0.0),
-                    relevance_score=self._calculate_relevance_score(result, request),
+                    similarity_score=similarity,
+                    keyword_score=result.get("keyword_score"),
+                    relevance_score=self._calculate_relevance_score(
+                        result,
+                        request,
+                        query_terms=query_terms,
+                        content_terms=token_set,
+                    ),
                     ranking_score=0.0,  # Will be calculated below
                     chunk_index=result.get("chunk_index"),
-                    token_count=len(result.get("content", "").split()),
+                    token_count=len(tokens),
                     created_at=result.get("created_at"),
                     metadata=result.get("metadata", {}),
                 )
-                rag_results.append(rag_result)
             except Exception as e:
                 logger.warning(f"Failed to process result: {e}")
                 continue
 
-        # Apply similarity threshold
-        rag_results = [
-            result
-            for result in rag_results
-            if result.similarity_score >= config.similarity_threshold
-        ]
+            # Apply similarity threshold
+            if similarity is not None and similarity < config.similarity_threshold:
+                continue
+
+            rag_results.append(rag_result)
+            vectors.append(result.get("vector"))
+            token_sets.append(token_set)
+            fusion_scores.append(result.get("fusion_score"))
 
         # Rank results
-        rag_results = await self._rank_results(rag_results, config)
+        rag_results = await self._rank_results(
+            rag_results,
+            config,
+            vectors=vectors,
+            token_sets=token_sets,
+            fusion_scores=self._scale_fusion_scores(fusion_scores),
+        )
 
         # Limit results
         return rag_results[: config.max_results]
@@ -395,48 +597,167 @@ class RAGService:
         self,
         results: list[RAGResult],
         config: RAGConfig,
+        vectors: list[list[float] | None] | None = None,
+        token_sets: list[set[str]] | None = None,
+        fusion_scores: list[float | None] | None = None,
     ) -> list[RAGResult]:
-        """Rank results based on configuration."""
+        """
+        Rank results based on configuration.
 
-        for result in results:
-            ranking_score = 0.0
+        With ``ContextRankingMethod.DIVERSITY`` results are ordered by Maximal
+        Marginal Relevance, penalizing each pick by its highest similarity to
+        the results already selected.
 
-            # Base score from similarity
-            ranking_score += result.similarity_score * 0.4
+        Args:
+            results: Results to rank
+            config: RAG configuration
+            vectors: Result embeddings aligned with ``results``, if known
+            token_sets: Lowercased content tokens aligned with ``results``
+            fusion_scores: Fused scores scaled to [0, 1] aligned with
+                ``results``; None for results that were not fused
 
-            # Relevance score
-            ranking_score += result.relevance_score * 0.3
+        Returns:
+            Results in ranked order
+        """
+        if fusion_scores is None:
+            fusion_scores = [None] * len(results)
+        base_scores = np.array(
+            [
+                self._calculate_ranking_score(result, config, fusion_score)
+                for result, fusion_score in zip(results, fusion_scores, strict=True)
+            ],
+            dtype=np.float32,
+        )
 
-            # Freshness bonus
-            if result.created_at:
-                freshness_score = self._calculate_freshness_score(result.created_at)
-                ranking_score += freshness_score * config.freshness_weight
+        if config.ranking_method != ContextRankingMethod.DIVERSITY or len(results) < 2:
+            for result, score in zip(results, base_scores, strict=True):
+                result.ranking_score = min(1.0, max(0.0, float(score)))
 
-            # Authority bonus
-            authority_score = self._calculate_authority_score(result.source)
-            ranking_score += authority_score * config.authority_weight
+            # Sort by ranking score
+            results.sort(key=lambda x: x.ranking_score, reverse=True)
+            return results
 
-            # Diversity penalty (simplified)
-            if config.ranking_method == ContextRankingMethod.DIVERSITY:
-                diversity_penalty = self._calculate_diversity_penalty(result, results)
-                ranking_score -= diversity_penalty * config.diversity_penalty
+        if token_sets is None:
+            token_sets = [set(result.content.lower().split()) for result in results]
+        similarity = self._pairwise_similarity(vectors, token_sets)
 
-            result.ranking_score = min(1.0, max(0.0, ranking_score))
+        order, marginal_scores = maximal_marginal_relevance(
+            base_scores,
+            similarity,
+            config.diversity_penalty,
+        )
 
-        # Sort by ranking score
-        results.sort(key=lambda x: x.ranking_score, reverse=True)
+        ranked = []
+        for index, score in zip(order, marginal_scores, strict=True):
+            result = results[index]
+            result.ranking_score = min(1.0, max(0.0, float(score)))
+            ranked.append(result)
+        return ranked
 
-        return results
+    def _calculate_ranking_score(
+        self,
+        result: RAGResult,
+        config: RAGConfig,
+        fusion_score: float | None = None,
+    ) -> float:
+        """Calculate the relevance-only ranking score of a result."""
+        ranking_score = 0.0
+
+        # Base score from similarity; similarities of different sub-queries
+        # are not comparable, so fused results use their scaled fused score,
+        # and keyword-only hits their scaled BM25 score
+        if fusion_score is not None:
+            base_score = fusion_score
+        elif result.similarity_score is not None:
+            base_score = result.similarity_score
+        else:
+            base_score = result.keyword_score or 0.0
+        ranking_score += base_score * 0.4
+
+        # Relevance score
+        ranking_score += result.relevance_score * 0.3
+
+        # Freshness bonus
+        if result.created_at:
+            freshness_score = self._calculate_freshness_score(result.created_at)
+            ranking_score += freshness_score * config.freshness_weight
+
+        # Authority bonus
+        authority_score = self._calculate_authority_score(result.source)
+        ranking_score += authority_score * config.authority_weight
+
+        return ranking_score
+
+    @staticmethod
+    def _scale_fusion_scores(scores: list[float | None]) -> list[float | None]:
+        """
+        Min-max scale the fused scores of a result set to [0, 1].
+
+        Only results merged from several lists carry a fused score; the others
+        keep their similarity.
+        """
+        known = [score for score in scores if score is not None]
+        if not known:
+            return scores
+        low, high = min(known), max(known)
+        span = high - low
+        return [
+            None if score is None else (score - low) / span if span > 0 else 1.0
+            for score in scores
+        ]
+
+    @staticmethod
+    def _pairwise_similarity(
+        vectors: list[list[float] | None] | None,
+        token_sets: list[set[str]],
+    ) -> np.ndarray:
+        """
+        Compute the pairwise similarity of ranked results.
+
+        Uses cosine similarity of the embeddings when every result has one,
+        otherwise Jaccard similarity of the token sets. Both are computed with
+        a single matrix product.
+        """
+        if (
+            vectors
+            and all(vector is not None for vector in vectors)
+            and len({len(vector) for vector in vectors}) == 1
+        ):
+            normalized = SimilarityMatrix(vectors).normalized
+            return normalized @ normalized.T
+
+        vocabulary: dict[str, int] = {}
+        incidence_rows = [
+            [vocabulary.setdefault(token, len(vocabulary)) for token in tokens]
+            for tokens in token_sets
+        ]
+        incidence = np.zeros((len(token_sets), len(vocabulary)), dtype=np.float32)
+        for row, columns in enumerate(incidence_rows):
+            incidence[row, columns] = 1.0
+
+        intersection = incidence @ incidence.T
+        sizes = incidence.sum(axis=1)
+        union = sizes[:, None] + sizes[None, :] - intersection
+        return np.divide(
+            intersection,
+            union,
+            out=np.zeros_like(intersection),
+            where=union > 0,
+        )
 
     def _calculate_relevance_score(
         self,
         result: dict[str, Any],
         request: RAGRequest,
+        query_terms: set[str] | None = None,
+        content_terms: set[str] | None = None,
     ) -> float:
         """Calculate relevance score for a result."""
         # Simple relevance calculation based on query overlap
-        query_terms = set(request.query.lower().split())
-        content_terms = set(result.get("content", "").lower().split())
+        if query_terms is None:
+            query_terms = set(request.query.lower().split())
+        if content_terms is None:
+            content_terms = set(result.get("content", "").lower().split())
 
         if not query_terms:
             return 0.0
@@ -471,40 +792,6 @@ class RAGService:
 
         return authority_sources.get(source.lower(), 0.5)
 
-    def _calculate_diversity_penalty(
-        self,
-        result: RAGResult,
-        all_results: list[RAGResult],
-    ) -> float:
-        """Calculate diversity penalty for result."""
-        # Simplified diversity penalty
-        similar_results = 0
-        for other_result in all_results:
-            if other_result != result:
-                # Check for content similarity
-                content_similarity = self._calculate_content_similarity(
-                    result.content,
-                    other_result.content,
-                )
-                if content_similarity > 0.7:
-                    similar_results += 1
-
-        return min(1.0, similar_results * 0.1)
-
-    def _calculate_content_similarity(self, content1: str, content2: str) -> float:
-        """Calculate similarity between two content pieces."""
-        # Simple Jaccard similarity
-        words1 = set(content1.lower().split())
-        words2 = set(content2.lower().split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-
-        return intersection / union if union > 0 else 0.0
-
     def _format_knowledge_results(
         self,
         results: list[dict[str, Any]],
@@ -515,11 +802,12 @@ class RAGService:
                 "content": result.get("content", ""),
                 "source": "knowledge_base",
                 "source_type": "document",
-                "source_id": result.get("id", ""),
+                "source_id": result.get("doc_id") or result.get("id", ""),
                 "similarity_score": result.get("score", 0.0),
                 "chunk_index": result.get("chunk_index"),
                 "created_at": result.get("created_at"),
                 "metadata": result.get("metadata", {}),
+                "vector": result.get("vector"),
             }
             for result in results
         ]
@@ -538,6 +826,7 @@ class RAGService:
                 "similarity_score": result.get("score", 0.0),
                 "created_at": result.get("created_at"),
                 "metadata": result.get("metadata", {}),
+                "vector": result.get("vector"),
             }
             for result in results
         ]
@@ -590,6 +879,63 @@ class RAGService:
         except Exception as e:
             logger.warning(f"Failed to cache result: {e}")
 
+    def _create_semantic_cache_scope(
+        self,
+        request: RAGRequest,
+        config: RAGConfig,
+    ) -> str:
+        """Create the semantic cache scope for a request's config and user."""
+        scope_data = {
+            "user_id": request.user_id,
+            "conversation_id": request.conversation_id,
+            "config_hash": hashlib.md5(
+                config.json().encode(), usedforsecurity=False
+            ).hexdigest()[:8],
+        }
+        return hashlib.md5(
+            json.dumps(scope_data, sort_keys=True).encode(), usedforsecurity=False
+        ).hexdigest()
+
+    async def _embed_query(self, query: str) -> list[float] | None:
+        """Embed a query for the semantic cache."""
+        embedding_batch = await embedding_service.generate_embedding_batch([query])
+        return embedding_batch.get_vector(0) if len(embedding_batch.texts) else None
+
+    def _get_semantic_cached_result(
+        self,
+        scope: str,
+        query_embedding: list[float] | None,
+        request: RAGRequest,
+        config: RAGConfig,
+        request_id: str,
+    ) -> RAGResponse | None:
+        """Get a cached RAG result for a semantically similar query."""
+        if not query_embedding:
+            return None
+
+        hit = self.semantic_cache.lookup(
+            scope,
+            query_embedding,
+            config.semantic_cache_threshold,
+        )
+        if hit is None:
+            return None
+
+        cached_response, similarity = hit
+        return cached_response.model_copy(
+            update={
+                "query": request.query,
+                "cached": True,
+                "cache_hit": True,
+                "metadata": {
+                    **cached_response.metadata,
+                    "request_id": request_id,
+                    "cached_query": cached_response.query,
+                    "semantic_cache_similarity": similarity,
+                },
+            },
+        )
+
     def _validate_request(self, request: RAGRequest, config: RAGConfig) -> None:
         """Validate RAG request."""
         if not request.query.strip():
@@ -632,20 +978,23 @@ class RAGService:
                     + response.processing_time
                 ) / self.metrics.successful_requests
 
-                # Update quality metrics
+                # Update quality metrics; keyword-only hits have no similarity
+                similarities = [
+                    r.similarity_score
+                    for r in response.results
+                    if r.similarity_score is not None
+                ]
+                if similarities:
+                    self.metrics.avg_similarity_score = (
+                        self.metrics.avg_similarity_score
+                        * (self.metrics.successful_requests - 1)
+                        + sum(similarities) / len(similarities)
+                    ) / self.metrics.successful_requests
                 if response.results:
-                    avg_similarity = sum(
-                        r.similarity_score for r in response.results
-                    ) / len(response.results)
                     avg_relevance = sum(
                         r.relevance_score for r in response.results
                     ) / len(response.results)
 
-                    self.metrics.avg_similarity_score = (
-                        self.metrics.avg_similarity_score
-                        * (self.metrics.successful_requests - 1)
-                        + avg_similarity
-                    ) / self.metrics.successful_requests
                     self.metrics.avg_relevance_score = (
                         self.metrics.avg_relevance_score
                         * (self.metrics.successful_requests - 1)
@@ -739,33 +1088,71 @@ class RAGService:
             "has_specific_terms": has_specific_terms,
         }
 
+    @staticmethod
+    def _result_identity(result: dict[str, Any]) -> str:
+        """Identify a retrieved item across sub-queries."""
+        source_id = result.get("source_id")
+        if source_id:
+            return (
+                f"{result.get('source_type')}:{source_id}:{result.get('chunk_index')}"
+            )
+        return hashlib.md5(
+            result.get("content", "").encode(), usedforsecurity=False
+        ).hexdigest()
+
     def _combine_results(
         self,
-        results1: list[dict[str, Any]],
-        results2: list[dict[str, Any]],
+        *result_lists: list[dict[str, Any]],
+        rank_constant: int = 60,
     ) -> list[dict[str, Any]]:
-        """Combine and deduplicate results from different retrieval methods."""
-        combined = results1 + results2
-
-        # Simple deduplication based on content similarity
-        deduplicated = []
-        for result in combined:
-            is_duplicate = False
-            for existing in deduplicated:
-                if (
-                    self._calculate_content_similarity(
-                        result.get("content", ""),
-                        existing.get("content", ""),
-                    )
-                    > 0.8
-                ):
-                    is_duplicate = True
-                    break
+        """
+        Merge ranked result lists with reciprocal-rank fusion.
+
+        Each item scores ``sum(1 / (k + rank))`` over the lists it appears
+        in; duplicates collapse into one item keeping the best similarity and
+        keyword score. A single non-empty list is only deduplicated, keeping
+        its order and scores.
 
-            if not is_duplicate:
-                deduplicated.append(result)
+        Args:
+            result_lists: Ranked result lists, one per sub-query
+            rank_constant: RRF constant k
 
-        return deduplicated
+        Returns:
+            Deduplicated results ordered by fused score
+        """
+        fuse = sum(1 for results in result_lists if results) > 1
+        fused: dict[str, dict[str, Any]] = {}
+
+        for results in result_lists:
+            for rank, result in enumerate(results, start=1):
+                key = self._result_identity(result)
+                contribution = 1.0 / (rank_constant + rank)
+                existing = fused.get(key)
+                if existing is None:
+                    fused[key] = (
+                        {**result, "fusion_score": contribution} if fuse else {**result}
+                    )
+                    continue
+
+                if fuse:
+                    existing["fusion_score"] += contribution
+                for score_key in ("similarity_score", "keyword_score"):
+                    scores = [
+                        score
+                        for score in (existing.get(score_key), result.get(score_key))
+                        if score is not None
+                    ]
+                    existing[score_key] = max(scores) if scores else None
+                if existing.get("vector") is None:
+                    existing["vector"] = result.get("vector")
+
+        if not fuse:
+            return list(fused.values())
+        return sorted(
+            fused.values(),
+            key=lambda item: item["fusion_score"],
+            reverse=True,
+        )
 
     async def get_metrics(self) -> RAGMetrics:
         """Get current RAG metrics."""
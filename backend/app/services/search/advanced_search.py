@@ -23,7 +23,7 @@ from sqlalchemy.orm import Session
 from backend.app.core.config import get_settings
 from backend.app.models.knowledge import Document, DocumentChunk, SearchQuery, Tag
 from backend.app.services.ai_service import AIService
-from backend.app.services.weaviate_service import WeaviateService
+from backend.app.services.weaviate_service import async_weaviate_service
 
 
 class SearchType(Enum):
@@ -94,7 +94,7 @@ class AdvancedSearchService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.weaviate_service = WeaviateService()
+        self.weaviate_service = async_weaviate_service
         self.ai_service = AIService()
         self.settings = get_settings()
 
@@ -271,7 +271,59 @@ class AdvancedSearchService:
     async def _full_text_search(
         self, parsed_query: dict[str, Any], filters: dict[str, Any], user_id: str
     ) -> list[SearchResult]:
-        """Perform full-text search using database."""
+        """Perform full-text search using the BM25 keyword index."""
+        if self.weaviate_service.client is None:
+            # Keyword index unavailable, fall back to scanning chunk text
+            return await self._sql_text_search(parsed_query, filters, user_id)
+
+        query_text = " ".join(parsed_query["terms"] + parsed_query["phrases"])
+        if not query_text:
+            return []
+
+        keyword_results = await self.weaviate_service.keyword_search_knowledge(
+            query=query_text,
+            limit=self.max_results,
+            filters=self._convert_filters_for_weaviate(filters, user_id),
+        )
+
+        # BM25 scores are unbounded; scale to the best hit of this query
+        scores = {
+            r["chunk_id"]: r.get("score") or 0.0
+            for r in keyword_results
+            if r.get("chunk_id")
+        }
+        top_score = max(scores.values(), default=0.0)
+        if top_score <= 0:
+            return []
+
+        # Load the matching chunks in one query, re-checking ownership and
+        # the filters the index does not carry
+        query = (
+            self.db.query(DocumentChunk)
+            .join(Document)
+            .filter(Document.user_id == user_id, DocumentChunk.id.in_(scores))
+        )
+        query = self._apply_sql_filters(query, filters)
+
+        phrases = [phrase.lower() for phrase in parsed_query["phrases"]]
+        results = []
+        for chunk in query.all():
+            # BM25 matches terms independently; quoted phrases must appear as-is
+            content_lower = chunk.content.lower()
+            if any(phrase not in content_lower for phrase in phrases):
+                continue
+
+            score = scores[str(chunk.id)] / top_score
+            if score >= self.min_score_threshold:
+                results.append(self._chunk_result(chunk, score))
+
+        results.sort(key=lambda x: x.score, reverse=True)
+        return results
+
+    async def _sql_text_search(
+        self, parsed_query: dict[str, Any], filters: dict[str, Any], user_id: str
+    ) -> list[SearchResult]:
+        """Perform full-text search by scanning chunk text in the database."""
         results = []
 
         # Build SQL query
@@ -333,7 +385,7 @@ class AdvancedSearchService:
                 return []
 
             # Search in Weaviate
-            weaviate_results = self.weaviate_service.search_similar(
+            weaviate_results = await self.weaviate_service.search_similar(
                 query_embedding=query_embedding,
                 limit=self.max_results,
                 filters=self._convert_filters_for_weaviate(filters, user_id),
@@ -482,6 +534,23 @@ class AdvancedSearchService:
 
         return results
 
+    def _chunk_result(self, chunk: DocumentChunk, score: float) -> SearchResult:
+        """Build a search result for a document chunk."""
+        return SearchResult(
+            document_id=str(chunk.document_id),
+            chunk_id=str(chunk.id),
+            content=chunk.content,
+            score=score,
+            highlights=[],
+            metadata={
+                "chunk_index": chunk.chunk_index,
+                "chunk_type": chunk.chunk_type,
+                "page_number": chunk.page_number,
+                "section_title": chunk.section_title,
+            },
+            document_info=self._get_document_info(chunk.document),
+        )
+
     def _apply_sql_filters(self, query, filters: dict[str, Any]):
         """Apply filters to SQL query."""
         for field, value in filters.items():
@@ -0,0 +1,419 @@
+"""
+Semantic cache for RAG responses.
+
+Responses are keyed by the embedding of the query that produced them, so a
+paraphrased question within a similarity threshold reuses the cached result.
+Entries are grouped by scope (configuration, user and conversation); each
+scope holds a small flat index of normalized query vectors searched with one
+matrix-vector product. A reverse index from document id to entries lets
+reprocessed or deleted documents invalidate every response that cited them.
+
+Each worker holds its own cache. Invalidations are applied locally at once
+and published on a Redis channel so that every other worker drops the
+responses built from the changed documents as well.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import redis
+from redis import asyncio as aioredis
+
+from backend.app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Rows allocated for a new scope; doubled as the scope fills up
+_INITIAL_ROWS = 8
+
+
+@dataclass
+class _Entry:
+    """A cached response and the documents it was built from."""
+
+    slot: int
+    response: Any
+    document_ids: frozenset[str]
+    expires_at: float
+
+
+@dataclass
+class _ScopeIndex:
+    """Flat vector index over the cached queries of one scope."""
+
+    vectors: np.ndarray
+    capacity: int
+    entries: dict[int, _Entry] = field(default_factory=dict)
+    # slot -> None, least recently used first
+    lru: OrderedDict[int, None] = field(default_factory=OrderedDict)
+    free: list[int] = field(default_factory=list)
+
+    @classmethod
+    def create(cls, capacity: int, dimension: int) -> "_ScopeIndex":
+        # Most scopes hold a few queries; rows are added on demand
+        rows = min(capacity, _INITIAL_ROWS)
+        return cls(
+            vectors=np.zeros((rows, dimension), dtype=np.float32),
+            capacity=capacity,
+            free=list(range(rows - 1, -1, -1)),
+        )
+
+    @property
+    def dimension(self) -> int:
+        return self.vectors.shape[1]
+
+    def take_slot(self) -> int | None:
+        """Take a free slot, growing the index up to its capacity."""
+        if not self.free:
+            rows = self.vectors.shape[0]
+            if rows >= self.capacity:
+                return None
+            grown = min(self.capacity, rows * 2)
+            vectors = np.zeros((grown, self.dimension), dtype=np.float32)
+            vectors[:rows] = self.vectors
+            self.vectors = vectors
+            self.free = list(range(grown - 1, rows - 1, -1))
+        return self.free.pop()
+
+
+class SemanticResponseCache:
+    """Embedding-keyed response cache with document-based invalidation."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_scopes: int | None = None,
+        ttl_seconds: int | None = None,
+        channel: str | None = None,
+    ):
+        settings = get_settings()
+        kb_settings = settings.knowledge_base
+
+        self.max_entries = max_entries or kb_settings.rag_semantic_cache_max_entries
+        self.max_scopes = max_scopes or kb_settings.rag_semantic_cache_max_scopes
+        self.ttl_seconds = ttl_seconds or kb_settings.rag_semantic_cache_ttl_seconds
+        self.channel = channel or kb_settings.rag_semantic_cache_channel
+        self.redis_url = settings.redis.redis_url
+        self.redis_db = settings.redis.redis_db
+        self.worker_id = uuid.uuid4().hex
+
+        self._scopes: OrderedDict[str, _ScopeIndex] = OrderedDict()
+        # document id -> {(scope, slot)}
+        self._by_document: dict[str, set[tuple[str, int]]] = {}
+
+        # Invalidations are published with a sync client, so that background
+        # jobs running their own event loop in a thread can publish too
+        self._publisher: redis.Redis | None = None
+        self._redis: aioredis.Redis | None = None
+        self._pubsub: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def __len__(self) -> int:
+        return sum(len(index.entries) for index in self._scopes.values())
+
+    @staticmethod
+    def _normalize(vector: list[float] | np.ndarray) -> np.ndarray | None:
+        query = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(query))
+        if query.size == 0 or norm == 0.0:
+            return None
+        return query / norm
+
+    def lookup(
+        self,
+        scope: str,
+        vector: list[float] | np.ndarray,
+        threshold: float,
+    ) -> tuple[Any, float] | None:
+        """
+        Find the cached response of the most similar query in a scope.
+
+        Args:
+            scope: Cache scope key
+            vector: Query embedding
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            The cached response and its similarity, or None on a miss
+        """
+        index = self._scopes.get(scope)
+        query = self._normalize(vector)
+        if (
+            index is None
+            or query is None
+            or not index.entries
+            or index.dimension != query.shape[0]
+        ):
+            self.stats["misses"] += 1
+            return None
+
+        self._scopes.move_to_end(scope)
+        now = time.monotonic()
+        for slot in [s for s, e in index.entries.items() if e.expires_at <= now]:
+            self._remove(scope, slot)
+            self.stats["expirations"] += 1
+
+        slots = np.fromiter(index.entries, dtype=np.intp, count=len(index.entries))
+        if slots.size == 0:
+            self.stats["misses"] += 1
+            return None
+
+        similarities = index.vectors[slots] @ query
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < threshold:
+            self.stats["misses"] += 1
+            return None
+
+        slot = int(slots[best])
+        index.lru.move_to_end(slot)
+        self.stats["hits"] += 1
+        return index.entries[slot].response, similarity
+
+    def store(
+        self,
+        scope: str,
+        vector: list[float] | np.ndarray,
+        response: Any,
+        document_ids: Iterable[str],
+    ) -> None:
+        """
+        Cache a response under its query embedding.
+
+        Args:
+            scope: Cache scope key
+            vector: Query embedding
+            response: Response to cache
+            document_ids: Documents the response was built from
+        """
+        query = self._normalize(vector)
+        if query is None:
+            return
+
+        index = self._scopes.get(scope)
+        if index is not None and index.dimension != query.shape[0]:
+            # Embedding model changed; older queries are no longer comparable
+            self._drop_scope(scope)
+            index = None
+        if index is None:
+            index = self._scopes[scope] = _ScopeIndex.create(
+                self.max_entries,
+                query.shape[0],
+            )
+            while len(self._scopes) > self.max_scopes:
+                self._drop_scope(next(iter(self._scopes)))
+        self._scopes.move_to_end(scope)
+
+        slot = index.take_slot()
+        if slot is None:
+            self._remove(scope, next(iter(index.lru)))
+            self.stats["evictions"] += 1
+            slot = index.free.pop()
+
+        entry = _Entry(
+            slot=slot,
+            response=response,
+            document_ids=frozenset(doc_id for doc_id in document_ids if doc_id),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        index.vectors[slot] = query
+        index.entries[slot] = entry
+        index.lru[slot] = None
+        for doc_id in entry.document_ids:
+            self._by_document.setdefault(doc_id, set()).add((scope, slot))
+
+    def invalidate_documents(self, document_ids: Iterable[str]) -> int:
+        """
+        Drop every cached response built from any of the given documents,
+        on all workers.
+
+        Args:
+            document_ids: Reprocessed or deleted document ids
+
+        Returns:
+            Number of responses removed from this worker's cache
+        """
+        document_ids = [str(doc_id) for doc_id in document_ids]
+        removed = self._drop_documents(document_ids)
+        if document_ids:
+            self._publish_soon({"document_ids": document_ids})
+        return removed
+
+    def apply(self, event: dict[str, Any]) -> None:
+        """Apply an invalidation received from another worker."""
+        document_ids = event.get("document_ids")
+        if isinstance(document_ids, list):
+            self._drop_documents(str(doc_id) for doc_id in document_ids)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._scopes.clear()
+        self._by_document.clear()
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get cache counters."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups > 0 else 0.0,
+            "entries": len(self),
+            "scopes": len(self._scopes),
+        }
+
+    async def start(self) -> None:
+        """Subscribe to invalidations published by other workers."""
+        if self._listener is not None:
+            return
+        try:
+            self._publisher = redis.Redis.from_url(
+                self.redis_url,
+                db=self.redis_db,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+            self._redis = aioredis.Redis.from_url(
+                self.redis_url,
+                db=self.redis_db,
+                decode_responses=True,
+                socket_connect_timeout=2,
+            )
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(self.channel)
+        except (redis.RedisError, OSError, ValueError) as e:
+            # Other workers keep serving responses of changed documents until
+            # they expire
+            logger.warning(f"Semantic cache invalidation channel unavailable: {e}")
+            self._publisher = None
+            self._redis = None
+            self._pubsub = None
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"Semantic cache listening on {self.channel}")
+
+    async def stop(self) -> None:
+        """Stop the listener and close the Redis connections."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._pubsub is not None:
+            with contextlib.suppress(Exception):
+                await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis is not None:
+            with contextlib.suppress(Exception):
+                await self._redis.aclose()
+            self._redis = None
+        if self._publisher is not None:
+            with contextlib.suppress(Exception):
+                self._publisher.close()
+            self._publisher = None
+        self._loop = None
+
+    def _publish(self, payload: str) -> None:
+        try:
+            self._publisher.publish(self.channel, payload)
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"Semantic cache invalidation publish failed: {e}")
+
+    def _publish_soon(self, event: dict[str, Any]) -> None:
+        if self._publisher is None:
+            return
+        payload = json.dumps({**event, "origin": self.worker_id})
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or loop is not self._loop:
+            # Background jobs run outside the server's event loop, so their
+            # thread can block on the publish
+            self._publish(payload)
+            return
+        task = loop.create_task(asyncio.to_thread(self._publish, payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Semantic cache listener error: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if not message or message.get("type") != "message":
+                continue
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            # Invalidations from this worker were applied when published
+            if event.get("origin") == self.worker_id:
+                continue
+            self.apply(event)
+
+    def _drop_documents(self, document_ids: Iterable[str]) -> int:
+        removed = 0
+        for doc_id in document_ids:
+            for scope, slot in list(self._by_document.get(doc_id, ())):
+                self._remove(scope, slot)
+                removed += 1
+        if removed:
+            self.stats["invalidations"] += removed
+            logger.debug(f"Invalidated {removed} cached RAG responses")
+        return removed
+
+    def _remove(self, scope: str, slot: int) -> None:
+        index = self._scopes.get(scope)
+        if index is None:
+            return
+        entry = index.entries.pop(slot, None)
+        if entry is None:
+            return
+        index.lru.pop(slot, None)
+        index.free.append(slot)
+        for doc_id in entry.document_ids:
+            refs = self._by_document.get(doc_id)
+            if refs is not None:
+                refs.discard((scope, slot))
+                if not refs:
+                    del self._by_document[doc_id]
+
+    def _drop_scope(self, scope: str) -> None:
+        index = self._scopes.get(scope)
+        if index is None:
+            return
+        for slot in list(index.entries):
+            self._remove(scope, slot)
+        del self._scopes[scope]
+
+
+# Global semantic cache for RAG responses
+rag_response_cache = SemanticResponseCache()
@@ -8,6 +8,8 @@ from sqlalchemy import and_, or_
 from sqlalchemy.orm import joinedload
 
 from backend.app.core.database import get_db
+from backend.app.core.permission_matrix import permission_matrix
+from backend.app.core.principal_cache import principal_cache
 from backend.app.core.security import get_password_hash, verify_password
 from backend.app.models.user import AuthProvider, User, UserGroup, UserRole, UserStatus
 from backend.app.schemas.user import (
@@ -203,6 +205,7 @@ class UserService:
         user.updated_at = datetime.now(UTC)
         self.db.commit()
         self.db.refresh(user)
+        principal_cache.invalidate_user(str(user.id))
 
         return user
 
@@ -222,6 +225,7 @@ class UserService:
 
         self.db.delete(user)
         self.db.commit()
+        principal_cache.invalidate_user(user_id)
         return True
 
     def list_users(
@@ -316,6 +320,7 @@ class UserService:
         # Apply updates
         update_data = bulk_data.dict(exclude_unset=True, exclude={"user_ids"})
         updated_count = 0
+        updated_ids = []
 
         for user in users:
             # Check if current user can manage this user
@@ -328,6 +333,7 @@ class UserService:
 
             user.updated_at = datetime.now(UTC)
             updated_count += 1
+            updated_ids.append(str(user.id))
 
         # Handle group assignments
         if bulk_data.group_ids is not None:
@@ -336,6 +342,8 @@ class UserService:
                     self.assign_user_to_groups(user.id, bulk_data.group_ids)
 
         self.db.commit()
+        for user_id in updated_ids:
+            principal_cache.invalidate_user(user_id)
         return updated_count
 
     # User authentication and security
@@ -507,6 +515,9 @@ class UserService:
         group.updated_at = datetime.now(UTC)
         self.db.commit()
         self.db.refresh(group)
+        permission_matrix.invalidate_group(group.id)
+        for user in group.users:
+            principal_cache.invalidate_user(str(user.id))
 
         return group
 
@@ -523,8 +534,12 @@ class UserService:
         if group.is_system:
             raise PermissionDeniedError
 
+        member_ids = [str(user.id) for user in group.users]
         self.db.delete(group)
         self.db.commit()
+        permission_matrix.invalidate_group(group_id)
+        for user_id in member_ids:
+            principal_cache.invalidate_user(user_id)
         return True
 
     def list_groups(
@@ -555,6 +570,7 @@ class UserService:
         # Clear existing group assignments and add new ones
         user.groups = groups
         self.db.commit()
+        principal_cache.invalidate_user(str(user.id))
 
         return True
 
@@ -574,17 +590,19 @@ class UserService:
             .all()
         )
 
-        updated_count = 0
+        updated_ids = []
         for user in users:
             if self._can_manage_user(current_user, user):
                 if assignment.operation == "add":
                     user.groups.extend([g for g in groups if g not in user.groups])
                 elif assignment.operation == "remove":
                     user.groups = [g for g in user.groups if g not in groups]
-                updated_count += 1
+                updated_ids.append(str(user.id))
 
         self.db.commit()
-        return updated_count
+        for user_id in updated_ids:
+            principal_cache.invalidate_user(user_id)
+        return len(updated_ids)
 
     # User statistics
     def get_user_stats(
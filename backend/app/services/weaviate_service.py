@@ -3,20 +3,50 @@ Weaviate service for semantic search and RAG.
 
 This module provides integration with Weaviate for:
 - Semantic search in chat conversations
+- BM25 keyword search over knowledge chunks
 - Retrieval-Augmented Generation (RAG) for external knowledge
 """
 
+import asyncio
+import functools
 import logging
 import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 
 from loguru import logger
 import weaviate
-from weaviate.classes.init import Auth
-from weaviate.classes.query import Filter
+from weaviate.classes.init import AdditionalConfig, Auth, Timeout
+from weaviate.classes.query import Filter, MetadataQuery
+from weaviate.util import generate_uuid5
+
+from backend.app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Chunk metadata fields stored as top-level properties so they can be filtered
+_CHUNK_FILTER_PROPERTIES = ("user_id", "document_type", "language", "year")
+
+
+@dataclass
+class BatchIngestResult:
+    """Outcome of a batch ingestion into Weaviate."""
+
+    total: int = 0
+    failed: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        """Number of objects stored successfully."""
+        return self.total - len(self.failed)
+
+    @property
+    def failed_uuids(self) -> set[str]:
+        """UUIDs of objects that could not be stored."""
+        return {item["uuid"] for item in self.failed}
+
 
 class WeaviateService:
     """Service for Weaviate semantic search and RAG."""
@@ -24,6 +54,13 @@ class WeaviateService:
     def __init__(self):
         self.url = os.getenv("WEAVIATE_URL", "http://localhost:8080")
         self.api_key = os.getenv("WEAVIATE_API_KEY")
+        weaviate_settings = get_settings().weaviate
+        self.batch_size = weaviate_settings.weaviate_batch_size
+        self.batch_concurrent_requests = (
+            weaviate_settings.weaviate_batch_concurrent_requests
+        )
+        self.query_timeout = weaviate_settings.weaviate_query_timeout_seconds
+        self.insert_timeout = weaviate_settings.weaviate_insert_timeout_seconds
         self.client = self._init_client()
 
     def _parse_host_port(self) -> tuple[str, int]:
@@ -48,14 +85,25 @@ class WeaviateService:
                 return None
 
             host, port = self._parse_host_port()
+            additional_config = AdditionalConfig(
+                timeout=Timeout(
+                    query=self.query_timeout,
+                    insert=self.insert_timeout,
+                ),
+            )
             if self.api_key:
                 client = weaviate.connect_to_local(
                     host=host,
                     port=port,
                     auth_credentials=Auth.api_key(self.api_key),
+                    additional_config=additional_config,
                 )
             else:
-                client = weaviate.connect_to_local(host=host, port=port)
+                client = weaviate.connect_to_local(
+                    host=host,
+                    port=port,
+                    additional_config=additional_config,
+                )
 
             # Probe readiness
             client.is_ready()
@@ -82,6 +130,126 @@ class WeaviateService:
             logger.error(f"Weaviate health check failed (unexpected error): {e}")
             return False
 
+    @staticmethod
+    def object_uuid(*parts: Any) -> str:
+        """
+        Build a deterministic UUID for an object.
+
+        Re-ingesting the same logical object yields the same UUID, so retried
+        batches overwrite instead of duplicating.
+        """
+        return generate_uuid5(":".join(str(part) for part in parts))
+
+    def batch_insert(
+        self,
+        collection_name: str,
+        objects: list[dict[str, Any]],
+        batch_size: int | None = None,
+        concurrent_requests: int | None = None,
+    ) -> BatchIngestResult:
+        """
+        Insert objects into a collection using the v4 client's batching.
+
+        Args:
+            collection_name: Target collection
+            objects: Dicts with ``properties``, ``uuid`` and optional ``vector``
+            batch_size: Objects per request; 0 selects dynamic sizing
+            concurrent_requests: Requests in flight for fixed-size batching
+
+        Returns:
+            Batch result with per-object errors
+        """
+        result = BatchIngestResult(total=len(objects))
+        if not objects:
+            return result
+
+        if not self.client:
+            logger.warning("Weaviate client not available")
+            result.failed = [
+                {"uuid": str(obj["uuid"]), "error": "Weaviate client not available"}
+                for obj in objects
+            ]
+            return result
+
+        batch_size = self.batch_size if batch_size is None else batch_size
+        concurrent_requests = concurrent_requests or self.batch_concurrent_requests
+
+        try:
+            coll = self.client.collections.get(collection_name)
+            batch_context = (
+                coll.batch.fixed_size(
+                    batch_size=batch_size,
+                    concurrent_requests=concurrent_requests,
+                )
+                if batch_size
+                else coll.batch.dynamic()
+            )
+            with batch_context as batch:
+                for obj in objects:
+                    batch.add_object(
+                        properties=obj["properties"],
+                        uuid=obj["uuid"],
+                        vector=obj.get("vector"),
+                    )
+
+            result.failed = [
+                {
+                    "uuid": str(error.object_.uuid),
+                    "error": error.message,
+                }
+                for error in coll.batch.failed_objects
+            ]
+        except (ConnectionError, TimeoutError) as e:  # noqa: PT011
+            logger.error(f"Batch insert failed (connection error): {e}")
+            result.failed = [
+                {"uuid": str(obj["uuid"]), "error": str(e)} for obj in objects
+            ]
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Batch insert failed (unexpected error): {e}")
+            result.failed = [
+                {"uuid": str(obj["uuid"]), "error": str(e)} for obj in objects
+            ]
+
+        if result.failed:
+            logger.warning(
+                f"Batch insert into {collection_name}: "
+                f"{len(result.failed)} of {result.total} objects failed",
+            )
+        else:
+            logger.info(f"Batch inserted {result.total} objects into {collection_name}")
+        return result
+
+    def index_messages(
+        self,
+        messages: list[dict[str, Any]],
+        batch_size: int | None = None,
+    ) -> BatchIngestResult:
+        """
+        Index chat messages in Weaviate in batches (v4).
+
+        Args:
+            messages: Dicts with conversation_id, message_id, content, role
+                and optional metadata
+            batch_size: Override the configured batch size
+
+        Returns:
+            Batch result with per-object errors
+        """
+        objects = [
+            {
+                "properties": {
+                    "conversation_id": message["conversation_id"],
+                    "message_id": message["message_id"],
+                    "content": message["content"],
+                    "role": message["role"],
+                    "metadata": message.get("metadata") or {},
+                },
+                "uuid": message["message_id"],
+            }
+            for message in messages
+        ]
+        return self.batch_insert("ChatMessage", objects, batch_size=batch_size)
+
     def index_message(
         self,
         conversation_id: str,
@@ -91,30 +259,169 @@ class WeaviateService:
         metadata: dict[str, Any] | None = None,
     ) -> None:
         """Index a chat message in Weaviate (v4)."""
+        self.index_messages(
+            [
+                {
+                    "conversation_id": conversation_id,
+                    "message_id": message_id,
+                    "content": content,
+                    "role": role,
+                    "metadata": metadata,
+                },
+            ],
+        )
+
+    def add_document_chunks(
+        self,
+        document_id: str,
+        chunks: list[dict[str, Any]],
+        batch_size: int | None = None,
+    ) -> BatchIngestResult:
+        """
+        Index the chunks of a document in Weaviate in batches (v4).
+
+        Object UUIDs are derived from the document ID and chunk index, so
+        reprocessing a document overwrites its chunks in place.
+
+        Args:
+            document_id: Owning document ID
+            chunks: Dicts with chunk_id, chunk_index, content, embedding and
+                optional metadata
+            batch_size: Override the configured batch size
+
+        Returns:
+            Batch result with per-object errors
+        """
+        objects = []
+        for chunk in chunks:
+            metadata = chunk.get("metadata") or {}
+            properties = {
+                "doc_id": document_id,
+                "chunk_id": chunk["chunk_id"],
+                "chunk_index": chunk["chunk_index"],
+                "content": chunk["content"],
+                "source": metadata.get("title", ""),
+                "metadata": metadata,
+            }
+            for name in _CHUNK_FILTER_PROPERTIES:
+                if metadata.get(name) is not None:
+                    properties[name] = metadata[name]
+            objects.append(
+                {
+                    "properties": properties,
+                    "uuid": self.object_uuid(document_id, chunk["chunk_index"]),
+                    "vector": chunk.get("embedding"),
+                },
+            )
+        return self.batch_insert("Knowledge", objects, batch_size=batch_size)
+
+    def delete_document_chunks(self, document_id: str) -> int:
+        """
+        Delete every chunk of a document from Weaviate (v4).
+
+        Args:
+            document_id: Owning document ID
+
+        Returns:
+            Number of chunks deleted
+        """
         try:
             if not self.client:
                 logger.warning("Weaviate client not available")
-                return
+                return 0
 
-            obj = {
-                "conversation_id": conversation_id,
-                "message_id": message_id,
-                "content": content,
-                "role": role,
-                "metadata": metadata or {},
-            }
+            result = self.client.collections.get("Knowledge").data.delete_many(
+                where=Filter.by_property("doc_id").equal(document_id),
+            )
+            deleted = getattr(result, "successful", 0)
+            logger.info(f"Deleted {deleted} chunks of document {document_id}")
+            return deleted
+        except (ConnectionError, TimeoutError) as e:  # noqa: PT011
+            logger.error(f"Failed to delete document chunks (connection error): {e}")
+            return 0
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Failed to delete document chunks (unexpected error): {e}")
+            return 0
 
-            self.client.collections.get("ChatMessage").data.insert(
-                properties=obj,
-                uuid=message_id,
+    @staticmethod
+    def _build_filter(filters: dict[str, Any] | None) -> Any:
+        """Build a v4 filter from simple property equality filters."""
+        conditions = [
+            Filter.by_property(name).equal(value)
+            for name, value in (filters or {}).items()
+            if value is not None and not isinstance(value, dict | list)
+        ]
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else Filter.all_of(conditions)
+
+    @staticmethod
+    def _chunk_properties(obj: Any) -> dict[str, Any]:
+        """Extract the stored properties of a document chunk object."""
+        props = getattr(obj, "properties", {}) or {}
+        return {
+            "chunk_id": props.get("chunk_id"),
+            "doc_id": props.get("doc_id"),
+            "chunk_index": props.get("chunk_index"),
+            "content": props.get("content"),
+            "source": props.get("source"),
+            "metadata": props.get("metadata", {}),
+        }
+
+    @staticmethod
+    def _object_vector(obj: Any) -> list[float] | None:
+        """Get the default vector of an object queried with include_vector."""
+        vector = getattr(obj, "vector", None) or {}
+        return vector.get("default") if isinstance(vector, dict) else vector
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 10,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Vector search over document chunks (v4).
+
+        Args:
+            query_embedding: Query embedding vector
+            limit: Maximum number of results
+            filters: Property equality filters (e.g. user_id)
+
+        Returns:
+            Chunks with similarity score and stored vector
+        """
+        try:
+            if not self.client:
+                logger.warning("Weaviate client not available")
+                return []
+
+            coll = self.client.collections.get("Knowledge")
+            result = coll.query.near_vector(
+                near_vector=query_embedding,
+                limit=limit,
+                filters=self._build_filter(filters),
+                include_vector=True,
+                return_metadata=MetadataQuery(distance=True),
             )
-            logger.info(f"Indexed message {message_id} in Weaviate")
+
+            items: list[dict[str, Any]] = []
+            for o in getattr(result, "objects", []) or []:
+                distance = getattr(getattr(o, "metadata", None), "distance", None)
+                items.append(
+                    {
+                        **self._chunk_properties(o),
+                        "score": 1.0 - distance if distance is not None else None,
+                        "vector": self._object_vector(o),
+                    }
+                )
+            return items
         except (ConnectionError, TimeoutError) as e:  # noqa: PT011
-            logger.error(f"Failed to index message (connection error): {e}")
-        except ValueError as e:
-            logger.error(f"Failed to index message (invalid data): {e}")
+            logger.error(f"Vector search failed (connection error): {e}")
+            return []
         except Exception as e:  # noqa: BLE001
-            logger.error(f"Failed to index message (unexpected error): {e}")
+            logger.error(f"Vector search failed (unexpected error): {e}")
+            return []
 
     def semantic_search_messages(
         self,
@@ -138,11 +445,14 @@ class WeaviateService:
                 query=query,
                 limit=limit,
                 filters=weaviate_filter,
+                include_vector=True,
+                return_metadata=MetadataQuery(distance=True),
             )
 
             items: list[dict[str, Any]] = []
             for o in getattr(result, "objects", []) or []:
                 props = getattr(o, "properties", {}) or {}
+                distance = getattr(getattr(o, "metadata", None), "distance", None)
                 items.append(
                     {
                         "message_id": props.get("message_id"),
@@ -150,9 +460,8 @@ class WeaviateService:
                         "role": props.get("role"),
                         "conversation_id": props.get("conversation_id"),
                         "metadata": props.get("metadata", {}),
-                        "score": getattr(o, "metadata", {}).get("score")
-                        if getattr(o, "metadata", None)
-                        else None,
+                        "score": 1.0 - distance if distance is not None else None,
+                        "vector": self._object_vector(o),
                     }
                 )
             return items
@@ -210,20 +519,21 @@ class WeaviateService:
                 return []
 
             coll = self.client.collections.get("Knowledge")
-            result = coll.query.near_text(query=query, limit=limit)
+            result = coll.query.near_text(
+                query=query,
+                limit=limit,
+                include_vector=True,
+                return_metadata=MetadataQuery(distance=True),
+            )
 
             items: list[dict[str, Any]] = []
             for o in getattr(result, "objects", []) or []:
-                props = getattr(o, "properties", {}) or {}
+                distance = getattr(getattr(o, "metadata", None), "distance", None)
                 items.append(
                     {
-                        "doc_id": props.get("doc_id"),
-                        "content": props.get("content"),
-                        "source": props.get("source"),
-                        "metadata": props.get("metadata", {}),
-                        "score": getattr(o, "metadata", {}).get("score")
-                        if getattr(o, "metadata", None)
-                        else None,
+                        **self._chunk_properties(o),
+                        "score": 1.0 - distance if distance is not None else None,
+                        "vector": self._object_vector(o),
                     }
                 )
             return items
@@ -237,6 +547,185 @@ class WeaviateService:
             logger.error(f"Knowledge search failed (unexpected error): {e}")
             return []
 
+    def keyword_search_knowledge(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        BM25 keyword search over document chunk text (v4).
+
+        Uses Weaviate's inverted index on the ``content`` property, which is
+        updated as chunks are ingested by ``add_document_chunks``.
+
+        Args:
+            query: Keyword query; terms are OR-ed and ranked by BM25
+            limit: Maximum number of results
+            filters: Property equality filters (e.g. user_id)
+
+        Returns:
+            Chunks with their BM25 score and stored vector, best match first
+        """
+        try:
+            if not self.client:
+                logger.warning("Weaviate client not available")
+                return []
+
+            coll = self.client.collections.get("Knowledge")
+            result = coll.query.bm25(
+                query=query,
+                query_properties=["content"],
+                limit=limit,
+                filters=self._build_filter(filters),
+                include_vector=True,
+                return_metadata=MetadataQuery(score=True),
+            )
+
+            return [
+                {
+                    **self._chunk_properties(o),
+                    "score": getattr(getattr(o, "metadata", None), "score", None),
+                    "vector": self._object_vector(o),
+                }
+                for o in getattr(result, "objects", []) or []
+            ]
+        except (ConnectionError, TimeoutError) as e:  # noqa: PT011
+            logger.error(f"Keyword search failed (connection error): {e}")
+            return []
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Keyword search failed (unexpected error): {e}")
+            return []
+
+
+class AsyncWeaviateService:
+    """
+    Non-blocking facade over WeaviateService for async code.
+
+    Calls run on a bounded thread pool against one shared client, so vector
+    queries do not block the event loop and connections are reused. Every
+    call has a deadline; on timeout the caller gets the same empty result
+    the sync service returns on errors.
+    """
+
+    def __init__(
+        self,
+        service: WeaviateService,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+    ):
+        weaviate_settings = get_settings().weaviate
+        self.service = service
+        self.timeout = timeout or weaviate_settings.weaviate_query_timeout_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or weaviate_settings.weaviate_max_workers,
+            thread_name_prefix="weaviate",
+        )
+
+    @property
+    def client(self):
+        """Underlying v4 client (None when Weaviate is unavailable)."""
+        return self.service.client
+
+    async def _run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        default: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor, call),
+                timeout=timeout or self.timeout,
+            )
+        except TimeoutError:
+            logger.error(
+                f"Weaviate call {func.__name__} timed out after "
+                f"{timeout or self.timeout}s",
+            )
+            return default
+
+    async def health(self, timeout: float | None = None) -> bool:
+        """Check Weaviate health."""
+        return await self._run(self.service.health, default=False, timeout=timeout)
+
+    async def semantic_search_messages(
+        self,
+        query: str,
+        conversation_id: str | None = None,
+        limit: int = 5,
+        timeout: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Semantic search in chat messages."""
+        return await self._run(
+            self.service.semantic_search_messages,
+            query=query,
+            conversation_id=conversation_id,
+            limit=limit,
+            default=[],
+            timeout=timeout,
+        )
+
+    async def semantic_search_knowledge(
+        self,
+        query: str,
+        limit: int = 5,
+        timeout: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Semantic search in knowledge documents."""
+        return await self._run(
+            self.service.semantic_search_knowledge,
+            query=query,
+            limit=limit,
+            default=[],
+            timeout=timeout,
+        )
+
+    async def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 10,
+        filters: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Vector search over document chunks."""
+        return await self._run(
+            self.service.search_similar,
+            query_embedding=query_embedding,
+            limit=limit,
+            filters=filters,
+            default=[],
+            timeout=timeout,
+        )
+
+    async def keyword_search_knowledge(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """BM25 keyword search over document chunks."""
+        return await self._run(
+            self.service.keyword_search_knowledge,
+            query=query,
+            limit=limit,
+            filters=filters,
+            default=[],
+            timeout=timeout,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
 
 # Global Weaviate service instance (safe for tests due to TESTING guard)
 weaviate_service = WeaviateService()
+
+# Shared async facade reusing the global client
+async_weaviate_service = AsyncWeaviateService(weaviate_service)
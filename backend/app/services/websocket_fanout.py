@@ -0,0 +1,242 @@
+"""
+Cross-worker fan-out for WebSocket events.
+
+Each worker only holds the sockets of its own clients. A fan-out backend
+carries conversation broadcasts and per-user messages to the other workers,
+which deliver them to their local sockets. Events go out on one channel per
+conversation and one per user, and a worker subscribes only to the channels
+of the conversations and users it has sockets for, so it never receives
+traffic it cannot deliver.
+"""
+
+import asyncio
+import contextlib
+import json
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+from loguru import logger
+
+from backend.app.core.config import get_settings
+
+# Channel kinds
+CONVERSATION = "conversation"
+USER = "user"
+
+EventHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class FanoutBackend:
+    """
+    In-process fan-out.
+
+    Publishing is a no-op because every socket is local to this worker; this
+    is the behaviour of a single-worker deployment.
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self.stats = {
+            "published": 0,
+            "received": 0,
+            "errors": 0,
+        }
+
+    async def start(self, handler: EventHandler) -> None:
+        """Start delivering events from other workers to ``handler``."""
+
+    async def stop(self) -> None:
+        """Stop receiving events."""
+
+    async def publish(self, kind: str, key: str, event: dict[str, Any]) -> None:
+        """
+        Publish an event to the other workers.
+
+        Args:
+            kind: Channel kind, ``conversation`` or ``user``
+            key: Conversation or user id
+            event: JSON-serializable event
+        """
+
+    async def subscribe(self, kind: str, key: str) -> None:
+        """Receive events for a conversation or user."""
+
+    async def unsubscribe(self, kind: str, key: str) -> None:
+        """Stop receiving events for a conversation or user."""
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get fan-out counters."""
+        return {**self.stats, "backend": "local", "worker_id": self.worker_id}
+
+
+class RedisFanout(FanoutBackend):
+    """Fan-out over Redis pub/sub with one channel per conversation and user."""
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        channel_prefix: str | None = None,
+    ):
+        super().__init__()
+        settings = get_settings()
+
+        self.redis_url = redis_url or settings.redis.redis_url
+        self.redis_db = settings.redis.redis_db
+        self.channel_prefix = channel_prefix or settings.websocket.fanout_channel_prefix
+
+        self._redis: redis.Redis | None = None
+        self._pubsub: Any = None
+        self._handler: EventHandler | None = None
+        self._channels: set[str] = set()
+        self._subscribed = asyncio.Event()
+        self._listener: asyncio.Task | None = None
+
+    def channel(self, kind: str, key: str) -> str:
+        """Name of the channel carrying events for a conversation or user."""
+        return f"{self.channel_prefix}:{kind}:{key}"
+
+    async def start(self, handler: EventHandler) -> None:
+        """Connect to Redis and subscribe to the channels requested so far."""
+        self._handler = handler
+        try:
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                db=self.redis_db,
+                decode_responses=True,
+                socket_connect_timeout=2,
+            )
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            if self._channels:
+                await self._pubsub.subscribe(*self._channels)
+                self._subscribed.set()
+        except (redis.RedisError, OSError, ValueError) as e:
+            logger.warning(f"WebSocket fan-out unavailable, delivering locally only: {e}")
+            self.stats["errors"] += 1
+            self._redis = None
+            self._pubsub = None
+            return
+
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"WebSocket fan-out started on {self.channel_prefix}")
+
+    async def stop(self) -> None:
+        """Stop the listener and close the Redis connections."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._pubsub is not None:
+            with contextlib.suppress(Exception):
+                await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis is not None:
+            with contextlib.suppress(Exception):
+                await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, kind: str, key: str, event: dict[str, Any]) -> None:
+        """Publish an event; failures are logged and the event stays local."""
+        if self._redis is None:
+            return
+        payload = json.dumps({**event, "origin": self.worker_id})
+        try:
+            await self._redis.publish(self.channel(kind, key), payload)
+            self.stats["published"] += 1
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"WebSocket fan-out publish failed: {e}")
+            self.stats["errors"] += 1
+
+    async def subscribe(self, kind: str, key: str) -> None:
+        """Subscribe to a conversation or user channel."""
+        channel = self.channel(kind, key)
+        if channel in self._channels:
+            return
+        self._channels.add(channel)
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.subscribe(channel)
+            self._subscribed.set()
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"WebSocket fan-out subscribe to {channel} failed: {e}")
+            self.stats["errors"] += 1
+
+    async def unsubscribe(self, kind: str, key: str) -> None:
+        """Unsubscribe from a conversation or user channel."""
+        channel = self.channel(kind, key)
+        if channel not in self._channels:
+            return
+        self._channels.discard(channel)
+        if not self._channels:
+            self._subscribed.clear()
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(channel)
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"WebSocket fan-out unsubscribe from {channel} failed: {e}")
+            self.stats["errors"] += 1
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get fan-out counters and the number of subscribed channels."""
+        return {
+            **self.stats,
+            "backend": "redis",
+            "worker_id": self.worker_id,
+            "channels": len(self._channels),
+            "connected": self._pubsub is not None,
+        }
+
+    async def _listen(self) -> None:
+        while True:
+            # get_message needs at least one subscription to read from
+            await self._subscribed.wait()
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket fan-out listener error: {e}")
+                self.stats["errors"] += 1
+                await asyncio.sleep(1.0)
+                continue
+
+            if not message or message.get("type") != "message":
+                continue
+
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                self.stats["errors"] += 1
+                continue
+            # Events from this worker were already delivered locally
+            if event.get("origin") == self.worker_id:
+                continue
+
+            self.stats["received"] += 1
+            try:
+                await self._handler(event)
+            except Exception as e:
+                logger.error(f"WebSocket fan-out delivery failed: {e}")
+                self.stats["errors"] += 1
+
+
+def create_fanout_backend(backend: str | None = None) -> FanoutBackend:
+    """
+    Create the fan-out backend selected in the WebSocket settings.
+
+    Args:
+        backend: ``local`` or ``redis``; defaults to the configured backend
+
+    Returns:
+        FanoutBackend instance
+    """
+    backend = backend or get_settings().websocket.fanout_backend
+    if backend == "redis":
+        return RedisFanout()
+    if backend != "local":
+        logger.warning(f"Unknown WebSocket fan-out backend {backend!r}, using local")
+    return FanoutBackend()
@@ -4,6 +4,7 @@ AI Assistant Platform - Main Application Entry Point
 This module contains the main FastAPI application setup and configuration.
 """
 
+import asyncio
 import sys
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -20,14 +21,23 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.sessions import SessionMiddleware
 
 from backend.app.api.v1.api import api_router
+from backend.app.api.v1.endpoints.websocket import manager as websocket_manager
+from backend.app.core.audit_monitoring import close_audit_monitoring
 from backend.app.core.config import get_settings
-from backend.app.core.database import check_db_connection, engine, get_db, init_db
+from backend.app.core.database import (
+    check_db_connection,
+    close_async_db,
+    engine,
+    get_db,
+    init_db,
+)
 from backend.app.core.error_responses import CommonErrors, handle_validation_errors
 from backend.app.core.i18n import I18nMiddleware, i18n_manager, t
 from backend.app.core.opentelemetry_config import (
     initialize_opentelemetry,
     shutdown_opentelemetry,
 )
+from backend.app.core.principal_cache import principal_cache
 from backend.app.core.redis_client import (
     check_redis_connection,
     close_redis,
@@ -44,8 +54,14 @@ from backend.app.core.weaviate_client import (
     init_weaviate,
 )
 from backend.app.monitoring import PerformanceMiddleware, get_performance_monitor
+from backend.app.services.assistants.assistant_engine import assistant_engine
+from backend.app.services.audit.audit_partitions import (
+    ensure_audit_partitions,
+    run_partition_maintenance,
+)
 from backend.app.services.audit_service import audit_service
 from backend.app.services.enhanced_background_job_service import job_manager
+from backend.app.services.semantic_cache import rag_response_cache
 
 
 @asynccontextmanager
@@ -85,6 +101,18 @@ async def lifespan(_: Any) -> AsyncGenerator[None, None]:
         create_schema_if_not_exists()
         logger.info("Weaviate initialized successfully")
 
+        # Receive cache invalidations from other workers
+        await principal_cache.start()
+        await rag_response_cache.start()
+
+        # Start cross-worker WebSocket fan-out
+        await websocket_manager.start()
+        logger.info("WebSocket fan-out started")
+
+        # Audit rows need a partition before the audit service writes them
+        await asyncio.to_thread(ensure_audit_partitions)
+        partition_maintenance = asyncio.create_task(run_partition_maintenance())
+
         # Start audit service
         await audit_service.start()
         logger.info("Audit service started")
@@ -120,14 +148,22 @@ async def lifespan(_: Any) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down AI Assistant Platform...")
     try:
+        partition_maintenance.cancel()
+        # Persist the last turns before the services they use are closed
+        await assistant_engine.wait_for_background_tasks()
         await audit_service.stop()
+        await close_audit_monitoring()
         job_manager.stop()
+        await websocket_manager.stop()
+        await principal_cache.stop()
+        await rag_response_cache.stop()
 
         # Stop performance monitor
         db = next(get_db())
         performance_monitor = get_performance_monitor(db)
         await performance_monitor.stop_monitoring()
 
+        await close_async_db()
         await close_redis()
         close_weaviate()
         shutdown_opentelemetry()
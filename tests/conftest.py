@@ -16,11 +16,14 @@ import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from backend.app.core.database import get_db
+from backend.app.core import database
+from backend.app.core.database import get_async_db, get_db
 from backend.app.models.base import Base
 from backend.app.models.knowledge import Document
 from backend.app.models.user import User
@@ -35,6 +38,13 @@ TEST_DATABASE_URL = os.getenv(
     "TEST_DATABASE_URL", 
     "sqlite:///./test.db"
 )
+# The same database through the asyncio drivers
+TEST_ASYNC_DATABASE_URL = os.getenv(
+    "TEST_ASYNC_DATABASE_URL",
+    TEST_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1).replace(
+        "postgresql://", "postgresql+asyncpg://", 1
+    ),
+)
 TEST_REDIS_URL = "redis://localhost:6380"
 TEST_WEAVIATE_URL = "http://localhost:8081"
 
@@ -151,19 +161,50 @@ def override_get_db(test_db_session):
     return _override_get_db
 
 
+@pytest.fixture(scope="session")
+def test_async_engine(test_engine):
+    """Create async database engine for testing."""
+    # Unpooled: TestClient runs the app on an event loop of its own
+    return create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+
+
+@pytest.fixture(scope="session")
+def test_async_session_factory(test_async_engine):
+    """Create async database session factory for testing."""
+    return async_sessionmaker(
+        test_async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+@pytest.fixture
+def override_get_async_db(test_async_engine, test_async_session_factory, monkeypatch):
+    """Override the async database dependency and the app's async engine."""
+    # Code opening its own sessions (auth, audit writer) uses them too
+    monkeypatch.setattr(database, "_async_engine", test_async_engine)
+    monkeypatch.setattr(database, "_async_session_factory", test_async_session_factory)
+
+    async def _override_get_async_db():
+        async with test_async_session_factory() as session:
+            yield session
+
+    return _override_get_async_db
+
+
 @pytest.fixture
-def client(override_get_db):
+def client(override_get_db, override_get_async_db):
     """Create a test client."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
 @pytest_asyncio.fixture
-async def async_client(override_get_db):
+async def async_client(override_get_db, override_get_async_db):
     """Create an async test client."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     async with AsyncClient(app=app, base_url="http://test") as test_client:
         yield test_client
     app.dependency_overrides.clear()
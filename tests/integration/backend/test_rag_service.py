@@ -216,7 +216,7 @@ class TestRAGService:
 
         with patch.object(
             rag_service.weaviate_service,
-            "semantic_search_knowledge",
+            "keyword_search_knowledge",
             return_value=mock_results,
         ):
             results = await rag_service._keyword_retrieval(
@@ -549,49 +549,50 @@ class TestRAGService:
             result = await rag_service._get_cached_result(cache_key)
             assert result == test_data  # noqa: S101
 
-    def test_calculate_content_similarity(self, rag_service):
-        """Test content similarity calculation."""
-        content1 = "This is a test message about API authentication"
-        content2 = "This is another test message about API authentication"
-        content3 = "This is a completely different message about databases"
-
-        similarity1 = rag_service._calculate_content_similarity(content1, content2)
-        similarity2 = rag_service._calculate_content_similarity(content1, content3)
-
-        assert similarity1 > similarity2  # noqa: S101
-        assert 0.0 <= similarity1 <= 1.0  # noqa: S101
-        assert 0.0 <= similarity2 <= 1.0  # noqa: S101
-
-    def test_calculate_diversity_penalty(self, rag_service):
-        """Test diversity penalty calculation."""
-        result = RAGResult(
-            content="test content",
-            source="source1",
-            source_type="document",
-            source_id="1",
-            similarity_score=0.8,
-            relevance_score=0.7,
-            ranking_score=0.0,
-            token_count=10,
-        )
+    def test_pairwise_similarity_tokens(self, rag_service):
+        """Test content similarity calculation without embeddings."""
+        contents = [
+            "This is a test message about API authentication",
+            "This is another test message about API authentication",
+            "This is a completely different message about databases",
+        ]
+        token_sets = [set(content.lower().split()) for content in contents]
+
+        similarity = rag_service._pairwise_similarity(None, token_sets)
+
+        assert similarity[0, 1] > similarity[0, 2]  # noqa: S101
+        assert ((similarity >= 0.0) & (similarity <= 1.0 + 1e-6)).all()  # noqa: S101
 
-        all_results = [
-            result,
+    @pytest.mark.asyncio
+    async def test_rank_results_diversity(self, rag_service, sample_config):
+        """Test diversity ranking demotes near-duplicates."""
+        sample_config.ranking_method = ContextRankingMethod.DIVERSITY
+        sample_config.diversity_penalty = 0.5
+        results = [
             RAGResult(
-                content="very similar test content",
-                source="source2",
+                content=content,
+                source="source",
                 source_type="document",
-                source_id="2",
-                similarity_score=0.8,
-                relevance_score=0.7,
+                source_id=str(i),
+                similarity_score=score,
+                relevance_score=0.5,
                 ranking_score=0.0,
-                token_count=10,
-            ),
+                token_count=3,
+            )
+            for i, (content, score) in enumerate(
+                [("alpha one", 0.9), ("alpha one copy", 0.85), ("beta two", 0.8)],
+            )
         ]
+        vectors = [[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]]
 
-        penalty = rag_service._calculate_diversity_penalty(result, all_results)
+        ranked = await rag_service._rank_results(
+            results,
+            sample_config,
+            vectors=vectors,
+        )
 
-        assert 0.0 <= penalty <= 1.0  # noqa: S101
+        assert [r.source_id for r in ranked] == ["0", "2", "1"]  # noqa: S101
+        assert all(0.0 <= r.ranking_score <= 1.0 for r in ranked)  # noqa: S101
 
     def test_format_knowledge_results(self, rag_service):
         """Test knowledge results formatting."""
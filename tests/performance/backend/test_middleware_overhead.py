@@ -0,0 +1,160 @@
+"""
+Benchmark of the per-request overhead of the HTTP middleware stack.
+
+This module drives the application built by ``create_application`` directly
+through its ASGI interface and compares:
+- A bare application serving the same endpoint without middleware
+- The full middleware stack
+- The full stack with the i18n and performance middleware replaced by the
+  previous ``BaseHTTPMiddleware`` implementations
+"""
+
+import asyncio
+import statistics
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.app.core.i18n import I18nMiddleware
+from backend.app.monitoring import PerformanceMiddleware, get_metrics_collector
+from backend.main import create_application
+
+REQUESTS = 2000
+ROUNDS = 5
+
+
+class LegacyI18nMiddleware(BaseHTTPMiddleware):
+    """The previous i18n middleware, kept as the benchmark baseline."""
+
+    def __init__(self, app, i18n_manager):
+        super().__init__(app)
+        self.i18n_manager = i18n_manager
+
+    async def dispatch(self, request: Request, call_next):
+        language = self.i18n_manager.detect_language(request)
+        request.state.language = language
+        response = await call_next(request)
+        response.headers["Content-Language"] = language
+        return response
+
+
+class LegacyPerformanceMiddleware(BaseHTTPMiddleware):
+    """The previous performance middleware, kept as the benchmark baseline."""
+
+    def __init__(self, app, metrics_collector):
+        super().__init__(app)
+        self.recorder = PerformanceMiddleware(app, metrics_collector)
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        self.recorder._record_request_metrics(
+            method=request.method,
+            route=request.url.path,
+            status_code=response.status_code,
+            response_time=time.perf_counter() - start_time,
+            user_agent=request.headers.get("user-agent", ""),
+            success=True,
+        )
+        return response
+
+
+LEGACY = {
+    I18nMiddleware: LegacyI18nMiddleware,
+    PerformanceMiddleware: LegacyPerformanceMiddleware,
+}
+
+
+async def bench(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def build_app(legacy: bool = False) -> FastAPI:
+    app = create_application()
+    app.add_api_route("/bench", bench, methods=["GET"])
+    if not any(m.cls is PerformanceMiddleware for m in app.user_middleware):
+        app.add_middleware(
+            PerformanceMiddleware, metrics_collector=get_metrics_collector()
+        )
+    if legacy:
+        app.user_middleware = [
+            Middleware(LEGACY.get(m.cls, m.cls), *m.args, **m.kwargs)
+            for m in app.user_middleware
+        ]
+    return app
+
+
+def build_bare_app() -> FastAPI:
+    app = FastAPI()
+    app.add_api_route("/bench", bench, methods=["GET"])
+    return app
+
+
+async def time_requests(app, requests: int = REQUESTS) -> float:
+    """Serve requests through the ASGI interface; seconds per request."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/bench",
+        "raw_path": b"/bench",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"user-agent", b"benchmark"),
+            (b"accept-language", b"de-DE,de;q=0.9"),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    start_ns = time.perf_counter_ns()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    elapsed_ns = time.perf_counter_ns() - start_ns
+
+    assert set(statuses) == {200}
+    return elapsed_ns / requests / 1e9
+
+
+def per_request(app) -> float:
+    """Median seconds per request over several rounds, after a warm-up."""
+
+    async def run() -> float:
+        await time_requests(app, requests=100)
+        return statistics.median(
+            [await time_requests(app) for _ in range(ROUNDS)]
+        )
+
+    return asyncio.run(run())
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_middleware_stack_overhead():
+    """Pure ASGI middleware adds less per-request overhead than BaseHTTPMiddleware."""
+    bare = per_request(build_bare_app())
+    legacy = per_request(build_app(legacy=True)) - bare
+    current = per_request(build_app()) - bare
+
+    print(
+        f"\nMiddleware overhead per request: "
+        f"BaseHTTPMiddleware {legacy * 1e6:.1f}us, "
+        f"pure ASGI {current * 1e6:.1f}us"
+    )
+    assert current < legacy
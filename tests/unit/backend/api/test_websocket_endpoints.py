@@ -8,6 +8,8 @@ This module tests all WebSocket functionality including:
 - Knowledge base integration
 - Typing indicators
 - Processing job updates
+- Coalesced stream frames
+- Per-connection outbound queues
 """
 
 import pytest
@@ -508,4 +510,284 @@ class TestWebSocketEndpoints:
             
             result = get_current_user_ws("invalid-token")
             assert result is None
-            mock_verify.assert_called_once_with("invalid-token")
\ No newline at end of file
+            mock_verify.assert_called_once_with("invalid-token")
+
+
+class TestStreamCoalescer:
+    """Test suite for coalesced WebSocket stream frames."""
+
+    @pytest.fixture
+    def websocket(self):
+        """Create a WebSocket mock recording sent frames."""
+        websocket = MagicMock()
+        websocket.send_text = AsyncMock()
+        websocket.send_bytes = AsyncMock()
+        return websocket
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_deltas_coalesce_into_one_frame(self, websocket):
+        """Deltas within the flush interval are sent as one stream_chunk."""
+        from backend.app.api.v1.endpoints.websocket import StreamCoalescer
+
+        stream = StreamCoalescer(websocket, "conv-123", flush_interval=10, max_bytes=1024)
+        for delta in ["Hel", "lo", ", ", "wörld"]:
+            await stream.push(delta)
+        websocket.send_text.assert_not_called()
+
+        await stream.close()
+
+        websocket.send_text.assert_awaited_once()
+        frame = json.loads(websocket.send_text.await_args.args[0])
+        assert frame == {
+            "type": "stream_chunk",
+            "data": {
+                "conversation_id": "conv-123",
+                "is_partial": True,
+                "content": "Hello, wörld",
+            },
+        }
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_byte_budget_flushes_immediately(self, websocket):
+        """Reaching the byte budget sends a frame without waiting."""
+        from backend.app.api.v1.endpoints.websocket import StreamCoalescer
+
+        stream = StreamCoalescer(websocket, "conv-123", flush_interval=10, max_bytes=4)
+        await stream.push("ab")
+        await stream.push("cd")
+        await stream.push("e")
+
+        assert stream.frames_sent == 1
+        await stream.close()
+        contents = [
+            json.loads(call.args[0])["data"]["content"]
+            for call in websocket.send_text.await_args_list
+        ]
+        assert contents == ["abcd", "e"]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_flush_interval_sends_buffered_deltas(self, websocket):
+        """Buffered deltas are sent once the flush interval elapses."""
+        from backend.app.api.v1.endpoints.websocket import StreamCoalescer
+
+        stream = StreamCoalescer(websocket, "conv-123", flush_interval=0.01, max_bytes=1024)
+        await stream.push("partial")
+        await asyncio.sleep(0.05)
+
+        websocket.send_text.assert_awaited_once()
+        await stream.close()
+        assert stream.frames_sent == 1
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_msgpack_falls_back_to_json_when_unavailable(self, websocket):
+        """Connections requesting msgpack get JSON frames without msgpack."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionManager
+
+        websocket.accept = AsyncMock()
+        manager = ConnectionManager()
+        with patch('backend.app.api.v1.endpoints.websocket.MSGPACK_AVAILABLE', False):
+            await manager.connect(websocket, "user-123", "conv-123", stream_encoding="msgpack")
+
+        confirmation = json.loads(websocket.send_text.await_args.args[0])
+        assert confirmation["data"]["stream_encoding"] == "json"
+        assert manager.open_stream("user-123", "conv-123").encoding == "json"
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_msgpack_frames_are_binary(self, websocket):
+        """msgpack streams send binary frames decoding to the JSON envelope."""
+        msgpack = pytest.importorskip("msgpack")
+        from backend.app.api.v1.endpoints.websocket import StreamCoalescer
+
+        stream = StreamCoalescer(
+            websocket, "conv-123", encoding="msgpack", flush_interval=10, max_bytes=1024
+        )
+        await stream.push("Hi")
+        await stream.close()
+
+        frame = msgpack.unpackb(websocket.send_bytes.await_args.args[0])
+        assert frame["data"]["content"] == "Hi"
+        assert frame["data"]["conversation_id"] == "conv-123"
+
+
+class TestConnectionWriter:
+    """Test suite for per-connection outbound queues."""
+
+    @pytest.fixture
+    def websocket(self):
+        """Create a WebSocket mock recording sent frames."""
+        websocket = MagicMock()
+        websocket.accept = AsyncMock()
+        websocket.send_text = AsyncMock()
+        websocket.send_bytes = AsyncMock()
+        websocket.close = AsyncMock()
+        return websocket
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self, websocket):
+        """With drop_oldest a full queue discards its oldest frame."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionWriter
+
+        writer = ConnectionWriter(
+            websocket, "user-123", "conv-123", on_close=MagicMock(),
+            max_queue=2, policy="drop_oldest",
+        )
+        for frame in ["a", "b", "c"]:
+            assert writer.enqueue(frame)
+
+        assert writer.depth == 2
+        assert writer.stats["dropped"] == 1
+
+        writer.start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        sent = [call.args[0] for call in websocket.send_text.await_args_list]
+        assert sent == ["b", "c"]
+        writer.close()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_stream_frames_are_not_dropped(self, websocket):
+        """drop_oldest discards broadcasts, never the connection's stream."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionWriter
+
+        writer = ConnectionWriter(
+            websocket, "user-123", "conv-123", on_close=MagicMock(),
+            max_queue=2, policy="drop_oldest",
+        )
+        await writer.send_text("chunk 1")
+        writer.enqueue("broadcast 1")
+        writer.enqueue("broadcast 2")
+
+        assert writer.stats["dropped"] == 1
+
+        writer.start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        sent = [call.args[0] for call in websocket.send_text.await_args_list]
+        assert sent == ["chunk 1", "broadcast 2"]
+        writer.close()
+
+        # A queue holding only stream frames drops the broadcast instead
+        writer = ConnectionWriter(
+            websocket, "user-123", "conv-123", on_close=MagicMock(),
+            max_queue=1, policy="drop_oldest",
+        )
+        await writer.send_text("chunk 2")
+        assert writer.enqueue("broadcast 3")
+        assert writer.depth == 1
+        assert writer.stats["dropped"] == 1
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_full_queue_disconnects_slow_client(self, websocket):
+        """With disconnect a full queue closes the connection."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionWriter
+
+        on_close = MagicMock()
+        writer = ConnectionWriter(
+            websocket, "user-123", "conv-123", on_close=on_close,
+            max_queue=1, policy="disconnect",
+        )
+        assert writer.enqueue("a")
+        assert not writer.enqueue("b")
+
+        await asyncio.sleep(0)
+        assert writer.closed
+        on_close.assert_called_once_with(writer)
+        websocket.close.assert_awaited_once_with(code=1013, reason="Client too slow")
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_coalesce_key_replaces_queued_frame(self, websocket):
+        """A frame with a queued coalesce key replaces the queued frame."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionWriter
+
+        writer = ConnectionWriter(websocket, "user-123", "conv-123", on_close=MagicMock())
+        writer.enqueue("typing on", coalesce_key="typing:user-456")
+        writer.enqueue("message")
+        writer.enqueue("typing off", coalesce_key="typing:user-456")
+
+        assert writer.depth == 2
+        assert writer.stats["coalesced"] == 1
+
+        writer.start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        sent = [call.args[0] for call in websocket.send_text.await_args_list]
+        assert sent == ["typing off", "message"]
+        writer.close()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_stream_of_closed_connection_is_discarded(self, websocket):
+        """Opening a stream after a disconnect does not fail."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionManager
+
+        manager = ConnectionManager()
+        await manager.connect(websocket, "user-123", "conv-123")
+        manager.disconnect("user-123", "conv-123")
+        websocket.send_text.reset_mock()
+
+        stream = manager.open_stream("user-123", "conv-123")
+        await stream.push("hello")
+        await stream.close()
+
+        websocket.send_text.assert_not_awaited()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_broadcast(self, websocket):
+        """A client stuck in send does not delay delivery to the others."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionManager
+
+        stalled = asyncio.Event()
+        slow = MagicMock()
+        slow.accept = AsyncMock()
+        slow.send_text = AsyncMock(side_effect=lambda _: stalled.wait())
+
+        manager = ConnectionManager()
+        await manager.connect(websocket, "user-fast", "conv-123")
+        await manager.connect(slow, "user-slow", "conv-123")
+        websocket.send_text.reset_mock()
+
+        await asyncio.wait_for(
+            manager.broadcast_to_conversation("hello", "conv-123"), timeout=1
+        )
+        await asyncio.sleep(0)
+
+        websocket.send_text.assert_awaited_once_with("hello")
+        stats = manager.get_connection_stats()
+        assert set(stats) == {"user-fast_conv-123", "user-slow_conv-123"}
+
+        stalled.set()
+        manager.disconnect("user-fast", "conv-123")
+        manager.disconnect("user-slow", "conv-123")
+        assert manager.get_connection_stats() == {}
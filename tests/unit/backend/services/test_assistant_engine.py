@@ -0,0 +1,307 @@
+"""
+Unit tests for Assistant Engine.
+
+This module tests the assistant engine request pipeline including:
+- Concurrent pre-generation stages
+- Per-stage deadlines degrading to empty defaults
+- Stage timings in the processing result metadata
+- Memory update and persistence off the response path
+- Token streaming events and early stream close
+- Concurrency slots released before tokens are streamed
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.app.services.assistants.assistant_engine import (
+    AssistantEngine,
+    ProcessingRequest,
+)
+from backend.app.services.ai.providers.base import ChatCompletionChunk
+from backend.app.services.assistants.assistant_response import AIResponse
+
+
+class TestAssistantEnginePipeline:
+    """Test class for AssistantEngine request processing."""
+
+    @pytest.fixture
+    def engine(self):
+        """Create an engine with mocked collaborators."""
+        engine = AssistantEngine()
+        engine.context_manager = MagicMock()
+        engine.tools_manager = MagicMock()
+        engine.memory_manager = MagicMock()
+        engine.response_generator = MagicMock()
+
+        engine.context_manager.get_conversation_context = AsyncMock(
+            return_value={"messages": []},
+        )
+        engine.context_manager.prepare_knowledge_context = AsyncMock(
+            return_value="knowledge",
+        )
+        engine.context_manager.save_response_to_conversation = AsyncMock(
+            return_value=True,
+        )
+        engine.tools_manager.prepare_tools = AsyncMock(return_value=[])
+        engine.memory_manager.update_memory = AsyncMock(return_value=[])
+        engine.response_generator.generate_response = AsyncMock(
+            return_value=AIResponse(content="answer", metadata={"tokens_used": 7}),
+        )
+        engine.response_generator.create_structured_response = AsyncMock(
+            return_value=None,
+        )
+        return engine
+
+    @pytest.fixture
+    def request_(self):
+        """Create a processing request."""
+        return ProcessingRequest(
+            request_id="req-1",
+            user_id="user-1",
+            conversation_id="conv-1",
+            message="hello",
+        )
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_stages_run_concurrently(self, engine, request_):
+        """Context, knowledge and tools stages overlap."""
+
+        async def slow(value):
+            await asyncio.sleep(0.1)
+            return value
+
+        engine.context_manager.get_conversation_context = AsyncMock(
+            side_effect=lambda request: slow({"messages": []}),
+        )
+        engine.context_manager.prepare_knowledge_context = AsyncMock(
+            side_effect=lambda request: slow("knowledge"),
+        )
+        engine.tools_manager.prepare_tools = AsyncMock(
+            side_effect=lambda message: slow([]),
+        )
+
+        started = time.perf_counter()
+        result = await engine._process_request(request_)
+        elapsed = time.perf_counter() - started
+
+        assert result.success is True
+        assert elapsed < 0.25
+        timings = result.metadata["stage_timings"]
+        assert {"conversation_context", "knowledge_context", "tools"} <= set(timings)
+        assert "generation" in timings
+        assert result.tokens_used == 7
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_slow_knowledge_search_degrades_to_empty(self, engine, request_):
+        """A knowledge stage past its deadline yields an empty context."""
+        engine.stage_timeouts["knowledge_context"] = 0.05
+
+        async def hung(request):
+            await asyncio.sleep(10)
+            return "late"
+
+        engine.context_manager.prepare_knowledge_context = AsyncMock(side_effect=hung)
+
+        result = await engine._process_request(request_)
+
+        assert result.success is True
+        assert result.metadata["degraded_stages"] == ["knowledge_context"]
+        args = engine.response_generator.generate_response.await_args.args
+        assert args[2] == ""
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_disabled_stages_are_skipped(self, engine, request_):
+        """Disabled knowledge and tools stages are not awaited or timed."""
+        request_.use_knowledge_base = False
+        request_.use_tools = False
+
+        result = await engine._process_request(request_)
+
+        engine.context_manager.prepare_knowledge_context.assert_not_called()
+        engine.tools_manager.prepare_tools.assert_not_called()
+        assert "knowledge_context" not in result.metadata["stage_timings"]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_persistence_runs_after_returning(self, engine, request_):
+        """Memory and persistence do not delay the result."""
+        release = asyncio.Event()
+
+        async def slow_save(request, structured_response):
+            await release.wait()
+            return True
+
+        engine.context_manager.save_response_to_conversation = AsyncMock(
+            side_effect=slow_save,
+        )
+
+        result = await asyncio.wait_for(engine._process_request(request_), 1.0)
+
+        assert result.success is True
+        assert engine.get_stats()["pending_background_tasks"] == 1
+
+        release.set()
+        await engine.wait_for_background_tasks()
+        engine.memory_manager.update_memory.assert_awaited_once()
+        engine.context_manager.save_response_to_conversation.assert_awaited_once()
+        assert engine.get_stats()["pending_background_tasks"] == 0
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_next_turn_sees_persisted_turn(self, engine, request_):
+        """The next turn's context is read after the previous turn is saved."""
+        events = []
+        release = asyncio.Event()
+
+        async def slow_save(request, structured_response):
+            await release.wait()
+            events.append("saved")
+            return True
+
+        async def get_context(request):
+            events.append("context")
+            return {"messages": []}
+
+        engine.context_manager.save_response_to_conversation = AsyncMock(
+            side_effect=slow_save,
+        )
+        engine.context_manager.get_conversation_context = AsyncMock(
+            side_effect=get_context,
+        )
+
+        await engine._process_request(request_)
+        next_turn = asyncio.create_task(engine._process_request(request_))
+        await asyncio.sleep(0.05)
+        release.set()
+        await next_turn
+        await engine.wait_for_background_tasks()
+
+        assert events == ["context", "saved", "context", "saved"]
+
+    def _provider_stream(self, parts, closed):
+        async def stream():
+            try:
+                for part in parts:
+                    yield ChatCompletionChunk(content=part)
+                yield ChatCompletionChunk(content="", finish_reason="stop")
+            finally:
+                closed.set()
+
+        return stream()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_stream_emits_tokens_in_order(self, engine):
+        """Streaming yields start, one token per chunk, then done."""
+        closed = asyncio.Event()
+        engine.response_generator.generate_response_stream = AsyncMock(
+            return_value=(
+                {"model_used": "gpt-4o", "provider": "openai"},
+                self._provider_stream(["Hel", "lo"], closed),
+            ),
+        )
+
+        events = [
+            event
+            async for event in engine.stream_message(
+                user_id="user-1", conversation_id="conv-1", message="hi"
+            )
+        ]
+
+        assert [e["event"] for e in events] == ["start", "token", "token", "done"]
+        assert [e["data"]["content"] for e in events[1:3]] == ["Hel", "lo"]
+        assert events[-1]["data"]["content"] == "Hello"
+        assert events[-1]["data"]["finish_reason"] == "stop"
+        assert closed.is_set()
+
+        await engine.wait_for_background_tasks()
+        engine.context_manager.save_response_to_conversation.assert_awaited_once()
+        engine.tools_manager.prepare_tools.assert_not_called()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_closing_stream_stops_generation(self, engine):
+        """Closing the event stream early closes the provider stream."""
+        closed = asyncio.Event()
+        engine.response_generator.generate_response_stream = AsyncMock(
+            return_value=(
+                {"model_used": "gpt-4o", "provider": "openai"},
+                self._provider_stream(["a", "b", "c"], closed),
+            ),
+        )
+
+        events = engine.stream_message(
+            user_id="user-1", conversation_id="conv-1", message="hi"
+        )
+        assert (await anext(events))["event"] == "start"
+        assert (await anext(events))["event"] == "token"
+        await events.aclose()
+
+        assert closed.is_set()
+        assert engine.processing_requests == {}
+        await engine.wait_for_background_tasks()
+        engine.context_manager.save_response_to_conversation.assert_not_called()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_open_stream_holds_no_processing_slot(self, engine):
+        """A client reading the stream slowly does not block other requests."""
+        closed = asyncio.Event()
+        engine.processing_semaphore = asyncio.Semaphore(1)
+        engine.response_generator.generate_response_stream = AsyncMock(
+            return_value=(
+                {"model_used": "gpt-4o", "provider": "openai"},
+                self._provider_stream(["a", "b"], closed),
+            ),
+        )
+
+        events = engine.stream_message(
+            user_id="user-1", conversation_id="conv-1", message="hi"
+        )
+        assert (await anext(events))["event"] == "start"
+        assert (await anext(events))["event"] == "token"
+
+        assert not engine.processing_semaphore.locked()
+        await events.aclose()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_stream_failure_yields_error_event(self, engine):
+        """A provider failure ends the stream with an error event."""
+        engine.response_generator.generate_response_stream = AsyncMock(
+            side_effect=ValueError("No AI provider is configured"),
+        )
+
+        events = [
+            event
+            async for event in engine.stream_message(
+                user_id="user-1", conversation_id="conv-1", message="hi"
+            )
+        ]
+
+        assert [e["event"] for e in events] == ["error"]
+        assert "No AI provider" in events[0]["data"]["message"]
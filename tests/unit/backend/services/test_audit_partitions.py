@@ -0,0 +1,87 @@
+"""
+Unit tests for audit table partitioning.
+
+This module tests the audit partition functionality including:
+- Partition intervals and names
+- Parsing of PostgreSQL partition bounds
+- Range overlap checks used before creating partitions
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.app.services.audit.audit_partitions import (
+    AuditPartitionManager,
+    Partition,
+    _parse_bound,
+    next_period,
+    partition_name,
+    period_start,
+)
+
+
+class TestPartitionIntervals:
+    """Test interval arithmetic and naming."""
+
+    def test_period_start(self):
+        """Moments are truncated to the start of their day or month."""
+        moment = datetime(2026, 10, 16, 13, 45, tzinfo=UTC)
+        assert period_start(moment, "day") == datetime(2026, 10, 16, tzinfo=UTC)
+        assert period_start(moment, "month") == datetime(2026, 10, 1, tzinfo=UTC)
+
+    def test_next_period(self):
+        """Months roll over into the next year."""
+        december = datetime(2026, 12, 1, tzinfo=UTC)
+        assert next_period(december, "month") == datetime(2027, 1, 1, tzinfo=UTC)
+        assert next_period(december, "day") == datetime(2026, 12, 2, tzinfo=UTC)
+
+    def test_partition_name(self):
+        """Partition names carry the start of their range."""
+        start = datetime(2026, 10, 1, tzinfo=UTC)
+        assert partition_name("audit_logs", start, "month") == "audit_logs_p202610"
+        assert partition_name("audit_logs", start, "day") == "audit_logs_p20261001"
+
+
+class TestPartitionBounds:
+    """Test bound parsing and overlap checks."""
+
+    def test_parse_bound(self):
+        """Bounds are parsed as rendered by pg_get_expr."""
+        assert _parse_bound("'2026-10-01 00:00:00+00'") == datetime(
+            2026, 10, 1, tzinfo=UTC
+        )
+        assert _parse_bound("MINVALUE") is None
+
+    def test_overlaps(self):
+        """Ranges are half-open and unbounded sides overlap everything."""
+        october = Partition(
+            "p202610",
+            datetime(2026, 10, 1, tzinfo=UTC),
+            datetime(2026, 11, 1, tzinfo=UTC),
+        )
+        legacy = Partition("legacy", None, datetime(2026, 11, 1, tzinfo=UTC))
+        november = (datetime(2026, 11, 1, tzinfo=UTC), datetime(2026, 12, 1, tzinfo=UTC))
+
+        assert not october.overlaps(*november)
+        assert not legacy.overlaps(*november)
+        assert legacy.overlaps(datetime(2026, 10, 5, tzinfo=UTC), november[0])
+        assert not Partition("default", is_default=True).overlaps(*november)
+
+
+class TestAuditPartitionManager:
+    """Test the manager on databases without partitioning."""
+
+    def test_unpartitioned_database_is_left_alone(self, test_db_session: Session):
+        """Without PostgreSQL partitioning nothing is created or dropped."""
+        manager = AuditPartitionManager(test_db_session)
+
+        assert not manager.is_partitioned("extended_audit_logs")
+        assert manager.ensure_partitions() == []
+        assert manager.drop_partitions_before("extended_audit_logs", datetime.now(UTC)) == 0
+
+    def test_unknown_interval(self, test_db_session: Session):
+        """Unknown partition intervals are rejected."""
+        with pytest.raises(ValueError):
+            AuditPartitionManager(test_db_session, interval="week")
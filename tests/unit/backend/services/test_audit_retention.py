@@ -0,0 +1,70 @@
+"""
+Unit tests for audit retention.
+
+This module tests the retention manager functionality including:
+- Summaries of retention policies
+- Row deletion on databases without partitioning
+- Legal hold of expired rows
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.app.models.audit_extended import (
+    AuditEventCategory,
+    AuditEventType,
+    AuditRetentionRule,
+    ExtendedAuditLog,
+)
+from backend.app.services.audit.audit_retention import RetentionManager
+
+
+def make_log(age_days: int, legal_hold: bool = False) -> ExtendedAuditLog:
+    return ExtendedAuditLog(
+        event_id=str(uuid.uuid4()),
+        event_type=AuditEventType.LOGIN_SUCCESS,
+        event_category=AuditEventCategory.AUTHENTICATION,
+        timestamp=datetime.now(UTC) - timedelta(days=age_days),
+        legal_hold=legal_hold,
+    )
+
+
+class TestRetentionManager:
+    """Test retention on databases without partitioning."""
+
+    @pytest.fixture
+    def manager(self, test_db_session: Session):
+        test_db_session.add_all(
+            [
+                AuditRetentionRule(name="short", retention_days=30, enabled=True),
+                AuditRetentionRule(name="disabled", retention_days=30, enabled=False),
+                make_log(age_days=1),
+                make_log(age_days=60),
+                make_log(age_days=60, legal_hold=True),
+            ]
+        )
+        test_db_session.flush()
+        return RetentionManager(test_db_session)
+
+    def test_retention_summary(self, manager: RetentionManager):
+        """The summary counts enabled policies and the rows they would delete."""
+        summary = manager.get_retention_summary()
+
+        assert summary["total_policies"] == 2
+        assert summary["active_policies"] == 1
+        details = {d["name"]: d for d in summary["policy_details"]}
+        assert details["short"]["is_active"] is True
+        assert details["short"]["logs_to_delete"] == 1
+
+    def test_legal_hold_rows_are_not_deleted(
+        self, manager: RetentionManager, test_db_session: Session
+    ):
+        """Deleting expired rows keeps those on legal hold."""
+        assert manager.apply_policies() == 1
+
+        remaining = test_db_session.query(ExtendedAuditLog).all()
+        assert len(remaining) == 2
+        assert any(log.legal_hold for log in remaining)
@@ -0,0 +1,150 @@
+"""
+Unit tests for the audit writer.
+
+This module tests the audit writer functionality including:
+- Batching queued events into bulk inserts
+- Overflow policies of the bounded queue
+- The local spool and its replay on startup
+"""
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from backend.app.models.audit import AuditEventType, AuditSeverity
+from backend.app.services.audit_writer import AuditSpool, AuditWriter
+
+
+def make_row(description="event"):
+    timestamp = datetime.now(UTC)
+    return {
+        "id": uuid.uuid4(),
+        "event_type": AuditEventType.USER_LOGIN,
+        "severity": AuditSeverity.INFO,
+        "user_id": uuid.uuid4(),
+        "session_id": None,
+        "ip_address": "192.168.1.1",
+        "user_agent": "test-browser",
+        "resource_type": None,
+        "resource_id": None,
+        "description": description,
+        "details": {"success": True},
+        "created_at": timestamp,
+        "updated_at": timestamp,
+    }
+
+
+def make_writer(**kwargs):
+    """Writer whose bulk inserts are recorded instead of executed."""
+    writer = AuditWriter(flush_interval=0.01, **kwargs)
+    writer.inserts = []
+
+    async def insert(rows):
+        writer.inserts.append(rows)
+
+    writer._insert = insert
+    return writer
+
+
+class TestAuditWriter:
+    """Test batching and overflow handling."""
+
+    @pytest.mark.asyncio
+    async def test_queued_events_are_written_in_batches(self):
+        """Events are inserted in batches of at most batch_size."""
+        writer = make_writer(batch_size=2)
+        for i in range(5):
+            await writer.submit(make_row(f"event {i}"))
+
+        await writer.start()
+        await writer.stop()
+
+        assert [len(rows) for rows in writer.inserts] == [2, 2, 1]
+        assert writer.get_statistics()["written"] == 5
+
+    @pytest.mark.asyncio
+    async def test_drop_newest(self):
+        """A full queue rejects new events."""
+        writer = make_writer(max_queue_size=2, overflow_policy="drop_newest")
+        for i in range(3):
+            await writer.submit(make_row(f"event {i}"))
+
+        await writer.start()
+        await writer.stop()
+
+        descriptions = [row["description"] for rows in writer.inserts for row in rows]
+        assert descriptions == ["event 0", "event 1"]
+        assert writer.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        """A full queue discards its oldest event."""
+        writer = make_writer(max_queue_size=2, overflow_policy="drop_oldest")
+        for i in range(3):
+            await writer.submit(make_row(f"event {i}"))
+
+        await writer.start()
+        await writer.stop()
+
+        descriptions = [row["description"] for rows in writer.inserts for row in rows]
+        assert descriptions == ["event 1", "event 2"]
+        assert writer.dropped == 1
+
+    def test_unknown_overflow_policy(self):
+        """Unknown overflow policies are rejected."""
+        with pytest.raises(ValueError):
+            AuditWriter(overflow_policy="ignore")
+
+
+class TestAuditSpool:
+    """Test spooling and replay of unwritten events."""
+
+    def test_segment_deleted_once_written(self, tmp_path):
+        """A closed segment is deleted when all its events are released."""
+        spool = AuditSpool(tmp_path / "audit.spool")
+        segment = spool.append(make_row())
+        spool.append(make_row())
+        spool.close()
+
+        assert len(list(tmp_path.iterdir())) == 1
+        spool.release(segment, count=2)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_read_restores_rows(self, tmp_path):
+        """Spooled rows are read back with their column types."""
+        row = make_row()
+        spool = AuditSpool(tmp_path / "audit.spool")
+        spool.append(row)
+        spool.close()
+
+        # A fresh spool sees the segment as left behind
+        (path,) = AuditSpool(tmp_path / "audit.spool").leftover()
+        with path.open("a", encoding="utf-8") as f:
+            f.write('{"torn')
+
+        assert spool.read(path) == [row]
+
+    def test_segments_of_running_process_are_not_replayed(self, tmp_path):
+        """Workers sharing a spool path only replay stopped workers' segments."""
+        running = AuditSpool(tmp_path / "audit.spool")
+        running.append(make_row())
+
+        assert AuditSpool(tmp_path / "audit.spool").leftover() == []
+        running.close()
+        assert len(AuditSpool(tmp_path / "audit.spool").leftover()) == 1
+
+    @pytest.mark.asyncio
+    async def test_unwritten_events_are_replayed_on_startup(self, tmp_path):
+        """Events spooled by a crashed process are written on startup."""
+        spool_path = str(tmp_path / "audit.spool")
+        crashed = make_writer(spool_path=spool_path)
+        await crashed.submit(make_row("unwritten"))
+        crashed.spool.close()
+
+        writer = make_writer(spool_path=spool_path)
+        await writer.start()
+        await writer.stop()
+
+        assert [row["description"] for row in writer.inserts[0]] == ["unwritten"]
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,237 @@
+"""
+Unit tests for Context Manager.
+
+This module tests the context manager functionality including:
+- Bounded LRU context store with TTL expiry
+- Redis round-trip of serialized contexts
+- Versioned writes shared between workers
+- Token counting with and without a tokenizer
+- Heap-based context optimization
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.app.services.context_manager import (
+    ContextItem,
+    ContextManager,
+    ContextStore,
+    ContextType,
+    ConversationContext,
+    context_from_json,
+    context_to_json,
+    count_tokens,
+)
+
+
+class FakeRedis:
+    """In-memory stand-in for the hashes and script used by the store."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    async def eval(self, script, numkeys, key, version, data, ttl):
+        current = int(self.hashes.get(key, {}).get("version", 0))
+        if current != int(version):
+            return -1
+        self.hashes[key] = {"version": str(current + 1), "data": data}
+        return current + 1
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+def make_item(item_id, tokens, importance=1.0, item_type=ContextType.CONVERSATION, age=0):
+    """Create a context item of a given size."""
+    return ContextItem(
+        id=item_id,
+        type=item_type,
+        content=item_id,
+        metadata={"role": "user"},
+        timestamp=datetime.now(UTC) - timedelta(minutes=age),
+        token_count=tokens,
+        importance_score=importance,
+    )
+
+
+class TestContextStore:
+    """Test class for the bounded context store."""
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_context_is_evicted(self):
+        """The store keeps at most max_contexts contexts."""
+        store = ContextStore(max_contexts=2, redis_enabled=False)
+        for conversation_id in ["a", "b"]:
+            await store.put(ConversationContext(conversation_id, "user-1"))
+
+        # Touch "a" so "b" becomes least recently used
+        assert await store.get("a") is not None
+        await store.put(ConversationContext("c", "user-1"))
+
+        assert "a" in store
+        assert "b" not in store
+        assert store.stats["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_context_expires(self):
+        """Contexts idle for longer than the TTL are not returned."""
+        store = ContextStore(ttl_seconds=60, redis_enabled=False)
+        context = ConversationContext("a", "user-1")
+        context.updated_at = datetime.now(UTC) - timedelta(minutes=5)
+        await store.put(context)
+
+        assert await store.get("a") is None
+        assert store.stats["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_local_miss_is_loaded_from_redis(self):
+        """A context saved by another worker is loaded from Redis."""
+        context = ConversationContext("a", "user-1", items=[make_item("m1", 3)])
+        client = MagicMock()
+        client.hmget = AsyncMock(return_value=["3", context_to_json(context)])
+
+        store = ContextStore(redis_enabled=True)
+        store._redis = client
+        loaded = await store.get("a")
+
+        assert loaded.items[0].type == ContextType.CONVERSATION
+        assert loaded.items[0].timestamp == context.items[0].timestamp
+        assert loaded.version == 3
+        assert store.stats["redis_hits"] == 1
+        assert "a" in store
+
+    @pytest.mark.asyncio
+    async def test_local_copy_is_replaced_by_newer_version(self):
+        """A context saved by another worker since it was read is reloaded."""
+        newer = ConversationContext("a", "user-1", items=[make_item("m1", 3)])
+        client = FakeRedis()
+        store = ContextStore(redis_enabled=True)
+        store._redis = client
+        await store.put(ConversationContext("a", "user-1"))
+
+        # Another worker saves its version
+        client.hashes[store._redis_key("a")] = {"version": "2", "data": context_to_json(newer)}
+
+        loaded = await store.get("a")
+        assert [item.id for item in loaded.items] == ["m1"]
+        assert loaded.version == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_write_is_rejected(self):
+        """A context is not written over a version saved by another worker."""
+        client = FakeRedis()
+        first = ContextStore(redis_enabled=True)
+        second = ContextStore(redis_enabled=True)
+        first._redis = second._redis = client
+
+        await first.put(ConversationContext("a", "user-1"))
+        stale = await second.get("a")
+        current = await first.get("a")
+        current.items.append(make_item("m1", 3))
+        assert await first.put(current)
+
+        stale.items.append(make_item("m2", 3))
+        assert not await second.put(stale)
+        assert second.stats["conflicts"] == 1
+        assert [item.id for item in (await second.get("a")).items] == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_conflicting_change_is_applied_again(self):
+        """Messages added by two workers are both kept."""
+        client = FakeRedis()
+        first = ContextManager(store=ContextStore(redis_enabled=True))
+        second = ContextManager(store=ContextStore(redis_enabled=True))
+        first.store._redis = second.store._redis = client
+
+        assert await first.add_message("a", "user-1", "Hello")
+        assert await second.add_message("a", "user-1", "Hi")
+        assert await first.add_message("a", "user-1", "How are you?")
+
+        context = await second.store.get("a")
+        assert [item.content for item in context.items] == [
+            "Hello",
+            "Hi",
+            "How are you?",
+        ]
+
+    def test_context_json_round_trip(self):
+        """Serialized contexts restore enums and timestamps."""
+        context = ConversationContext(
+            "a", "user-1", items=[make_item("k1", 5, item_type=ContextType.KNOWLEDGE)]
+        )
+
+        assert context_from_json(context_to_json(context)) == context
+
+
+class TestTokenCounting:
+    """Test class for token counting."""
+
+    def test_falls_back_to_estimate_without_tiktoken(self):
+        """Without tiktoken tokens are estimated from the text length."""
+        with patch("backend.app.services.context_manager._get_encoding", return_value=None):
+            assert count_tokens("x" * 40, "gpt-4") == 11
+
+    def test_uses_model_tokenizer(self):
+        """With tiktoken the model's encoding counts the tokens."""
+        pytest.importorskip("tiktoken")
+        assert count_tokens("hello world", "gpt-4") == 2
+
+
+class TestContextOptimization:
+    """Test class for context optimization."""
+
+    @pytest.fixture
+    def manager(self):
+        """Create ContextManager with an in-memory store."""
+        return ContextManager(store=ContextStore(redis_enabled=False))
+
+    @pytest.mark.asyncio
+    async def test_least_important_oldest_items_are_removed(self, manager):
+        """Optimization evicts low-importance, then older items first."""
+        manager.token_buffer = 0
+        context = ConversationContext("a", "user-1", max_tokens=30)
+        context.items = [
+            make_item("old-low", 10, importance=0.2, age=10),
+            make_item("new-low", 10, importance=0.2, age=1),
+            make_item("high", 10, importance=0.9, age=20),
+            make_item("newest", 10, importance=1.0),
+        ]
+        context.current_tokens = 40
+
+        await manager._optimize_context(context)
+
+        assert [item.id for item in context.items] == ["new-low", "high", "newest"]
+        assert context.current_tokens == 30
+
+    @pytest.mark.asyncio
+    async def test_system_items_are_kept_when_possible(self, manager):
+        """System items are skipped until most tokens are freed."""
+        manager.token_buffer = 0
+        context = ConversationContext("a", "user-1", max_tokens=20)
+        context.items = [
+            make_item("system", 10, importance=0.1, item_type=ContextType.SYSTEM),
+            make_item("message", 10, importance=0.5),
+            make_item("answer", 10, importance=1.0),
+        ]
+        context.current_tokens = 30
+
+        await manager._optimize_context(context)
+
+        assert [item.id for item in context.items] == ["system", "answer"]
+
+    @pytest.mark.asyncio
+    async def test_add_message_persists_context(self, manager):
+        """Messages are added to the context held by the store."""
+        assert await manager.add_message("a", "user-1", "Hello")
+
+        context = await manager.store.get("a")
+        assert context.items[0].content == "Hello"
+        assert context.current_tokens == context.items[0].token_count
@@ -0,0 +1,180 @@
+"""
+Unit tests for incremental conversation history.
+
+This module tests the conversation history functionality including:
+- Token-budgeted tail window led by the rolling summary
+- Keeping unsummarized messages until a batch is summarized
+- Scheduling summary refreshes once the window rolls over
+- Folding messages into the persisted summary
+"""
+
+import asyncio
+from contextlib import nullcontext
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.app.models.conversation import Conversation, Message, MessageRole
+from backend.app.services.conversation_history import (
+    SUMMARY_KEY,
+    ConversationHistoryProvider,
+)
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def make_message(index, content):
+    """Create a stored message `index` minutes into the conversation."""
+    return SimpleNamespace(
+        role=MessageRole.USER if index % 2 == 0 else MessageRole.ASSISTANT,
+        content=content,
+        created_at=START + timedelta(minutes=index),
+    )
+
+
+def make_db(conversation, newest_first):
+    """Create a session mock answering the provider's queries."""
+    db = MagicMock()
+
+    def query(entity):
+        chain = MagicMock()
+        chain.filter.return_value = chain
+        chain.order_by.return_value = chain
+        chain.limit.return_value = chain
+        if entity is Conversation:
+            chain.first.return_value = conversation
+        elif entity is Message:
+            chain.all.side_effect = lambda: newest_first[: chain.limit.call_args.args[0]]
+        return chain
+
+    db.query.side_effect = query
+    return db
+
+
+@pytest.fixture
+def count_words():
+    """Count one token per word."""
+    with patch(
+        "backend.app.services.conversation_history.count_tokens",
+        side_effect=lambda text, model: len(text.split()),
+    ):
+        yield
+
+
+class TestHistoryWindow:
+    """Test class for the token-budgeted history window."""
+
+    def test_window_keeps_newest_messages_within_budget(self, count_words):
+        """Older messages beyond the budget are left out."""
+        conversation = SimpleNamespace(id="conv-1", user_id="user-1", conversation_metadata={})
+        messages = [make_message(i, f"message {i} text") for i in range(5)]
+        db = make_db(conversation, messages[::-1])
+
+        provider = ConversationHistoryProvider(
+            db, window_max_messages=10, refresh_messages=100
+        )
+        history = provider.get_history("conv-1", token_budget=7)
+
+        assert [m["content"] for m in history] == ["message 3 text", "message 4 text"]
+        assert history[0]["role"] == "assistant"
+
+    def test_summary_leads_the_window(self, count_words):
+        """The rolling summary is sent first and counts against the budget."""
+        conversation = SimpleNamespace(
+            id="conv-1",
+            user_id="user-1",
+            conversation_metadata={
+                SUMMARY_KEY: {"content": "s", "through": START.isoformat()},
+            },
+        )
+        messages = [make_message(i, "two words") for i in range(1, 6)]
+        db = make_db(conversation, messages[::-1])
+
+        provider = ConversationHistoryProvider(
+            db, window_max_messages=10, refresh_messages=100
+        )
+        history = provider.get_history("conv-1", token_budget=10)
+
+        assert history[0]["role"] == "system"
+        assert history[0]["content"].endswith("\ns")
+        # 10 tokens minus 6 for the summary leaves two messages
+        assert len(history) == 3
+
+    @pytest.mark.asyncio
+    async def test_unsummarized_messages_stay_until_batch_fills(self, count_words):
+        """Messages beyond the window are kept while too few are pending."""
+        conversation = SimpleNamespace(id="conv-1", user_id="user-1", conversation_metadata={})
+        messages = [make_message(i, "a b c") for i in range(15)]
+        db = make_db(conversation, messages[::-1])
+
+        provider = ConversationHistoryProvider(
+            db, window_max_messages=10, refresh_messages=10
+        )
+        with patch.object(provider, "refresh_summary", AsyncMock()) as refresh:
+            history = provider.get_history("conv-1", token_budget=1000)
+            await asyncio.sleep(0)
+
+        assert len(history) == 15
+        refresh.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rollover_schedules_one_refresh(self, count_words):
+        """A message left out of the prompt triggers a refresh at once."""
+        conversation = SimpleNamespace(id="conv-1", user_id="user-1", conversation_metadata={})
+        messages = [make_message(i, "a b c") for i in range(30)]
+        db = make_db(conversation, messages[::-1])
+
+        provider = ConversationHistoryProvider(
+            db, window_max_messages=10, refresh_messages=10
+        )
+        with patch.object(provider, "refresh_summary", AsyncMock()) as refresh:
+            provider.get_history("conv-1", token_budget=9)
+            provider.get_history("conv-1", token_budget=9)
+            await asyncio.sleep(0)
+
+        refresh.assert_awaited_once_with("conv-1", "user-1", messages[27].created_at)
+
+
+class TestSummaryRefresh:
+    """Test class for rolling summary refreshes."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_folds_batch_into_summary(self):
+        """The summary is extended and its checkpoint advanced."""
+        conversation = SimpleNamespace(
+            id="conv-1",
+            user_id="user-1",
+            conversation_metadata={
+                "topic": "kept",
+                SUMMARY_KEY: {
+                    "content": "old",
+                    "through": START.isoformat(),
+                    "message_count": 4,
+                },
+            },
+        )
+        batch = [make_message(i, f"m{i}") for i in range(1, 4)]
+        db = make_db(conversation, batch)
+        summarizer = AsyncMock(return_value="new summary")
+
+        provider = ConversationHistoryProvider(
+            MagicMock(),
+            summarizer=summarizer,
+            session_factory=lambda: nullcontext(db),
+        )
+        updated = await provider.refresh_summary(
+            "conv-1", "user-1", START + timedelta(minutes=10)
+        )
+
+        assert updated
+        previous, messages, user_id = summarizer.await_args.args
+        assert previous == "old"
+        assert [m["content"] for m in messages] == ["m1", "m2", "m3"]
+        summary = conversation.conversation_metadata[SUMMARY_KEY]
+        assert summary["content"] == "new summary"
+        assert summary["through"] == batch[-1].created_at.isoformat()
+        assert summary["message_count"] == 7
+        assert conversation.conversation_metadata["topic"] == "kept"
+        db.commit.assert_called_once()
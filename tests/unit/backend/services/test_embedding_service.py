@@ -0,0 +1,392 @@
+"""
+Unit tests for Embedding Service.
+
+This module tests the embedding service functionality including:
+- Batched similarity scoring for all similarity metrics
+- Top-k selection over a prebuilt similarity matrix
+- Maximal Marginal Relevance selection
+- LRU/TTL embedding cache behaviour
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from backend.app.services.embedding_cache import EmbeddingCache
+from backend.app.services.embedding_service import (
+    EmbeddingService,
+    SimilarityMatrix,
+    SimilarityMetric,
+    maximal_marginal_relevance,
+    select_top_k,
+)
+
+
+class TestSimilarityMatrix:
+    """Test class for the batched similarity engine."""
+
+    @pytest.fixture
+    def service(self):
+        """Create EmbeddingService instance for testing."""
+        return EmbeddingService()
+
+    @pytest.fixture
+    def vectors(self):
+        """Random query and candidate vectors."""
+        rng = np.random.default_rng(42)
+        query = rng.normal(size=32).tolist()
+        candidates = rng.normal(size=(50, 32)).tolist()
+        return query, candidates
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize("metric", list(SimilarityMetric))
+    def test_batch_matches_pairwise(self, service, vectors, metric):
+        """Batched scores match the per-pair reference implementation."""
+        query, candidates = vectors
+
+        batched = service.calculate_batch_similarity(query, candidates, metric)
+        expected = [
+            service.calculate_similarity(query, candidate, metric)
+            for candidate in candidates
+        ]
+
+        assert np.allclose(batched, expected, rtol=1e-4, atol=1e-4)
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_find_most_similar_orders_descending(self, service, vectors):
+        """Top-k results are the k best candidates, best first."""
+        query, candidates = vectors
+
+        results = service.find_most_similar(query, candidates, top_k=5)
+
+        reference = sorted(
+            (
+                (service.calculate_similarity(query, candidate), i)
+                for i, candidate in enumerate(candidates)
+            ),
+            reverse=True,
+        )[:5]
+        assert [r["index"] for r in results] == [i for _, i in reference]
+        assert all(
+            a["similarity"] >= b["similarity"]
+            for a, b in zip(results, results[1:], strict=False)
+        )
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_prebuilt_matrix_is_reused(self, service, vectors):
+        """A SimilarityMatrix can be passed instead of raw candidates."""
+        query, candidates = vectors
+        matrix = SimilarityMatrix(candidates)
+
+        assert service.find_most_similar(
+            query, matrix, top_k=3
+        ) == service.find_most_similar(query, candidates, top_k=3)
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_zero_vectors_score_zero_cosine(self):
+        """Zero candidates and zero queries yield a cosine score of 0.0."""
+        matrix = SimilarityMatrix([[0.0, 0.0], [1.0, 0.0]])
+
+        assert matrix.scores([1.0, 0.0]).tolist() == [0.0, 1.0]
+        assert matrix.scores([0.0, 0.0]).tolist() == [0.0, 0.0]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_select_top_k_edge_cases(self):
+        """Top-k handles k larger than the candidate set and empty input."""
+        scores = np.array([0.1, 0.9, 0.5], dtype=np.float32)
+
+        assert select_top_k(scores, 10).tolist() == [1, 2, 0]
+        assert select_top_k(scores, 0).tolist() == []
+        assert select_top_k(np.empty(0, dtype=np.float32), 3).tolist() == []
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_mmr_skips_redundant_candidates(self):
+        """MMR picks a diverse candidate before a near-duplicate."""
+        relevance = np.array([0.9, 0.88, 0.7], dtype=np.float32)
+        matrix = SimilarityMatrix([[1.0, 0.0], [0.99, 0.05], [0.0, 1.0]])
+        similarity = matrix.normalized @ matrix.normalized.T
+
+        order, scores = maximal_marginal_relevance(relevance, similarity, 0.5)
+        assert order.tolist() == [0, 2, 1]
+        assert scores[0] == pytest.approx(0.9)
+
+        # Without a penalty MMR is plain relevance ordering
+        order, _ = maximal_marginal_relevance(relevance, similarity, 0.0, k=2)
+        assert order.tolist() == [0, 1]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_empty_inputs(self, service):
+        """Empty queries or candidate sets return empty results."""
+        assert service.calculate_batch_similarity([], [[1.0]]) == []
+        assert service.find_most_similar([1.0], []) == []
+
+
+class TestEmbeddingCache:
+    """Test class for the two-tier embedding cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a small local-only cache for testing."""
+        return EmbeddingCache(max_entries=2, ttl_seconds=60, redis_enabled=False)
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_roundtrip_as_float32(self, cache):
+        """Vectors are stored as float32 buffers and counted in bytes."""
+        await cache.set_many({"a": [1.0, 2.0, 3.0]})
+
+        found = await cache.get_many(["a"])
+
+        assert found["a"].dtype == np.float32
+        assert found["a"].tolist() == [1.0, 2.0, 3.0]
+        assert cache.get_statistics()["bytes"] == 12
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, cache):
+        """Reading an entry protects it from eviction."""
+        await cache.set_many({"a": [1.0], "b": [2.0]})
+        await cache.get_many(["a"])
+        await cache.set_many({"c": [3.0]})
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.get_statistics()["evictions"] == 1
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self, cache, monkeypatch):
+        """Entries past their TTL are dropped on access."""
+        await cache.set_many({"a": [1.0]})
+        real_monotonic = time.monotonic
+        monkeypatch.setattr(time, "monotonic", lambda: real_monotonic() + 120)
+
+        assert await cache.get_many(["a"]) == {}
+        stats = cache.get_statistics()
+        assert stats["expirations"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes"] == 0
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_service_reuses_cached_embeddings(self, monkeypatch):
+        """A second request for the same text does not call the provider."""
+        service = EmbeddingService()
+        service.embedding_cache = EmbeddingCache(redis_enabled=False)
+        provider = AsyncMock(return_value=[[0.5, 0.5]])
+        monkeypatch.setattr(service, "_generate_embeddings_with_retry", provider)
+
+        first = await service.generate_embeddings(["hello"])
+        second = await service.generate_embeddings(["hello"])
+
+        assert provider.await_count == 1
+        assert first[0].embedding == second[0].embedding == [0.5, 0.5]
+        stats = service.get_embedding_statistics()
+        assert stats["cache_hits"] == 1
+        assert stats["cache"]["bytes"] == 8
+
+
+class TestEmbeddingDispatch:
+    """Test class for concurrent, token-budgeted batch dispatch."""
+
+    @pytest.fixture
+    def service(self):
+        """Create EmbeddingService instance with fast retries."""
+        service = EmbeddingService()
+        service.retry_delay = 0
+        return service
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_batches_respect_token_budget(self, service):
+        """Batches are cut at the model's max_tokens and at max_items."""
+        # 512-token budget, 200 tokens per text -> two texts per batch
+        texts = ["x" * 800] * 5
+
+        batches = service._plan_batches(texts, "embed-english-v3.0", max_items=10)
+        assert batches == [(0, 2), (2, 4), (4, 5)]
+
+        batches = service._plan_batches(texts, "text-embedding-3-small", max_items=3)
+        assert batches == [(0, 3), (3, 5)]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_oversized_text_gets_own_batch(self, service):
+        """A text larger than the budget is still sent, on its own."""
+        texts = ["short", "x" * 10000, "short"]
+
+        batches = service._plan_batches(texts, "embed-english-v3.0", max_items=10)
+        assert batches == [(0, 1), (1, 2), (2, 3)]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_only_failed_batch_is_retried(self, service):
+        """A failing batch is retried alone and other batches keep results."""
+        calls = []
+
+        async def fake_batch(batch, model):
+            calls.append(tuple(batch))
+            if batch == ["b"] and calls.count(("b",)) < 2:
+                return []
+            return [[float(ord(text))] for text in batch]
+
+        service._generate_batch_embeddings = fake_batch
+
+        result = await service._generate_embeddings_with_retry(
+            ["a", "b", "c"],
+            "text-embedding-3-small",
+            batch_size=1,
+        )
+
+        assert result == [[97.0], [98.0], [99.0]]
+        assert calls.count(("a",)) == 1
+        assert calls.count(("b",)) == 2
+        assert calls.count(("c",)) == 1
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_exhausted_batch_yields_none(self, service):
+        """Texts of a batch that never succeeds come back as None."""
+
+        async def fake_batch(batch, model):
+            return [] if batch == ["b"] else [[1.0]] * len(batch)
+
+        service._generate_batch_embeddings = fake_batch
+
+        result = await service._generate_embeddings_with_retry(
+            ["a", "b"],
+            "text-embedding-3-small",
+            batch_size=1,
+        )
+
+        assert result == [[1.0], None]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_in_flight_limit(self, service):
+        """No more than max_concurrent_batches run at once."""
+        service.max_concurrent_batches = 2
+        in_flight = 0
+        peak = 0
+
+        async def fake_batch(batch, model):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [[1.0]] * len(batch)
+
+        service._generate_batch_embeddings = fake_batch
+
+        await service._generate_embeddings_with_retry(
+            ["t"] * 8,
+            "text-embedding-3-small",
+            batch_size=1,
+        )
+
+        assert peak == 2
+
+
+class TestEmbeddingResultBatch:
+    """Test class for the columnar result merge path."""
+
+    @pytest.fixture
+    def service(self):
+        """Create EmbeddingService instance with a local-only cache."""
+        service = EmbeddingService()
+        service.embedding_cache = EmbeddingCache(redis_enabled=False)
+        return service
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_merges_cached_and_new_in_order(self, service, monkeypatch):
+        """Cached, generated and failed rows land at their text's index."""
+        await service.embedding_cache.set_many(
+            {service._get_cache_key("b", service.model): [2.0, 2.0]},
+        )
+
+        async def fake_dispatch(texts, model, batch_size):
+            return [None if text == "c" else [1.0, 1.0] for text in texts]
+
+        monkeypatch.setattr(service, "_generate_embeddings_with_retry", fake_dispatch)
+
+        batch = await service.generate_embedding_batch(["a", "b", "c", "d"])
+
+        assert batch.vectors.dtype == np.float32
+        assert batch.vectors.shape == (4, 2)
+        assert batch.valid.tolist() == [True, True, False, True]
+        assert batch.cached.tolist() == [False, True, False, False]
+        assert batch.get_vector(1) == [2.0, 2.0]
+        assert batch.get_vector(2) is None
+
+        results = batch.to_results()
+        assert results[2] is None
+        assert [r.text for r in results if r] == ["a", "b", "d"]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_vectorized_quality_matches_scalar(self, service):
+        """Batch quality scoring equals the per-vector score."""
+        rng = np.random.default_rng(3)
+        matrix = rng.normal(scale=0.1, size=(6, 16)).astype(np.float32)
+
+        scores = service._calculate_quality_scores(matrix)
+
+        for row, score in zip(matrix, scores, strict=True):
+            assert score == pytest.approx(
+                service._calculate_quality_score(row.tolist()), rel=1e-5
+            )
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_embed_chunks_uses_vectors(self, service, monkeypatch):
+        """embed_chunks attaches plain vectors taken from the batch."""
+
+        async def fake_dispatch(texts, model, batch_size):
+            return [[0.25, 0.75] for _ in texts]
+
+        monkeypatch.setattr(service, "_generate_embeddings_with_retry", fake_dispatch)
+
+        chunks = await service.embed_chunks([{"content": "x"}, {"content": "y"}])
+
+        assert [chunk["embedding"] for chunk in chunks] == [[0.25, 0.75]] * 2
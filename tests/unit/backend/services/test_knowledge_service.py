@@ -0,0 +1,63 @@
+"""
+Unit tests for the knowledge service.
+
+This module tests the knowledge service functionality including:
+- Deleting documents with their chunks and cached answers
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.app.services.knowledge_service import KnowledgeService
+from backend.app.services.semantic_cache import SemanticResponseCache
+
+
+class TestDeleteDocument:
+    """Test class for document deletion."""
+
+    @pytest.fixture
+    def cache(self):
+        """Semantic cache holding an answer that cites the document."""
+        cache = SemanticResponseCache(max_entries=4, max_scopes=2, ttl_seconds=60)
+        cache.store("scope", [1.0, 0.0], "cites doc-1", ["doc-1"])
+        with patch("backend.app.services.knowledge_service.rag_response_cache", cache):
+            yield cache
+
+    @pytest.fixture
+    def service(self):
+        """Knowledge service with mocked storage, database and Weaviate."""
+        service = KnowledgeService.__new__(KnowledgeService)
+        service.db = MagicMock()
+        service.weaviate_service = MagicMock()
+        service.storage_manager = MagicMock(delete_document=AsyncMock())
+        service.get_document = MagicMock(
+            return_value=SimpleNamespace(id="doc-1", file_path="docs/doc-1.txt"),
+        )
+        return service
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_delete_removes_chunks_and_cached_answers(self, service, cache):
+        """Deleting a document drops its chunks and the answers citing it."""
+        assert await service.delete_document("doc-1", "user-1") is True
+
+        service.weaviate_service.delete_document_chunks.assert_called_once_with("doc-1")
+        service.db.commit.assert_called_once()
+        assert cache.lookup("scope", [1.0, 0.0], 0.95) is None
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_failed_delete_still_invalidates_cache(self, service, cache):
+        """Cached answers are dropped even when a later step fails."""
+        service.storage_manager.delete_document.side_effect = OSError("unavailable")
+
+        assert await service.delete_document("doc-1", "user-1") is False
+
+        service.db.rollback.assert_called_once()
+        assert cache.lookup("scope", [1.0, 0.0], 0.95) is None
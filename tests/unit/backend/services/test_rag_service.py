@@ -0,0 +1,532 @@
+"""
+Unit tests for RAG Service.
+
+This module tests the RAG service retrieval internals including:
+- Concurrent sub-query fan-out under a shared deadline
+- Partial results when sub-queries time out or fail
+- BM25 keyword sub-queries and score normalization
+- Reciprocal-rank fusion of sub-query result lists
+- Semantic response cache hits, eviction and document invalidation
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.app.schemas.rag import (
+    RAGConfig,
+    RAGRequest,
+    RAGResponse,
+    RAGResult,
+    RAGStrategy,
+)
+from backend.app.services.rag_service import RAGService
+from backend.app.services.semantic_cache import SemanticResponseCache
+
+
+def _result(content, source_id="", score=0.5, chunk_index=None):
+    return {
+        "content": content,
+        "source": "knowledge_base",
+        "source_type": "document",
+        "source_id": source_id,
+        "similarity_score": score,
+        "chunk_index": chunk_index,
+    }
+
+
+class TestRAGFanOut:
+    """Test class for concurrent RAG retrieval."""
+
+    @pytest.fixture
+    def rag_service(self):
+        """Create RAG service instance."""
+        return RAGService()
+
+    @pytest.fixture
+    def config(self):
+        """Create a hybrid RAG configuration."""
+        return RAGConfig(
+            name="Fan-out",
+            description="Concurrent hybrid retrieval",
+            strategy=RAGStrategy.HYBRID,
+            max_results=4,
+            timeout_seconds=5.0,
+            max_concurrent_searches=5,
+        )
+
+    @pytest.fixture
+    def request_(self):
+        """Create a RAG request with several keywords."""
+        return RAGRequest(query="weaviate batch ingestion latency tuning")
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_sub_queries_run_concurrently(self, rag_service, config):
+        """Sub-queries overlap instead of running back to back."""
+
+        async def slow(label):
+            await asyncio.sleep(0.1)
+            return [_result(label, source_id=label)]
+
+        subqueries = [(f"q{i}", lambda i=i: slow(f"r{i}")) for i in range(5)]
+
+        started = time.perf_counter()
+        result_lists = await rag_service._fan_out(subqueries, config)
+        elapsed = time.perf_counter() - started
+
+        assert [r[0]["content"] for r in result_lists] == [
+            "r0",
+            "r1",
+            "r2",
+            "r3",
+            "r4",
+        ]
+        assert elapsed < 0.3
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self, rag_service, config):
+        """Sub-queries past the deadline are cancelled, finished ones kept."""
+        cancelled = asyncio.Event()
+
+        async def fast():
+            return [_result("fast", source_id="fast")]
+
+        async def hung():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return []
+
+        deadline = asyncio.get_running_loop().time() + 0.05
+        result_lists = await rag_service._fan_out(
+            [("fast", fast), ("hung", hung)],
+            config,
+            deadline,
+        )
+
+        assert result_lists == [[_result("fast", source_id="fast")]]
+        assert cancelled.is_set()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_failed_sub_query_is_skipped(self, rag_service, config):
+        """A failing sub-query does not discard the others."""
+
+        async def ok():
+            return [_result("ok")]
+
+        async def broken():
+            raise RuntimeError("weaviate down")
+
+        result_lists = await rag_service._fan_out(
+            [("ok", ok), ("broken", broken)],
+            config,
+        )
+
+        assert result_lists == [[_result("ok")]]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, rag_service, config):
+        """No more than max_concurrent_searches sub-queries run at once."""
+        config.max_concurrent_searches = 2
+        running = 0
+        peak = 0
+
+        async def tracked():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+        await rag_service._fan_out(
+            [(f"q{i}", tracked) for i in range(6)],
+            config,
+        )
+
+        assert peak == 2
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_hybrid_combines_vector_and_bm25(self, rag_service, config, request_):
+        """Hybrid retrieval fuses one vector query with one BM25 query."""
+        semantic = AsyncMock(
+            return_value=[{"content": "vector hit", "doc_id": "d1", "score": 0.9}],
+        )
+        keyword = AsyncMock(
+            return_value=[
+                {"content": "bm25 hit", "doc_id": "d2", "score": 8.0},
+                {"content": "vector hit", "doc_id": "d1", "score": 2.0},
+            ],
+        )
+        with (
+            patch.object(
+                rag_service.weaviate_service, "semantic_search_knowledge", semantic
+            ),
+            patch.object(
+                rag_service.weaviate_service, "keyword_search_knowledge", keyword
+            ),
+        ):
+            results = await rag_service._hybrid_retrieval(request_, config, [])
+
+        semantic.assert_awaited_once()
+        keyword.assert_awaited_once()
+        keywords = rag_service._extract_keywords(request_.query)
+        assert keyword.await_args.kwargs["query"] == " ".join(keywords)
+        assert results[0]["content"] == "vector hit"
+        assert {r["content"] for r in results} == {"vector hit", "bm25 hit"}
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_bm25_scores_are_normalized(self, rag_service):
+        """BM25 scores are scaled to the best hit and kept apart from similarity."""
+        keyword = AsyncMock(
+            return_value=[
+                {"content": "a", "doc_id": "d1", "score": 6.0},
+                {"content": "b", "doc_id": "d2", "score": 3.0},
+            ],
+        )
+        with patch.object(
+            rag_service.weaviate_service, "keyword_search_knowledge", keyword
+        ):
+            results = await rag_service._search_keywords("a b", limit=5)
+
+        assert [r["keyword_score"] for r in results] == [1.0, 0.5]
+        assert [r["similarity_score"] for r in results] == [None, None]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_keyword_hits_skip_similarity_threshold(self, rag_service, request_):
+        """Keyword-only hits are kept however high the similarity threshold."""
+        config = RAGConfig(name="Keyword", description="BM25", similarity_threshold=0.9)
+        keyword_hit = _result("bm25 hit", source_id="d1", score=None)
+        keyword_hit["keyword_score"] = 0.4
+        fused = rag_service._combine_results(
+            [keyword_hit, _result("weak vector hit", source_id="d2", score=0.5)]
+        )
+
+        results = await rag_service._process_results(fused, request_, config)
+
+        assert [r.content for r in results] == ["bm25 hit"]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_keyword_hits_rank_by_keyword_score(self, rag_service):
+        """Keyword-only hits rank by BM25 and stay out of similarity metrics."""
+        config = RAGConfig(
+            name="Keyword",
+            description="BM25",
+            similarity_threshold=0.0,
+            freshness_weight=0.0,
+            authority_weight=0.0,
+        )
+        weak = _result("weak", source_id="d1", score=None)
+        weak["keyword_score"] = 0.2
+        strong = _result("strong", source_id="d2", score=None)
+        strong["keyword_score"] = 1.0
+        vector_hit = _result("vector", source_id="d3", score=0.8)
+        request = RAGRequest(query="unrelated")
+
+        results = await rag_service._process_results(
+            [weak, strong, vector_hit], request, config
+        )
+        rag_service._update_metrics(
+            True,
+            0.1,
+            RAGResponse(
+                query=request.query,
+                results=results,
+                config_used=config,
+                total_results=len(results),
+                retrieval_time=0.0,
+                processing_time=0.0,
+                context_length=0,
+                sources_queried=[],
+            ),
+        )
+
+        assert [r.content for r in results] == ["strong", "vector", "weak"]
+        assert results[0].similarity_score is None
+        assert rag_service.metrics.avg_similarity_score == pytest.approx(0.8)
+
+
+class TestReciprocalRankFusion:
+    """Test class for RAG result fusion."""
+
+    @pytest.fixture
+    def rag_service(self):
+        """Create RAG service instance."""
+        return RAGService()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_items_ranked_in_several_lists_win(self, rag_service):
+        """An item near the top of every list outranks single-list leaders."""
+        shared = _result("shared", source_id="s", score=0.6)
+        list_a = [_result("a", source_id="a", score=0.9), shared]
+        list_b = [_result("b", source_id="b", score=0.9), shared]
+
+        fused = rag_service._combine_results(list_a, list_b, rank_constant=60)
+
+        assert fused[0]["content"] == "shared"
+        assert fused[0]["fusion_score"] == pytest.approx(2 / 62)
+        assert {r["content"] for r in fused} == {"shared", "a", "b"}
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_duplicates_keep_best_similarity(self, rag_service):
+        """Duplicates collapse and keep their highest similarity score."""
+        fused = rag_service._combine_results(
+            [_result("x", source_id="d1", score=0.4, chunk_index=0)],
+            [_result("x", source_id="d1", score=0.8, chunk_index=0)],
+        )
+
+        assert len(fused) == 1
+        assert fused[0]["similarity_score"] == 0.8
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_chunks_of_one_document_stay_distinct(self, rag_service):
+        """Different chunks of the same document are not merged."""
+        fused = rag_service._combine_results(
+            [
+                _result("first", source_id="d1", chunk_index=0),
+                _result("second", source_id="d1", chunk_index=1),
+            ],
+        )
+
+        assert len(fused) == 2
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_results_without_ids_dedup_by_content(self, rag_service):
+        """Results without a source id are identified by their content."""
+        fused = rag_service._combine_results(
+            [_result("same text")],
+            [_result("same text"), _result("other text")],
+        )
+
+        assert [r["content"] for r in fused] == ["same text", "other text"]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_fused_order_survives_ranking(self, rag_service):
+        """Ranking orders fused results by their fused score, not similarity."""
+        config = RAGConfig(
+            name="Fusion",
+            description="Fused ranking",
+            similarity_threshold=0.0,
+            freshness_weight=0.0,
+            authority_weight=0.0,
+        )
+        shared = _result("shared", source_id="s", score=0.5)
+        fused = rag_service._combine_results(
+            [_result("a", source_id="a", score=0.95), shared],
+            [_result("b", source_id="b", score=0.9), shared],
+        )
+
+        ranked = await rag_service._process_results(
+            fused, RAGRequest(query="unrelated"), config
+        )
+
+        assert ranked[0].content == "shared"
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_single_list_keeps_similarity(self, rag_service):
+        """Results of one sub-query are not fused and rank by similarity."""
+        config = RAGConfig(
+            name="Semantic",
+            description="Single list",
+            similarity_threshold=0.0,
+            freshness_weight=0.0,
+            authority_weight=0.0,
+        )
+        combined = rag_service._combine_results(
+            [
+                _result("a", source_id="a", score=0.9),
+                _result("b", source_id="b", score=0.8),
+            ],
+            [],
+        )
+
+        ranked = await rag_service._process_results(
+            combined, RAGRequest(query="unrelated"), config
+        )
+
+        assert all("fusion_score" not in r for r in combined)
+        assert [r.ranking_score for r in ranked] == pytest.approx([0.36, 0.32])
+
+
+class TestSemanticResponseCache:
+    """Test class for the semantic RAG response cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a small semantic cache."""
+        return SemanticResponseCache(max_entries=2, max_scopes=2, ttl_seconds=60)
+
+    @pytest.fixture
+    def rag_service(self, cache):
+        """Create RAG service using an isolated semantic cache."""
+        service = RAGService()
+        service.semantic_cache = cache
+        service._cache_enabled = False
+        return service
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_similar_query_hits_within_scope(self, cache):
+        """A nearby query vector hits; other scopes and far queries miss."""
+        cache.store("scope", [1.0, 0.0, 0.0], "answer", ["doc-1"])
+
+        assert cache.lookup("scope", [0.99, 0.05, 0.0], 0.95)[0] == "answer"
+        assert cache.lookup("scope", [0.0, 1.0, 0.0], 0.95) is None
+        assert cache.lookup("other", [1.0, 0.0, 0.0], 0.95) is None
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_invalidation_by_document(self, cache):
+        """Responses citing a reprocessed document are dropped."""
+        cache.store("scope", [1.0, 0.0], "cites doc-1", ["doc-1"])
+        cache.store("scope", [0.0, 1.0], "cites doc-2", ["doc-2"])
+
+        assert cache.invalidate_documents(["doc-1"]) == 1
+        assert cache.lookup("scope", [1.0, 0.0], 0.95) is None
+        assert cache.lookup("scope", [0.0, 1.0], 0.95)[0] == "cites doc-2"
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_invalidation_reaches_other_workers(self, cache):
+        """Invalidations are published and applied by the other workers."""
+        published = []
+        cache._publisher = SimpleNamespace(
+            publish=lambda channel, payload: published.append((channel, payload)),
+        )
+        other = SemanticResponseCache(max_entries=2, max_scopes=2, ttl_seconds=60)
+        other.store("scope", [1.0, 0.0], "cites doc-1", ["doc-1"])
+
+        cache.invalidate_documents(["doc-1"])
+
+        ((channel, payload),) = published
+        assert channel == cache.channel
+        other.apply(json.loads(payload))
+        assert other.lookup("scope", [1.0, 0.0], 0.95) is None
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        """A full scope evicts its least recently used response."""
+        cache.store("scope", [1.0, 0.0, 0.0], "a", ["doc-a"])
+        cache.store("scope", [0.0, 1.0, 0.0], "b", ["doc-b"])
+        cache.lookup("scope", [1.0, 0.0, 0.0], 0.95)
+        cache.store("scope", [0.0, 0.0, 1.0], "c", ["doc-c"])
+
+        assert cache.lookup("scope", [0.0, 1.0, 0.0], 0.95) is None
+        assert cache.lookup("scope", [1.0, 0.0, 0.0], 0.95)[0] == "a"
+        # The evicted entry no longer answers invalidations
+        assert cache.invalidate_documents(["doc-b"]) == 0
+        assert cache.get_statistics()["evictions"] == 1
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_scope_index_grows_on_demand(self):
+        """A scope allocates rows as it fills, up to max_entries."""
+        cache = SemanticResponseCache(max_entries=20, max_scopes=1, ttl_seconds=60)
+        cache.store("scope", [1.0, 0.0], "first", [])
+        assert cache._scopes["scope"].vectors.shape[0] < 20
+
+        for i in range(1, 25):
+            cache.store("scope", [1.0, float(i)], f"r{i}", [])
+
+        assert cache._scopes["scope"].vectors.shape[0] == 20
+        assert len(cache) == 20
+        assert cache.lookup("scope", [1.0, 24.0], 0.999)[0] == "r24"
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_paraphrased_request_reuses_response(self, rag_service):
+        """A paraphrased query is served from cache without retrieval."""
+        config = RAGConfig(name="Cached", description="Semantic cache")
+        raw = [
+            {
+                "content": "reset your password from settings",
+                "source": "knowledge_base",
+                "source_type": "document",
+                "source_id": "doc-1",
+                "similarity_score": 0.9,
+            },
+        ]
+        embeddings = {
+            "how do i reset my password": [1.0, 0.0],
+            "how can i reset my password": [0.99, 0.02],
+        }
+
+        with (
+            patch.object(
+                rag_service,
+                "_embed_query",
+                AsyncMock(side_effect=lambda query: embeddings[query]),
+            ),
+            patch.object(
+                rag_service,
+                "_perform_retrieval",
+                AsyncMock(return_value=raw),
+            ) as retrieval,
+        ):
+            first = await rag_service.retrieve(
+                RAGRequest(query="how do i reset my password", user_id="u1"),
+                config,
+            )
+            second = await rag_service.retrieve(
+                RAGRequest(query="how can i reset my password", user_id="u1"),
+                config,
+            )
+
+        retrieval.assert_awaited_once()
+        assert isinstance(second.results[0], RAGResult)
+        assert second.cache_hit is True
+        assert second.query == "how can i reset my password"
+        assert second.metadata["cached_query"] == first.query
+        assert rag_service.semantic_cache.invalidate_documents(["doc-1"]) == 1
@@ -0,0 +1,263 @@
+"""
+Unit tests for Weaviate Service.
+
+This module tests the Weaviate service functionality including:
+- Batch ingestion with per-object error reporting
+- Deterministic object UUIDs for safe retries
+- BM25 keyword search over chunk content
+- Non-blocking async facade with per-call timeouts
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app.services.weaviate_service import (
+    AsyncWeaviateService,
+    WeaviateService,
+)
+
+
+class TestWeaviateBatchIngestion:
+    """Test class for WeaviateService batch ingestion."""
+
+    @pytest.fixture
+    def collection(self):
+        """Mock v4 collection with a batch context manager."""
+        collection = MagicMock()
+        collection.batch.failed_objects = []
+        return collection
+
+    @pytest.fixture
+    def service(self, collection, monkeypatch):
+        """Create WeaviateService with a mocked client."""
+        monkeypatch.setenv("TESTING", "1")
+        service = WeaviateService()
+        service.client = MagicMock()
+        service.client.collections.get.return_value = collection
+        return service
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_add_document_chunks_uses_fixed_size_batch(self, service, collection):
+        """Chunks are sent through one fixed-size batch with their vectors."""
+        chunks = [
+            {
+                "chunk_id": f"c{i}",
+                "chunk_index": i,
+                "content": f"text {i}",
+                "embedding": [0.1, 0.2],
+                "metadata": {"title": "Doc"},
+            }
+            for i in range(3)
+        ]
+
+        result = service.add_document_chunks("doc-1", chunks, batch_size=50)
+
+        collection.batch.fixed_size.assert_called_once_with(
+            batch_size=50,
+            concurrent_requests=service.batch_concurrent_requests,
+        )
+        batch = collection.batch.fixed_size.return_value.__enter__.return_value
+        assert batch.add_object.call_count == 3
+        first_call = batch.add_object.call_args_list[0].kwargs
+        assert first_call["vector"] == [0.1, 0.2]
+        assert first_call["uuid"] == service.object_uuid("doc-1", 0)
+        assert first_call["properties"]["source"] == "Doc"
+        assert result.total == 3
+        assert result.succeeded == 3
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_dynamic_batching_when_size_is_zero(self, service, collection):
+        """A batch size of 0 selects the client's dynamic batching."""
+        service.index_messages(
+            [
+                {
+                    "conversation_id": "conv",
+                    "message_id": "m1",
+                    "content": "hi",
+                    "role": "user",
+                },
+            ],
+            batch_size=0,
+        )
+
+        collection.batch.dynamic.assert_called_once_with()
+        collection.batch.fixed_size.assert_not_called()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_reports_per_object_errors(self, service, collection):
+        """Failed objects are reported with their UUID and message."""
+        collection.batch.failed_objects = [
+            SimpleNamespace(message="bad vector", object_=SimpleNamespace(uuid="u2")),
+        ]
+        objects = [
+            {"properties": {"content": "a"}, "uuid": "u1"},
+            {"properties": {"content": "b"}, "uuid": "u2"},
+        ]
+
+        result = service.batch_insert("Knowledge", objects)
+
+        assert result.succeeded == 1
+        assert result.failed_uuids == {"u2"}
+        assert result.failed[0]["error"] == "bad vector"
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_object_uuid_is_deterministic(self, service):
+        """The same document/chunk pair always maps to the same UUID."""
+        assert service.object_uuid("doc", 1) == service.object_uuid("doc", 1)
+        assert service.object_uuid("doc", 1) != service.object_uuid("doc", 2)
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_without_client_everything_fails(self, service):
+        """Without a client every object is reported as failed."""
+        service.client = None
+
+        result = service.batch_insert("Knowledge", [{"properties": {}, "uuid": "u"}])
+
+        assert result.failed_uuids == {"u"}
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_delete_document_chunks_filters_by_document(self, service, collection):
+        """Deleting a document removes its chunks with one filtered delete."""
+        collection.data.delete_many.return_value = SimpleNamespace(successful=3)
+
+        assert service.delete_document_chunks("doc-1") == 3
+        where = collection.data.delete_many.call_args.kwargs["where"]
+        assert where is not None
+
+
+class TestAsyncWeaviateService:
+    """Test class for the non-blocking Weaviate facade."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        """Create WeaviateService with a mocked client."""
+        monkeypatch.setenv("TESTING", "1")
+        service = WeaviateService()
+        service.client = MagicMock()
+        return service
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_calls_run_off_the_event_loop(self, service):
+        """Searches execute on the worker pool, not the event loop thread."""
+        threads = []
+
+        def fake_search(query, limit):
+            threads.append(threading.current_thread().name)
+            return [{"content": query}]
+
+        service.semantic_search_knowledge = fake_search
+        async_service = AsyncWeaviateService(service, max_workers=2)
+
+        result = await async_service.semantic_search_knowledge("hello", limit=3)
+
+        assert result == [{"content": "hello"}]
+        assert threads[0].startswith("weaviate")
+        async_service.shutdown()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.asyncio
+    async def test_timeout_returns_default(self, service):
+        """A call exceeding its deadline returns the empty default."""
+        release = threading.Event()
+
+        def slow_search(query, limit):
+            release.wait(1)
+            return [{"content": query}]
+
+        service.semantic_search_knowledge = slow_search
+        async_service = AsyncWeaviateService(service, max_workers=1)
+
+        result = await async_service.semantic_search_knowledge("hello", timeout=0.01)
+
+        assert result == []
+        release.set()
+        async_service.shutdown()
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_search_similar_filters_and_scores(self, service):
+        """Vector search applies equality filters and converts distance."""
+        collection = service.client.collections.get.return_value
+        collection.query.near_vector.return_value = SimpleNamespace(
+            objects=[
+                SimpleNamespace(
+                    properties={"chunk_id": "c1", "content": "text"},
+                    metadata=SimpleNamespace(distance=0.25),
+                    vector={"default": [0.1, 0.2]},
+                ),
+            ],
+        )
+
+        results = service.search_similar(
+            [0.1, 0.2],
+            limit=5,
+            filters={"user_id": "u1", "year": {"operator": "Between"}},
+        )
+
+        kwargs = collection.query.near_vector.call_args.kwargs
+        assert kwargs["filters"] is not None
+        assert kwargs["include_vector"] is True
+        assert results[0]["chunk_id"] == "c1"
+        assert results[0]["score"] == pytest.approx(0.75)
+        assert results[0]["vector"] == [0.1, 0.2]
+
+    @pytest.mark.fast
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_keyword_search_uses_bm25_on_content(self, service):
+        """Keyword search queries the BM25 index of chunk content."""
+        collection = service.client.collections.get.return_value
+        collection.query.bm25.return_value = SimpleNamespace(
+            objects=[
+                SimpleNamespace(
+                    properties={"chunk_id": "c1", "doc_id": "d1", "content": "text"},
+                    metadata=SimpleNamespace(score=4.2),
+                    vector={"default": [0.3, 0.4]},
+                ),
+            ],
+        )
+
+        results = service.keyword_search_knowledge(
+            "batch ingestion",
+            limit=5,
+            filters={"user_id": "u1"},
+        )
+
+        kwargs = collection.query.bm25.call_args.kwargs
+        assert kwargs["query"] == "batch ingestion"
+        assert kwargs["query_properties"] == ["content"]
+        assert kwargs["filters"] is not None
+        assert kwargs["include_vector"] is True
+        assert results == [
+            {
+                "chunk_id": "c1",
+                "doc_id": "d1",
+                "chunk_index": None,
+                "content": "text",
+                "source": None,
+                "metadata": {},
+                "score": 4.2,
+                "vector": [0.3, 0.4],
+            },
+        ]
@@ -0,0 +1,185 @@
+"""
+Unit tests for cross-worker WebSocket fan-out.
+
+This module tests the fan-out functionality including:
+- Per-conversation and per-user Redis channels
+- Skipping events published by the same worker
+- Delivering remote events to local connections only
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.app.services.websocket_fanout import (
+    CONVERSATION,
+    USER,
+    FanoutBackend,
+    RedisFanout,
+    create_fanout_backend,
+)
+
+
+class RecordingFanout(FanoutBackend):
+    """Fan-out backend recording published events and subscriptions."""
+
+    def __init__(self):
+        super().__init__()
+        self.published = []
+        self.channels = set()
+
+    async def publish(self, kind, key, event):
+        self.published.append((kind, key, event))
+
+    async def subscribe(self, kind, key):
+        self.channels.add((kind, key))
+
+    async def unsubscribe(self, kind, key):
+        self.channels.discard((kind, key))
+
+
+def make_websocket():
+    """Create a WebSocket mock recording sent frames."""
+    websocket = MagicMock()
+    websocket.accept = AsyncMock()
+    websocket.send_text = AsyncMock()
+    return websocket
+
+
+class TestRedisFanout:
+    """Test class for the Redis pub/sub backend."""
+
+    @pytest.fixture
+    def fanout(self):
+        """Create RedisFanout with a mocked Redis client."""
+        fanout = RedisFanout(redis_url="redis://localhost:6379", channel_prefix="ws")
+        fanout._redis = MagicMock()
+        fanout._redis.publish = AsyncMock()
+        fanout._pubsub = MagicMock()
+        fanout._pubsub.subscribe = AsyncMock()
+        fanout._pubsub.unsubscribe = AsyncMock()
+        return fanout
+
+    @pytest.mark.asyncio
+    async def test_publish_uses_conversation_channel(self, fanout):
+        """Events are published on the conversation's own channel."""
+        await fanout.publish(CONVERSATION, "conv-123", {"message": "hi"})
+
+        channel, payload = fanout._redis.publish.await_args.args
+        assert channel == "ws:conversation:conv-123"
+        assert json.loads(payload) == {"message": "hi", "origin": fanout.worker_id}
+
+    @pytest.mark.asyncio
+    async def test_subscribes_once_per_channel(self, fanout):
+        """Repeated subscriptions to a channel are sent to Redis once."""
+        await fanout.subscribe(USER, "user-123")
+        await fanout.subscribe(USER, "user-123")
+        await fanout.unsubscribe(USER, "user-123")
+
+        fanout._pubsub.subscribe.assert_awaited_once_with("ws:user:user-123")
+        fanout._pubsub.unsubscribe.assert_awaited_once_with("ws:user:user-123")
+        assert fanout.get_statistics()["channels"] == 0
+
+    @pytest.mark.asyncio
+    async def test_listener_skips_own_events(self, fanout):
+        """Only events published by other workers reach the handler."""
+        own = json.dumps({"message": "own", "origin": fanout.worker_id})
+        remote = json.dumps({"message": "remote", "origin": "other-worker"})
+        messages = [
+            {"type": "message", "data": own},
+            {"type": "message", "data": remote},
+        ]
+        received = []
+
+        async def get_message(timeout):
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(timeout)
+
+        async def handler(event):
+            received.append(event["message"])
+
+        fanout._pubsub.get_message = get_message
+        fanout._handler = handler
+        await fanout.subscribe(CONVERSATION, "conv-123")
+
+        listener = asyncio.create_task(fanout._listen())
+        await asyncio.sleep(0.01)
+        listener.cancel()
+
+        assert received == ["remote"]
+        assert fanout.stats["received"] == 1
+
+    def test_unknown_backend_falls_back_to_local(self):
+        """An unknown backend name selects in-process fan-out."""
+        assert type(create_fanout_backend("kafka")) is FanoutBackend
+
+
+class TestConnectionManagerFanout:
+    """Test class for ConnectionManager cross-worker delivery."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_is_published(self):
+        """Broadcasts are delivered locally and published once."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionManager
+
+        fanout = RecordingFanout()
+        manager = ConnectionManager(fanout=fanout)
+        websocket = make_websocket()
+        await manager.connect(websocket, "user-123", "conv-123")
+        assert fanout.channels == {(CONVERSATION, "conv-123"), (USER, "user-123")}
+
+        await manager.broadcast_to_conversation("hello", "conv-123")
+        await asyncio.sleep(0)
+
+        websocket.send_text.assert_awaited_with("hello")
+        [(kind, key, event)] = fanout.published
+        assert (kind, key) == (CONVERSATION, "conv-123")
+        assert event["message"] == "hello"
+
+        manager.disconnect("user-123", "conv-123")
+        await asyncio.sleep(0)
+        assert fanout.channels == set()
+
+    @pytest.mark.asyncio
+    async def test_personal_message_for_remote_user_is_published(self):
+        """Messages for users without a local connection go to their channel."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionManager
+
+        fanout = RecordingFanout()
+        manager = ConnectionManager(fanout=fanout)
+
+        await manager.send_personal_message("update", "user-456", "conv-123")
+
+        [(kind, key, event)] = fanout.published
+        assert (kind, key) == (USER, "user-456")
+        assert event["conversation_id"] == "conv-123"
+
+    @pytest.mark.asyncio
+    async def test_remote_event_reaches_local_sockets(self):
+        """Events from other workers respect the excluded user."""
+        from backend.app.api.v1.endpoints.websocket import ConnectionManager
+
+        manager = ConnectionManager(fanout=RecordingFanout())
+        sender, receiver = make_websocket(), make_websocket()
+        await manager.connect(sender, "user-123", "conv-123")
+        await manager.connect(receiver, "user-456", "conv-123")
+        sender.send_text.reset_mock()
+        receiver.send_text.reset_mock()
+
+        await manager._on_fanout_event(
+            {
+                "kind": CONVERSATION,
+                "conversation_id": "conv-123",
+                "message": "typing",
+                "exclude_user": "user-123",
+            }
+        )
+        await asyncio.sleep(0)
+
+        sender.send_text.assert_not_called()
+        receiver.send_text.assert_awaited_once_with("typing")
+        manager.disconnect("user-123", "conv-123")
+        manager.disconnect("user-456", "conv-123")
@@ -0,0 +1,159 @@
+"""
+Unit tests for audit metrics aggregation.
+
+This module tests the audit metrics functionality including:
+- Folding events into the in-process buffer
+- Flushing the buffer to Redis in a single pipeline
+- Averages derived from atomic sum and count fields
+- Stopping the monitor and flushing on shutdown
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from backend.app.core.audit_monitoring import (
+    AuditMetrics,
+    AuditMetricsBuffer,
+    AuditPerformanceMonitor,
+    _duration_bucket,
+)
+from backend.app.models.audit_extended import AuditEventType
+
+
+class FakePipeline:
+    """Pipeline applying hash increments to a dict."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def hincrby(self, key, field, amount):
+        self.commands.append(("hincrby", key, field, amount))
+
+    def hincrbyfloat(self, key, field, amount):
+        self.commands.append(("hincrbyfloat", key, field, amount))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    def execute(self):
+        self.redis_client.executed += 1
+        for command, key, *args in self.commands:
+            if command == "expire":
+                continue
+            fields = self.redis_client.hashes.setdefault(key, {})
+            fields[args[0]] = fields.get(args[0], 0) + args[1]
+
+
+class FakeRedis:
+    """Redis client holding hashes in memory and counting round trips."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.executed = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hmget(self, key, *fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def metrics(redis_client):
+    return AuditMetrics(db=None, redis_client=redis_client)
+
+
+class TestAuditMetricsBuffer:
+    """Test the in-process aggregation buffer."""
+
+    def test_record_and_drain(self):
+        """Events are folded into increments and drained once."""
+        buffer = AuditMetricsBuffer()
+        buffer.record(counts=[("events", "total")], sums=[("duration", "sum", 2.5)])
+        buffer.record(counts=[("events", "total")], sums=[("duration", "sum", 1.5)])
+
+        counts, sums, _, events = buffer.drain()
+
+        assert events == 2
+        assert counts["events"]["total"] == 2
+        assert sums["duration"]["sum"] == 4.0
+        assert len(buffer) == 0
+
+    def test_duration_bucket(self):
+        """Durations map to the smallest bucket bound they fit under."""
+        assert _duration_bucket(3) == "le_5"
+        assert _duration_bucket(100) == "le_100"
+        assert _duration_bucket(101) == "le_250"
+        assert _duration_bucket(60000) == "le_inf"
+
+
+class TestAuditMetrics:
+    """Test buffered recording and flushing of audit metrics."""
+
+    @pytest.mark.asyncio
+    async def test_events_are_flushed_in_one_pipeline(self, metrics, redis_client):
+        """Recording does not touch Redis; a flush is one round trip."""
+        for duration in (100, 200, 300):
+            await metrics.record_audit_event(AuditEventType.LOGIN_SUCCESS, duration)
+        await metrics.record_audit_event(
+            AuditEventType.LOGIN_SUCCESS, 400, success=False
+        )
+
+        assert redis_client.executed == 0
+        assert metrics.flush() == 4
+        assert redis_client.executed == 1
+        assert metrics.flush() == 0
+
+        events = next(
+            fields
+            for key, fields in redis_client.hashes.items()
+            if key.startswith("audit_metrics:events:")
+        )
+        event = AuditEventType.LOGIN_SUCCESS.value
+        assert events[f"total_{event}"] == 4
+        assert events[f"success_{event}"] == 3
+        assert events[f"failed_{event}"] == 1
+
+        await metrics.close()
+
+    @pytest.mark.asyncio
+    async def test_average_duration_from_sum_and_count(self, metrics):
+        """The average is derived from the flushed sum and count."""
+        for duration in (100, 200, 600):
+            await metrics.record_audit_event(AuditEventType.LOGIN_SUCCESS, duration)
+        metrics.flush()
+
+        assert metrics.get_average_duration(AuditEventType.LOGIN_SUCCESS) == (300.0, 3)
+        assert metrics.get_average_duration(AuditEventType.LOGOUT) is None
+
+        await metrics.close()
+
+
+class TestAuditPerformanceMonitor:
+    """Test the monitor's lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_tasks_and_flushes(self, metrics, redis_client):
+        """Stopping the monitor ends its tasks and flushes buffered events."""
+        with patch(
+            "backend.app.core.audit_monitoring.AuditMetrics", return_value=metrics
+        ):
+            monitor = AuditPerformanceMonitor(db=None)
+        await monitor.start_monitoring()
+        tasks = list(monitor._tasks)
+        await metrics.record_audit_event(AuditEventType.LOGIN_SUCCESS, 100)
+        await asyncio.sleep(0)
+
+        await monitor.stop_monitoring()
+
+        assert all(task.done() for task in tasks)
+        assert len(metrics.buffer) == 0
+        assert redis_client.executed >= 1
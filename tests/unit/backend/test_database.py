@@ -22,3 +22,39 @@ def test_database_initialization():
         assert True  # noqa: S101
     except Exception as e:  # noqa: BLE001
         pytest.fail(f"Database initialization failed: {e}")
+
+
+@pytest.mark.parametrize(
+    ("database_url", "expected"),
+    [
+        ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+        ("postgresql+asyncpg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ],
+)
+def test_async_database_url_uses_async_driver(monkeypatch, database_url, expected):
+    """The async engine URL swaps in the asyncio driver."""
+    from backend.app.core import database
+
+    db_settings = database.get_settings().database
+    monkeypatch.setattr(db_settings, "database_url", database_url)
+    monkeypatch.setattr(db_settings, "database_async_url", None)
+
+    assert database.get_async_database_url() == expected  # noqa: S101
+
+
+@pytest.mark.asyncio
+async def test_async_session_executes_queries():
+    """Async sessions from get_async_db run queries on the event loop."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import text
+
+    from backend.app.core.database import close_async_db, get_async_db
+
+    try:
+        async for db in get_async_db():
+            result = await db.execute(text("SELECT 1"))
+            assert result.scalar() == 1  # noqa: S101
+    finally:
+        await close_async_db()
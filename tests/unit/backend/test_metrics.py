@@ -0,0 +1,157 @@
+"""
+Unit tests for the metrics registry.
+
+This module tests the metrics functionality including:
+- Pre-aggregated counters, gauges and histograms
+- Quantile accuracy over every observation
+- Series bounds and the Prometheus text exposition
+"""
+
+import random
+import statistics
+
+import pytest
+
+from backend.app.monitoring.core.metrics import (
+    QUANTILE_ACCURACY,
+    Histogram,
+    MetricsCollector,
+    MetricType,
+    label_key,
+)
+
+
+class TestHistogram:
+    """Test the histogram used by timers and histograms."""
+
+    def test_statistics_match_exact_values(self):
+        """Count, sum, mean and spread are exact."""
+        values = [0.1, 0.2, 0.3, 0.4, 2.0]
+        histogram = Histogram()
+        for value in values:
+            histogram.observe(value)
+
+        stats = histogram.statistics()
+        assert stats["count"] == 5
+        assert stats["min"] == 0.1
+        assert stats["max"] == 2.0
+        assert stats["sum"] == pytest.approx(sum(values))
+        assert stats["mean"] == pytest.approx(statistics.mean(values))
+        assert stats["std_dev"] == pytest.approx(statistics.stdev(values))
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Quantiles stay within the configured relative error."""
+        rng = random.Random(42)
+        values = sorted(rng.lognormvariate(-3, 1) for _ in range(10000))
+        histogram = Histogram()
+        for value in values:
+            histogram.observe(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[round(q * (len(values) - 1))]
+            assert histogram.quantile(q) == pytest.approx(
+                exact, rel=QUANTILE_ACCURACY * 1.5
+            )
+
+    def test_cumulative_buckets(self):
+        """Exported buckets are cumulative and end with +Inf."""
+        histogram = Histogram(bounds=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative_buckets() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+
+    def test_merge(self):
+        """Merged histograms summarize both sets of observations."""
+        first, second = Histogram(), Histogram()
+        first.observe(1.0)
+        second.observe(3.0)
+
+        first.merge(second)
+
+        assert first.statistics()["count"] == 2
+        assert first.statistics()["mean"] == pytest.approx(2.0)
+
+
+class TestMetricsCollector:
+    """Test the pre-aggregated metrics registry."""
+
+    def test_counter_accumulates_per_label_set(self):
+        """Counters keep one running total per label set."""
+        collector = MetricsCollector()
+        collector.increment_counter("requests", tags={"route": "/a", "method": "GET"})
+        collector.increment_counter("requests", tags={"method": "GET", "route": "/a"})
+        collector.increment_counter("requests", tags={"route": "/b", "method": "GET"})
+
+        assert collector.get_total("requests") == 3
+        assert collector.get_total("requests", tags={"route": "/a"}) == 2
+        assert len(collector.get_metrics(name="requests")) == 2
+
+    def test_gauge_keeps_last_value(self):
+        """Gauges report the last value set."""
+        collector = MetricsCollector()
+        collector.set_gauge("cpu_percent", 10.0, tags={"component": "system"})
+        collector.set_gauge("cpu_percent", 20.0, tags={"component": "system"})
+
+        metrics = collector.get_metrics(
+            name="cpu_percent", tags={"component": "system"}, limit=1
+        )
+        assert metrics[-1].value == 20.0
+
+    def test_timer_statistics(self):
+        """Timer statistics cover every observation of all series."""
+        collector = MetricsCollector()
+        for duration in (0.1, 0.2, 0.3):
+            collector.record_timer("latency", duration, tags={"route": "/a"})
+        collector.record_timer("latency", 0.4, tags={"route": "/b"})
+
+        stats = collector.get_statistics("latency", MetricType.TIMER)
+
+        assert stats["count"] == 4
+        assert stats["mean"] == pytest.approx(0.25)
+        assert collector.get_histogram("latency", tags={"route": "/b"}).count == 1
+
+    def test_series_are_bounded(self):
+        """Observations for series beyond the bound are dropped."""
+        collector = MetricsCollector(max_metrics=2)
+        for i in range(5):
+            collector.increment_counter("requests", tags={"user": str(i)})
+        collector.increment_counter("requests", tags={"user": "0"})
+
+        assert collector.get_total("requests") == 3
+        assert collector.dropped_observations == 3
+        assert collector.get_metric_summary()["total_metrics"] == 2
+
+    def test_prometheus_exposition(self):
+        """Counters, gauges and histograms are exposed in the text format."""
+        collector = MetricsCollector()
+        collector.increment_counter(
+            "http_requests_total", tags={"route": "/users/{user_id}"}
+        )
+        collector.set_gauge("memory.percent", 42.5)
+        collector.record_timer("http_request_duration_seconds", 0.02)
+
+        text = collector.export_metrics("prometheus")
+
+        assert "# TYPE http_requests_total counter" in text
+        assert 'http_requests_total{route="/users/{user_id}"} 1' in text
+        assert "# TYPE memory_percent gauge" in text
+        assert "memory_percent 42.5" in text
+        assert "# TYPE http_request_duration_seconds histogram" in text
+        assert 'http_request_duration_seconds_bucket{le="0.025"} 1' in text
+        assert 'http_request_duration_seconds_bucket{le="+Inf"} 1' in text
+        assert "http_request_duration_seconds_count 1" in text
+
+    def test_label_values_are_escaped(self):
+        """Quotes and backslashes in label values are escaped."""
+        collector = MetricsCollector()
+        collector.increment_counter("errors", tags={"error": 'bad "value"\\'})
+
+        assert 'errors_total{error="bad \\"value\\"\\\\"} 1' in collector.export_metrics(
+            "prometheus"
+        )
+
+    def test_label_key_is_order_independent(self):
+        """Label sets map to the same key regardless of order."""
+        assert label_key({"a": "1", "b": "2"}) == label_key({"b": "2", "a": "1"})
+        assert label_key(None) == ()
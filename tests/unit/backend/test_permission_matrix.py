@@ -0,0 +1,130 @@
+"""
+Unit tests for the compiled permission matrix.
+
+This module tests the permission matrix functionality including:
+- Interning permissions to bits and decoding masks
+- Role and group masks, including the wildcard
+- Versioned recompilation of group masks
+"""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from backend.app.core.permission_matrix import (
+    ROLE_PERMISSIONS,
+    PermissionMatrix,
+)
+from backend.app.models.user import User, UserGroup, UserRole
+
+
+def make_group(group_id="group-1", permissions=None, updated_at=None):
+    return SimpleNamespace(
+        id=group_id,
+        permissions=permissions,
+        updated_at=updated_at,
+    )
+
+
+class TestPermissionMatrix:
+    """Test bit interning and role and group masks."""
+
+    def test_role_masks_match_role_permissions(self):
+        """Every role mask decodes to the role's permissions."""
+        matrix = PermissionMatrix()
+        for role, permissions in ROLE_PERMISSIONS.items():
+            assert matrix.names(matrix.role_mask(role)) == set(permissions)
+
+    def test_role_enum_and_value_are_equivalent(self):
+        """Roles can be given as enum members or values."""
+        matrix = PermissionMatrix()
+        assert matrix.role_mask(UserRole.MANAGER) == matrix.role_mask("manager")
+        assert matrix.role_mask("unknown") == 0
+
+    def test_allows(self):
+        """Checks are bit tests against the mask."""
+        matrix = PermissionMatrix()
+        mask = matrix.role_mask(UserRole.USER)
+
+        assert matrix.allows(mask, "conversation:write")
+        assert not matrix.allows(mask, "user:delete")
+        # Never interned, so no role or group grants it
+        assert not matrix.allows(mask, "does:not_exist")
+
+    def test_wildcard_allows_everything(self):
+        """The wildcard grants permissions that were never interned."""
+        matrix = PermissionMatrix()
+        mask = matrix.role_mask(UserRole.SUPER_ADMIN)
+        assert matrix.allows(mask, "does:not_exist")
+
+    def test_group_permissions_are_interned(self):
+        """Group permissions outside every role get their own bits."""
+        matrix = PermissionMatrix()
+        group = make_group(permissions=["report:export"])
+
+        mask = matrix.user_mask(UserRole.GUEST, [group])
+
+        assert matrix.allows(mask, "report:export")
+        assert matrix.allows(mask, "assistant:read")
+        assert matrix.get_statistics()["groups"] == 1
+
+    def test_group_mask_reused_until_group_changes(self):
+        """A group's mask is recompiled only when its version changes."""
+        matrix = PermissionMatrix()
+        updated_at = datetime.now(UTC)
+        group = make_group(permissions=["report:read"], updated_at=updated_at)
+        matrix.group_mask(group)
+
+        # Same version: the compiled mask is kept
+        group.permissions = ["report:write"]
+        assert matrix.allows(matrix.group_mask(group), "report:read")
+
+        # Newer version: the mask is recompiled
+        group.updated_at = updated_at + timedelta(seconds=1)
+        mask = matrix.group_mask(group)
+        assert matrix.allows(mask, "report:write")
+        assert not matrix.allows(mask, "report:read")
+
+    def test_never_updated_group_versioned_by_permissions(self):
+        """Groups without updated_at are recompiled when permissions change."""
+        matrix = PermissionMatrix()
+        group = make_group(permissions=["report:read"])
+        matrix.group_mask(group)
+
+        group.permissions = ["report:write"]
+        assert matrix.allows(matrix.group_mask(group), "report:write")
+
+    def test_invalidate(self):
+        """Invalidation drops compiled group masks."""
+        matrix = PermissionMatrix()
+        group = make_group(permissions=["report:read"], updated_at=datetime.now(UTC))
+        matrix.group_mask(group)
+
+        matrix.invalidate_group("group-1")
+        assert matrix.get_statistics()["groups"] == 0
+
+        matrix.group_mask(group)
+        matrix.invalidate()
+        stats = matrix.get_statistics()
+        assert stats["groups"] == 0
+        assert stats["generation"] == 1
+
+
+class TestUserPermissions:
+    """Test User permission checks backed by the matrix."""
+
+    def test_role_permission(self):
+        """Role permissions are granted without consulting groups."""
+        user = User(role=UserRole.ADMIN)
+        assert user.has_permission("user:delete")
+        assert not user.has_permission("system:shutdown")
+
+    def test_group_permission(self):
+        """Group permissions extend the role's permissions."""
+        user = User(role=UserRole.USER)
+        user.groups = []
+        assert not user.has_permission("report:read")
+
+        user.groups = [UserGroup(name="Reports", permissions=["report:read"])]
+        assert user.has_permission("report:read")
+        assert "report:read" in user.get_effective_permissions()
+        assert "conversation:write" in user.get_effective_permissions()
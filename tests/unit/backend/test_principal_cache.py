@@ -0,0 +1,288 @@
+"""
+Unit tests for the authenticated principal cache.
+
+This module tests the principal cache functionality including:
+- Immutable user snapshots
+- TTL, token expiry and LRU bounds
+- Invalidation by user and token, locally and across workers
+- Loading the user once per request on a cache miss
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from jose import jwt
+
+from backend.app.core.config import get_settings
+from backend.app.core.principal_cache import (
+    Principal,
+    PrincipalCache,
+    token_cache_key,
+)
+from backend.app.core.security import (
+    create_access_token,
+    decode_token,
+    get_current_principal,
+    get_current_user,
+)
+
+
+def make_principal(user_id="user-1", permissions=("conversation:read",)):
+    return Principal(
+        id=user_id,
+        email=f"{user_id}@example.com",
+        username=user_id,
+        role="user",
+        organization_id=None,
+        group_ids=frozenset(),
+        permissions=frozenset(permissions),
+    )
+
+
+class TestPrincipal:
+    """Test user snapshots."""
+
+    def test_from_user(self):
+        """The snapshot carries ids, groups and effective permissions."""
+        user = SimpleNamespace(
+            id="user-1",
+            email="user@example.com",
+            username="user",
+            role="manager",
+            organization_id="org-1",
+            groups=[SimpleNamespace(id="group-1"), SimpleNamespace(id="group-2")],
+            is_active=True,
+            get_effective_permissions=lambda: ["group:read", "report:read"],
+        )
+
+        principal = Principal.from_user(user)
+
+        assert principal.id == "user-1"
+        assert principal.organization_id == "org-1"
+        assert principal.group_ids == frozenset({"group-1", "group-2"})
+        assert principal.has_permission("report:read")
+        assert not principal.has_permission("user:delete")
+
+    def test_is_immutable(self):
+        """Cached snapshots cannot be modified by a request."""
+        principal = make_principal()
+        with pytest.raises(AttributeError):
+            principal.role = "admin"
+
+    def test_wildcard_permission(self):
+        """The wildcard grants every permission."""
+        assert make_principal(permissions=("*",)).has_permission("anything:at_all")
+
+
+class TestTokenCacheKey:
+    """Test cache keys of tokens."""
+
+    def test_access_tokens_carry_jti(self):
+        """Each access token gets its own jti, used as cache key."""
+        first = create_access_token("user-1")
+        second = create_access_token("user-1")
+
+        first_payload = decode_token(first)
+        assert first_payload["jti"] != decode_token(second)["jti"]
+        assert token_cache_key(first, first_payload) == first_payload["jti"]
+
+    def test_legacy_token_keyed_by_digest(self):
+        """Tokens without jti are keyed by their digest."""
+        settings = get_settings()
+        token = jwt.encode(
+            {"sub": "user-1", "exp": int(time.time()) + 60},
+            settings.security.secret_key,
+            algorithm=settings.security.jwt_algorithm,
+        )
+        payload = decode_token(token)
+
+        key = token_cache_key(token, payload)
+        assert len(key) == 64
+        assert key == token_cache_key(token, payload)
+
+
+class TestPrincipalCache:
+    """Test the per-worker principal cache."""
+
+    def test_put_and_get(self):
+        """A cached principal is served until invalidated."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10, enabled=True)
+        principal = make_principal()
+
+        assert cache.get("token-1") is None
+        cache.put("token-1", principal)
+
+        assert cache.get("token-1") is principal
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        """Entries are reloaded once the TTL has passed."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10, enabled=True)
+        now = time.monotonic()
+        monkeypatch.setattr(
+            "backend.app.core.principal_cache.time.monotonic", lambda: now
+        )
+        cache.put("token-1", make_principal())
+
+        monkeypatch.setattr(
+            "backend.app.core.principal_cache.time.monotonic", lambda: now + 31
+        )
+        assert cache.get("token-1") is None
+        assert cache.get_statistics()["size"] == 0
+
+    def test_entries_do_not_outlive_token(self):
+        """An already expired token is not cached."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10, enabled=True)
+        cache.put("token-1", make_principal(), token_expires_at=time.time() - 1)
+        assert cache.get("token-1") is None
+
+    def test_evicts_least_recently_used(self):
+        """The cache stays within its bound, evicting the LRU entry."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=2, enabled=True)
+        cache.put("token-1", make_principal("user-1"))
+        cache.put("token-2", make_principal("user-2"))
+        cache.get("token-1")
+        cache.put("token-3", make_principal("user-3"))
+
+        assert cache.get("token-1") is not None
+        assert cache.get("token-2") is None
+        assert cache.get("token-3") is not None
+        assert cache.stats["evictions"] == 1
+
+    def test_invalidate_user_drops_all_tokens(self):
+        """All tokens of a user are dropped, other users are kept."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10, enabled=True)
+        cache.put("token-1", make_principal("user-1"))
+        cache.put("token-2", make_principal("user-1"))
+        cache.put("token-3", make_principal("user-2"))
+
+        cache.invalidate_user("user-1")
+
+        assert cache.get("token-1") is None
+        assert cache.get("token-2") is None
+        assert cache.get("token-3") is not None
+
+    def test_invalidate_token(self):
+        """Revoking one token keeps the user's other tokens."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10, enabled=True)
+        cache.put("token-1", make_principal("user-1"))
+        cache.put("token-2", make_principal("user-1"))
+
+        cache.invalidate_token("token-1")
+
+        assert cache.get("token-1") is None
+        assert cache.get("token-2") is not None
+
+    def test_disabled_cache(self):
+        """A disabled cache never serves entries."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10, enabled=False)
+        cache.put("token-1", make_principal())
+        assert cache.get("token-1") is None
+
+    def test_apply_remote_invalidations(self):
+        """Invalidations from other workers are applied locally."""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10, enabled=True)
+        cache.put("token-1", make_principal("user-1"))
+        cache.put("token-2", make_principal("user-2"))
+        cache.put("token-3", make_principal("user-3"))
+
+        cache.apply({"user_id": "user-1"})
+        cache.apply({"key": "token-2"})
+        assert cache.get("token-1") is None
+        assert cache.get("token-2") is None
+        assert cache.get("token-3") is not None
+
+        cache.apply({"all": True})
+        assert cache.get("token-3") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_published(self):
+        """Local invalidations are published for the other workers."""
+        cache = PrincipalCache(
+            ttl_seconds=30, max_entries=10, channel="test:principal", enabled=True
+        )
+        cache._redis = AsyncMock()
+
+        cache.invalidate_user("user-1")
+        await asyncio.sleep(0)
+
+        channel, payload = cache._redis.publish.call_args.args
+        assert channel == "test:principal"
+        event = json.loads(payload)
+        assert event["user_id"] == "user-1"
+        assert event["origin"] == cache.worker_id
+
+
+class TestCurrentUser:
+    """Test the authentication dependencies."""
+
+    @pytest.fixture
+    def user(self):
+        return SimpleNamespace(
+            id="user-1",
+            email="user@example.com",
+            username="user",
+            role="user",
+            organization_id=None,
+            groups=[],
+            is_active=True,
+            get_effective_permissions=lambda: [],
+        )
+
+    @pytest.fixture
+    def session(self, user, monkeypatch):
+        """Async session counting the user queries."""
+        session = SimpleNamespace(queries=0)
+
+        async def execute(statement):
+            session.queries += 1
+            return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+        class Session:
+            async def __aenter__(self):
+                return SimpleNamespace(execute=execute)
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        monkeypatch.setattr(
+            "backend.app.core.database.get_async_session_factory",
+            lambda: Session,
+        )
+        monkeypatch.setattr(
+            "backend.app.core.security.is_token_revoked", AsyncMock(return_value=False)
+        )
+        monkeypatch.setattr(
+            "backend.app.core.security.principal_cache",
+            PrincipalCache(ttl_seconds=30, max_entries=10, enabled=True),
+        )
+        return session
+
+    @pytest.mark.asyncio
+    async def test_cold_request_loads_user_once(self, session):
+        """The user loaded for the principal is reused by get_current_user."""
+        credentials = SimpleNamespace(credentials=create_access_token("user-1"))
+        request = SimpleNamespace(state=SimpleNamespace())
+
+        principal = await get_current_principal(request, credentials)
+        user = await get_current_user(request, principal)
+
+        assert user.id == "user-1"
+        assert session.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_principal_loads_user(self, session):
+        """With a cached principal the user is queried by get_current_user."""
+        credentials = SimpleNamespace(credentials=create_access_token("user-1"))
+        await get_current_principal(SimpleNamespace(state=SimpleNamespace()), credentials)
+
+        request = SimpleNamespace(state=SimpleNamespace())
+        principal = await get_current_principal(request, credentials)
+        await get_current_user(request, principal)
+
+        assert session.queries == 2